@@ -507,6 +507,11 @@ def _handle_data_persona_menu():
                 Choice(None, "⬅️  Back to Persona Selection"),
                 Separator(SEPARATOR_LINE),
                 Choice("manage_mock_data", "🗃️  Manage Mock Data & DB"),
+                Choice("generate_synthetic_data", "📈  Generate Synthetic Load-Test Data"),
+                Choice("search_analyses", "🔎  Search Prompts & AI Responses"),
+                Choice("prp_retention", "🗄️  Archive Old Sessions (Retention)"),
+                Choice("model_similarity", "🧮  Compute Model Similarity Connections"),
+                Choice("job_workers", "⚙️  Run Background Job Workers"),
                 Separator(SEPARATOR_LINE),
                 Choice("critique", "🔬  Critique Data Layer (test_data.py)"),
             ],
@@ -523,6 +528,25 @@ def _handle_data_persona_menu():
 
         if action == "manage_mock_data":
             run_command(f'{PY_EXEC} "{PROJECT_ROOT / "admin" / "create_mock_data.py"}"')
+        elif action == "generate_synthetic_data":
+            # Adds ~100k comparisons and 10k analysis sessions to the application's databases.
+            if inquirer.confirm(message=f"Write synthetic data into {config.DB_PATH} and {config.PRP_DB_PATH}?",
+                                default=False).execute():
+                run_command(f'{PY_EXEC} "{PROJECT_ROOT / "admin" / "generate_synthetic_data.py"}" '
+                            f'--mock-db "{config.DB_PATH}" --prp-db "{config.PRP_DB_PATH}"')
+        elif action == "search_analyses":
+            query = inquirer.text(message="Search prompts and AI responses for:").execute().strip()
+            if query:
+                # An argument list, not a shell string: the query reaches the script verbatim.
+                run_command([sys.executable, str(PROJECT_ROOT / "admin" / "search_analyses.py"), query])
+        elif action == "prp_retention":
+            run_command(f'{PY_EXEC} "{PROJECT_ROOT / "admin" / "prp_retention.py"}"')
+            if inquirer.confirm(message="Archive these sessions now?", default=False).execute():
+                run_command(f'{PY_EXEC} "{PROJECT_ROOT / "admin" / "prp_retention.py"}" --apply')
+        elif action == "model_similarity":
+            run_command(f'{PY_EXEC} "{PROJECT_ROOT / "admin" / "compute_model_similarity.py"}"')
+        elif action == "job_workers":
+            run_command(f'{PY_EXEC} "{PROJECT_ROOT / "admin" / "run_job_workers.py"}"')
         elif action == "critique":
             _run_test_sequence(target="DATA", with_allure=False, is_regression=False, serve_report=False)
 
@@ -3,7 +3,7 @@ import subprocess
 import sys
 import os
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Sequence, Union
 
 # --- Root Project Path Setup (CRITICAL for Imports) ---
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -29,10 +29,12 @@ def _pause_for_acknowledgement(message: str = "\nPress Enter to return to the me
     """Pauses execution and waits for the user to press Enter."""
     input(message)
 
-def run_command(command: str, cwd: Path = PROJECT_ROOT, env: Optional[Dict[str, str]] = None) -> bool:
+def run_command(command: Union[str, Sequence[str]], cwd: Path = PROJECT_ROOT,
+                env: Optional[Dict[str, str]] = None) -> bool:
     """
     Runs a command, streams its output in real-time, and returns True on success.
-    Handles KeyboardInterrupt gracefully.
+    A string is run through the shell; pass an argument list for user input, which
+    is then handed to the program as-is. Handles KeyboardInterrupt gracefully.
     """
     process = None
     try:
@@ -41,7 +43,7 @@ def run_command(command: str, cwd: Path = PROJECT_ROOT, env: Optional[Dict[str,
             merged_env.update(env)
 
         process = subprocess.Popen(
-            command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            command, shell=isinstance(command, str), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
             cwd=cwd, text=True, encoding="utf-8", env=merged_env
         )
 
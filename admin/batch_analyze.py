@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Analyzes a batch of repositories listed in a manifest and stores sessions, snapshots
+and generated prompts in prp.db. Re-running with the same batch id resumes the batch,
+skipping repositories that already completed.
+
+Usage: python admin/batch_analyze.py MANIFEST --template TEMPLATE.md [--batch-id ID] [--workers N] [--chunk-size N]
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from config.loguru_setup import setup_logging, logger
+from src.business.ai.batch_analysis import BatchAnalysisPipeline, DEFAULT_TEMPLATE_DIR, load_manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", type=Path, help="JSON list, JSON lines, or one repository path per line.")
+    parser.add_argument("--template", required=True, help="Prompt template filename.")
+    parser.add_argument("--template-dir", type=Path, default=DEFAULT_TEMPLATE_DIR)
+    parser.add_argument("--batch-id", help="Identifier used to resume the batch (defaults to the manifest file name).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (defaults to CPU count).")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Results committed per transaction.")
+    parser.add_argument("--db", type=Path, default=config.PRP_DB_PATH)
+    args = parser.parse_args()
+
+    setup_logging(debug_mode=config.DEBUG_MODE)
+    repo_paths = load_manifest(args.manifest)
+    pipeline = BatchAnalysisPipeline(
+        template_filename=args.template,
+        db_path=args.db,
+        template_dir=args.template_dir,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    progress = pipeline.run(repo_paths, batch_id=args.batch_id or args.manifest.stem)
+    logger.info(
+        f"Done: {progress.completed} completed, {progress.failed} failed, {progress.skipped} skipped; "
+        f"throughput {progress.repos_per_second:.1f} repos/s."
+    )
+    return 0 if progress.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Benchmarks ingesting analysis sessions one create() per row (one commit each)
+against create_many() (executemany in chunks inside a single transaction).
+
+Usage: python admin/benchmark_bulk_ingest.py [--rows N] [--chunk-size N]
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.implementations.sqlite_crud_repository import ANALYSIS_SESSIONS, SQLiteCrudRepository, create_prp_pool
+from src.data.obj.entities import AnalysisSession
+
+
+def _sessions(rows: int):
+    return [AnalysisSession(target_repository_identifier=f"/repos/{i}", analysis_timestamp="2025-01-01T00:00:00",
+                            status="completed_successfully") for i in range(rows)]
+
+
+def _timed(rows: int, ingest) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = create_prp_pool(Path(tmp) / "bench.db")
+        repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+        items = _sessions(rows)
+        started = time.perf_counter()
+        ingest(repo, items)
+        elapsed = time.perf_counter() - started
+        assert len(repo.read_all()) == rows
+        pool.close_all()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    single = _timed(args.rows, lambda repo, items: [repo.create(item) for item in items])
+    bulk = _timed(args.rows, lambda repo, items: repo.create_many(items, chunk_size=args.chunk_size))
+    print(f"{'method':>12} | {'seconds':>8} | {'rows/s':>10}")
+    print("-" * 38)
+    print(f"{'create':>12} | {single:>8.3f} | {args.rows / single:>10.0f}")
+    print(f"{'create_many':>12} | {bulk:>8.3f} | {args.rows / bulk:>10.0f}")
+    print(f"Speedup: {single / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
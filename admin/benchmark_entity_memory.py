@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Benchmarks the memory and time of reading a large prp.db result set as dict rows,
+as plain dataclasses (one __dict__ per row) and as the slotted entities built by
+the repositories' compiled row factories.
+
+Usage: python admin/benchmark_entity_memory.py [--rows N]
+"""
+import gc
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Optional
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.implementations.sqlite_crud_repository import AI_ANALYSIS_RESULTS, SQLiteCrudRepository, create_prp_pool
+from src.data.obj.entities import AIAnalysisResult
+
+
+@dataclass
+class PlainAIAnalysisResult:
+    """AIAnalysisResult as it was before __slots__, for comparison."""
+    result_id: Optional[int] = None
+    prompt_id: int = 0
+    ai_response_raw: str = ""
+    response_timestamp: str = ""
+    parsed_system_requirements_json: Optional[str] = None
+    parsed_dependencies_json: Optional[str] = None
+
+
+def _populate(pool, rows: int) -> None:
+    conn = pool.connection()
+    with conn:
+        conn.execute("INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES ('/repos/a', 't0')")
+        conn.execute("INSERT INTO generated_prompts (session_id, prompt_content, creation_timestamp) VALUES (1, 'p', 't0')")
+        conn.executemany(
+            "INSERT INTO ai_analysis_results (prompt_id, ai_response_raw, response_timestamp, parsed_system_requirements_json) "
+            "VALUES (1, ?, ?, ?)",
+            ((f"response {i}", f"2025-01-01T00:00:{i % 60:02d}", '{"requires_gpu": false}') for i in range(rows)),
+        )
+
+
+def _measure(read):
+    """Returns (seconds, bytes retained by the result) for read()."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = read()
+    elapsed = time.perf_counter() - started
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = create_prp_pool(Path(tmp) / "bench.db")
+        _populate(pool, args.rows)
+        repo = SQLiteCrudRepository(AI_ANALYSIS_RESULTS, pool)
+        conn = pool.connection()
+        select = "SELECT * FROM ai_analysis_results ORDER BY result_id"
+        names = [field.name for field in fields(AIAnalysisResult)]
+
+        results = {
+            "dict rows": _measure(lambda: [dict(row) for row in conn.execute(select)]),
+            "dataclass": _measure(lambda: [PlainAIAnalysisResult(*row) for row in conn.execute(select)]),
+            "slotted entity": _measure(repo.read_all),
+        }
+        assert [getattr(repo.read_by_id(1), name) for name in names] == list(conn.execute(select).fetchone())
+        pool.close_all()
+
+    baseline = results["dict rows"][1]
+    print(f"{args.rows} rows of ai_analysis_results, memory retained by the result list:")
+    print(f"{'representation':>16} | {'seconds':>8} | {'MB':>8} | {'bytes/row':>9} | {'vs dict':>7}")
+    print("-" * 62)
+    for name, (elapsed, retained) in results.items():
+        print(f"{name:>16} | {elapsed:>8.3f} | {retained / 1_048_576:>8.1f} | {retained / args.rows:>9.0f} | "
+              f"{retained / baseline:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Benchmarks FTS5 search against LIKE scans over a synthetic prp.db with many
+AI responses (random technical vocabulary, a few rare error strings).
+
+Usage: python admin/benchmark_full_text_search.py [--rows N] [--seed N]
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.implementations import prp_database
+from src.data.implementations.full_text_search import AnalysisSearch
+
+VOCABULARY = ("python numpy pandas flask torch tensorflow cuda driver memory install requirements version "
+              "package module import error warning gpu cpu ram disk linux windows macos docker build test").split()
+RARE = ["ModuleNotFoundError: No module named 'cupy'", "CUDA_ERROR_OUT_OF_MEMORY", "segfault in libtorch_cuda"]
+
+
+def populate(db_path: Path, rows: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    with prp_database.transaction(db_path) as conn:
+        prp_database.initialize_schema(conn)
+        conn.execute("INSERT INTO analysis_sessions (session_id, target_repository_identifier, analysis_timestamp) "
+                     "VALUES (1, '/repos/bench', '2025-01-01T00:00:00')")
+        conn.execute("INSERT INTO generated_prompts (prompt_id, session_id, prompt_content, creation_timestamp) "
+                     "VALUES (1, 1, 'benchmark', '2025-01-01T00:00:00')")
+    AnalysisSearch(db_path)  # Creates the index and triggers before the bulk load.
+    words = np.array(VOCABULARY)
+    with prp_database.transaction(db_path) as conn:
+        for start in range(0, rows, 100_000):
+            n = min(100_000, rows - start)
+            tokens = words[rng.integers(0, len(words), (n, 30))]
+            texts = [" ".join(row) for row in tokens.tolist()]
+            for i in rng.choice(n, max(1, n // 10_000), replace=False).tolist():
+                texts[i] += " " + RARE[i % len(RARE)]
+            conn.executemany(
+                "INSERT INTO ai_analysis_results (prompt_id, ai_response_raw, response_timestamp) VALUES (1, ?, ?)",
+                [(text, "2025-01-01T00:00:00") for text in texts],
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        started = time.perf_counter()
+        populate(db_path, args.rows, args.seed)
+        print(f"Loaded {args.rows} responses (with FTS triggers) in {time.perf_counter() - started:.1f}s.")
+        search = AnalysisSearch(db_path)
+        conn = prp_database.connect(db_path)
+
+        print(f"{'query':>32} | {'hits':>6} | {'LIKE (ms)':>10} | {'FTS5 top 20 (ms)':>16}")
+        print("-" * 74)
+        for query, like in (("cupy", "%cupy%"), ("CUDA_ERROR_OUT_OF_MEMORY", "%CUDA_ERROR_OUT_OF_MEMORY%"),
+                            ("libtorch_cuda segfault", "%segfault in libtorch_cuda%")):
+            started = time.perf_counter()
+            count = conn.execute("SELECT COUNT(*) FROM ai_analysis_results WHERE ai_response_raw LIKE ?", (like,)).fetchone()[0]
+            like_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            search.search(query, kinds=["result"], limit=20)
+            fts_ms = (time.perf_counter() - started) * 1000
+            print(f"{query:>32} | {count:>6} | {like_ms:>10.1f} | {fts_ms:>16.1f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
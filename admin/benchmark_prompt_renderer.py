@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Benchmarks the compiled single-pass prompt renderer against the legacy
+re.findall + str.replace approach on large templates and contexts.
+
+Usage: python admin/benchmark_prompt_renderer.py [--placeholders N] [--content-kb N] [--repeat N]
+"""
+import re
+import sys
+import argparse
+import timeit
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.business.ai.prompt_renderer import CompiledTemplate
+
+
+def legacy_render(template_content: str, populated_data: dict) -> str:
+    """The pre-compiled implementation: one full copy of the prompt per placeholder."""
+    populated_prompt = template_content
+    for key in set(re.findall(r"{{(.*?)}}", template_content)):
+        value = populated_data.get(key)
+        if value is None:
+            value = f"{key} not found or empty."
+        populated_prompt = populated_prompt.replace(f"{{{{{key}}}}}", str(value))
+    return populated_prompt
+
+
+def build_case(placeholders: int, content_kb: int):
+    """Builds a template with `placeholders` keys and a context whose values total ~content_kb per key."""
+    filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+    sections = [f"## Section {i}\n{filler}\n{{{{key_{i}}}}}\n" for i in range(placeholders)]
+    template = "".join(sections)
+    value = ("x" * 1023 + "\n") * content_kb
+    context = {f"key_{i}": value for i in range(placeholders)}
+    return template, context
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--placeholders", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--content-kb", type=int, default=64, help="Size of each substituted value in KB.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'placeholders':>12} | {'prompt size':>12} | {'legacy (ms)':>12} | {'compiled (ms)':>13} | {'render only (ms)':>16} | {'speedup':>7}")
+    print("-" * 90)
+    for count in args.placeholders:
+        template, context = build_case(count, args.content_kb)
+        compiled = CompiledTemplate(template)
+        assert compiled.render(context) == legacy_render(template, context)
+
+        legacy = min(timeit.repeat(lambda: legacy_render(template, context), number=1, repeat=args.repeat))
+        compile_and_render = min(timeit.repeat(lambda: CompiledTemplate(template).render(context), number=1, repeat=args.repeat))
+        render_only = min(timeit.repeat(lambda: compiled.render(context), number=1, repeat=args.repeat))
+        size_kb = len(compiled.render(context)) / 1024
+        print(f"{count:>12} | {size_kb:>9.0f} KB | {legacy * 1e3:>12.2f} | {compile_and_render * 1e3:>13.2f} | "
+              f"{render_only * 1e3:>16.2f} | {legacy / render_only:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
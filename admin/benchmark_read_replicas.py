@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Benchmarks writer latency on prp.db while reporting queries run alongside it,
+with the reports reading prp.db itself and then reading snapshot replicas.
+One writer commits a small session at a time; --readers threads repeatedly
+stream every session in batches, pausing briefly per batch the way a report
+renders rows, so each read transaction stays open for a while.
+
+Usage: python admin/benchmark_read_replicas.py [--sessions N] [--readers N] [--seconds S]
+                                               [--journal-mode delete|wal] [--refresh-interval S]
+"""
+import sys
+import time
+import argparse
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.implementations import prp_database
+from src.data.implementations.read_replicas import ReplicaManager, read_connection
+
+REPORT = "SELECT session_id, target_repository_identifier, analysis_timestamp, user_notes FROM analysis_sessions"
+
+
+def populate(db_path: Path, sessions: int, journal_mode: str) -> None:
+    conn = prp_database.connect(db_path)
+    prp_database.initialize_schema(conn)
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    with conn:
+        conn.executemany(
+            "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp, user_notes, status) "
+            "VALUES (?, ?, ?, 'completed_successfully')",
+            [(f"/repos/project-{n % 5000}", f"2025-01-01T00:00:{n % 60:02d}", "note " * (n % 20)) for n in range(sessions)],
+        )
+    conn.close()
+
+
+def run(db_path: Path, readers: int, seconds: float, replicas: Optional[ReplicaManager]) -> Dict[str, float]:
+    stop = threading.Event()
+    reports = [0]
+
+    def report_loop() -> None:
+        while not stop.is_set():
+            with read_connection(db_path, replicas) as conn:
+                cursor = conn.execute(REPORT)
+                while cursor.fetchmany(5000) and not stop.is_set():
+                    time.sleep(0.01)
+            reports[0] += 1
+
+    threads = [threading.Thread(target=report_loop) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    latencies, busy = [], 0
+    conn = prp_database.connect(db_path, timeout=1.0)
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            with conn:
+                conn.execute("INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) "
+                             "VALUES ('/repos/writer', '2025-06-01T00:00:00')")
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError:  # database is locked
+            busy += 1
+    conn.close()
+    stop.set()
+    for thread in threads:
+        thread.join()
+    ms = np.array(latencies) * 1000
+    return {"writes": len(latencies), "busy": busy, "p50": float(np.percentile(ms, 50)) if len(ms) else 0.0,
+            "p99": float(np.percentile(ms, 99)) if len(ms) else 0.0, "max": float(ms.max()) if len(ms) else 0.0,
+            "reports": reports[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=300_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--journal-mode", choices=["delete", "wal"], default="delete")
+    parser.add_argument("--refresh-interval", type=float, default=5.0, help="Seconds between replica refreshes.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "prp.db"
+        populate(db_path, args.sessions, args.journal_mode)
+        print(f"{args.sessions} sessions, {args.readers} report threads, journal_mode={args.journal_mode}\n")
+        print(f"{'reads from':<12} {'writes':>7} {'busy':>5} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'reports':>8}")
+        for label in ("primary", "replicas"):
+            replicas = ReplicaManager(db_path, Path(tmp) / "replicas", refresh_interval=args.refresh_interval).start() \
+                if label == "replicas" else None
+            try:
+                r = run(db_path, args.readers, args.seconds, replicas)
+            finally:
+                if replicas is not None:
+                    replicas.close()
+            print(f"{label:<12} {r['writes']:>7} {r['busy']:>5} {r['p50']:>8.2f} {r['p99']:>8.2f} "
+                  f"{r['max']:>8.1f} {r['reports']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Benchmarks concurrent reads against a busy writer through SQLiteCrudRepository,
+comparing the rollback journal (DELETE) with WAL. In WAL mode readers keep reading
+the last committed version while the writer commits, so their tail latency stays flat.
+
+Usage: python admin/benchmark_sqlite_concurrency.py [--readers N] [--seconds S] [--rows-per-commit N]
+"""
+import sys
+import time
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.implementations import prp_database
+from src.data.implementations.sqlite_crud_repository import ANALYSIS_SESSIONS, SQLiteConnectionPool, SQLiteCrudRepository
+
+SEED_ROWS = 10_000
+
+
+def run_case(db_path: Path, journal_mode: str, readers: int, seconds: float, rows_per_commit: int) -> dict:
+    pool = SQLiteConnectionPool(db_path, journal_mode=journal_mode, initializer=prp_database.initialize_schema)
+    repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    conn = pool.connection()
+    with conn:
+        conn.executemany(
+            "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp, status) VALUES (?, ?, ?)",
+            [(f"/repos/{i}", "2025-01-01T00:00:00", "created") for i in range(SEED_ROWS)],
+        )
+
+    stop = threading.Event()
+    latencies, commits, errors = [], [0], [0]
+    lock = threading.Lock()
+
+    def writer():
+        conn = pool.connection()
+        while not stop.is_set():
+            with conn:
+                conn.executemany(
+                    "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp, status) VALUES (?, ?, ?)",
+                    [("/repos/new", "2025-01-01T00:00:00", "x" * 200)] * rows_per_commit,
+                )
+            commits[0] += 1
+
+    def reader(seed: int):
+        local, i = [], seed
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                repo.read_by_id(i % SEED_ROWS + 1)
+            except Exception:
+                errors[0] += 1
+            local.append(time.perf_counter() - started)
+            i += 7919
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    pool.close_all()
+
+    latencies.sort()
+
+    def pick(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    return {
+        "reads_per_s": len(latencies) / seconds, "p50_ms": pick(0.50), "p99_ms": pick(0.99),
+        "max_ms": latencies[-1] * 1000, "commits": commits[0], "errors": errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rows-per-commit", type=int, default=2000, help="Rows the writer inserts per transaction.")
+    args = parser.parse_args()
+
+    print(f"{'journal':>8} | {'reads/s':>9} | {'p50 (ms)':>8} | {'p99 (ms)':>8} | {'max (ms)':>8} | {'commits':>7} | {'errors':>6}")
+    print("-" * 72)
+    for journal_mode in ("DELETE", "WAL"):
+        with tempfile.TemporaryDirectory() as tmp:
+            r = run_case(Path(tmp) / "bench.db", journal_mode, args.readers, args.seconds, args.rows_per_commit)
+        print(f"{journal_mode:>8} | {r['reads_per_s']:>9.0f} | {r['p50_ms']:>8.3f} | {r['p99_ms']:>8.3f} | "
+              f"{r['max_ms']:>8.1f} | {r['commits']:>7} | {r['errors']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Benchmarks the prp.db text codec on synthetic prompts and AI responses (a shared
+template around per-repository files and requirements), storing the same rows as
+plain text, zlib without a dictionary and zlib with a trained dictionary. Reports
+column and file size, write throughput, full-scan and point reads of the text, and
+a scan of the other columns (which the codec only helps, through a smaller file).
+
+Usage: python admin/benchmark_text_codec.py [--rows N] [--seed N]
+"""
+import sys
+import time
+import zlib
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.implementations import prp_database, text_codec
+
+INSTRUCTIONS = """You are an expert build and release engineer. Analyze the repository below and report the
+minimum system requirements needed to install, build and run it on a developer workstation.
+Answer with a fenced JSON block holding minimum.ram_gb, minimum.cpu_cores, minimum.gpu_vram_gb and
+minimum.disk_gb, then requires_gpu and requires_cuda, followed by a short justification for every value.
+Consider the declared dependencies, the README, Dockerfiles, CI workflows and any notebooks.
+Flag native extensions that need a compiler, and drivers the target machine must provide.
+"""
+PACKAGES = ("numpy pandas scipy torch torchvision tensorflow keras flask django fastapi uvicorn requests httpx "
+            "sqlalchemy pydantic loguru pytest black ruff matplotlib seaborn scikit-learn xgboost lightgbm "
+            "transformers datasets accelerate opencv-python pillow jax cupy numba dask polars pyarrow").split()
+WORDS = ("the a repository model training data pipeline service api server client install run build test deploy "
+         "configure gpu cpu memory disk dataset inference batch cache queue worker docker image notebook").split()
+
+
+def _requirements(rng: np.random.Generator) -> str:
+    chosen = rng.choice(PACKAGES, int(rng.integers(5, 20)), replace=False)
+    return "".join(f"{name}=={rng.integers(0, 3)}.{rng.integers(0, 30)}.{rng.integers(0, 10)}\n" for name in chosen)
+
+
+def _sentence(rng: np.random.Generator, words: int) -> str:
+    return " ".join(rng.choice(WORDS, words)) + ".\n"
+
+
+def make_texts(rows: int, seed: int) -> Tuple[List[str], List[str]]:
+    rng = np.random.default_rng(seed)
+    prompts, responses = [], []
+    for n in range(rows):
+        readme = "".join(_sentence(rng, int(rng.integers(8, 20))) for _ in range(int(rng.integers(10, 40))))
+        files = "".join(f"src/module_{rng.integers(0, 500)}/file_{rng.integers(0, 5000)}.py\n" for _ in range(40))
+        prompts.append(f"{INSTRUCTIONS}\n## Repository /repos/project-{n}\n\n### README.md\n{readme}\n"
+                       f"### requirements.txt\n{_requirements(rng)}\n### Files\n{files}")
+        gpu = bool(rng.random() < 0.3)
+        responses.append(
+            "Here is my analysis of the repository.\n\n```json\n{\n"
+            f'  "minimum": {{"ram_gb": {int(rng.choice([4, 8, 16, 32]))}, "cpu_cores": {int(rng.choice([2, 4, 8]))}, '
+            f'"gpu_vram_gb": {int(rng.choice([4, 8, 12])) if gpu else 0}, "disk_gb": {int(rng.integers(1, 50))}}},\n'
+            f'  "requires_gpu": {str(gpu).lower()},\n  "requires_cuda": {str(gpu).lower()}\n}}\n```\n\n'
+            "### Justification\n"
+            f"- **RAM**: {_sentence(rng, 20)}- **CPU**: {_sentence(rng, 15)}- **GPU**: {_sentence(rng, 15)}"
+            f"- **Disk**: {_sentence(rng, 12)}\n### Notes\n{_sentence(rng, 40)}"
+        )
+    return prompts, responses
+
+
+def run(db_path: Path, mode: str, prompts: List[str], responses: List[str]) -> Dict[str, float]:
+    conn = prp_database.connect(db_path)
+    prp_database.initialize_schema(conn)
+    if mode == "zlib+dict":
+        with conn:
+            for column, texts in (("prompt_content", prompts), ("ai_response_raw", responses)):
+                data = text_codec.train_dictionary(texts[:1000])
+                conn.execute("INSERT INTO codec_dictionaries VALUES (?, ?, ?, '2025-01-01T00:00:00', ?)",
+                             (zlib.adler32(data), column, min(len(texts), 1000), data))
+        text_codec.register_text_codec(conn)
+    value = "?" if mode == "plain" else "prp_compress('{column}', ?)"
+    rows = len(prompts)
+
+    started = time.perf_counter()
+    with conn:
+        conn.execute("INSERT INTO analysis_sessions (session_id, target_repository_identifier, analysis_timestamp) "
+                     "VALUES (1, '/repos/bench', '2025-01-01T00:00:00')")
+        conn.executemany(
+            "INSERT INTO generated_prompts (prompt_id, session_id, prompt_content, creation_timestamp) "
+            f"VALUES (?, 1, {value.format(column='prompt_content')}, '2025-01-01T00:00:00')",
+            list(zip(range(1, rows + 1), prompts)),
+        )
+        conn.executemany(
+            "INSERT INTO ai_analysis_results (result_id, prompt_id, ai_response_raw, response_timestamp) "
+            f"VALUES (?, ?, {value.format(column='ai_response_raw')}, '2025-01-01T00:00:00')",
+            [(n, n, text) for n, text in enumerate(responses, 1)],
+        )
+    write_seconds = time.perf_counter() - started
+    column_bytes = text_codec.codec_column_bytes(conn)
+    conn.close()
+    file_bytes = db_path.stat().st_size
+
+    conn = prp_database.connect(db_path)
+    started = time.perf_counter()
+    total = sum(len(text) for (text,) in conn.execute("SELECT prp_decompress(prompt_content) FROM generated_prompts"))
+    total += sum(len(text) for (text,) in conn.execute("SELECT prp_decompress(ai_response_raw) FROM ai_analysis_results"))
+    scan_seconds = time.perf_counter() - started
+    assert total == sum(map(len, prompts)) + sum(map(len, responses))
+
+    ids = np.random.default_rng(0).integers(1, rows + 1, min(rows, 5000)).tolist()
+    started = time.perf_counter()
+    for row_id in ids:
+        conn.execute("SELECT prp_decompress(prompt_content) FROM generated_prompts WHERE prompt_id = ?", (row_id,)).fetchone()
+    point_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    conn.execute("SELECT COUNT(*), MAX(creation_timestamp) FROM generated_prompts").fetchone()
+    metadata_seconds = time.perf_counter() - started
+    conn.close()
+    return {"column_bytes": column_bytes, "file_bytes": file_bytes, "write_rows_per_s": 2 * rows / write_seconds,
+            "scan_mb_per_s": total / scan_seconds / 1e6, "point_us": point_seconds / len(ids) * 1e6,
+            "metadata_ms": metadata_seconds * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000, help="Prompts, each with one response.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    prompts, responses = make_texts(args.rows, args.seed)
+    raw = sum(len(text.encode("utf-8")) for text in prompts + responses)
+    print(f"{args.rows} prompts + {args.rows} responses, {raw / 1e6:.1f} MB of text\n")
+    print(f"{'mode':<10} {'columns MB':>10} {'file MB':>8} {'ratio':>6} {'writes/s':>9} "
+          f"{'scan MB/s':>9} {'point µs':>9} {'meta ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("plain", "zlib", "zlib+dict"):
+            r = run(Path(tmp) / f"{mode}.db", mode, prompts, responses)
+            print(f"{mode:<10} {r['column_bytes'] / 1e6:>10.1f} {r['file_bytes'] / 1e6:>8.1f} "
+                  f"{raw / r['column_bytes']:>5.1f}x {r['write_rows_per_s']:>9.0f} {r['scan_mb_per_s']:>9.0f} "
+                  f"{r['point_us']:>9.1f} {r['metadata_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Compresses the prompt and response text already stored in prp.db
+(generated_prompts.prompt_content, ai_analysis_results.ai_response_raw) with
+dictionaries trained on those rows, and reports the space saved. Rows written
+afterwards are only compressed when PRP_TEXT_CODEC_ENABLED is set; without it they
+stay plain TEXT and the script warns. The full-text search index keeps its own
+uncompressed copy of the text, so the space saved is that of the columns alone.
+
+Usage: python admin/compress_text_columns.py [--db PATH] [--retrain] [--recompress]
+                                             [--batch-size N] [--sample-size N] [--vacuum]
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from src.data.implementations.text_codec import compress_existing_rows
+
+
+def _mb(num_bytes: int) -> str:
+    return f"{num_bytes / (1024 * 1024):.2f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=config.PRP_DB_PATH)
+    parser.add_argument("--retrain", action="store_true",
+                        help="Train new dictionaries even for columns that already have one.")
+    parser.add_argument("--recompress", action="store_true",
+                        help="Also rewrite compressed values, e.g. with the dictionaries from --retrain.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows rewritten per transaction.")
+    parser.add_argument("--sample-size", type=int, default=1000, help="Rows each dictionary is trained on.")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards so the file itself shrinks.")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"No database at {args.db}.")
+        return
+    report = compress_existing_rows(args.db, retrain=args.retrain, recompress=args.recompress,
+                                    batch_size=args.batch_size, sample_size=args.sample_size, vacuum=args.vacuum)
+    print(f"Dictionaries trained: {report.dictionaries_trained}")
+    print(f"Rows rewritten      : {report.rows_rewritten}")
+    print(f"Rows compressed     : {report.rows_compressed}")
+    print(f"Column bytes before : {_mb(report.bytes_before)}")
+    print(f"Column bytes after  : {_mb(report.bytes_after)} (compressed values + dictionaries)")
+    print(f"Space saved         : {_mb(report.bytes_saved)} ({report.ratio:.1f}x smaller)")
+    if not config.PRP_TEXT_CODEC_ENABLED:
+        print("Note: PRP_TEXT_CODEC_ENABLED is not set, so new rows are still written uncompressed.")
+    if args.vacuum:
+        print(f"Database file       : {_mb(report.file_bytes_before)} -> {_mb(report.file_bytes_after)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Computes pairwise similarity between every model in the mock model database (TF-IDF
+over each model's domain and focus) and stores each model's top-k most similar models
+as comparisons with 'similarity' inferred connections. Re-running replaces the
+connections from the previous run.
+
+Usage: python admin/compute_model_similarity.py [--top-k N] [--min-score X]
+                                                [--block-size N] [--workers N] [--db PATH]
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from src.business.ai.model_similarity import ModelSimilarityEngine
+from src.data.implementations.sqlite_crud_repository import MODELS, SQLiteConnectionPool, SQLiteCrudRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=5, help="Most similar models kept per model.")
+    parser.add_argument("--min-score", type=float, default=0.1, help="Lowest cosine similarity stored.")
+    parser.add_argument("--block-size", type=int, default=256, help="Models scored per block (bounds memory).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: up to 4 cores).")
+    parser.add_argument("--db", type=Path, default=config.DB_PATH)
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"{args.db} not found. Run create_mock_data.py first.")
+        return
+    pool = SQLiteConnectionPool(args.db)
+    try:
+        models = list(SQLiteCrudRepository(MODELS, pool).iter_all())
+        if len(models) < 2:
+            print(f"Found {len(models)} model(s) in {args.db}; nothing to compare. Run create_mock_data.py first.")
+            return
+        engine = ModelSimilarityEngine(top_k=args.top_k, block_size=args.block_size,
+                                       workers=args.workers, min_score=args.min_score)
+        report = engine.write_connections(pool.connection(), models)
+    finally:
+        pool.close_all()
+
+    print(f"{report.models} models, {report.features} features -> {report.pairs} similarity connections "
+          f"({report.replaced} from the previous run replaced).")
+    print(f"  embed {report.embed_seconds:.2f} s | similarity {report.similarity_seconds:.2f} s "
+          f"| write {report.write_seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
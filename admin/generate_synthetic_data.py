@@ -0,0 +1,601 @@
+#!/usr/bin/env python
+"""
+Generates large, reproducible synthetic data sets for load-testing the mock model
+database (models, comparisons, inferred_connections, questions_and_hypotheses) and
+prp.db (analysis sessions with system profiles, prompts and AI results).
+
+Values are drawn with numpy in whole chunks from realistic distributions: Zipf-like
+model and repository popularity, diurnal activity, Poisson connection counts,
+Beta-distributed confidence scores and a realistic hardware mix. Rows are
+bulk-inserted with executemany in large transactions under bulk-load PRAGMAs.
+The same --seed always produces the same data.
+
+Nothing is written unless a target is named: --mock-db for the mock model
+tables, --prp-db for the analysis sessions (either or both).
+
+Usage: python admin/generate_synthetic_data.py (--mock-db PATH | --prp-db PATH ...)
+           [--comparisons N] [--questions N] [--sessions N] [--seed N] [--reset]
+"""
+
+import sys
+import json
+import time
+import argparse
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from src.data.implementations import prp_database
+from src.data.implementations.analytics_index import ensure_analytics_schema
+from src.data.implementations.mock_model_schema import (
+    ALL_MOCK_LLMS_LIST,
+    DB_SCHEMA_CONTENT,
+    mock_model_id,
+)
+
+CONNECTION_TYPES = np.array(
+    ["causal", "correlational", "analogical", "contradictory", "complementary"]
+)
+CONNECTION_TYPE_P = [0.20, 0.35, 0.25, 0.05, 0.15]
+QUESTION_TEMPLATES = [
+    "How does {a} relate to {b}?",
+    "Could {a} explain observed variation in {b}?",
+    "What evidence links {a} and {b}?",
+    "Is there a shared mechanism behind {a} and {b}?",
+]
+# Share of activity per hour of day (UTC): quiet nights, busy afternoons.
+DIURNAL = np.array(
+    [1, 1, 1, 1, 1, 2, 3, 5, 7, 8, 8, 8, 7, 8, 9, 9, 8, 7, 6, 5, 4, 3, 2, 1],
+    dtype=float,
+)
+DIURNAL /= DIURNAL.sum()
+
+SESSION_STATUSES = np.array(
+    ["completed_successfully", "prompt_generated", "failed_data_collection"]
+)
+SESSION_STATUS_P = [0.80, 0.15, 0.05]
+OS_CHOICES = np.array(["Windows", "Linux", "Darwin"])
+OS_P = [0.55, 0.35, 0.10]
+RAM_GB = np.array([8, 16, 32, 64, 128])
+RAM_P = [0.15, 0.35, 0.30, 0.15, 0.05]
+CORES = np.array([4, 8, 12, 16, 24, 32])
+CORES_P = [0.10, 0.30, 0.25, 0.20, 0.10, 0.05]
+VRAM_GB = np.array([0, 6, 8, 12, 16, 24])
+VRAM_P = [0.25, 0.10, 0.20, 0.20, 0.15, 0.10]
+REQ_RAM_GB = np.array([2, 4, 8, 16, 32])
+REQ_RAM_P = [0.15, 0.30, 0.30, 0.20, 0.05]
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> np.ndarray:
+    """Popularity weights: the k-th most popular item has weight 1/k^exponent."""
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def timestamps(
+    rng: np.random.Generator,
+    count: int,
+    start: np.datetime64,
+    days: int,
+    sep: str = " ",
+) -> np.ndarray:
+    """Sorted ISO timestamps spread over `days` days with a diurnal activity pattern."""
+    seconds = (
+        rng.integers(0, days, count) * 86400
+        + rng.choice(24, count, p=DIURNAL) * 3600
+        + rng.integers(0, 3600, count)
+    )
+    seconds.sort()
+    stamps = np.datetime_as_string(start + seconds.astype("timedelta64[s]"), unit="s")
+    return np.char.replace(stamps, "T", sep) if sep != "T" else stamps
+
+
+def tune_for_bulk_load(conn: sqlite3.Connection) -> str:
+    """Applies bulk-load PRAGMAs; returns the previous journal mode to restore later."""
+    previous = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.execute(
+        "PRAGMA journal_mode = MEMORY"
+    )  # Rollback journal in RAM: still atomic, no journal file I/O.
+    conn.execute(
+        "PRAGMA synchronous = OFF"
+    )  # No fsync per commit; fine for regenerable data.
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -262144")  # 256 MB page cache.
+    return previous
+
+
+def restore_after_bulk_load(conn: sqlite3.Connection, journal_mode: str) -> None:
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    conn.execute(
+        "PRAGMA synchronous = FULL"
+        if journal_mode.lower() != "wal"
+        else "PRAGMA synchronous = NORMAL"
+    )
+    conn.execute("PRAGMA optimize")
+
+
+def _next_id(conn: sqlite3.Connection, table: str, key: str) -> int:
+    return (conn.execute(f"SELECT MAX({key}) FROM {table}").fetchone()[0] or 0) + 1
+
+
+class Report:
+    def __init__(self):
+        self.rows: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+
+    def add(self, table: str, rows: int, seconds: float) -> None:
+        self.rows[table] = self.rows.get(table, 0) + rows
+        self.seconds[table] = self.seconds.get(table, 0.0) + seconds
+
+    def print(self) -> None:
+        print(f"{'table':>26} | {'rows':>10} | {'seconds':>8} | {'rows/s':>10}")
+        print("-" * 64)
+        for table, rows in self.rows.items():
+            seconds = self.seconds[table]
+            rate = rows / seconds if seconds else 0
+            print(f"{table:>26} | {rows:>10} | {seconds:>8.2f} | {rate:>10.0f}")
+
+
+def _insert(
+    conn: sqlite3.Connection, report: Report, table: str, sql: str, rows: List[Tuple]
+) -> None:
+    started = time.perf_counter()
+    conn.executemany(sql, rows)
+    report.add(table, len(rows), time.perf_counter() - started)
+
+
+# --- Mock model database ---
+
+
+def generate_models(
+    conn: sqlite3.Connection, rng: np.random.Generator, total: int, report: Report
+) -> List[Tuple[str, str, str]]:
+    """The 30 seed models plus numbered variants of them, up to `total` models."""
+    models = [
+        (mock_model_id(name, domain), name, domain, focus)
+        for name, domain, focus in ALL_MOCK_LLMS_LIST
+    ]
+    bases = rng.integers(0, len(ALL_MOCK_LLMS_LIST), max(0, total - len(models)))
+    for variant, base in enumerate(bases, start=2):
+        name, domain, focus = ALL_MOCK_LLMS_LIST[base]
+        models.append(
+            (
+                mock_model_id(f"{name} v{variant}", domain),
+                f"{name} v{variant}",
+                domain,
+                focus,
+            )
+        )
+    _insert(
+        conn,
+        report,
+        "models",
+        "INSERT OR IGNORE INTO models (model_id, name, domain, focus, description) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                model_id,
+                name,
+                domain,
+                focus,
+                f"Mock LLM focused on {focus} within {domain} domain.",
+            )
+            for model_id, name, domain, focus in models
+        ],
+    )
+    return [(model_id, name, focus) for model_id, name, _, focus in models]
+
+
+def generate_comparisons(conn, rng, models, args, start, report) -> Tuple[int, int]:
+    """
+    Comparisons between popularity-weighted model pairs, each with a Poisson number
+    of inferred connections.
+    """
+    model_ids = np.array([m[0] for m in models])
+    model_names = np.array([m[1] for m in models])
+    popularity = zipf_weights(len(models))
+    user_popularity = zipf_weights(args.users)
+    first_id = next_id = _next_id(conn, "comparisons", "comparison_id")
+    next_connection_id = _next_id(conn, "inferred_connections", "connection_id")
+
+    remaining = args.comparisons
+    while remaining > 0:
+        n = min(args.chunk_size, remaining)
+        left = rng.choice(len(models), n, p=popularity)
+        right = rng.choice(len(models), n, p=popularity)
+        same = left == right
+        right[same] = (
+            right[same] + 1 + rng.integers(0, len(models) - 1, same.sum())
+        ) % len(models)
+        users = rng.choice(args.users, n, p=user_popularity)
+        stamps = timestamps(rng, n, start, args.days)
+        ids = np.arange(next_id, next_id + n)
+
+        _insert(
+            conn,
+            report,
+            "comparisons",
+            "INSERT INTO comparisons (comparison_id, model_id_1, model_id_2, "
+            "comparison_timestamp, user_session_id) VALUES (?, ?, ?, ?, ?)",
+            list(
+                zip(
+                    ids.tolist(),
+                    model_ids[left].tolist(),
+                    model_ids[right].tolist(),
+                    stamps.tolist(),
+                    [f"user-{u:06d}" for u in users.tolist()],
+                )
+            ),
+        )
+
+        counts = rng.poisson(args.connections_per_comparison, n)
+        total = int(counts.sum())
+        owner = np.repeat(np.arange(n), counts)
+        types = rng.choice(CONNECTION_TYPES, total, p=CONNECTION_TYPE_P)
+        confidence = np.round(rng.beta(5, 2, total), 2)
+        by_ai = rng.random(total) < 0.85
+        texts = [
+            f"{kind.capitalize()} connection between {a} and {b}."
+            for kind, a, b in zip(
+                types.tolist(),
+                model_names[left[owner]].tolist(),
+                model_names[right[owner]].tolist(),
+            )
+        ]
+        _insert(
+            conn,
+            report,
+            "inferred_connections",
+            "INSERT INTO inferred_connections (connection_id, comparison_id, "
+            "connection_text, connection_type, confidence_score, generated_by_ai, "
+            "timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            list(
+                zip(
+                    range(next_connection_id, next_connection_id + total),
+                    ids[owner].tolist(),
+                    texts,
+                    types.tolist(),
+                    confidence.tolist(),
+                    by_ai.astype(int).tolist(),
+                    stamps[owner].tolist(),
+                )
+            ),
+        )
+        conn.commit()
+        next_id += n
+        next_connection_id += total
+        remaining -= n
+    return first_id, next_id - 1
+
+
+def generate_questions(
+    conn, rng, models, comparison_range, args, start, report
+) -> None:
+    """Questions about pairs of model focuses; 70% cite a recency-skewed comparison."""
+    focuses = np.array([m[2] for m in models])
+    user_popularity = zipf_weights(args.users)
+    low, high = comparison_range
+    remaining = args.questions
+    while remaining > 0:
+        n = min(args.chunk_size, remaining)
+        a = rng.integers(0, len(focuses), n)
+        b = rng.integers(0, len(focuses), n)
+        template = rng.integers(0, len(QUESTION_TEMPLATES), n)
+        texts = [
+            QUESTION_TEMPLATES[t].format(a=fa, b=fb)
+            for t, fa, fb in zip(
+                template.tolist(), focuses[a].tolist(), focuses[b].tolist()
+            )
+        ]
+        related = None
+        if high >= low:
+            # Newer comparisons attract more questions: a triangular skew
+            # towards the highest ids.
+            related = (
+                np.floor(rng.triangular(low, high + 1, high + 1, n))
+                .astype(np.int64)
+                .tolist()
+            )
+            linked = rng.random(n) < 0.7
+            related = [r if keep else None for r, keep in zip(related, linked.tolist())]
+        users = rng.choice(args.users, n, p=user_popularity)
+        _insert(
+            conn,
+            report,
+            "questions_and_hypotheses",
+            "INSERT INTO questions_and_hypotheses (question_text, "
+            "submitted_by_user_id, submission_timestamp, related_comparison_id) "
+            "VALUES (?, ?, ?, ?)",
+            list(
+                zip(
+                    texts,
+                    [f"user-{u:06d}" for u in users.tolist()],
+                    timestamps(rng, n, start, args.days).tolist(),
+                    related if related is not None else [None] * n,
+                )
+            ),
+        )
+        conn.commit()
+        remaining -= n
+
+
+# --- prp.db ---
+
+
+def generate_sessions(conn, rng, args, start, report) -> None:
+    """
+    Analysis sessions over Zipf-popular repositories, with system profiles (and
+    their facts), prompts and results.
+    """
+    repositories = max(1, args.sessions // 5)
+    repo_popularity = zipf_weights(repositories)
+    session_id = _next_id(conn, "analysis_sessions", "session_id")
+    profile_id = _next_id(conn, "system_profiles", "profile_id")
+    prompt_id = _next_id(conn, "generated_prompts", "prompt_id")
+    result_id = _next_id(conn, "ai_analysis_results", "result_id")
+
+    remaining = args.sessions
+    while remaining > 0:
+        n = min(args.chunk_size, remaining)
+        ids = np.arange(session_id, session_id + n)
+        repos = rng.choice(repositories, n, p=repo_popularity)
+        status = rng.choice(SESSION_STATUSES, n, p=SESSION_STATUS_P)
+        stamps = timestamps(rng, n, start, args.days, sep="T").tolist()
+        _insert(
+            conn,
+            report,
+            "analysis_sessions",
+            "INSERT INTO analysis_sessions (session_id, target_repository_identifier, "
+            "analysis_timestamp, user_notes, status) VALUES (?, ?, ?, ?, ?)",
+            list(
+                zip(
+                    ids.tolist(),
+                    [f"/repos/synthetic/repo-{r:06d}" for r in repos.tolist()],
+                    stamps,
+                    ["synthetic"] * n,
+                    status.tolist(),
+                )
+            ),
+        )
+
+        collected = np.flatnonzero(status != "failed_data_collection")
+        k = len(collected)
+        os_system = rng.choice(OS_CHOICES, k, p=OS_P).tolist()
+        ram = rng.choice(RAM_GB, k, p=RAM_P).tolist()
+        cores = rng.choice(CORES, k, p=CORES_P).tolist()
+        vram = rng.choice(VRAM_GB, k, p=VRAM_P).tolist()
+        session_ids = ids[collected].tolist()
+        session_stamps = [stamps[i] for i in collected.tolist()]
+        profile_ids = list(range(profile_id, profile_id + k))
+        profiles = [
+            json.dumps(
+                {
+                    "os": {"system": o},
+                    "cpu": {"logical_cores": c, "physical_cores": c // 2},
+                    "ram": {"total_gb": r},
+                    "gpu_info": {
+                        "gpus": [{"name": "Synthetic GPU", "total_vram_gb": v}]
+                        if v
+                        else []
+                    },
+                }
+            )
+            for o, c, r, v in zip(os_system, cores, ram, vram)
+        ]
+        _insert(
+            conn,
+            report,
+            "system_profiles",
+            "INSERT INTO system_profiles (profile_id, session_id, profile_timestamp, "
+            "profile_data) VALUES (?, ?, ?, ?)",
+            list(zip(profile_ids, session_ids, session_stamps, profiles)),
+        )
+        _insert(
+            conn,
+            report,
+            "system_profile_facts",
+            "INSERT INTO system_profile_facts (profile_id, session_id, os_system, "
+            "logical_cores, physical_cores, ram_total_gb, gpu_count, gpu_vram_gb) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            list(
+                zip(
+                    profile_ids,
+                    session_ids,
+                    os_system,
+                    cores,
+                    [c // 2 for c in cores],
+                    ram,
+                    [1 if v else 0 for v in vram],
+                    [v or None for v in vram],
+                )
+            ),
+        )
+        prompt_ids = list(range(prompt_id, prompt_id + k))
+        _insert(
+            conn,
+            report,
+            "generated_prompts",
+            "INSERT INTO generated_prompts (prompt_id, session_id, prompt_type, "
+            "template_name_used, prompt_content, creation_timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            list(
+                zip(
+                    prompt_ids,
+                    session_ids,
+                    ["initial_analysis"] * k,
+                    ["synthetic.md"] * k,
+                    [
+                        f"Analyze the system requirements of session {s}."
+                        for s in session_ids
+                    ],
+                    session_stamps,
+                )
+            ),
+        )
+
+        completed = [
+            i
+            for i, c in enumerate(collected.tolist())
+            if status[c] == "completed_successfully"
+        ]
+        m = len(completed)
+        req_ram = rng.choice(REQ_RAM_GB, m, p=REQ_RAM_P).tolist()
+        req_cores = rng.choice([1, 2, 4, 8], m, p=[0.2, 0.4, 0.3, 0.1]).tolist()
+        needs_gpu = (rng.random(m) < 0.3).tolist()
+        needs_cuda = [
+            g and c for g, c in zip(needs_gpu, (rng.random(m) < 0.8).tolist())
+        ]
+        req_vram = rng.choice([4, 6, 8, 12], m).tolist()
+        requirements = [
+            json.dumps(
+                {
+                    "minimum": {
+                        "ram_gb": r,
+                        "cpu_cores": c,
+                        "gpu_vram_gb": v if g else 0,
+                        "disk_gb": 10,
+                    },
+                    "requires_gpu": g,
+                    "requires_cuda": cu,
+                }
+            )
+            for r, c, v, g, cu in zip(
+                req_ram, req_cores, req_vram, needs_gpu, needs_cuda
+            )
+        ]
+        _insert(
+            conn,
+            report,
+            "ai_analysis_results",
+            "INSERT INTO ai_analysis_results (result_id, prompt_id, ai_response_raw, "
+            "response_timestamp, parsed_system_requirements_json) "
+            "VALUES (?, ?, ?, ?, ?)",
+            list(
+                zip(
+                    range(result_id, result_id + m),
+                    [prompt_ids[i] for i in completed],
+                    ["Synthetic AI response."] * m,
+                    [session_stamps[i] for i in completed],
+                    requirements,
+                )
+            ),
+        )
+        conn.commit()
+        session_id += n
+        profile_id += k
+        prompt_id += k
+        result_id += m
+        remaining -= n
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--models",
+        type=int,
+        default=300,
+        help="Total models, including the 30 seed models.",
+    )
+    parser.add_argument("--comparisons", type=int, default=100_000)
+    parser.add_argument(
+        "--connections-per-comparison", type=float, default=3.0, help="Poisson mean."
+    )
+    parser.add_argument("--questions", type=int, default=50_000)
+    parser.add_argument(
+        "--sessions", type=int, default=10_000, help="prp.db analysis sessions."
+    )
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--start", default="2025-01-01")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50_000,
+        help="Rows generated and committed per batch.",
+    )
+    parser.add_argument(
+        "--mock-db",
+        type=Path,
+        help=f"Mock model database to fill (the application's is {config.DB_PATH}).",
+    )
+    parser.add_argument(
+        "--prp-db",
+        type=Path,
+        help="prp.db to fill with analysis sessions "
+        f"(the application's is {config.PRP_DB_PATH}).",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Recreate the mock model tables before generating.",
+    )
+    args = parser.parse_args(argv)
+    if args.mock_db is None and args.prp_db is None:
+        parser.error(
+            "name the database(s) to write with --mock-db and/or --prp-db; "
+            "nothing is written by default."
+        )
+
+    # Independent streams, so the sessions for a seed are the same whether or not
+    # the mock tables are generated too.
+    mock_rng, session_rng = (
+        np.random.default_rng(seed)
+        for seed in np.random.SeedSequence(args.seed).spawn(2)
+    )
+    start = np.datetime64(args.start, "s")
+    report = Report()
+
+    if args.mock_db is not None:
+        conn = sqlite3.connect(args.mock_db)
+        try:
+            has_models = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'models'"
+            ).fetchone()
+            if args.reset or not has_models:
+                conn.executescript(DB_SCHEMA_CONTENT)
+            conn.execute(
+                "PRAGMA foreign_keys = OFF"
+            )  # Ids are generated consistently; skip per-row FK checks.
+            journal_mode = tune_for_bulk_load(conn)
+            models = generate_models(conn, mock_rng, args.models, report)
+            comparison_range = generate_comparisons(
+                conn, mock_rng, models, args, start, report
+            )
+            generate_questions(
+                conn, mock_rng, models, comparison_range, args, start, report
+            )
+            restore_after_bulk_load(conn, journal_mode)
+        finally:
+            conn.close()
+
+    if args.prp_db is not None and args.sessions > 0:
+        conn = prp_database.connect(args.prp_db)
+        try:
+            prp_database.initialize_schema(conn)
+            ensure_analytics_schema(conn)
+            conn.commit()
+            conn.execute("PRAGMA foreign_keys = OFF")
+            journal_mode = tune_for_bulk_load(conn)
+            generate_sessions(conn, session_rng, args, start, report)
+            restore_after_bulk_load(conn, journal_mode)
+        finally:
+            conn.close()
+
+    report.print()
+    print(f"Mock model database: {args.mock_db or '(not written)'}")
+    print(f"prp.db             : {args.prp_db or '(not written)'}")
+
+
+if __name__ == "__main__":
+    main()
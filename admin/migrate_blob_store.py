@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Migrates existing repository_snapshots and system_profiles rows in prp.db to the
+content-addressed blob store and reports the space saved.
+
+Usage: python admin/migrate_blob_store.py [--db PATH] [--batch-size N] [--vacuum]
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from src.data.implementations.blob_store import migrate_to_blob_store
+
+
+def _mb(num_bytes: int) -> str:
+    return f"{num_bytes / (1024 * 1024):.2f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=config.PRP_DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows rewritten per transaction.")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards so the file itself shrinks.")
+    args = parser.parse_args()
+
+    report = migrate_to_blob_store(args.db, batch_size=args.batch_size, vacuum=args.vacuum)
+    print(f"Snapshots migrated : {report.snapshots_migrated}")
+    print(f"Profiles migrated  : {report.profiles_migrated}")
+    print(f"Column bytes before: {_mb(report.bytes_before)}")
+    print(f"Column bytes after : {_mb(report.bytes_after)} (manifests + compressed blobs)")
+    print(f"Space saved        : {_mb(report.bytes_saved)} ({report.ratio:.1f}x smaller)")
+    if args.vacuum:
+        print(f"Database file      : {_mb(report.file_bytes_before)} -> {_mb(report.file_bytes_after)}")
+
+
+if __name__ == "__main__":
+    main()
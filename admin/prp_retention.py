@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Moves analysis sessions older than the retention policy from prp.db into yearly
+archive databases, then reclaims the freed space with incremental vacuum.
+Without --apply only a dry-run report (sessions per archive, estimated bytes) is printed.
+
+Usage: python admin/prp_retention.py [--apply] [--days N] [--keep-latest N]
+                                     [--vacuum-pages N] [--convert-vacuum]
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from src.data.implementations.retention import RetentionEngine, RetentionPolicy, RetentionReport
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1_048_576:.1f} MB"
+
+
+def print_report(report: RetentionReport) -> None:
+    verb = "Would archive" if report.dry_run else "Archived"
+    print(f"{verb} {report.sessions} session(s) analyzed before {report.cutoff}:")
+    for archive, count in sorted(report.sessions_by_archive.items()):
+        print(f"  {archive:<24} {count:>7} session(s)")
+    print(f"  {report.profiles} profiles, {report.snapshots} snapshots, {report.prompts} prompts, {report.results} results")
+    print(f"  Estimated size: {_mb(report.estimated_bytes)} "
+          f"(row text {_mb(report.row_bytes)}, blobs only these sessions use {_mb(report.blob_bytes)})")
+    if not report.dry_run:
+        print(f"  {report.blobs_collected} unreferenced blobs deleted, {report.pages_reclaimed} pages reclaimed.")
+        print(f"  prp.db: {_mb(report.file_bytes_before)} -> {_mb(report.file_bytes_after)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apply", action="store_true", help="Archive the sessions (default is a dry run).")
+    parser.add_argument("--days", type=int, default=config.PRP_RETENTION_DAYS, help="Maximum session age in days.")
+    parser.add_argument("--keep-latest", type=int, default=1,
+                        help="Newest sessions per repository kept regardless of age.")
+    parser.add_argument("--vacuum-pages", type=int, default=2000, help="Pages released per incremental vacuum step.")
+    parser.add_argument("--convert-vacuum", action="store_true",
+                        help="Switch an older prp.db to incremental auto-vacuum first (one full, blocking VACUUM).")
+    parser.add_argument("--db", type=Path, default=config.PRP_DB_PATH)
+    parser.add_argument("--archive-dir", type=Path, default=config.PRP_ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    engine = RetentionEngine(args.db, args.archive_dir, RetentionPolicy(args.days, args.keep_latest))
+    if args.apply:
+        report = engine.apply(vacuum_pages=args.vacuum_pages, convert_to_incremental=args.convert_vacuum)
+    else:
+        report = engine.plan()
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Runs the background job workers: analyses queued through POST /api/jobs/analyses
+(and model similarity jobs) are claimed from the job queue in prp.db and run until
+Ctrl+C, or with --drain until no job is left queued or running. Any number of worker
+processes may run against the same database.
+
+Usage: python admin/run_job_workers.py [--threads N] [--processes N] [--poll-interval S]
+                                       [--enqueue-similarity] [--drain] [--db PATH]
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from core.bootstrap import configure_project_business_dependencies
+from core.dependency_container import DependencyContainer
+from src.business.ai.analysis_jobs import MODEL_SIMILARITY_JOB, JobWorkerPool, default_job_kinds
+from src.business.interfaces.IAIService import IAIService
+from src.data.implementations.job_queue import JOB_QUEUED, JOB_RUNNING, SQLiteJobQueue
+
+
+def _pending(queue: SQLiteJobQueue) -> int:
+    counts = queue.counts()
+    return counts.get(JOB_QUEUED, 0) + counts.get(JOB_RUNNING, 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=config.JOB_THREAD_WORKERS,
+                        help="Workers for I/O-bound jobs (analyses).")
+    parser.add_argument("--processes", type=int, default=config.JOB_PROCESS_WORKERS,
+                        help="Workers for CPU-bound jobs (model similarity).")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls of an empty queue.")
+    parser.add_argument("--enqueue-similarity", action="store_true",
+                        help="Queue a model similarity recomputation before starting.")
+    parser.add_argument("--drain", action="store_true",
+                        help="Exit once no job is queued or running instead of waiting for Ctrl+C.")
+    parser.add_argument("--db", type=Path, default=config.PRP_DB_PATH)
+    args = parser.parse_args(argv)
+
+    container = DependencyContainer()
+    configure_project_business_dependencies(container)
+    queue = SQLiteJobQueue(args.db)
+    if args.enqueue_similarity:
+        print(f"Queued job {queue.enqueue(MODEL_SIMILARITY_JOB, {})} ({MODEL_SIMILARITY_JOB}).")
+
+    workers = JobWorkerPool(queue, default_job_kinds(container.resolve(IAIService), args.db),
+                            thread_workers=args.threads, process_workers=args.processes,
+                            poll_interval=args.poll_interval)
+    workers.start()
+    print(f"Job workers running against {args.db} ({args.threads} threads, {args.processes} processes). "
+          f"{'Stopping once the queue is empty' if args.drain else 'Press Ctrl+C to stop'}.")
+    try:
+        if args.drain:
+            while _pending(queue):
+                time.sleep(args.poll_interval)
+            print(f"Jobs: {queue.counts()}")
+        else:
+            while True:
+                time.sleep(30)
+                print(f"Jobs: {queue.counts()}")
+    except KeyboardInterrupt:
+        print("Stopping; waiting for running jobs to finish...")
+    finally:
+        workers.stop(wait=True)
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Full-text search over generated prompts and AI responses in prp.db.
+Prompts for the search text when none is given (as when run from the admin console).
+
+Usage: python admin/search_analyses.py [TEXT] [--kind prompt|result] [--session ID]
+                                       [--since ISO] [--until ISO] [--limit N] [--raw] [--rebuild]
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from src.data.implementations import prp_database
+from src.data.implementations.full_text_search import KIND_PROMPT, KIND_RESULT, AnalysisSearch, rebuild_search_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("text", nargs="*", help="Words to search for (all must match; 'word*' for prefixes).")
+    parser.add_argument("--kind", choices=[KIND_PROMPT, KIND_RESULT], action="append")
+    parser.add_argument("--session", type=int)
+    parser.add_argument("--since", help="ISO timestamp, inclusive.")
+    parser.add_argument("--until", help="ISO timestamp, exclusive.")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--raw", action="store_true", help="Pass the text to FTS5 unchanged (OR, NEAR, phrases).")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild and optimize the search index first.")
+    parser.add_argument("--db", type=Path, default=config.PRP_DB_PATH)
+    args = parser.parse_args()
+
+    search = AnalysisSearch(args.db)
+    if args.rebuild:
+        with prp_database.transaction(args.db) as conn:
+            rebuild_search_index(conn)
+        print("Search index rebuilt.")
+
+    text = " ".join(args.text) or input("Search prompts and AI responses for: ").strip()
+    if not text:
+        return
+    started = time.perf_counter()
+    try:
+        hits = search.search(text, kinds=args.kind or (KIND_PROMPT, KIND_RESULT), session_id=args.session,
+                             since=args.since, until=args.until, limit=args.limit, raw=args.raw)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for hit in hits:
+        print(f"[{hit.kind:<6}] session {hit.session_id:<6} id {hit.row_id:<7} {hit.timestamp}  score {hit.score:.2f}")
+        print(f"          {hit.snippet}")
+    print(f"\n{len(hits)} hit(s) in {elapsed_ms:.1f} ms.")
+
+
+if __name__ == "__main__":
+    main()
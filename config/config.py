@@ -49,6 +49,41 @@ LOG_FILE = LOGS_DIR / "jennai.log"
 # ============================================================================
 DB_PATH      = ROOT / "jennai_db.sqlite"
 TEST_DB_PATH = ROOT / "test_jennai_db.sqlite"
+PRP_DB_PATH  = DATA_DIR / "database" / "prp.db"  # Analysis sessions, snapshots, prompts and AI results
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))  # How long a writer waits for the lock
+SQLITE_CACHED_STATEMENTS = int(os.getenv("SQLITE_CACHED_STATEMENTS", "256"))  # Prepared statements kept per connection
+# Read-through cache in front of the prp.db repositories (see src/data/implementations/cached_crud_repository.py).
+CRUD_CACHE_ENABLED = os.getenv("CRUD_CACHE_ENABLED", "True").lower() in ('true', '1', 't')
+CRUD_CACHE_MAX_ENTRIES = int(os.getenv("CRUD_CACHE_MAX_ENTRIES", "1024"))
+CRUD_CACHE_TTL_SECONDS = float(os.getenv("CRUD_CACHE_TTL_SECONDS", "60"))
+# Retention: sessions older than this move to yearly archive databases (see src/data/implementations/retention.py).
+PRP_ARCHIVE_DIR = DATA_DIR / "database" / "archive"
+PRP_RETENTION_DAYS = int(os.getenv("PRP_RETENTION_DAYS", "180"))
+# Compression of prompt and response text in prp.db (see src/data/implementations/text_codec.py).
+# The full-text search index keeps an uncompressed copy of the same text; only the source columns shrink.
+PRP_TEXT_CODEC_ENABLED = os.getenv("PRP_TEXT_CODEC_ENABLED", "False").lower() in ('true', '1', 't')
+PRP_TEXT_CODEC_MIN_BYTES = int(os.getenv("PRP_TEXT_CODEC_MIN_BYTES", "256"))  # Shorter values stay plain text
+PRP_TEXT_CODEC_LEVEL = int(os.getenv("PRP_TEXT_CODEC_LEVEL", "6"))  # zlib level, 1 (fastest) to 9 (smallest)
+# Read-only snapshots of prp.db for reporting queries (see src/data/implementations/read_replicas.py).
+# Used by the search API and, only while CRUD_CACHE_ENABLED is off, by the prp.db repositories: with the
+# cache on (the default) repository cache misses read the primary, because an entry refilled from a
+# snapshot older than the write that invalidated it would stay stale until the next write.
+PRP_REPLICAS_ENABLED = os.getenv("PRP_REPLICAS_ENABLED", "False").lower() in ('true', '1', 't')
+PRP_REPLICA_DIR = DATA_DIR / "database" / "replicas"
+PRP_REPLICA_MAX_STALENESS_SECONDS = float(os.getenv("PRP_REPLICA_MAX_STALENESS_SECONDS", "60"))  # Older snapshots are not read
+# Each refresh that finds new commits copies all of prp.db; raise this for a large, busy database.
+PRP_REPLICA_REFRESH_SECONDS = float(os.getenv("PRP_REPLICA_REFRESH_SECONDS", "15"))
+PRP_REPLICA_BACKUP_PAGES = int(os.getenv("PRP_REPLICA_BACKUP_PAGES", "256"))  # Pages copied per backup step
+# Background jobs in prp.db (see src/data/implementations/job_queue.py and src/business/ai/analysis_jobs.py).
+JOB_THREAD_WORKERS = int(os.getenv("JOB_THREAD_WORKERS", "4"))  # For I/O-bound jobs (AI calls, repository reads)
+JOB_PROCESS_WORKERS = int(os.getenv("JOB_PROCESS_WORKERS", "2"))  # For CPU-bound jobs
+JOB_VISIBILITY_TIMEOUT_SECONDS = float(os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300"))  # Lease before another worker may retry
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY_SECONDS = float(os.getenv("JOB_RETRY_DELAY_SECONDS", "10"))  # Doubles with every failed attempt
+# HTTP job API (src/presentation/api_server/flask_app/routes/job_routes.py).
+JOBS_API_TOKEN = os.getenv("JOBS_API_TOKEN", "")  # Bearer token required by /api/jobs and /api/search; both refuse every request while unset
+# Directories (os.pathsep-separated) whose repositories the job API may analyze; none are allowed while unset.
+ANALYSIS_REPO_ROOTS = [Path(path) for path in os.getenv("ANALYSIS_REPO_ROOTS", "").split(os.pathsep) if path]
 
 # ============================================================================
 # 5. ENVIRONMENTS & EXECUTION CONTEXT
@@ -92,6 +127,10 @@ ROLES = [
     "USER",
     "VIEWER"
 ]
+# User accounts (see src/business/users/sqlite_user_manager.py); stored in DB_PATH by default.
+USER_IDENTITY_MAP_SIZE = int(os.getenv("USER_IDENTITY_MAP_SIZE", "4096"))  # Hot users kept in memory
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "600000"))  # PBKDF2-HMAC-SHA256 rounds
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))  # Threads that run the hashing
 
 # ============================================================================
 # 8. DEBUGGING & DEVELOPMENT FLAGS
@@ -192,6 +231,17 @@ class ArchitecturalPersona(Enum):
 
 # Maintain backward compatibility
 ROLES_PRESENTATION = list(ARCHITECTURAL_PERSONAS.keys())
+# ============================================================================
+# 13. AI SERVICE SETTINGS
+# ============================================================================
+# IAIService is backed by Gemini (src/business/ai/gemini_api.py) when a key is set, and by the offline
+# placeholder in core/bootstrap.py otherwise.
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+# Opt-in near-duplicate prompt cache layered over IAIService (see src/business/ai/near_duplicate_cache.py).
+NEAR_DUPLICATE_CACHE_ENABLED = os.getenv("NEAR_DUPLICATE_CACHE_ENABLED", "False").lower() in ('true', '1', 't')
+NEAR_DUPLICATE_CACHE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_CACHE_THRESHOLD", "0.9"))
+NEAR_DUPLICATE_CACHE_MAX_ENTRIES = int(os.getenv("NEAR_DUPLICATE_CACHE_MAX_ENTRIES", "1024"))
+
 # ============================================================================
 # END OF CONFIGURATION
 # ============================================================================
\ No newline at end of file
@@ -2,9 +2,35 @@
 This module centralizes the bootstrapping process for the application,
 including the configuration of the dependency injection container.
 """
+from typing import Any, Dict, Optional
+
 from loguru import logger
 from .dependency_container import DependencyContainer
 
+from src.business.interfaces.IAIService import IAIService
+
+
+class ConceptualAIService(IAIService):
+    """Offline stand-in for IAIService, used when no GOOGLE_API_KEY is configured."""
+    def generate_text(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        logger.info(f"ConceptualAIService: Generating text for prompt: {prompt[:50]}...")
+        return "Conceptual AI generated text."
+
+    def analyze_image(self, image_data: bytes, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        logger.info(f"ConceptualAIService: Analyzing image of {len(image_data)} bytes.")
+        return {"description": "Conceptual AI image description."}
+
+
+def create_ai_service() -> IAIService:
+    """The Gemini-backed AIGenerator when GOOGLE_API_KEY is set, the offline ConceptualAIService otherwise."""
+    from config import config
+    if config.GOOGLE_API_KEY:
+        from src.business.ai.gemini_api import AIGenerator
+        return AIGenerator(config.GOOGLE_API_KEY)
+    logger.warning("GOOGLE_API_KEY is not set; IAIService is the offline ConceptualAIService.")
+    return ConceptualAIService()
+
+
 # --- Dependency Configuration Functions for Sub-Projects ---
 
 def configure_project_business_dependencies(container: DependencyContainer):
@@ -13,15 +39,27 @@ def configure_project_business_dependencies(container: DependencyContainer):
     """
     logger.info("INFO - Configuring src/business dependencies (conceptual).")
 
-    # --- AI Service Registration (Conceptual) ---
-    from src.business.interfaces.IAIService import IAIService
-    # Placeholder for a concrete AI service implementation
-    class AIGenerator(IAIService):
-        def generate_text(self, prompt: str) -> str:
-            logger.info(f"AIGenerator: Generating text for prompt: {prompt[:50]}...")
-            return "Conceptual AI generated text."
-    container.register_singleton(IAIService, AIGenerator)
-    logger.info("Registered AIGenerator for IAIService.")
+    # --- AI Service Registration ---
+    from config import config
+    if config.NEAR_DUPLICATE_CACHE_ENABLED:
+        from src.business.ai.near_duplicate_cache import NearDuplicateCacheAIService
+        container.register_singleton(IAIService, lambda: NearDuplicateCacheAIService(
+            create_ai_service(),
+            threshold=config.NEAR_DUPLICATE_CACHE_THRESHOLD,
+            max_entries=config.NEAR_DUPLICATE_CACHE_MAX_ENTRIES,
+        ))
+        logger.info("Registered the AI service behind NearDuplicateCacheAIService for IAIService.")
+    else:
+        container.register_singleton(IAIService, create_ai_service)
+        logger.info("Registered the AI service for IAIService.")
+
+    # --- User management ---
+    # Registered lazily: the users database is only opened when IUserManager is first resolved.
+    from src.business.interfaces.IUserManager import IUserManager
+    from src.business.users.sqlite_user_manager import SQLiteUserManager
+    container.register_singleton(IUserManager, SQLiteUserManager)
+    logger.info("Registered SQLiteUserManager for IUserManager.")
+
     # We log success to align with the integration test's expectations for this layer.
     logger.success("SUCCESS - src/business dependencies configured (conceptual).")
 
@@ -31,8 +69,42 @@ def configure_project_data_dependencies(container: DependencyContainer):
     Configures dependencies specific to the `src/data` layer.
     """
     logger.info("INFO - Configuring src/data dependencies (conceptual).")
-    # This is a placeholder. As data repositories are added, they will be registered here,
-    # for now, we just log success to indicate the function was called.
+
+    # --- prp.db repositories ---
+    # Registered lazily: the database is only opened when a repository is first resolved.
+    from src.data.interfaces.ICrudRepository import ICrudRepository
+    from src.data.implementations.sqlite_crud_repository import (
+        PRP_MAPPINGS, SQLiteConnectionPool, SQLiteCrudRepository, create_prp_pool,
+    )
+    from src.data.implementations.read_replicas import ReplicaManager
+    from config import config
+    container.register_singleton(SQLiteConnectionPool, lambda: create_prp_pool())
+    container.register_singleton(ReplicaManager,
+                                 lambda: ReplicaManager(container.resolve(SQLiteConnectionPool).db_path).start())
+
+    def repository_factory(mapping):
+        def factory():
+            pool = container.resolve(SQLiteConnectionPool)
+            if not config.CRUD_CACHE_ENABLED:
+                replicas = container.resolve(ReplicaManager) if config.PRP_REPLICAS_ENABLED else None
+                return SQLiteCrudRepository(mapping, pool, replicas)
+            # With the cache, misses read the primary: an entry refilled from a snapshot that
+            # predates the write which invalidated it would stay stale until the next write.
+            repository = SQLiteCrudRepository(mapping, pool)
+            from src.data.implementations.cached_crud_repository import CachedCrudRepository, sqlite_data_version
+            return CachedCrudRepository(
+                repository,
+                max_entries=config.CRUD_CACHE_MAX_ENTRIES,
+                ttl_seconds=config.CRUD_CACHE_TTL_SECONDS,
+                change_counter=sqlite_data_version(pool),
+            )
+        return factory
+
+    for mapping in PRP_MAPPINGS:
+        container.register_singleton(ICrudRepository[mapping.entity_type], repository_factory(mapping))
+    logger.info(f"Registered SQLiteCrudRepository for {len(PRP_MAPPINGS)} prp.db entity types "
+                f"(read-through cache {'on' if config.CRUD_CACHE_ENABLED else 'off'}, "
+                f"replica reads {'on' if config.PRP_REPLICAS_ENABLED and not config.CRUD_CACHE_ENABLED else 'off'}).")
     logger.success("SUCCESS - src/data dependencies configured (conceptual).")
 
 def configure_project_presentation_dependencies(container: DependencyContainer):
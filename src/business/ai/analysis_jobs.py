@@ -0,0 +1,266 @@
+# analysis_jobs.py
+"""
+Background analyses on the durable job queue (src/data/implementations/job_queue.py).
+
+A web request only enqueues: it creates the analysis session and its job in one
+short transaction and returns. JobWorkerPool runs the jobs elsewhere (see
+admin/run_job_workers.py). Each job kind is run on the executor that suits it:
+
+- "thread" for I/O-bound work, such as collecting a repository and waiting on the AI
+  service (the GIL is released while waiting);
+- "process" for CPU-bound work, such as recomputing model similarity.
+
+Every worker lane is a dispatcher thread that claims a job, hands it to its executor
+and renews the job's lease while it runs, so a job is only retried by another worker
+when this one has died or stalled.
+"""
+import json
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from loguru import logger
+
+from config import config
+from src.business.ai.batch_analysis import STATUS_FAILED_DATA_COLLECTION
+from src.business.ai.response_parser import StreamingResponseParser
+from src.business.interfaces.IAIService import IAIService
+from src.data.implementations.full_text_search import index_stored_text
+from src.data.implementations.job_queue import (
+    JOB_QUEUED, SESSION_STATUS, CompletionHook, Job, PermanentJobError, SQLiteJobQueue,
+)
+from src.data.implementations.unit_of_work import UnitOfWork, write_units
+from src.data.obj.entities import SystemProfile
+
+ANALYSIS_JOB = "analysis"
+MODEL_SIMILARITY_JOB = "model_similarity"
+DEFAULT_ANALYSIS_TEMPLATE = "generate_min_sys_reqs_from_repo_prompt.md"
+
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+
+# Returned by JobWorkerPool._wait when another worker took over the job; nothing is recorded then.
+_LEASE_LOST = object()
+
+
+@dataclass(frozen=True)
+class JobKind:
+    """
+    How to run one kind of job. `handler(payload)` returns the job's result; for the
+    "process" executor it must be a module-level function so it can be pickled.
+    """
+    name: str
+    handler: Callable[[Dict[str, Any]], Any]
+    executor: str = EXECUTOR_THREAD
+    on_complete: Optional[CompletionHook] = None
+
+
+def enqueue_analysis(queue: SQLiteJobQueue, repo_path: str, template_filename: str = DEFAULT_ANALYSIS_TEMPLATE,
+                     priority: int = 0, user_notes: Optional[str] = None) -> Job:
+    """Creates an analysis session and its job in one transaction; the session starts as 'queued'."""
+    conn = queue.pool.connection()
+    with conn:
+        session_id = conn.execute(
+            "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp, user_notes, status) "
+            "VALUES (?, ?, ?, ?)",
+            (repo_path, datetime.now(timezone.utc).isoformat(), user_notes, SESSION_STATUS[JOB_QUEUED]),
+        ).lastrowid
+        job_id = queue.enqueue(ANALYSIS_JOB, {"repo_path": repo_path, "template_filename": template_filename},
+                               priority=priority, session_id=session_id, conn=conn)
+    return queue.get(job_id)
+
+
+class AnalysisJobHandler:
+    """
+    Runs one analysis: DataCollectService.prepare_analysis_data_and_prompt, then the AI call,
+    whose streamed response is parsed for system requirements as it arrives.
+    The system profile, prompt and response are written by store_results, in the transaction
+    that completes the job, so a retried job never leaves a half-written analysis behind.
+    """
+    def __init__(self, ai_service: IAIService, data_collect_service=None, db_path: Optional[Union[str, Path]] = None):
+        if data_collect_service is None:
+            # Repositories are collected incrementally against the file index in the job's database.
+            from src.business.ai.data_collect_service import DataCollectService
+            from src.business.ai.incremental_repo_collector import IncrementalRepositoryCollector
+            from src.data.implementations.repository_file_index import RepositoryFileIndex
+            data_collect_service = DataCollectService(
+                repo_collector=IncrementalRepositoryCollector(RepositoryFileIndex(db_path)))
+        self.ai_service = ai_service
+        self.data_collect_service = data_collect_service
+
+    def __call__(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        template_filename = payload.get("template_filename") or DEFAULT_ANALYSIS_TEMPLATE
+        analysis = self.data_collect_service.prepare_analysis_data_and_prompt(payload["repo_path"], template_filename)
+        if not analysis or not analysis.get("prompt_str"):
+            raise PermanentJobError(f"Could not collect data for {payload['repo_path']}.",
+                                    session_status=STATUS_FAILED_DATA_COLLECTION)
+        parser = StreamingResponseParser()
+        for chunk in self.ai_service.generate_text_stream(analysis["prompt_str"]):
+            updates = parser.feed(chunk)
+            if updates:
+                logger.debug(f"Analysis of {payload['repo_path']}: "
+                             f"{', '.join('.'.join(update.path) for update in updates)} parsed.")
+        parsed = parser.close()
+        if parsed.errors:
+            logger.warning(f"Analysis of {payload['repo_path']}: response parsed with errors: {parsed.errors}")
+        return {
+            "template_filename": template_filename,
+            "prompt": analysis["prompt_str"],
+            "response": parsed.text,
+            "requirements_json": parsed.requirements_json(),
+            "dependencies_json": parsed.dependencies_json(),
+            "system_info": analysis.get("system_info"),
+            "timings": analysis.get("timings"),
+        }
+
+    @staticmethod
+    def store_results(conn, job: Job, result: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc).isoformat()
+        if result.get("system_info"):
+            # Through the SYSTEM_PROFILES mapping, so the profile is packed and its facts indexed.
+            profile = UnitOfWork()
+            profile.add(SystemProfile(session_id=job.session_id, profile_timestamp=now,
+                                      profile_data=json.dumps(result["system_info"])))
+            write_units(conn, [profile])
+        prompt_id = conn.execute(
+            "INSERT INTO generated_prompts (session_id, prompt_type, template_name_used, prompt_content, creation_timestamp) "
+            "VALUES (?, ?, ?, prp_compress('prompt_content', ?), ?)",
+            (job.session_id, "initial_analysis", result["template_filename"], result["prompt"], now),
+        ).lastrowid
+        result_id = conn.execute(
+            "INSERT INTO ai_analysis_results (prompt_id, ai_response_raw, response_timestamp, "
+            "parsed_system_requirements_json, parsed_dependencies_json) "
+            "VALUES (?, prp_compress('ai_response_raw', ?), ?, ?, ?)",
+            (prompt_id, result["response"], now, result.get("requirements_json"), result.get("dependencies_json")),
+        ).lastrowid
+        index_stored_text(conn, "generated_prompts", [(prompt_id, result["prompt"])])
+        index_stored_text(conn, "ai_analysis_results", [(result_id, result["response"])])
+        return {"prompt_id": prompt_id, "result_id": result_id, "timings": result.get("timings")}
+
+
+def compute_model_similarity(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """CPU-bound job: recomputes the similarity connections in the mock model database."""
+    from src.business.ai.model_similarity import ModelSimilarityEngine
+    from src.data.implementations.sqlite_crud_repository import MODELS, SQLiteConnectionPool, SQLiteCrudRepository
+    pool = SQLiteConnectionPool(payload.get("db_path") or config.DB_PATH)
+    try:
+        models = list(SQLiteCrudRepository(MODELS, pool).iter_all())
+        engine = ModelSimilarityEngine(top_k=payload.get("top_k", 5), workers=1)  # Already one of the job processes.
+        return asdict(engine.write_connections(pool.connection(), models))
+    finally:
+        pool.close_all()
+
+
+def default_job_kinds(ai_service: IAIService, db_path: Optional[Union[str, Path]] = None) -> List[JobKind]:
+    handler = AnalysisJobHandler(ai_service, db_path=db_path)
+    return [
+        JobKind(ANALYSIS_JOB, handler, EXECUTOR_THREAD, on_complete=handler.store_results),
+        JobKind(MODEL_SIMILARITY_JOB, compute_model_similarity, EXECUTOR_PROCESS),
+    ]
+
+
+class JobWorkerPool:
+    """
+    Runs queued jobs on `thread_workers` threads and `process_workers` processes.
+    Each executor only claims the kinds registered for it. Call start() and stop(),
+    or run_once() to process a single job in the calling thread.
+    """
+    def __init__(self, queue: SQLiteJobQueue, kinds: Iterable[JobKind],
+                 thread_workers: int = config.JOB_THREAD_WORKERS,
+                 process_workers: int = config.JOB_PROCESS_WORKERS,
+                 poll_interval: float = 1.0):
+        self.queue = queue
+        self.kinds: Dict[str, JobKind] = {kind.name: kind for kind in kinds}
+        self.workers = {EXECUTOR_THREAD: max(0, thread_workers), EXECUTOR_PROCESS: max(0, process_workers)}
+        self.poll_interval = poll_interval
+        self._executors: Dict[str, Executor] = {}
+        self._dispatchers: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+    def _kind_names(self, executor: str) -> List[str]:
+        return [name for name, kind in self.kinds.items() if kind.executor == executor]
+
+    def start(self) -> None:
+        self._stopping.clear()
+        for executor, workers in self.workers.items():
+            names = self._kind_names(executor)
+            if not workers or not names:
+                continue
+            if executor == EXECUTOR_THREAD:
+                self._executors[executor] = ThreadPoolExecutor(max_workers=workers)
+            else:
+                # Spawned, not forked: a child forked while a dispatcher (or loguru's writer)
+                # thread holds a lock would wait on that lock forever.
+                self._executors[executor] = ProcessPoolExecutor(max_workers=workers,
+                                                                mp_context=multiprocessing.get_context("spawn"))
+            for lane in range(workers):
+                dispatcher = threading.Thread(target=self._dispatch, args=(executor, names), daemon=True,
+                                              name=f"job-{executor}-{lane}")
+                dispatcher.start()
+                self._dispatchers.append(dispatcher)
+        logger.info(f"JobWorkerPool started: {self.workers[EXECUTOR_THREAD]} thread and "
+                    f"{self.workers[EXECUTOR_PROCESS]} process workers for {', '.join(self.kinds)}.")
+
+    def stop(self, wait: bool = True) -> None:
+        """Stops claiming jobs; with wait=True, lets the running ones finish first."""
+        self._stopping.set()
+        if wait:
+            for dispatcher in self._dispatchers:
+                dispatcher.join()
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+        self._dispatchers, self._executors = [], {}
+
+    def _dispatch(self, executor: str, names: List[str]) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.claim(names)
+            except Exception as e:
+                logger.error(f"Claiming a job failed: {e}")
+                job = None
+            if job is None:
+                self._stopping.wait(self.poll_interval)
+                continue
+            self._run(job, self._executors[executor])
+
+    def run_once(self, kinds: Optional[Iterable[str]] = None) -> Optional[Job]:
+        """Claims and runs one job (of `kinds`, default all) in the calling thread; returns it, or None."""
+        job = self.queue.claim(list(kinds or self.kinds))
+        if job is not None:
+            self._run(job, None)
+        return job
+
+    def _run(self, job: Job, executor: Optional[Executor]) -> None:
+        kind = self.kinds.get(job.kind)
+        if kind is None:
+            self.queue.fail(job, f"No handler for job kind '{job.kind}'.", retry=False)
+            return
+        logger.info(f"Job {job.job_id} ({job.kind}) started, attempt {job.attempts}/{job.max_attempts}.")
+        try:
+            if executor is None:
+                result = kind.handler(job.payload)
+            else:
+                result = self._wait(job, executor.submit(kind.handler, job.payload))
+        except PermanentJobError as e:
+            self.queue.fail(job, str(e), retry=False, session_status=e.session_status)
+            return
+        except Exception as e:
+            self.queue.fail(job, f"{type(e).__name__}: {e}")
+            return
+        if result is not _LEASE_LOST and self.queue.complete(job, result, kind.on_complete):
+            logger.success(f"Job {job.job_id} ({job.kind}) succeeded.")
+
+    def _wait(self, job: Job, future) -> Any:
+        """Waits for the job's result, renewing its lease every third of the visibility timeout."""
+        while True:
+            try:
+                return future.result(timeout=self.queue.visibility_timeout / 3)
+            except FutureTimeoutError:
+                if not self.queue.heartbeat(job):
+                    logger.warning(f"Job {job.job_id}: lease lost while running; its result will be discarded.")
+                    future.cancel()
+                    return _LEASE_LOST
@@ -0,0 +1,266 @@
+# batch_analysis.py
+
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+# --- Root Project Path Setup ---
+# Worker processes re-import this module, so the project root must be importable from here.
+jennai_root_for_path = Path(__file__).resolve().parent.parent.parent.parent
+if str(jennai_root_for_path) not in sys.path:
+    sys.path.insert(0, str(jennai_root_for_path))
+
+from loguru import logger
+
+from src.business.ai.incremental_repo_collector import IncrementalRepositoryCollector
+from src.business.ai.prompt_renderer import PromptTemplateLoader, build_prompt_context
+from src.business.sys.system_profile_cache import SystemProfileCache
+from src.data.implementations import prp_database
+from src.data.implementations.analytics_index import ensure_analytics_schema, index_profile_facts
+from src.data.implementations.blob_store import BlobStore
+from src.data.implementations.full_text_search import index_stored_text
+from src.data.implementations.repository_file_index import RepositoryFileIndex
+
+DEFAULT_TEMPLATE_DIR = jennai_root_for_path / "src" / "business" / "ai" / "prompt_templates"
+BATCH_NOTE_PREFIX = "batch:"
+STATUS_PROMPT_GENERATED = "prompt_generated"
+STATUS_FAILED_DATA_COLLECTION = "failed_data_collection"
+
+# Per-process state for pool workers, created lazily on first use.
+_worker_state: Dict[str, Any] = {}
+
+
+def load_manifest(manifest_path: Union[str, Path]) -> List[str]:
+    """
+    Reads a list of repository paths from a manifest file.
+    Accepts a JSON list, JSON lines ({"repo_path": ...} or strings), or one path per line ('#' comments allowed).
+    """
+    text = Path(manifest_path).read_text(encoding="utf-8")
+    stripped = text.strip()
+    if stripped.startswith("["):
+        return [str(item) for item in json.loads(stripped)]
+    repos = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith(("{", '"')):
+            item = json.loads(line)
+            repos.append(item["repo_path"] if isinstance(item, dict) else str(item))
+        else:
+            repos.append(line)
+    return repos
+
+
+def _analyze_repository(repo_path: str, template_filename: str, template_dir: str,
+                        db_path: Optional[str]) -> Dict[str, Any]:
+    """
+    Pool worker: collects one repository and renders its prompt.
+    Only reads prp.db; file index updates are returned for the parent to write.
+    Never raises; failures are reported in the returned dict.
+    """
+    started = time.perf_counter()
+    try:
+        if "collector" not in _worker_state:
+            _worker_state["collector"] = IncrementalRepositoryCollector(RepositoryFileIndex(db_path, initialize=False))
+            _worker_state["templates"] = PromptTemplateLoader(template_dir)
+        snapshot = _worker_state["collector"].collect(repo_path, persist=False)
+        if snapshot is None:
+            return {"repo_path": repo_path, "error": f"Invalid repository path: {repo_path}"}
+        template = _worker_state["templates"].load(template_filename)
+        if template is None:
+            return {"repo_path": repo_path, "error": f"Prompt template not found: {template_filename}"}
+        context = build_prompt_context(snapshot.to_repo_data())
+        if "system_info" in _worker_state:
+            context["system_info"] = _worker_state["system_info"]
+        return {
+            "repo_path": repo_path,
+            "repository_identifier": snapshot.repository_identifier,
+            "snapshot_json": snapshot.to_snapshot_json(),
+            "index_upserted": snapshot.pending_fingerprints,
+            "index_removed": snapshot.removed,
+            "prompt": template.render(context),
+            "seconds": time.perf_counter() - started,
+        }
+    except Exception as e:
+        return {"repo_path": repo_path, "error": f"{type(e).__name__}: {e}"}
+
+
+def _init_worker(system_info: Optional[Dict[str, Any]]) -> None:
+    if system_info is not None:
+        _worker_state["system_info"] = system_info
+
+
+@dataclass
+class BatchProgress:
+    """Running totals reported after every committed chunk."""
+    total: int
+    skipped: int = 0
+    completed: int = 0
+    failed: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def processed(self) -> int:
+        return self.completed + self.failed
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def repos_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+class BatchAnalysisPipeline:
+    """
+    Analyzes many repositories in one batch.
+
+    Collection and prompt rendering fan out over a process pool whose workers
+    only read prp.db; results are streamed back and the parent alone writes them
+    (analysis_sessions, system_profiles, repository_snapshots, generated_prompts and
+    the file index) in chunked transactions, so workers never contend for the write
+    lock. Sessions are tagged with the batch id: re-running a batch skips repositories
+    that already completed and retries failed ones in place of their failure rows.
+    """
+    def __init__(self, template_filename: str, db_path: Optional[Union[str, Path]] = None,
+                 template_dir: Union[str, Path] = DEFAULT_TEMPLATE_DIR, workers: Optional[int] = None,
+                 chunk_size: int = 50, profile_cache: Optional[SystemProfileCache] = None):
+        self.template_filename = template_filename
+        self.db_path = str(db_path) if db_path else None
+        self.template_dir = str(template_dir)
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.profile_cache = profile_cache or SystemProfileCache(disk_path=jennai_root_for_path)
+        conn = prp_database.connect(self.db_path)
+        try:
+            # WAL lets the workers keep reading the file index while a chunk commits.
+            conn.execute("PRAGMA journal_mode = WAL")
+        finally:
+            conn.close()
+        with prp_database.transaction(self.db_path) as conn:
+            prp_database.initialize_schema(conn)
+            ensure_analytics_schema(conn)
+        RepositoryFileIndex(self.db_path)  # Created here so the workers never write.
+
+    def completed_repositories(self, batch_id: str) -> set:
+        """Returns the repository paths already completed in this batch."""
+        conn = prp_database.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT target_repository_identifier FROM analysis_sessions WHERE user_notes = ? AND status = ?",
+                (BATCH_NOTE_PREFIX + batch_id, STATUS_PROMPT_GENERATED),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {row[0] for row in rows}
+
+    def _write_chunk(self, batch_id: str, results: List[Dict[str, Any]], profile_json: Optional[str]) -> None:
+        """Persists one chunk of worker results in a single transaction."""
+        now = datetime.now(timezone.utc).isoformat()
+        notes = BATCH_NOTE_PREFIX + batch_id
+        with prp_database.transaction(self.db_path) as conn:
+            # Snapshots and profiles are stored as manifests over deduplicated, compressed blobs.
+            store = BlobStore(conn)
+            packed_profile = store.pack_document(profile_json) if profile_json is not None else None
+            profile = json.loads(profile_json) if profile_json is not None else None
+            for result in results:
+                failed = "error" in result
+                status = STATUS_FAILED_DATA_COLLECTION if failed else STATUS_PROMPT_GENERATED
+                # A repository that failed in an earlier run of this batch reuses its failure row.
+                previous = conn.execute(
+                    "SELECT session_id FROM analysis_sessions "
+                    "WHERE user_notes = ? AND target_repository_identifier = ? AND status = ?",
+                    (notes, result["repo_path"], STATUS_FAILED_DATA_COLLECTION),
+                ).fetchone()
+                if previous is not None:
+                    session_id = previous[0]
+                    conn.execute("UPDATE analysis_sessions SET analysis_timestamp = ?, status = ? WHERE session_id = ?",
+                                 (now, status, session_id))
+                else:
+                    session_id = conn.execute(
+                        "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp, user_notes, status) "
+                        "VALUES (?, ?, ?, ?)",
+                        (result["repo_path"], now, notes, status),
+                    ).lastrowid
+                if failed:
+                    continue
+                RepositoryFileIndex.apply_on(conn, result["repository_identifier"], result["index_upserted"],
+                                             result["index_removed"])
+                if packed_profile is not None:
+                    profile_id = conn.execute(
+                        "INSERT INTO system_profiles (session_id, profile_timestamp, profile_data) VALUES (?, ?, ?)",
+                        (session_id, now, packed_profile),
+                    ).lastrowid
+                    index_profile_facts(conn, profile_id, session_id, profile)
+                conn.execute(
+                    "INSERT INTO repository_snapshots (session_id, snapshot_data, creation_timestamp) VALUES (?, ?, ?)",
+                    (session_id, store.pack_snapshot(result["snapshot_json"]), now),
+                )
+                prompt_id = conn.execute(
+                    "INSERT INTO generated_prompts (session_id, prompt_type, template_name_used, prompt_content, creation_timestamp) "
+                    "VALUES (?, ?, ?, prp_compress('prompt_content', ?), ?)",
+                    (session_id, "initial_analysis", self.template_filename, result["prompt"], now),
+                ).lastrowid
+                index_stored_text(conn, "generated_prompts", [(prompt_id, result["prompt"])])
+
+    def run(self, repo_paths: Iterable[str], batch_id: str,
+            on_progress: Optional[Callable[[BatchProgress], None]] = None) -> BatchProgress:
+        """
+        Runs (or resumes) a batch and returns the final progress totals.
+        on_progress is called after every committed chunk.
+        """
+        repo_paths = list(dict.fromkeys(repo_paths))
+        done = self.completed_repositories(batch_id)
+        pending = [path for path in repo_paths if path not in done]
+        progress = BatchProgress(total=len(repo_paths), skipped=len(repo_paths) - len(pending))
+        logger.info(f"Batch '{batch_id}': {len(pending)} repositories to analyze, {progress.skipped} already completed.")
+        if not pending:
+            return progress
+
+        system_info = self.profile_cache.get_profile()
+        profile_json = json.dumps(system_info) if system_info else None
+
+        chunk: List[Dict[str, Any]] = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(system_info,)) as executor:
+            results = executor.map(
+                _analyze_repository, pending,
+                [self.template_filename] * len(pending), [self.template_dir] * len(pending), [self.db_path] * len(pending),
+                chunksize=max(1, min(self.chunk_size, len(pending) // ((self.workers or 4) * 4) or 1)),
+            )
+            for result in results:
+                chunk.append(result)
+                if len(chunk) >= self.chunk_size:
+                    self._flush(batch_id, chunk, profile_json, progress, on_progress)
+                    chunk = []
+            if chunk:
+                self._flush(batch_id, chunk, profile_json, progress, on_progress)
+
+        logger.success(
+            f"Batch '{batch_id}' finished: {progress.completed} completed, {progress.failed} failed, "
+            f"{progress.skipped} skipped in {progress.elapsed_seconds:.1f}s ({progress.repos_per_second:.1f} repos/s)."
+        )
+        return progress
+
+    def _flush(self, batch_id: str, chunk: List[Dict[str, Any]], profile_json: Optional[str],
+               progress: BatchProgress, on_progress: Optional[Callable[[BatchProgress], None]]) -> None:
+        self._write_chunk(batch_id, chunk, profile_json)
+        for result in chunk:
+            if "error" in result:
+                progress.failed += 1
+                logger.warning(f"Batch '{batch_id}': {result['repo_path']} failed: {result['error']}")
+            else:
+                progress.completed += 1
+        logger.info(
+            f"Batch '{batch_id}': {progress.processed}/{progress.total - progress.skipped} processed "
+            f"({progress.repos_per_second:.1f} repos/s)."
+        )
+        if on_progress is not None:
+            on_progress(progress)
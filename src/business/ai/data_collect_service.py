@@ -1,9 +1,10 @@
 # data_collect_service.py
 
 import sys
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Union
 
 # --- Root Project Path Setup ---
 jennai_root_for_path = Path(__file__).resolve().parent.parent.parent.parent
@@ -14,112 +15,112 @@ from config.loguru_setup import logger # Simply import the configured logger
 
 
 # Import other necessary modules from the project
-from src.business.sys import sys_profiler
-from src.business.ai import repo_data_collector
+from src.business.sys.system_profile_cache import SystemProfileCache
+from src.business.ai.incremental_repo_collector import IncrementalRepositoryCollector
+from src.business.ai.prompt_renderer import CompiledTemplate, PromptTemplateLoader, build_prompt_context
+from src.data.implementations.repository_file_index import RepositoryFileIndex
+
+# Per-step timeouts (seconds) for the concurrent collection in prepare_analysis_data_and_prompt.
+# A step that times out is abandoned, not stopped (see _run_collection_steps).
+DEFAULT_STEP_TIMEOUTS = {
+    "system_info": 15.0,
+    "repo_info": 120.0,
+    "template": 10.0,
+}
 
 class DataCollectService:
     """
     Service to collect data from various sources (system, repository),
     populate a prompt template with this data, and persist the generated prompt.
     """
-    def __init__(self):
+    def __init__(self, profile_cache: Optional[SystemProfileCache] = None,
+                 step_timeouts: Optional[Dict[str, float]] = None,
+                 repo_collector: Optional[IncrementalRepositoryCollector] = None):
         # Assuming jennai_root_for_path is defined globally in this file
         self.project_root = jennai_root_for_path
         self.sys_info_dir = self.project_root / "src" / "data" / "system_info"
-        self.sys_info_file = self.sys_info_dir / sys_profiler.OUTPUT_FILENAME
+        # Static hardware facts are probed once per boot; dynamic facts are re-sampled on a short TTL.
+        self.profile_cache = profile_cache or SystemProfileCache(
+            cache_file=self.sys_info_dir / "static_profile_cache.json",
+            disk_path=self.project_root,
+        )
         self.prompt_template_dir = self.project_root / "src" / "business" / "ai" / "prompt_templates"
+        # Templates are parsed once and re-compiled only when the file changes on disk.
+        self.template_loader = PromptTemplateLoader(self.prompt_template_dir)
         # self.generated_prompts_dir is no longer needed here as orchestrator handles saving.
+        self.step_timeouts = {**DEFAULT_STEP_TIMEOUTS, **(step_timeouts or {})}
+        # Repository files are collected incrementally against the fingerprint index in prp.db;
+        # the default collector (over config.PRP_DB_PATH) is created on first use.
+        self.repo_collector = repo_collector
 
         logger.debug("DataCollectService initialized.")
 
-    def _collect_system_info(self) -> Optional[Dict]:
+    def _collect_system_info(self, max_age: Optional[float] = None) -> Optional[Dict]:
         """
-        Runs the system profiler and reads its output.
+        Returns the cached system profile, re-sampling dynamic facts older than max_age seconds
+        (None uses the cache's TTL, 0 forces a fresh sample).
         Returns the system information as a dictionary, or None on failure.
         """
         logger.info("Collecting system information...")
         try:
-            # Run the sys_profiler's main function to generate/update the hardware_specs.json
-            sys_profiler.main() # Assumes sys_profiler.main() is callable and handles its own errors
-            
-            if self.sys_info_file.exists():
-                with open(self.sys_info_file, 'r', encoding='utf-8') as f:
-                    system_data = json.load(f)
-                logger.success(f"Successfully loaded system information from {self.sys_info_file}")
-                return system_data
+            system_data = self.profile_cache.get_profile(max_age=max_age)
+            logger.success("Successfully loaded system information from profile cache.")
+            return system_data
         except Exception as e:
             logger.error(f"Failed to collect or load system information: {e}")
             return None
 
-    def _collect_repository_info(self, repo_path_str: str) -> Optional[Dict[str, Optional[str]]]:
+    def _collect_repository_info(self, repo_path_str: str) -> Optional[Dict[str, Any]]:
         """
-        Collects repository information using repo_data_collector.
-        Returns repository data as a dictionary, or None on failure.
+        Collects repository information, re-reading only files changed since the last analysis.
+        A JSON-safe summary of the RepositorySnapshot (paths and delta) is returned under "repository_snapshot".
+        Returns repository data as a dictionary, or None on failure (e.g. the path is not a directory).
         """
         logger.info(f"Collecting repository information from: {repo_path_str}")
         try:
-            repo_data = repo_data_collector.collect_repository_data(repo_path_str)
-            if repo_data.get("error") and "Invalid repository path" in repo_data["error"]: # Check specific error message
-                logger.warning(f"Repository data collection handled known issue: {repo_data['error']}")
-                return None
-            logger.success(f"Successfully collected repository information from: {repo_path_str}")
-            return repo_data
+            if self.repo_collector is None:
+                self.repo_collector = IncrementalRepositoryCollector(RepositoryFileIndex())
+            snapshot = self.repo_collector.collect(repo_path_str)
         except Exception as e:
-            logger.warning(f"Handled failure during repository info collection for {repo_path_str}: {e}")
+            logger.warning(f"Handled failure during incremental repository collection for {repo_path_str}: {e}")
+            return None
+        if snapshot is None:
             return None
+        repo_data: Dict[str, Any] = snapshot.to_repo_data()
+        repo_data["repository_snapshot"] = snapshot.to_dict()
+        logger.success(f"Successfully collected repository information from: {repo_path_str}")
+        return repo_data
 
-    def _load_prompt_template(self, template_filename: str) -> Optional[str]:
-        """Loads a prompt template file."""
+    def _load_prompt_template(self, template_filename: str) -> Optional[CompiledTemplate]:
+        """Loads a prompt template file, compiled and cached by mtime."""
         template_file_path = self.prompt_template_dir / template_filename
         logger.info(f"Loading prompt template: {template_file_path}")
-        if template_file_path.is_file():
-            try:
-                template_content = template_file_path.read_text(encoding='utf-8')
-                logger.success(f"Successfully loaded template: {template_filename}")
-                return template_content
-            except Exception as e:
-                logger.error(f"Could not read template file {template_file_path}: {e}")
-                return None
-        logger.warning(f"Prompt template file not found: {template_file_path}. This may be an expected condition if the template is optional.")
-        return None
-
-    def _populate_prompt_template(self, template_content: str, data_context: Dict[str, Optional[str]]) -> str:
+        try:
+            template = self.template_loader.load(template_filename)
+        except Exception as e:
+            logger.error(f"Could not read template file {template_file_path}: {e}")
+            return None
+        if template is None:
+            logger.warning(f"Prompt template file not found: {template_file_path}. This may be an expected condition if the template is optional.")
+            return None
+        logger.success(f"Successfully loaded template: {template_filename}")
+        return template
+
+    def _populate_prompt_template(self, template_content: Union[str, CompiledTemplate], data_context: Dict[str, Any]) -> str:
         """Populates the prompt template with collected data.
-        Placeholders in the template should be like {{key_name}}.
+        Placeholders in the template should be like {{key_name}}; dotted paths such as
+        {{system_info.cpu.logical_cores}} resolve against nested dicts.
         """
         logger.info("Populating prompt template...")
-        import re # For finding placeholders
-
-        # Initialize populated_data with defaults for all known placeholders.
-        populated_data = {
-            "readme_content": "README.md not found or empty.",
-            "requirements_txt_content": "requirements.txt not found or empty.",
-            "environment_yaml_content": "environment.yaml not found or empty.",
-            "existing_min_sys_reqs_content": "No existing min-sys-requirements file found or empty.",
-            "repository_description": "No repository description provided."
-            # Add any other placeholders from your primary template with their defaults here
-        }
+        template = template_content if isinstance(template_content, CompiledTemplate) else CompiledTemplate(template_content)
 
-        # Override defaults with actual values from data_context if they exist and are not None.
-        # Also, add any "unexpected" keys from data_context.
-        if data_context:
-            for key, value in data_context.items():
-                if value is not None: # If data_context has a real value, use it
-                    populated_data[key] = value
-                # If value is None, the default from populated_data (if key is known) will be kept.
-                # If key is new and value is None, we'll handle it below by checking all template placeholders.
+        # Start from the defaults for all known placeholders, then override with
+        # actual values from data_context if they are not None.
+        populated_data = build_prompt_context(data_context)
+
+        # Any placeholder that still resolves to None gets a generic "<key> not found or empty." default.
+        populated_prompt = template.render(populated_data)
 
-        populated_prompt = template_content
-        
-        # Find all placeholders in the template like {{placeholder_name}}
-        placeholders_in_template = set(re.findall(r"{{(.*?)}}", template_content))
-
-        for key in placeholders_in_template:
-            value_to_substitute = populated_data.get(key)
-            if value_to_substitute is None: # If key not in populated_data or its value was None after previous step
-                value_to_substitute = f"{key} not found or empty." # Generic default for any other placeholder
-            populated_prompt = populated_prompt.replace(f"{{{{{key}}}}}", str(value_to_substitute))
-        
         logger.success("Prompt template populated.")
         return populated_prompt
 
@@ -135,35 +136,87 @@ class DataCollectService:
     #         logger.error(f"Failed to save prompt to {output_file_path}: {e}")
     #         return None
 
-    def prepare_analysis_data_and_prompt(self, repo_path: str, template_filename: str) -> Optional[Dict[str, Any]]:
+    def _run_collection_steps(self, steps: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Runs independent collection steps concurrently.
+        Each step gets its own timeout measured from the common start time.
+        Returns {step_name: {"value": ..., "seconds": ..., "status": "ok" | "timeout" | "error"}}.
+        Python cannot stop a running thread, so a step that times out keeps running in the
+        background until it returns on its own and its result is dropped. Each call starts at
+        most one thread per step; the repository walk and the probes are bounded by the
+        filesystem and the hardware, not by the timeout.
+        """
+        def timed(step):
+            started = time.perf_counter()
+            value = step()
+            return value, time.perf_counter() - started
+
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="data-collect")
+        try:
+            futures = {name: executor.submit(timed, step) for name, step in steps.items()}
+            for name, future in futures.items():
+                remaining = self.step_timeouts[name] - (time.perf_counter() - started)
+                try:
+                    value, seconds = future.result(timeout=max(0.0, remaining))
+                    outcomes[name] = {"value": value, "seconds": seconds, "status": "ok"}
+                except FutureTimeoutError:
+                    logger.warning(f"Collection step '{name}' timed out after {self.step_timeouts[name]}s.")
+                    outcomes[name] = {"value": None, "seconds": self.step_timeouts[name], "status": "timeout"}
+                except Exception as e:
+                    logger.error(f"Collection step '{name}' failed: {e}")
+                    outcomes[name] = {"value": None, "seconds": time.perf_counter() - started, "status": "error"}
+        finally:
+            # Do not wait for steps that timed out; their results are discarded.
+            executor.shutdown(wait=False, cancel_futures=True)
+        return outcomes
+
+    def prepare_analysis_data_and_prompt(self, repo_path: str, template_filename: str,
+                                         system_info_max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Collects system and repository data, loads a prompt template,
         populates it, and returns all collected data and the prompt string.
+        The three collection steps run concurrently, each with its own timeout;
+        per-step durations are returned under "timings".
+        system_info_max_age bounds the age in seconds of the dynamic system facts.
         """
         logger.info(f"Preparing analysis data and prompt for: {repo_path} using template: {template_filename}")
-        
-        system_info = self._collect_system_info()
+        started = time.perf_counter()
+
+        outcomes = self._run_collection_steps({
+            "system_info": lambda: self._collect_system_info(max_age=system_info_max_age),
+            "repo_info": lambda: self._collect_repository_info(repo_path),
+            "template": lambda: self._load_prompt_template(template_filename),
+        })
+        timings = {name: outcome["seconds"] for name, outcome in outcomes.items()}
+
+        system_info = outcomes["system_info"]["value"]
         # Not returning None immediately if system_info fails, as repo analysis might still proceed.
         # The orchestrator can decide how to handle missing system_info.
         
-        repo_data = self._collect_repository_info(repo_path)
+        repo_data = outcomes["repo_info"]["value"]
         if not repo_data: 
             logger.warning("Repository data collection returned None or an error state. Aborting prompt generation.")
             return None
 
-        template_content = self._load_prompt_template(template_filename)
-        if not template_content: return None
+        template_content = outcomes["template"]["value"]
+        if not template_content or not template_content.source: return None
             
         context_for_template = repo_data.copy() # Start with repo_data
         if system_info: # Add system info if available, for templates that might use it
             context_for_template.update({"system_info": system_info}) # e.g. {{system_info.os_info.platform}}
             
+        render_started = time.perf_counter()
         populated_prompt = self._populate_prompt_template(template_content, context_for_template)
+        timings["render"] = time.perf_counter() - render_started
+        timings["total"] = time.perf_counter() - started
 
         return {
             "system_info": system_info,
             "repo_info": repo_data,
-            "prompt_str": populated_prompt
+            "prompt_str": populated_prompt,
+            "timings": timings
         }
 
 if __name__ == "__main__":
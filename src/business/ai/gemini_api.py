@@ -1,8 +1,13 @@
 import os
-from typing import Dict, Any, Optional
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional
 from loguru import logger
 from google.generativeai import GenerativeModel # Ensure this is uncommented
 from src.business.interfaces.IAIService import IAIService # Import the interface
+from src.business.ai.image_preprocessor import ImagePreprocessor, ImageResultCache, PreparedImage
+
+DEFAULT_IMAGE_PROMPT = "Describe this image and list any notable objects, text or technical details."
 
 class AIGenerator(IAIService): # Inherit from IAIService
     """
@@ -14,6 +19,10 @@ class AIGenerator(IAIService): # Inherit from IAIService
             raise ValueError("API key must be provided for AIGenerator.")
         self.api_key = api_key
         self.model = GenerativeModel("gemini-pro") # Initialize the model
+        # Images are downscaled/re-encoded locally and results cached by content digest;
+        # the perceptual hash is only used by the opt-in dedupe_similar.
+        self.image_preprocessor = ImagePreprocessor()
+        self.image_cache = ImageResultCache()
         logger.info(f"AIGenerator initialized with API Key (masked): {api_key[:5]}...")
 
     def generate_text(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
@@ -25,10 +34,99 @@ class AIGenerator(IAIService): # Inherit from IAIService
         response = self.model.generate_content(prompt)
         return response.text
 
+    def generate_text_stream(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Streams the response: chunks are yielded as the model produces them, so callers
+        (e.g. StreamingResponseParser) can start parsing before the response is complete.
+        """
+        logger.info(f"Streaming text for prompt: '{prompt[:50]}...' with options: {options}")
+        for chunk in self.model.generate_content(prompt, stream=True):
+            yield chunk.text
+
+    @staticmethod
+    def _image_cache_key(prepared: PreparedImage, options: Optional[Dict[str, Any]]):
+        return (prepared.digest, json.dumps(options or {}, sort_keys=True, default=str))
+
+    def _submit_image(self, prepared: PreparedImage, options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Sends one preprocessed image to the model."""
+        prompt = (options or {}).get("prompt", DEFAULT_IMAGE_PROMPT)
+        response = self.model.generate_content([prompt, {"mime_type": prepared.mime_type, "data": prepared.data}])
+        return {
+            "description": response.text,
+            "digest": prepared.digest,
+            "phash": f"{prepared.phash:016x}",
+            "width": prepared.width,
+            "height": prepared.height,
+            "original_size_bytes": prepared.original_size_bytes,
+            "payload_size_bytes": prepared.payload_size_bytes,
+        }
+
     def analyze_image(self, image_data: bytes, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Analyzes an image and returns insights.
-        This method is not implemented in this specific generator.
+        The image is downscaled and re-encoded locally before upload, and results
+        for byte-identical images are served from cache. A failure is returned
+        under "error" rather than raised.
         """
-        logger.warning("analyze_image is not implemented in AIGenerator.")
-        raise NotImplementedError("analyze_image is not implemented in this AIGenerator.")
+        return self.analyze_images([image_data], options)[0]
+
+    def analyze_images(self, images: List[bytes], options: Optional[Dict[str, Any]] = None,
+                       batch_size: int = 4, dedupe_similar: bool = False) -> List[Dict[str, Any]]:
+        """
+        Analyzes several images, returning one result per input in the same order.
+        Byte-identical images are submitted once and cached by content digest; with
+        `dedupe_similar`, images in this call that share a perceptual hash are also
+        submitted once (never across calls, since pHash cannot tell apart e.g.
+        screenshots that differ only in their text). Cache misses are sent upstream
+        concurrently in batches of `batch_size`. An image that cannot be decoded or
+        submitted gets {"error": ...} in its slot; the rest of the batch still completes.
+        """
+        keys: List[Any] = []
+        results: Dict[Any, Dict[str, Any]] = {}
+        pending: Dict[Any, PreparedImage] = {}
+        similar: Dict[int, Any] = {}           # pHash -> key submitted for it (dedupe_similar only)
+        aliases: Dict[Any, Any] = {}           # key -> key whose result it shares
+        for index, data in enumerate(images):
+            try:
+                prepared = self.image_preprocessor.prepare(data)
+            except ValueError as e:
+                logger.warning(f"Image {index} could not be prepared: {e}")
+                key = ("error", index)
+                results[key] = {"error": str(e)}
+                keys.append(key)
+                continue
+            key = self._image_cache_key(prepared, options)
+            keys.append(key)
+            if key in results or key in pending or key in aliases:
+                continue
+            cached = self.image_cache.get(key)
+            if cached is not None:
+                results[key] = dict(cached, cached=True)
+            elif dedupe_similar and prepared.phash in similar:
+                aliases[key] = similar[prepared.phash]
+            else:
+                pending[key] = prepared
+                similar.setdefault(prepared.phash, key)
+
+        logger.info(f"Analyzing {len(images)} image(s): {len(pending)} to submit, "
+                    f"{len(aliases)} perceptual duplicate(s), {len(results)} served from cache or failed locally.")
+        pending_items = list(pending.items())
+        with ThreadPoolExecutor(max_workers=max(1, batch_size)) as executor:
+            for start in range(0, len(pending_items), batch_size):
+                batch = pending_items[start:start + batch_size]
+                futures = [(key, executor.submit(self._submit_image, prepared, options)) for key, prepared in batch]
+                for key, future in futures:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning(f"Image analysis request failed: {e}")
+                        results[key] = {"error": str(e)}
+                        continue
+                    self.image_cache.put(key, result)
+                    results[key] = dict(result, cached=False)
+
+        for key, source in aliases.items():
+            # Keys are (digest, options): the copy keeps its own digest and names the image analyzed for it.
+            results[key] = results[source] if "error" in results[source] else \
+                dict(results[source], digest=key[0], similar_to=source[0])
+        return [results[key] for key in keys]
@@ -0,0 +1,127 @@
+# image_preprocessor.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+import cv2
+import numpy as np
+from loguru import logger
+
+
+@dataclass
+class PreparedImage:
+    """An image that has been downscaled and re-encoded for upload."""
+    data: bytes
+    mime_type: str
+    digest: str                    # SHA-256 of the original bytes: identifies the exact image
+    phash: int                     # Perceptual hash: equal for visually similar images
+    width: int
+    height: int
+    original_size_bytes: int
+
+    @property
+    def payload_size_bytes(self) -> int:
+        return len(self.data)
+
+
+class ImagePreprocessor:
+    """
+    Local preprocessing stage for image analysis.
+
+    Decodes uploads with OpenCV, downscales anything larger than the model's
+    maximum useful resolution, re-encodes to JPEG, and computes a SHA-256
+    digest of the upload (the cache key) and a DCT perceptual hash, which
+    callers may use to group visually identical uploads.
+    """
+    def __init__(self, max_dimension: int = 3072, jpeg_quality: int = 85):
+        if max_dimension <= 0:
+            raise ValueError("max_dimension must be a positive integer.")
+        self.max_dimension = max_dimension
+        self.jpeg_quality = jpeg_quality
+
+    @staticmethod
+    def perceptual_hash(image: np.ndarray) -> int:
+        """Computes a 64-bit pHash: the sign of the low-frequency DCT terms against their median."""
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+        low_freq = cv2.dct(small)[:8, :8].flatten()
+        # Skip the DC term when taking the median so overall brightness does not dominate.
+        bits = low_freq > np.median(low_freq[1:])
+        return int("".join("1" if bit else "0" for bit in bits), 2)
+
+    @staticmethod
+    def hamming_distance(hash_a: int, hash_b: int) -> int:
+        return bin(hash_a ^ hash_b).count("1")
+
+    def prepare(self, image_data: bytes) -> PreparedImage:
+        """
+        Decodes, downscales and re-encodes an image.
+        Raises ValueError if the bytes cannot be decoded as an image.
+        """
+        buffer = np.frombuffer(image_data, dtype=np.uint8)
+        image = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Image data could not be decoded.")
+
+        height, width = image.shape[:2]
+        scale = self.max_dimension / max(height, width)
+        if scale < 1.0:
+            new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            image = cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+            height, width = image.shape[:2]
+
+        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError("Image could not be re-encoded as JPEG.")
+        data = encoded.tobytes()
+        mime_type = "image/jpeg"
+        if scale >= 1.0 and len(image_data) <= len(data) and image_data[:3] == b"\xff\xd8\xff":
+            # Already a small JPEG; re-encoding would only cost quality.
+            data = image_data
+
+        prepared = PreparedImage(
+            data=data,
+            mime_type=mime_type,
+            digest=hashlib.sha256(image_data).hexdigest(),
+            phash=self.perceptual_hash(image),
+            width=width,
+            height=height,
+            original_size_bytes=len(image_data),
+        )
+        logger.debug(
+            f"Prepared image {width}x{height}: {prepared.original_size_bytes} -> {prepared.payload_size_bytes} bytes."
+        )
+        return prepared
+
+
+class ImageResultCache:
+    """Thread-safe LRU cache of analysis results keyed by image digest and options."""
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Hashable, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,184 @@
+# incremental_repo_collector.py
+
+import os
+import json
+import fnmatch
+import hashlib
+import posixpath
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from src.data.implementations.repository_file_index import FileFingerprint, RepositoryFileIndex
+
+# Files worth capturing for a requirements analysis, matched case-insensitively against file names anywhere in the tree.
+DEFAULT_RELEVANT_PATTERNS = (
+    "readme*", "requirements*.txt", "environment.yml", "environment.yaml", "pyproject.toml",
+    "setup.py", "setup.cfg", "pipfile", "package.json", "dockerfile", "*min*sys*req*",
+)
+
+# Directories never descended into: VCS metadata, dependencies and build/tool caches.
+DEFAULT_SKIPPED_DIRECTORIES = (
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".tox", ".nox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", "site-packages", ".ipynb_checkpoints",
+)
+
+# Which captured file feeds which prompt placeholder (the shallowest matching file wins).
+PLACEHOLDER_PATTERNS = (
+    ("readme_content", ("readme.md", "readme*")),
+    ("requirements_txt_content", ("requirements.txt", "requirements*.txt")),
+    ("environment_yaml_content", ("environment.yaml", "environment.yml")),
+    ("existing_min_sys_reqs_content", ("*min*sys*req*",)),
+)
+
+
+@dataclass
+class RepositorySnapshot:
+    """File contents captured for one analysis (keyed by path relative to the root), plus what changed since the previous one."""
+    repository_identifier: str
+    files: Dict[str, Optional[str]]
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    # Fingerprints read this time but not yet written to the index (collect(persist=False)).
+    pending_fingerprints: List[FileFingerprint] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    def delta(self) -> Dict[str, Any]:
+        """Only the files that changed, suitable for storing as an incremental snapshot."""
+        return {
+            "added": {path: self.files[path] for path in self.added},
+            "modified": {path: self.files[path] for path in self.modified},
+            "removed": list(self.removed),
+        }
+
+    def to_snapshot_json(self) -> str:
+        """Serializes the snapshot in the repository_snapshots.snapshot_data format."""
+        return json.dumps({"repository": self.repository_identifier, "files": self.files,
+                           "delta": {"added": self.added, "modified": self.modified, "removed": self.removed}})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A JSON-serializable summary (paths and delta, no contents) for prompt contexts and logs."""
+        return {"repository": self.repository_identifier, "files": sorted(self.files), "added": list(self.added),
+                "modified": list(self.modified), "removed": list(self.removed), "unchanged": list(self.unchanged),
+                "changed": self.changed}
+
+    def to_repo_data(self) -> Dict[str, Optional[str]]:
+        """Maps captured files onto the placeholder keys used by the prompt templates."""
+        # Shallowest first, so the repository's own README wins over one in docs/ or a vendored package.
+        by_depth = sorted(self.files, key=lambda path: (path.count("/"), path.lower()))
+        repo_data: Dict[str, Optional[str]] = {"repository_path": self.repository_identifier}
+        for key, patterns in PLACEHOLDER_PATTERNS:
+            repo_data[key] = None
+            for pattern in patterns:
+                match = next((path for path in by_depth if fnmatch.fnmatch(posixpath.basename(path).lower(), pattern)),
+                             None)
+                if match is not None:
+                    repo_data[key] = self.files[match]
+                    break
+        return repo_data
+
+
+class IncrementalRepositoryCollector:
+    """
+    Collects the relevant files of a repository, re-reading only those whose
+    size or mtime changed since the fingerprints recorded in prp.db. The whole
+    tree is walked (minus `skipped_directories`); unchanged files are served
+    from the blob store through the index.
+    """
+    def __init__(self, index: RepositoryFileIndex, relevant_patterns: Sequence[str] = DEFAULT_RELEVANT_PATTERNS,
+                 max_file_bytes: int = 1024 * 1024,
+                 skipped_directories: Sequence[str] = DEFAULT_SKIPPED_DIRECTORIES):
+        self.index = index
+        self.relevant_patterns = tuple(pattern.lower() for pattern in relevant_patterns)
+        self.max_file_bytes = max_file_bytes
+        self.skipped_directories = frozenset(skipped_directories)
+
+    def _relevant_entries(self, repo_root: Path) -> List[Tuple[str, os.stat_result]]:
+        """Stats the files anywhere under the root that match the relevant patterns, keyed by POSIX relative path."""
+        entries = []
+        for directory, subdirectories, filenames in os.walk(repo_root):
+            subdirectories[:] = [name for name in subdirectories if name not in self.skipped_directories]
+            relative_dir = Path(directory).relative_to(repo_root).as_posix()
+            for name in filenames:
+                if not any(fnmatch.fnmatch(name.lower(), pattern) for pattern in self.relevant_patterns):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:  # Dangling symlink or removed mid-walk.
+                    continue
+                if not os.path.isfile(path):
+                    continue
+                entries.append((name if relative_dir == "." else f"{relative_dir}/{name}", stat))
+        return entries
+
+    def _read(self, path: Path, relative_path: str, stat: os.stat_result) -> FileFingerprint:
+        data = path.read_bytes()
+        content = data.decode("utf-8", errors="replace") if len(data) <= self.max_file_bytes else None
+        return FileFingerprint(
+            relative_path=relative_path,
+            size_bytes=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            content_hash=hashlib.sha256(data).hexdigest(),
+            content=content,
+        )
+
+    def collect(self, repo_path: str, persist: bool = True) -> Optional[RepositorySnapshot]:
+        """
+        Returns a snapshot of the repository's relevant files, or None if the path is not a directory.
+        Fingerprints are updated in the index as a side effect; with persist=False they are left
+        in snapshot.pending_fingerprints (and snapshot.removed) for the caller to apply, so the
+        collector only ever reads prp.db.
+        """
+        repo_root = Path(repo_path).resolve()
+        if not repo_root.is_dir():
+            logger.warning(f"Invalid repository path: {repo_path}")
+            return None
+        repository_identifier = str(repo_root)
+
+        known = self.index.load(repository_identifier)
+        snapshot = RepositorySnapshot(repository_identifier=repository_identifier, files={})
+        upserted: List[FileFingerprint] = []
+        reused: Dict[str, Optional[str]] = {}         # unchanged path -> blob hash of its content
+
+        for name, stat in self._relevant_entries(repo_root):
+            previous = known.pop(name, None)
+            if previous is not None and previous.matches_stat(stat.st_size, stat.st_mtime_ns):
+                reused[name] = previous.blob_hash
+                snapshot.files[name] = None
+                snapshot.unchanged.append(name)
+                continue
+
+            fingerprint = self._read(repo_root / name, name, stat)
+            upserted.append(fingerprint)
+            snapshot.files[name] = fingerprint.content
+            if previous is None:
+                snapshot.added.append(name)
+            elif previous.content_hash != fingerprint.content_hash:
+                snapshot.modified.append(name)
+            else:
+                # Touched but identical: only the stat data needed refreshing.
+                snapshot.unchanged.append(name)
+
+        contents = self.index.read_contents(blob_hash for blob_hash in reused.values() if blob_hash)
+        for name, blob_hash in reused.items():
+            snapshot.files[name] = contents.get(blob_hash) if blob_hash else None
+
+        snapshot.removed = sorted(known)
+        if not persist:
+            snapshot.pending_fingerprints = upserted
+        elif upserted or snapshot.removed:
+            self.index.apply(repository_identifier, upserted, snapshot.removed)
+
+        logger.info(
+            f"Collected {len(snapshot.files)} file(s) from {repository_identifier}: "
+            f"{len(upserted)} read, {len(snapshot.unchanged)} reused from index, {len(snapshot.removed)} removed."
+        )
+        return snapshot
@@ -0,0 +1,193 @@
+# model_router.py
+"""
+Routes a query to the mock models whose focus or domain it mentions.
+
+MockLLM.infer decides relevance one model at a time, with a substring check of its
+focus against the query, so routing costs one check per model. ModelRouter compiles
+every model's focus phrase, focus terms and domain into a single word-level
+Aho-Corasick automaton instead: the query is scanned once, in time proportional to
+its length plus the matches found, however many models there are. Each pattern
+carries a posting list (an inverted index) of the models it belongs to.
+"""
+import re
+import heapq
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from loguru import logger
+
+from src.data.interfaces.ICrudRepository import ICrudRepository
+from src.data.obj.entities import Comparison, Model
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# Too common to route on by themselves; they still count inside a whole focus phrase.
+STOPWORDS = frozenset({"a", "an", "and", "by", "for", "from", "in", "into", "of", "on", "or", "the", "to", "with"})
+
+# What a pattern is, for a model.
+_PHRASE, _TERM, _DOMAIN = 0, 1, 2
+PHRASE_BONUS = 1.0      # The whole focus phrase appears in the query (what MockLLM.infer checks)
+DOMAIN_BONUS = 0.25     # The model's domain is named in the query
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    return tuple(_TOKEN_PATTERN.findall(text.lower()))
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    model_id: str
+    name: str
+    domain: str
+    score: float
+    matched_terms: Tuple[str, ...]
+
+
+class _WordAutomaton:
+    """Aho-Corasick over token sequences, so patterns only match on word boundaries."""
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        self.patterns: List[Tuple[str, ...]] = []
+        self._pattern_ids: Dict[Tuple[str, ...], int] = {}
+
+    def add(self, tokens: Tuple[str, ...]) -> int:
+        """Adds a pattern (once) and returns its id."""
+        pattern_id = self._pattern_ids.get(tokens)
+        if pattern_id is not None:
+            return pattern_id
+        state = 0
+        for token in tokens:
+            next_state = self.goto[state].get(token)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][token] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        pattern_id = self._pattern_ids[tokens] = len(self.patterns)
+        self.patterns.append(tokens)
+        self.output[state].append(pattern_id)
+        return pattern_id
+
+    def build(self) -> None:
+        """Computes failure links breadth-first and merges each state's outputs with its fallback's."""
+        queue = list(self.goto[0].values())  # Depth-1 states fall back to the root.
+        for state in queue:
+            for token, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+                queue.append(child)
+
+    def search(self, tokens: Sequence[str]) -> Set[int]:
+        """Returns the ids of every pattern that occurs in the token sequence."""
+        found: Set[int] = set()
+        state = 0
+        for token in tokens:
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            found.update(self.output[state])
+        return found
+
+
+class ModelRouter:
+    """
+    Matches queries to models in a single pass over the query.
+
+    Scoring: the fraction of a model's focus terms in the query, plus PHRASE_BONUS when
+    the whole focus phrase appears, plus DOMAIN_BONUS when its domain is named. If only
+    a domain is named (e.g. "an overview of cosmology"), that domain's models are returned.
+    """
+    def __init__(self, models: Iterable[Model]):
+        self.models: List[Model] = list(models)
+        self._automaton = _WordAutomaton()
+        # Inverted index: pattern id -> [(model index, kind)].
+        self._postings: Dict[int, List[Tuple[int, int]]] = {}
+        self._term_counts: List[int] = []
+        self._domain_of: List[Optional[int]] = []
+        self._by_domain: Dict[int, List[int]] = {}
+        for index, model in enumerate(self.models):
+            focus = tokenize(model.focus or "")
+            terms = {token for token in focus if token not in STOPWORDS}
+            self._term_counts.append(len(terms))
+            if focus:
+                self._post(focus, index, _PHRASE)
+            for term in terms:
+                self._post((term,), index, _TERM)
+            domain = tokenize(model.domain)
+            domain_id = self._post(domain, index, _DOMAIN) if domain else None
+            self._domain_of.append(domain_id)
+            if domain_id is not None:
+                self._by_domain.setdefault(domain_id, []).append(index)
+        self._automaton.build()
+        logger.debug(f"ModelRouter indexed {len(self.models)} models "
+                     f"({len(self._automaton.patterns)} patterns, {len(self._automaton.goto)} states).")
+
+    def _post(self, tokens: Tuple[str, ...], index: int, kind: int) -> int:
+        pattern_id = self._automaton.add(tokens)
+        if kind != _DOMAIN:  # Domain members are kept in _by_domain and only listed when no focus matches.
+            self._postings.setdefault(pattern_id, []).append((index, kind))
+        return pattern_id
+
+    @classmethod
+    def from_mock_list(cls, entries: Iterable[Tuple[str, str, str]]) -> "ModelRouter":
+        """Builds a router from (name, domain, focus) tuples such as ALL_MOCK_LLMS_LIST."""
+        from src.data.implementations.mock_model_schema import mock_model_id
+        return cls(Model(mock_model_id(name, domain), name, domain, focus) for name, domain, focus in entries)
+
+    @classmethod
+    def from_database(cls, db_path: Optional[Union[str, Path]] = None) -> "ModelRouter":
+        """Builds a router over the models table of the mock model database (config.DB_PATH)."""
+        from config import config
+        from src.data.implementations.sqlite_crud_repository import MODELS, SQLiteConnectionPool, SQLiteCrudRepository
+        pool = SQLiteConnectionPool(db_path or config.DB_PATH)
+        try:
+            return cls(SQLiteCrudRepository(MODELS, pool).iter_all())
+        finally:
+            pool.close_all()
+
+    def route(self, query: str, limit: int = 5) -> List[ModelRoute]:
+        """Returns up to `limit` matching models, best first; ties keep the models' original order."""
+        matched = self._automaton.search(tokenize(query))
+        scores: Dict[int, float] = {}
+        terms: Dict[int, List[str]] = {}
+        for pattern_id in matched:
+            for index, kind in self._postings.get(pattern_id, ()):
+                if kind == _PHRASE:
+                    scores[index] = scores.get(index, 0.0) + PHRASE_BONUS
+                else:
+                    scores[index] = scores.get(index, 0.0) + 1.0 / self._term_counts[index]
+                    terms.setdefault(index, []).append(self._automaton.patterns[pattern_id][0])
+        domains = {pattern_id for pattern_id in matched if pattern_id in self._by_domain}
+        if scores:
+            for index in scores:
+                if self._domain_of[index] in domains:
+                    scores[index] += DOMAIN_BONUS
+        else:
+            for pattern_id in sorted(domains):
+                for index in self._by_domain[pattern_id][:limit]:
+                    scores[index] = DOMAIN_BONUS
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self._route(index, score, terms.get(index, ())) for index, score in best]
+
+    def _route(self, index: int, score: float, terms: Iterable[str]) -> ModelRoute:
+        model = self.models[index]
+        return ModelRoute(model.model_id, model.name, model.domain, round(score, 4), tuple(sorted(terms)))
+
+    def create_comparison(self, query: str, comparisons: ICrudRepository[Comparison],
+                          user_session_id: Optional[str] = None) -> Optional[Comparison]:
+        """
+        Records a comparison between the two models that best match the query,
+        or returns None when fewer than two models match.
+        """
+        routes = self.route(query, limit=2)
+        if len(routes) < 2:
+            return None
+        return comparisons.create(Comparison(model_id_1=routes[0].model_id, model_id_2=routes[1].model_id,
+                                             user_session_id=user_session_id))
@@ -0,0 +1,250 @@
+# model_similarity.py
+"""
+Pairwise model similarity for the mock model database.
+
+Each model's domain and focus are embedded as an L2-normalized TF-IDF vector, so a
+dot product is the cosine similarity. The full similarity matrix (n x n) is never
+held at once: rows are scored in blocks of `block_size` (block_size x n floats each)
+on a process pool, and only each model's top-k neighbours are kept.
+
+The resulting pairs are written as one comparison plus one inferred connection
+(confidence_score = similarity) per unordered model pair.
+"""
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.business.ai.model_router import STOPWORDS, tokenize
+from src.data.obj.entities import Model
+
+# Marks the comparisons this engine writes, so a re-run can replace them.
+ENGINE_SESSION_ID = "tfidf-similarity-engine"
+CONNECTION_TYPE = "similarity"
+
+
+def model_terms(model: Model) -> List[str]:
+    """Focus words and word pairs, plus domain words: the features a model is embedded on."""
+    focus = [token for token in tokenize(model.focus or "") if token not in STOPWORDS]
+    domain = [f"domain:{token}" for token in tokenize(model.domain) if token not in STOPWORDS]
+    return focus + [f"{a} {b}" for a, b in zip(focus, focus[1:])] + domain
+
+
+class SparseRows(NamedTuple):
+    """Rows of a sparse matrix in CSR form: row r holds data[indptr[r]:indptr[r + 1]] at columns indices[...]."""
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    n_columns: int
+
+    def transpose(self) -> "SparseRows":
+        """The same matrix by column: for each feature, the rows (models) that have it."""
+        order = np.argsort(self.indices, kind="stable")
+        rows = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        indptr = np.zeros(self.n_columns + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.n_columns), out=indptr[1:])
+        return SparseRows(indptr, rows[order], self.data[order], len(self.indptr) - 1)
+
+    def to_dense(self) -> np.ndarray:
+        dense = np.zeros((len(self.indptr) - 1, self.n_columns), dtype=self.data.dtype)
+        dense[np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr)), self.indices] = self.data
+        return dense
+
+
+class TfidfEmbedder:
+    """
+    Fits a vocabulary with smoothed IDF weights and embeds models as L2-normalized sparse rows.
+    A model has a handful of features out of thousands, so the vectors stay sparse.
+    """
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: np.ndarray = np.zeros(0, dtype=np.float32)
+
+    def fit_transform(self, models: Sequence[Model]) -> SparseRows:
+        documents = [Counter(model_terms(model)) for model in models]
+        document_frequency: Counter = Counter()
+        for counts in documents:
+            document_frequency.update(counts.keys())
+        self.vocabulary = {term: index for index, term in enumerate(sorted(document_frequency))}
+        n = len(models)
+        self.idf = np.array([math.log((1 + n) / (1 + document_frequency[term])) + 1 for term in self.vocabulary],
+                            dtype=np.float32)
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(counts) for counts in documents], out=indptr[1:])
+        indices = np.fromiter((self.vocabulary[term] for counts in documents for term in counts),
+                              dtype=np.int64, count=int(indptr[-1]))
+        data = np.fromiter((count for counts in documents for count in counts.values()),
+                           dtype=np.float32, count=int(indptr[-1])) * self.idf[indices]
+        norms = np.sqrt(np.add.reduceat(data ** 2, indptr[:-1])) if len(data) else np.zeros(n, dtype=np.float32)
+        norms[np.diff(indptr) == 0] = 1.0  # reduceat repeats the next value for empty rows; they have no data anyway.
+        data /= np.repeat(norms, np.diff(indptr))
+        return SparseRows(indptr, indices, data, len(self.vocabulary))
+
+
+def block_similarities(rows: SparseRows, columns: SparseRows, start: int, stop: int) -> np.ndarray:
+    """
+    Cosine similarities of rows[start:stop] to every row, as a dense (stop - start) x n block.
+    Only feature postings shared with the block are visited (a sparse-dense product in numpy),
+    so the cost follows the overlap between models, not n x n x features.
+    """
+    n = columns.n_columns
+    lo, hi = rows.indptr[start], rows.indptr[stop]
+    block_rows = np.repeat(np.arange(stop - start), np.diff(rows.indptr[start:stop + 1]))
+    features, weights = rows.indices[lo:hi], rows.data[lo:hi]
+    firsts, lengths = columns.indptr[features], np.diff(columns.indptr)[features]
+    # Position of every posting of every block feature: firsts[f] + 0..lengths[f]-1.
+    ends = np.cumsum(lengths)
+    postings = np.repeat(firsts - ends + lengths, lengths) + np.arange(ends[-1] if len(ends) else 0)
+    cells = np.repeat(block_rows, lengths) * n + columns.indices[postings]
+    products = np.repeat(weights, lengths) * columns.data[postings]
+    return np.bincount(cells, weights=products, minlength=(stop - start) * n).reshape(stop - start, n)
+
+
+def block_top_k(rows: SparseRows, columns: SparseRows, start: int, stop: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """The k most similar other rows for each row in [start, stop), sorted by descending similarity."""
+    distances = np.negative(block_similarities(rows, columns, start, stop), dtype=np.float32)
+    distances[np.arange(stop - start), np.arange(start, stop)] = np.inf  # Not its own neighbour.
+    # Selecting the k smallest distances is several times faster than the k largest similarities
+    # here: many models tie on the top scores (same domain), which slows the selection from the top.
+    candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    scores = np.take_along_axis(distances, candidates, axis=1)
+    order = np.argsort(scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1), -np.take_along_axis(scores, order, axis=1)
+
+
+# Matrices shared with worker processes, set once per process by the pool initializer.
+_WORKER_MATRICES: Optional[Tuple[SparseRows, SparseRows]] = None
+
+
+def _init_worker(rows: SparseRows, columns: SparseRows) -> None:
+    global _WORKER_MATRICES
+    _WORKER_MATRICES = (rows, columns)
+
+
+def _worker_top_k(start: int, stop: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    return block_top_k(*_WORKER_MATRICES, start, stop, k)
+
+
+@dataclass
+class SimilarityReport:
+    models: int = 0
+    features: int = 0
+    pairs: int = 0
+    replaced: int = 0
+    embed_seconds: float = 0.0
+    similarity_seconds: float = 0.0
+    write_seconds: float = 0.0
+
+
+class ModelSimilarityEngine:
+    """
+    Finds each model's `top_k` most similar models (cosine similarity >= `min_score`).
+
+    Blocks of `block_size` rows are scored in `workers` processes (the scatter-add that
+    builds a block holds the GIL, so threads would not use more cores). Peak memory per
+    worker is one block of block_size x n float64, e.g. 256 x 20,000 x 8 bytes = 41 MB,
+    instead of an n x n matrix.
+    """
+    def __init__(self, top_k: int = 5, block_size: int = 256, workers: Optional[int] = None, min_score: float = 0.1):
+        self.top_k = max(1, top_k)
+        self.block_size = max(1, block_size)
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.min_score = min_score
+
+    def top_k_neighbors(self, rows: SparseRows) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (indices, scores), both n x k, each row sorted by descending similarity."""
+        n = len(rows.indptr) - 1
+        k = min(self.top_k, n - 1)
+        if k <= 0:
+            return np.zeros((n, 0), dtype=np.int64), np.zeros((n, 0), dtype=np.float32)
+        columns = rows.transpose()
+        spans = [(start, min(start + self.block_size, n)) for start in range(0, n, self.block_size)]
+        if self.workers == 1 or len(spans) == 1:
+            blocks = [block_top_k(rows, columns, start, stop, k) for start, stop in spans]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(rows, columns)) as pool:
+                blocks = list(pool.map(_worker_top_k, *zip(*spans), [k] * len(spans)))
+        return np.vstack([indices for indices, _ in blocks]), np.vstack([scores for _, scores in blocks])
+
+    def pairs(self, indices: np.ndarray, scores: np.ndarray) -> Iterator[Tuple[int, int, float]]:
+        """
+        Yields each unordered pair (i, j, score) once, i < j. A pair found from both sides
+        is emitted from the smaller index; one found only from the larger side is emitted there.
+        """
+        rows = [[(j, score) for j, score in zip(row, row_scores) if score >= self.min_score]
+                for row, row_scores in zip(indices.tolist(), scores.tolist())]
+        kept = [{j for j, _ in row} for row in rows]
+        for i, row in enumerate(rows):
+            for j, score in row:
+                if i < j:
+                    yield i, j, score
+                elif i not in kept[j]:
+                    yield j, i, score
+
+    def compute(self, models: Sequence[Model], report: Optional[SimilarityReport] = None) -> List[Tuple[int, int, float]]:
+        """Embeds the models and returns their top-k similarity pairs as (i, j, score)."""
+        report = report if report is not None else SimilarityReport()
+        started = time.perf_counter()
+        embedder = TfidfEmbedder()
+        rows = embedder.fit_transform(models)
+        report.models, report.features = len(models), len(embedder.vocabulary)
+        report.embed_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        pairs = list(self.pairs(*self.top_k_neighbors(rows)))
+        report.pairs = len(pairs)
+        report.similarity_seconds = time.perf_counter() - started
+        return pairs
+
+    def write_connections(self, conn, models: Sequence[Model], replace: bool = True) -> SimilarityReport:
+        """
+        Computes the pairs and bulk-inserts them in one transaction on `conn` (the mock
+        model database). With replace=True, comparisons written by an earlier run are
+        removed first; questions that referred to them keep their text but lose the link.
+        """
+        report = SimilarityReport()
+        pairs = self.compute(models, report)
+        started = time.perf_counter()
+        now = datetime.now().isoformat(sep=" ", timespec="seconds")
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")  # Holds the write lock, so the ids allocated below stay free.
+            if replace:
+                report.replaced = self._delete_previous(conn)
+            first_comparison = (conn.execute("SELECT MAX(comparison_id) FROM comparisons").fetchone()[0] or 0) + 1
+            first_connection = (conn.execute("SELECT MAX(connection_id) FROM inferred_connections").fetchone()[0] or 0) + 1
+            conn.executemany(
+                "INSERT INTO comparisons (comparison_id, model_id_1, model_id_2, comparison_timestamp, user_session_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((first_comparison + n, models[i].model_id, models[j].model_id, now, ENGINE_SESSION_ID)
+                 for n, (i, j, _) in enumerate(pairs)),
+            )
+            conn.executemany(
+                "INSERT INTO inferred_connections (connection_id, comparison_id, connection_text, connection_type, "
+                "confidence_score, generated_by_ai, timestamp) VALUES (?, ?, ?, ?, ?, 0, ?)",
+                ((first_connection + n, first_comparison + n,
+                  f"{models[i].name} and {models[j].name} have similar focus: "
+                  f"'{models[i].focus}' / '{models[j].focus}'.",
+                  CONNECTION_TYPE, round(score, 2), now)
+                 for n, (i, j, score) in enumerate(pairs)),
+            )
+        report.write_seconds = time.perf_counter() - started
+        logger.info(f"Model similarity: {report.pairs} connections across {report.models} models "
+                    f"({report.features} features), {report.replaced} previous comparisons replaced.")
+        return report
+
+    @staticmethod
+    def _delete_previous(conn) -> int:
+        previous = "SELECT comparison_id FROM comparisons WHERE user_session_id = ?"
+        conn.execute(f"UPDATE questions_and_hypotheses SET related_comparison_id = NULL "
+                     f"WHERE related_comparison_id IN ({previous})", (ENGINE_SESSION_ID,))
+        conn.execute(f"DELETE FROM inferred_connections WHERE comparison_id IN ({previous})", (ENGINE_SESSION_ID,))
+        return conn.execute("DELETE FROM comparisons WHERE user_session_id = ?", (ENGINE_SESSION_ID,)).rowcount
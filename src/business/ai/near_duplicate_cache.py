@@ -0,0 +1,234 @@
+# near_duplicate_cache.py
+
+import re
+import json
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.business.interfaces.IAIService import IAIService
+
+# Mersenne-ish prime just above 2**32 so (a * x + b) stays inside uint64 for 32-bit shingle hashes.
+_MINHASH_PRIME = np.uint64(4294967311)
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures over word shingles of a text.
+    Two signatures agree on a fraction of positions that estimates the Jaccard
+    similarity of the underlying shingle sets.
+    """
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 42):
+        if num_perm <= 0:
+            raise ValueError("num_perm must be a positive integer.")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Keep a < 2**31 and b < 2**31 so a * x + b cannot overflow uint64 for x < 2**32.
+        self._a = rng.integers(1, 2**31, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 2**31, size=(num_perm, 1), dtype=np.uint64)
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        """Hashes every k-word shingle of the text to a 32-bit integer."""
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        k = self.shingle_size
+        if len(tokens) <= k:
+            shingles = {" ".join(tokens)}
+        else:
+            shingles = {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+        return np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        """Returns the MinHash signature of the text as a uint64 vector of length num_perm."""
+        hashes = self._shingle_hashes(text)
+        # (num_perm, 1) x (n_shingles,) -> (num_perm, n_shingles), then min across shingles.
+        permuted = (self._a * hashes + self._b) % _MINHASH_PRIME
+        return permuted.min(axis=1)
+
+    @staticmethod
+    def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        """Estimates the Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hash index over MinHash signatures.
+    Each signature is split into `bands` slices; two entries become candidates
+    when at least one slice hashes to the same bucket.
+    """
+    def __init__(self, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands}).")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: str, signature: np.ndarray) -> None:
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+
+    def remove(self, key: str, signature: np.ndarray) -> None:
+        for band, band_key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def candidates(self, signature: np.ndarray) -> Set[str]:
+        found: Set[str] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            found |= self._buckets[band].get(band_key, set())
+        return found
+
+
+class NearDuplicateCacheAIService(IAIService):
+    """
+    Opt-in caching layer for any IAIService.
+
+    Prompts are fingerprinted with MinHash and indexed in LSH buckets. A stored
+    response is reused when the prompt is identical (exact hit) or when its
+    estimated similarity to a cached prompt reaches `threshold` (approximate hit).
+    Responses are only shared between calls made with the same options.
+    """
+    def __init__(
+        self,
+        inner: IAIService,
+        threshold: float = 0.9,
+        max_entries: int = 1024,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 5,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in the range (0, 1].")
+        self.inner = inner
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self._index = LSHIndex(num_perm=num_perm, bands=bands)
+        # entry key -> (options key, signature, response); ordered for LRU eviction.
+        self._entries: "OrderedDict[str, Tuple[str, np.ndarray, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "approximate_hits": 0, "misses": 0, "evictions": 0}
+        logger.debug(f"NearDuplicateCacheAIService initialized (threshold={threshold}, max_entries={max_entries}).")
+
+    @staticmethod
+    def _options_key(options: Optional[Dict[str, Any]]) -> str:
+        return json.dumps(options or {}, sort_keys=True, default=str)
+
+    @staticmethod
+    def _entry_key(prompt: str, options_key: str) -> str:
+        return hashlib.sha256(f"{options_key}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, entry_key: str, options_key: str, signature: np.ndarray) -> Optional[str]:
+        """Returns a cached response for an exact or near-duplicate prompt. Caller holds the lock."""
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            self._entries.move_to_end(entry_key)
+            self.stats["exact_hits"] += 1
+            return entry[2]
+
+        best_key, best_score = None, 0.0
+        for candidate_key in self._index.candidates(signature):
+            candidate_options, candidate_sig, _ = self._entries[candidate_key]
+            if candidate_options != options_key:
+                continue
+            score = MinHasher.similarity(signature, candidate_sig)
+            if score > best_score:
+                best_key, best_score = candidate_key, score
+
+        if best_key is not None and best_score >= self.threshold:
+            self._entries.move_to_end(best_key)
+            self.stats["approximate_hits"] += 1
+            logger.debug(f"Near-duplicate prompt cache hit (estimated similarity {best_score:.3f}).")
+            return self._entries[best_key][2]
+        return None
+
+    def _store(self, entry_key: str, options_key: str, signature: np.ndarray, response: str) -> None:
+        """Adds a response to the cache, evicting the least recently used entry if full. Caller holds the lock."""
+        if entry_key in self._entries:
+            return
+        self._entries[entry_key] = (options_key, signature, response)
+        self._index.add(entry_key, signature)
+        while len(self._entries) > self.max_entries:
+            evicted_key, (_, evicted_sig, _) = self._entries.popitem(last=False)
+            self._index.remove(evicted_key, evicted_sig)
+            self.stats["evictions"] += 1
+
+    def generate_text(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Returns a cached response for the prompt or a near-duplicate of it,
+        falling back to the wrapped service on a miss.
+        """
+        options_key = self._options_key(options)
+        entry_key = self._entry_key(prompt, options_key)
+        signature = self._hasher.signature(prompt)
+
+        with self._lock:
+            cached = self._lookup(entry_key, options_key, signature)
+            if cached is not None:
+                return cached
+            self.stats["misses"] += 1
+
+        response = self.inner.generate_text(prompt, options)
+        with self._lock:
+            self._store(entry_key, options_key, signature, response)
+        return response
+
+    def generate_text_stream(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Yields a cached response as a single chunk, otherwise streams the wrapped
+        service's chunks through and caches the response once the stream completes.
+        """
+        options_key = self._options_key(options)
+        entry_key = self._entry_key(prompt, options_key)
+        signature = self._hasher.signature(prompt)
+
+        with self._lock:
+            cached = self._lookup(entry_key, options_key, signature)
+            if cached is None:
+                self.stats["misses"] += 1
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.inner.generate_text_stream(prompt, options):
+            chunks.append(chunk)
+            yield chunk
+        with self._lock:
+            self._store(entry_key, options_key, signature, "".join(chunks))
+
+    def analyze_image(self, image_data: bytes, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Image analysis is not cached by this layer and is delegated unchanged."""
+        return self.inner.analyze_image(image_data, options)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and the share of lookups served by approximate hits."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["exact_hits"] + stats["approximate_hits"] + stats["misses"]
+        stats["approximate_hit_rate"] = stats["approximate_hits"] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drops every cached response. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._index = LSHIndex(num_perm=self._hasher.num_perm, bands=self._index.bands)
@@ -0,0 +1,143 @@
+# prompt_renderer.py
+
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from loguru import logger
+
+# Placeholders look like {{key}} or {{system_info.cpu.logical_cores}}.
+PLACEHOLDER_PATTERN = re.compile(r"{{(.*?)}}")
+
+_MISSING = object()
+
+# Defaults for the known placeholders of the primary template.
+DEFAULT_PLACEHOLDER_VALUES = {
+    "readme_content": "README.md not found or empty.",
+    "requirements_txt_content": "requirements.txt not found or empty.",
+    "environment_yaml_content": "environment.yaml not found or empty.",
+    "existing_min_sys_reqs_content": "No existing min-sys-requirements file found or empty.",
+    "repository_description": "No repository description provided."
+    # Add any other placeholders from your primary template with their defaults here
+}
+
+
+def build_prompt_context(data_context: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Starts from DEFAULT_PLACEHOLDER_VALUES and overrides them with every non-None value in data_context."""
+    populated_data = dict(DEFAULT_PLACEHOLDER_VALUES)
+    if data_context:
+        populated_data.update((key, value) for key, value in data_context.items() if value is not None)
+    return populated_data
+
+
+def resolve_placeholder(context: Mapping[str, Any], key: str, path: Tuple[str, ...]) -> Any:
+    """
+    Resolves a placeholder against the context.
+    A literal key wins; otherwise the dotted path is walked through nested
+    dicts (and lists, for numeric segments). Returns None if nothing is found.
+    """
+    value = context.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+    if len(path) == 1:
+        return None
+
+    current: Any = context
+    for segment in path:
+        if isinstance(current, Mapping):
+            current = current.get(segment, _MISSING)
+        elif isinstance(current, (list, tuple)) and segment.lstrip("-").isdigit():
+            index = int(segment)
+            current = current[index] if -len(current) <= index < len(current) else _MISSING
+        else:
+            return None
+        if current is _MISSING:
+            return None
+    return current
+
+
+class CompiledTemplate:
+    """
+    A prompt template parsed once into alternating literal and placeholder segments.
+    `literals` always has exactly one more element than `placeholders`.
+    """
+    __slots__ = ("source", "literals", "placeholders")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.literals: List[str] = []
+        self.placeholders: List[Tuple[str, Tuple[str, ...]]] = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.literals.append(source[position:match.start()])
+            key = match.group(1).strip()
+            self.placeholders.append((key, tuple(key.split("."))))
+            position = match.end()
+        self.literals.append(source[position:])
+
+    @property
+    def placeholder_names(self) -> List[str]:
+        return [key for key, _ in self.placeholders]
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        """
+        Renders the template in a single pass.
+        Placeholders that resolve to None become "<key> not found or empty.".
+        """
+        literals = self.literals
+        parts = [literals[0]]
+        append = parts.append
+        for index, (key, path) in enumerate(self.placeholders, start=1):
+            value = resolve_placeholder(context, key, path)
+            append(f"{key} not found or empty." if value is None else str(value))
+            append(literals[index])
+        return "".join(parts)
+
+
+class PromptTemplateLoader:
+    """
+    Loads and compiles prompt templates from a directory.
+    Compiled templates are cached and only re-parsed when the file's mtime or size changes.
+    """
+    def __init__(self, template_dir: Union[str, Path]):
+        self.template_dir = Path(template_dir)
+        self._cache: Dict[Path, Tuple[int, int, CompiledTemplate]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, template_filename: str) -> Optional[Path]:
+        """The template's path, or None when the name points outside the template directory (e.g. '../x', '/etc/x')."""
+        template_path = (self.template_dir / template_filename).resolve()
+        return template_path if template_path.is_relative_to(self.template_dir.resolve()) else None
+
+    def load(self, template_filename: str) -> Optional[CompiledTemplate]:
+        """Returns the compiled template, or None if the file does not exist or is outside the template directory."""
+        template_path = self.resolve(template_filename)
+        if template_path is None:
+            logger.warning(f"Refusing prompt template outside {self.template_dir}: {template_filename}")
+            return None
+        try:
+            stat = template_path.stat()
+        except FileNotFoundError:
+            return None
+        if not template_path.is_file():
+            return None
+
+        with self._lock:
+            cached = self._cache.get(template_path)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
+
+        compiled = CompiledTemplate(template_path.read_text(encoding="utf-8"))
+        with self._lock:
+            self._cache[template_path] = (stat.st_mtime_ns, stat.st_size, compiled)
+        logger.debug(f"Compiled prompt template {template_filename} ({len(compiled.placeholders)} placeholders).")
+        return compiled
+
+    def invalidate(self, template_filename: Optional[str] = None) -> None:
+        """Drops one cached template, or all of them."""
+        with self._lock:
+            if template_filename is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(self.resolve(template_filename), None)
@@ -0,0 +1,425 @@
+# response_parser.py
+"""
+Incremental extraction of system requirements from streamed AI responses.
+
+The AI answers in markdown with the requirements as JSON, usually in a ```json
+fence, sometimes inline. StreamingResponseParser consumes the response chunk by
+chunk: a push parser builds each JSON block in place as characters arrive, so a
+field such as requires_gpu is available as soon as its value is complete, long
+before the stream ends. Blocks cut off mid-stream or broken by the model keep
+the values that were complete; everything is validated against SystemRequirements,
+dropping (and reporting) only the fields that do not fit.
+"""
+import copy
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+_NUMBER_IN_TEXT = re.compile(r"-?\d+(?:\.\d+)?")
+_NUMBER_CHARS = frozenset("+-0123456789.eE")
+_WHITESPACE = frozenset(" \t\r\n")
+# Python spellings are accepted too; models produce them often enough.
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+# Fence languages whose content is scanned for JSON; other fences (```python ...) are skipped.
+_JSON_FENCES = frozenset({"", "json", "jsonc", "json5", "javascript", "js"})
+
+JsonPath = Tuple[Union[str, int], ...]
+
+
+class MinimumRequirements(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    ram_gb: Optional[float] = Field(default=None, ge=0)
+    cpu_cores: Optional[int] = Field(default=None, ge=0)
+    gpu_vram_gb: Optional[float] = Field(default=None, ge=0)
+    disk_gb: Optional[float] = Field(default=None, ge=0)
+
+    @field_validator("ram_gb", "cpu_cores", "gpu_vram_gb", "disk_gb", mode="before")
+    @classmethod
+    def _number_from_text(cls, value: Any) -> Any:
+        """Accepts values such as "16 GB" or "4 cores"."""
+        if isinstance(value, str):
+            match = _NUMBER_IN_TEXT.search(value)
+            return match.group() if match else value
+        return value
+
+
+class SystemRequirements(BaseModel):
+    """The schema of parsed_system_requirements_json (see analytics_index.RESULT_GENERATED_COLUMNS)."""
+    model_config = ConfigDict(extra="allow")
+
+    minimum: Optional[MinimumRequirements] = None
+    requires_gpu: Optional[bool] = None
+    requires_cuda: Optional[bool] = None
+
+
+# A block holds requirements when its root, or an object directly under it, has one of these keys.
+REQUIREMENT_KEYS = frozenset(SystemRequirements.model_fields)
+
+
+def validate_partial(document: Dict[str, Any]) -> Tuple[SystemRequirements, List[str]]:
+    """
+    Validates what is known so far. Fields that fail validation are dropped and
+    reported instead of rejecting the whole document.
+    """
+    errors: List[str] = []
+    document = copy.deepcopy(document)
+    for _ in range(10):
+        try:
+            return SystemRequirements.model_validate(document), errors
+        except ValidationError as e:
+            for error in e.errors():
+                location = list(error["loc"])
+                errors.append(f"{'.'.join(map(str, location))}: {error['msg']}")
+                _remove(document, location)
+    return SystemRequirements(), errors
+
+
+def _remove(document: Any, location: List[Union[str, int]]) -> None:
+    for part in location[:-1]:
+        try:
+            document = document[part]
+        except (KeyError, IndexError, TypeError):
+            return
+    if isinstance(document, (dict, list)) and location:
+        try:
+            del document[location[-1]]
+        except (KeyError, IndexError, TypeError):
+            pass
+
+
+class JsonBlockParser:
+    """
+    Push parser for one JSON object or array. Values are built in place, so `root`
+    always holds everything complete so far. `on_value(path, value)` is called for each
+    completed scalar. Trailing commas are tolerated; any other syntax error stops the
+    block (`error` says why) and keeps what was parsed.
+    """
+    # What the parser expects next.
+    VALUE, VALUE_OR_END, KEY_OR_END, COLON, COMMA_OR_END = range(5)
+
+    def __init__(self, on_value: Optional[Callable[[JsonPath, Any], None]] = None):
+        self.on_value = on_value
+        self.root: Any = None
+        self.done = False
+        self.error: Optional[str] = None
+        self._containers: List[Union[dict, list]] = []
+        self._path: List[Union[str, int]] = []  # Key or index of each container's pending value
+        self._expect = self.VALUE
+        self._token: Optional[List[str]] = None
+        self._token_kind = ""  # 'string', 'key', 'number' or 'literal'
+        self._escaped = False
+
+    def feed_char(self, char: str) -> bool:
+        """Consumes one character. Returns False when the character ends or breaks the block (not consumed on error)."""
+        if self._token is not None:
+            if self._token_kind in ("string", "key"):
+                self._string_char(char)
+                return True
+            if (self._token_kind == "number" and char in _NUMBER_CHARS) or (self._token_kind == "literal" and char.isalpha()):
+                self._token.append(char)
+                return True
+            if not self._finish_scalar():
+                return False
+        if char in _WHITESPACE:
+            return True
+        return self._structural(char)
+
+    def finish(self) -> None:
+        """End of input: a pending number or literal is taken as complete; open containers stay as they are."""
+        if self._token is not None and self._token_kind in ("number", "literal"):
+            self._finish_scalar()
+        if not self.done and self.error is None:
+            self.error = "truncated"
+
+    def _string_char(self, char: str) -> None:
+        if self._escaped:
+            self._escaped = False
+        elif char == "\\":
+            self._escaped = True
+        elif char == '"':
+            raw = "".join(self._token)
+            self._token = None
+            try:
+                text = json.loads(f'"{raw}"')
+            except ValueError:
+                text = raw  # A bad escape keeps the raw text rather than losing the value.
+            if self._token_kind == "key":
+                self._path[-1] = text
+                self._expect = self.COLON
+            else:
+                self._add_value(text)
+            return
+        self._token.append(char)
+
+    def _finish_scalar(self) -> bool:
+        text = "".join(self._token)
+        self._token = None
+        if self._token_kind == "literal":
+            if text not in _LITERALS:
+                self.error = f"unexpected literal {text!r}"
+                return False
+            self._add_value(_LITERALS[text])
+            return True
+        try:
+            value = float(text) if any(c in text for c in ".eE") else int(text)
+        except ValueError:
+            self.error = f"bad number {text!r}"
+            return False
+        self._add_value(value)
+        return True
+
+    def _structural(self, char: str) -> bool:
+        expect = self._expect
+        if expect in (self.VALUE, self.VALUE_OR_END):
+            if char == "]" and expect == self.VALUE_OR_END:
+                return self._close(list)
+            if char in "{[":
+                container: Union[dict, list] = {} if char == "{" else []
+                self._add_value(container, scalar=False)
+                self._containers.append(container)
+                self._path.append(None if char == "{" else 0)
+                self._expect = self.KEY_OR_END if char == "{" else self.VALUE_OR_END
+                return True
+            if char == '"':
+                self._token, self._token_kind = [], "string"
+                return True
+            if char in _NUMBER_CHARS:
+                self._token, self._token_kind = [char], "number"
+                return True
+            if char.isalpha():
+                self._token, self._token_kind = [char], "literal"
+                return True
+        elif expect == self.KEY_OR_END:
+            if char == '"':
+                self._token, self._token_kind = [], "key"
+                return True
+            if char == "}":
+                return self._close(dict)
+        elif expect == self.COLON:
+            if char == ":":
+                self._expect = self.VALUE
+                return True
+        elif expect == self.COMMA_OR_END:
+            container = self._containers[-1]
+            if char == ",":
+                self._expect = self.KEY_OR_END if isinstance(container, dict) else self.VALUE_OR_END
+                return True
+            if char in "}]":
+                return self._close(dict if char == "}" else list)
+        self.error = f"unexpected {char!r}"
+        return False
+
+    def _add_value(self, value: Any, scalar: bool = True) -> None:
+        if not self._containers:  # The block's own object or array
+            self.root = value
+            return
+        container, key = self._containers[-1], self._path[-1]
+        if isinstance(container, dict):
+            container[key] = value
+        else:
+            container.append(value)
+            key = self._path[-1] = len(container) - 1
+        self._expect = self.COMMA_OR_END
+        if scalar and self.on_value is not None:
+            self.on_value(tuple(self._path[:-1]) + (key,), value)
+
+    def _close(self, kind: type) -> bool:
+        if not isinstance(self._containers[-1], kind):
+            self.error = "mismatched bracket"
+            return False
+        self._containers.pop()
+        self._path.pop()
+        if self._containers:
+            self._expect = self.COMMA_OR_END
+        else:
+            self.done = True
+        return True
+
+
+@dataclass
+class FieldUpdate:
+    """A requirements field that became available, e.g. ("minimum", "ram_gb") = 16.0."""
+    path: Tuple[str, ...]
+    value: Any
+
+
+@dataclass
+class ParsedResponse:
+    text: str
+    requirements: Optional[SystemRequirements] = None
+    dependencies: Optional[List[Any]] = None
+    complete: bool = False               # The requirements block was closed properly
+    errors: List[str] = field(default_factory=list)
+
+    def requirements_json(self) -> Optional[str]:
+        """For ai_analysis_results.parsed_system_requirements_json."""
+        if self.requirements is None:
+            return None
+        return json.dumps(self.requirements.model_dump(exclude_none=True, exclude={"dependencies"}))
+
+    def dependencies_json(self) -> Optional[str]:
+        """For ai_analysis_results.parsed_dependencies_json."""
+        return json.dumps(self.dependencies) if self.dependencies is not None else None
+
+
+class StreamingResponseParser:
+    """
+    Feed it response chunks as they arrive:
+
+        parser = StreamingResponseParser()
+        for chunk in ai_service.generate_text_stream(prompt):
+            for update in parser.feed(chunk):
+                ...  # e.g. update.path == ("requires_gpu",)
+        parsed = parser.close()
+
+    `requirements` validates what has been parsed so far at any point.
+    """
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._blocks: List[JsonBlockParser] = []
+        self._block: Optional[JsonBlockParser] = None
+        self._backticks = 0
+        self._fence: Optional[str] = None     # Language of the open fence, or None outside fences
+        self._fence_info: Optional[List[str]] = None  # Info string being read after an opening fence
+        self._dirty = False
+        self._known: Dict[Tuple[str, ...], Any] = {}
+        self._requirements: Optional[SystemRequirements] = None
+        self._errors: List[str] = []
+
+    def feed(self, chunk: str) -> List[FieldUpdate]:
+        """Consumes a chunk and returns the requirements fields that became available in it."""
+        self._chunks.append(chunk)
+        for char in chunk:
+            self._char(char)
+        return self._updates()
+
+    def close(self) -> ParsedResponse:
+        if self._block is not None:
+            self._block.finish()
+            self._block = None
+            self._dirty = True
+        self._updates()
+        source = self._requirements_block()
+        return ParsedResponse(
+            text="".join(self._chunks),
+            requirements=self._requirements,
+            dependencies=self._dependencies(),
+            complete=source is not None and source.done,
+            errors=([f"requirements block: {source.error}"] if source is not None and source.error else [])
+            + self._errors,
+        )
+
+    @property
+    def requirements(self) -> Optional[SystemRequirements]:
+        self._updates()
+        return self._requirements
+
+    # --- Scanning the markdown ---
+
+    def _char(self, char: str) -> None:
+        if self._block is not None:
+            if self._block.feed_char(char) and not self._block.done:
+                return
+            if self._block.done:
+                self._block = None
+                return
+            self._block = None  # Broken block: the character is scanned again as markdown below.
+        if char == "`":
+            self._backticks += 1
+            if self._backticks == 3:
+                self._backticks = 0
+                if self._fence is None:
+                    self._fence_info = []
+                else:
+                    self._fence = None
+            return
+        self._backticks = 0
+        if self._fence_info is not None:
+            if char == "\n":
+                self._fence = "".join(self._fence_info).strip().lower()
+                self._fence_info = None
+            else:
+                self._fence_info.append(char)
+            return
+        in_json_fence = self._fence is not None and self._fence in _JSON_FENCES
+        if char == "{" or (char == "[" and in_json_fence):
+            if self._fence is not None and not in_json_fence:
+                return
+            self._block = JsonBlockParser(self._on_value)
+            self._blocks.append(self._block)
+            self._block.feed_char(char)
+
+    def _on_value(self, path: JsonPath, value: Any) -> None:
+        self._dirty = True
+
+    # --- Requirements so far ---
+
+    def _requirements_document(self, block: JsonBlockParser) -> Optional[Dict[str, Any]]:
+        root = block.root
+        if not isinstance(root, dict):
+            return None
+        if REQUIREMENT_KEYS & root.keys():
+            return root
+        for value in root.values():  # e.g. {"system_requirements": {...}}
+            if isinstance(value, dict) and REQUIREMENT_KEYS & value.keys():
+                return value
+        return None
+
+    def _requirements_block(self) -> Optional[JsonBlockParser]:
+        for block in self._blocks:
+            if self._requirements_document(block) is not None:
+                return block
+        return None
+
+    def _dependencies(self) -> Optional[List[Any]]:
+        for block in self._blocks:
+            root = block.root
+            if isinstance(root, dict):
+                dependencies = root.get("dependencies")
+                if dependencies is None:
+                    nested = [value.get("dependencies") for value in root.values() if isinstance(value, dict)]
+                    dependencies = next((value for value in nested if value is not None), None)
+                if isinstance(dependencies, list):
+                    return dependencies
+        return None
+
+    def _updates(self) -> List[FieldUpdate]:
+        if not self._dirty:
+            return []
+        self._dirty = False
+        block = self._requirements_block()
+        if block is None:
+            return []
+        self._requirements, self._errors = validate_partial(self._requirements_document(block))
+        updates = []
+        for path, value in _flatten(self._requirements.model_dump(exclude_none=True)):
+            if self._known.get(path, _MISSING) != value:
+                self._known[path] = value
+                updates.append(FieldUpdate(path, value))
+        return updates
+
+
+_MISSING = object()
+
+
+def _flatten(document: Dict[str, Any], prefix: Tuple[str, ...] = ()) -> Iterable[Tuple[Tuple[str, ...], Any]]:
+    for key, value in document.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, prefix + (key,))
+        else:
+            yield prefix + (key,), value
+
+
+def parse_response(text: str) -> ParsedResponse:
+    """Parses a complete response (the non-streaming case)."""
+    parser = StreamingResponseParser()
+    parser.feed(text)
+    parsed = parser.close()
+    if parsed.errors:
+        logger.debug(f"Parsed AI response with recoverable errors: {parsed.errors}")
+    return parsed
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 class IAIService(ABC):
     """
@@ -22,6 +22,20 @@ class IAIService(ABC):
         """
         raise NotImplementedError
 
+    def generate_text_stream(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Generates text like generate_text, yielding it in chunks as they arrive.
+        The default yields the whole response at once; services that can stream override it.
+
+        Args:
+            prompt: The input text prompt for the AI model.
+            options: A dictionary of additional options for generation.
+
+        Returns:
+            An iterator over the chunks of the generated text.
+        """
+        yield self.generate_text(prompt, options)
+
     @abstractmethod
     def analyze_image(self, image_data: bytes, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
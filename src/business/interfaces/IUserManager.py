@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Iterable, Optional, List
 
 # For type hinting, you might define a UserDTO or User model elsewhere,
 # for now, we'll use Dict[str, Any] as a placeholder for user data.
@@ -51,4 +51,36 @@ class IUserManager(ABC):
         """
         raise NotImplementedError
 
-    # You can add more methods like update_user, delete_user, authenticate_user, etc.
\ No newline at end of file
+    def get_users_by_ids(self, user_ids: Iterable[Any]) -> Dict[Any, UserDataType]:
+        """
+        Retrieves several users at once.
+
+        Args:
+            user_ids: The unique IDs of the users.
+
+        Returns:
+            A dictionary of the users found, keyed by ID. IDs with no user are left out.
+        """
+        # Default implementation: one lookup per ID. Implementations should override with a single query.
+        users = {}
+        for user_id in user_ids:
+            user = self.get_user_by_id(user_id)
+            if user is not None:
+                users[user_id] = user
+        return users
+
+    @abstractmethod
+    def authenticate_user(self, email: str, password: str) -> Optional[UserDataType]:
+        """
+        Checks a user's password.
+
+        Args:
+            email: The email address of the user.
+            password: The password to check.
+
+        Returns:
+            A dictionary representing the user if the password matches, otherwise None.
+        """
+        raise NotImplementedError
+
+    # You can add more methods like update_user, delete_user, etc.
\ No newline at end of file
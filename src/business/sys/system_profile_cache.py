@@ -0,0 +1,290 @@
+# system_profile_cache.py
+
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import platform
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+try:
+    import psutil
+except ImportError:  # psutil is optional; stdlib fallbacks cover the common fields.
+    psutil = None
+
+_BYTES_PER_GB = 1024 ** 3
+BOOT_ID_FILE = Path("/proc/sys/kernel/random/boot_id")
+
+
+def _round_gb(num_bytes: Optional[float]) -> Optional[float]:
+    return None if num_bytes is None else round(num_bytes / _BYTES_PER_GB, 2)
+
+
+def current_boot_id() -> Optional[str]:
+    """Returns an identifier that changes on every reboot, or None if it cannot be determined."""
+    try:
+        return BOOT_ID_FILE.read_text(encoding="utf-8").strip()
+    except OSError:
+        pass
+    if psutil is not None:
+        return f"boot-{int(psutil.boot_time())}"
+    return None
+
+
+def _probe_gpus() -> Dict[str, Any]:
+    """Queries nvidia-smi for GPU models and VRAM. This is the slow probe (tens to hundreds of ms)."""
+    gpu_info: Dict[str, Any] = {"nvidia_driver_version": None, "gpus": []}
+    if shutil.which("nvidia-smi") is None:
+        return gpu_info
+    try:
+        output = subprocess.run(
+            ["nvidia-smi", "--query-gpu=index,name,memory.total,driver_version,compute_cap",
+             "--format=csv,noheader,nounits"],
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout
+    except (subprocess.SubprocessError, OSError) as e:
+        logger.warning(f"GPU probe failed: {e}")
+        return gpu_info
+    for line in output.strip().splitlines():
+        index, name, total_mib, driver, compute_cap = [field.strip() for field in line.split(",")]
+        gpu_info["nvidia_driver_version"] = driver
+        gpu_info["gpus"].append({
+            "id": int(index),
+            "name": name,
+            "total_vram_gb": round(float(total_mib) / 1024, 2),
+            "compute_capability": compute_cap,
+        })
+    return gpu_info
+
+
+def _sample_gpu_memory() -> List[Dict[str, Any]]:
+    """Queries nvidia-smi for free/used VRAM per GPU. Empty when there is no NVIDIA driver."""
+    if shutil.which("nvidia-smi") is None:
+        return []
+    try:
+        output = subprocess.run(
+            ["nvidia-smi", "--query-gpu=index,memory.free,memory.used", "--format=csv,noheader,nounits"],
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout
+    except (subprocess.SubprocessError, OSError) as e:
+        logger.warning(f"GPU memory sample failed: {e}")
+        return []
+    gpus = []
+    for line in output.strip().splitlines():
+        index, free_mib, used_mib = [field.strip() for field in line.split(",")]
+        gpus.append({"id": int(index), "free_vram_gb": round(float(free_mib) / 1024, 2),
+                     "used_vram_gb": round(float(used_mib) / 1024, 2)})
+    return gpus
+
+
+def probe_static_facts(disk_path: Path) -> Dict[str, Any]:
+    """Collects facts that cannot change without a reboot: OS, CPU model, core counts, total RAM, GPU models."""
+    uname = platform.uname()
+    total_ram = None
+    if psutil is not None:
+        total_ram = psutil.virtual_memory().total
+    elif hasattr(os, "sysconf") and "SC_PHYS_PAGES" in os.sysconf_names:
+        total_ram = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+    max_frequency = None
+    if psutil is not None:
+        frequency = psutil.cpu_freq()
+        max_frequency = frequency.max if frequency else None
+
+    return {
+        "os": {
+            "system": uname.system,
+            "release": uname.release,
+            "version": uname.version,
+            "machine": uname.machine,
+            "processor": uname.processor or uname.machine,
+            "hostname": socket.gethostname(),
+        },
+        "cpu": {
+            "model": platform.processor() or uname.machine,
+            "physical_cores": psutil.cpu_count(logical=False) if psutil is not None else None,
+            "logical_cores": os.cpu_count(),
+            "max_frequency_mhz": max_frequency,
+        },
+        "ram": {"total_gb": _round_gb(total_ram)},
+        "disk": {"path_checked": str(disk_path), "total_gb": _round_gb(shutil.disk_usage(disk_path).total)},
+        "gpu_info": _probe_gpus(),
+        "python": {
+            "version": sys.version,
+            "executable": sys.executable,
+            "conda_env": os.getenv("CONDA_DEFAULT_ENV"),
+            "conda_prefix": os.getenv("CONDA_PREFIX"),
+        },
+    }
+
+
+def sample_dynamic_facts(disk_path: Path) -> Dict[str, Any]:
+    """Samples fast-changing facts: CPU usage and frequency, free memory, disk and VRAM."""
+    cpu: Dict[str, Any] = {"current_frequency_mhz": None, "usage_percent": None}
+    ram: Dict[str, Any] = {"available_gb": None, "used_gb": None, "percentage_used": None}
+    if psutil is not None:
+        frequency = psutil.cpu_freq()
+        cpu["current_frequency_mhz"] = frequency.current if frequency else None
+        cpu["usage_percent"] = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        ram.update(available_gb=_round_gb(memory.available), used_gb=_round_gb(memory.used),
+                   percentage_used=memory.percent)
+    else:
+        if hasattr(os, "getloadavg"):
+            cpu["usage_percent"] = round(100.0 * os.getloadavg()[0] / (os.cpu_count() or 1), 1)
+        if hasattr(os, "sysconf") and "SC_AVPHYS_PAGES" in os.sysconf_names:
+            page_size = os.sysconf("SC_PAGE_SIZE")
+            total = page_size * os.sysconf("SC_PHYS_PAGES")
+            available = page_size * os.sysconf("SC_AVPHYS_PAGES")
+            ram.update(available_gb=_round_gb(available), used_gb=_round_gb(total - available),
+                       percentage_used=round(100.0 * (total - available) / total, 1))
+
+    disk = shutil.disk_usage(disk_path)
+    return {
+        "cpu": cpu,
+        "ram": ram,
+        "disk": {"used_gb": _round_gb(disk.used), "free_gb": _round_gb(disk.free),
+                 "percentage_used": round(100.0 * disk.used / disk.total, 1) if disk.total else None},
+        "gpu_info": {"gpus": _sample_gpu_memory()},
+    }
+
+
+def _merge(static: Dict[str, Any], dynamic: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merges the two halves into the hardware_specs.json layout without mutating either.
+    Lists of dicts with an "id" (gpu_info.gpus) are merged entry by entry.
+    """
+    merged = {section: dict(values) if isinstance(values, dict) else values for section, values in static.items()}
+    for section, values in dynamic.items():
+        target = merged.setdefault(section, {})
+        for key, value in values.items():
+            current = target.get(key)
+            if isinstance(current, list) and isinstance(value, list):
+                samples = {item.get("id"): item for item in value if isinstance(item, dict)}
+                target[key] = [dict(item, **samples.get(item.get("id"), {})) if isinstance(item, dict) else item
+                               for item in current]
+            else:
+                target[key] = value
+    return merged
+
+
+def _copy_profile(value: Any) -> Any:
+    """Copies the nested dict/list structure of a profile; leaf values are immutable."""
+    if isinstance(value, dict):
+        return {key: _copy_profile(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_profile(item) for item in value]
+    return value
+
+
+class SystemProfileCache:
+    """
+    Caches the system profile split into static and dynamic halves.
+
+    Static facts are probed once per boot and persisted to `cache_file` (keyed by
+    boot id) so new processes skip the slow probes. Dynamic facts are re-sampled
+    only when older than the requested maximum age.
+    """
+    def __init__(
+        self,
+        cache_file: Optional[Path] = None,
+        dynamic_ttl: float = 5.0,
+        disk_path: Optional[Path] = None,
+        static_probe: Callable[[Path], Dict[str, Any]] = probe_static_facts,
+        dynamic_probe: Callable[[Path], Dict[str, Any]] = sample_dynamic_facts,
+    ):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.dynamic_ttl = dynamic_ttl
+        self.disk_path = Path(disk_path) if disk_path else Path.cwd()
+        self._static_probe = static_probe
+        self._dynamic_probe = dynamic_probe
+        self._lock = threading.Lock()
+        self._static: Optional[Dict[str, Any]] = None
+        self._dynamic: Optional[Dict[str, Any]] = None
+        self._dynamic_sampled_at = 0.0
+        self._profile: Optional[Dict[str, Any]] = None
+        if psutil is not None:
+            # The first cpu_percent(interval=None) call only sets a baseline and returns 0.0.
+            psutil.cpu_percent(interval=None)
+
+    def _load_persisted_static(self, boot_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if self.cache_file is None or boot_id is None or not self.cache_file.is_file():
+            return None
+        try:
+            persisted = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable static profile cache {self.cache_file}: {e}")
+            return None
+        if persisted.get("boot_id") != boot_id:
+            return None
+        return persisted.get("static")
+
+    def _persist_static(self, boot_id: Optional[str], static: Dict[str, Any]) -> None:
+        if self.cache_file is None or boot_id is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps({"boot_id": boot_id, "static": static}, indent=4), encoding="utf-8")
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Could not persist static profile cache to {self.cache_file}: {e}")
+
+    def _get_static(self, refresh: bool) -> Dict[str, Any]:
+        """Returns static facts, probing only when nothing is cached for this boot. Caller holds the lock."""
+        if self._static is not None and not refresh:
+            return self._static
+        boot_id = current_boot_id()
+        static = None if refresh else self._load_persisted_static(boot_id)
+        if static is None:
+            started = time.perf_counter()
+            static = self._static_probe(self.disk_path)
+            logger.info(f"Probed static system facts in {time.perf_counter() - started:.3f}s.")
+            self._persist_static(boot_id, static)
+        self._static = static
+        self._profile = None
+        return static
+
+    def get_profile(self, max_age: Optional[float] = None, include_dynamic: bool = True,
+                    refresh_static: bool = False) -> Dict[str, Any]:
+        """
+        Returns the system profile in the hardware_specs.json layout.
+
+        Args:
+            max_age: Maximum acceptable age in seconds of the dynamic facts.
+                     None uses the cache's TTL; 0 forces a fresh sample.
+            include_dynamic: If False, returns only the static facts.
+            refresh_static: If True, re-runs the slow static probes.
+
+        Returns:
+            A new dict the caller may modify freely.
+        """
+        with self._lock:
+            static = self._get_static(refresh_static)
+            if not include_dynamic:
+                return _merge(static, {})
+
+            ttl = self.dynamic_ttl if max_age is None else max_age
+            now = time.monotonic()
+            if self._dynamic is None or now - self._dynamic_sampled_at > ttl or ttl <= 0:
+                self._dynamic = self._dynamic_probe(self.disk_path)
+                self._dynamic_sampled_at = now
+                self._profile = None
+            if self._profile is None:
+                self._profile = _merge(static, self._dynamic)
+            profile = self._profile
+        return _copy_profile(profile)
+
+    def invalidate(self) -> None:
+        """Forgets everything held in memory; the persisted static facts are re-validated on next use."""
+        with self._lock:
+            self._static = None
+            self._dynamic = None
+            self._profile = None
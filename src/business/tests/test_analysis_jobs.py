@@ -0,0 +1,110 @@
+import sys
+import json
+import time
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.ai.analysis_jobs import (
+    ANALYSIS_JOB, EXECUTOR_PROCESS, AnalysisJobHandler, JobKind, JobWorkerPool, enqueue_analysis,
+)
+from src.business.interfaces.IAIService import IAIService
+from src.data.implementations.job_queue import JOB_FAILED, JOB_SUCCEEDED, SQLiteJobQueue
+
+
+class FakeAIService(IAIService):
+    def generate_text(self, prompt, options=None):
+        return f"requirements for: {prompt}"
+
+    def generate_text_stream(self, prompt, options=None):
+        yield f"requirements for: {prompt}\n```json\n"
+        yield '{"requires_gpu": true, "minimum": {"ram_gb": 16}}'
+        yield "\n```"
+
+    def analyze_image(self, image_data, options=None):
+        return {}
+
+
+class FakeDataCollectService:
+    def prepare_analysis_data_and_prompt(self, repo_path, template_filename):
+        if repo_path == "/missing":
+            return None
+        return {"prompt_str": f"Analyze {repo_path} with {template_filename}", "timings": {"total": 0.01},
+                "system_info": {"os": {"system": "Linux"}, "ram": {"total_gb": 32}}}
+
+
+def square(payload):
+    return payload["n"] ** 2
+
+
+def _handler_kinds():
+    handler = AnalysisJobHandler(FakeAIService(), FakeDataCollectService())
+    return [JobKind(ANALYSIS_JOB, handler, on_complete=handler.store_results)]
+
+
+def _session_status(queue, session_id):
+    return queue.pool.connection().execute(
+        "SELECT status FROM analysis_sessions WHERE session_id = ?", (session_id,)
+    ).fetchone()[0]
+
+
+def test_analysis_job_stores_prompt_and_response_and_completes_the_session(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "prp.db")
+    try:
+        job = enqueue_analysis(queue, "/repos/a", "template.md")
+        assert _session_status(queue, job.session_id) == "queued"
+
+        JobWorkerPool(queue, _handler_kinds()).run_once()
+
+        done = queue.get(job.job_id)
+        assert done.state == JOB_SUCCEEDED
+        assert _session_status(queue, job.session_id) == "completed_successfully"
+        row = queue.pool.connection().execute(
+            "SELECT p.session_id, p.prompt_content, r.ai_response_raw, r.parsed_system_requirements_json "
+            "FROM generated_prompts p JOIN ai_analysis_results r ON r.prompt_id = p.prompt_id WHERE r.result_id = ?",
+            (done.result["result_id"],),
+        ).fetchone()
+        assert tuple(row[:2]) == (job.session_id, "Analyze /repos/a with template.md")
+        assert row[2].startswith("requirements for: Analyze /repos/a with template.md\n```json")
+        assert json.loads(row[3]) == {"minimum": {"ram_gb": 16.0}, "requires_gpu": True}
+        facts = queue.pool.connection().execute(
+            "SELECT os_system, ram_total_gb FROM system_profile_facts WHERE session_id = ?", (job.session_id,)
+        ).fetchone()
+        assert tuple(facts) == ("Linux", 32.0)
+    finally:
+        queue.close()
+
+
+def test_failed_data_collection_is_not_retried(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "prp.db", max_attempts=3)
+    try:
+        job = enqueue_analysis(queue, "/missing")
+        JobWorkerPool(queue, _handler_kinds()).run_once()
+        failed = queue.get(job.job_id)
+        assert (failed.state, failed.attempts) == (JOB_FAILED, 1)
+        assert _session_status(queue, job.session_id) == "failed_data_collection"
+    finally:
+        queue.close()
+
+
+def test_worker_pool_runs_thread_and_process_jobs(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "prp.db")
+    kinds = _handler_kinds() + [JobKind("square", square, EXECUTOR_PROCESS)]
+    workers = JobWorkerPool(queue, kinds, thread_workers=2, process_workers=1, poll_interval=0.05)
+    try:
+        analyses = [enqueue_analysis(queue, f"/repos/{n}").job_id for n in range(4)]
+        squares = [queue.enqueue("square", {"n": n}) for n in range(3)]
+        workers.start()
+        deadline = time.time() + 30
+        while queue.counts().get(JOB_SUCCEEDED, 0) < 7 and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        workers.stop()
+    try:
+        assert all(queue.get(job_id).state == JOB_SUCCEEDED for job_id in analyses)
+        assert [queue.get(job_id).result for job_id in squares] == [0, 1, 4]
+    finally:
+        queue.close()
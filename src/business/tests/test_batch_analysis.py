@@ -0,0 +1,88 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.ai.batch_analysis import BatchAnalysisPipeline, load_manifest
+from src.business.sys.system_profile_cache import SystemProfileCache
+from src.data.implementations import blob_store
+
+
+def _setup(tmp_path: Path, repo_count: int):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "prompt.md").write_text("README: {{readme_content}} on {{system_info.cpu.logical_cores}} cores",
+                                         encoding="utf-8")
+    repos = []
+    for i in range(repo_count):
+        repo = tmp_path / f"repo_{i}"
+        repo.mkdir()
+        (repo / "README.md").write_text(f"repo {i}", encoding="utf-8")
+        repos.append(str(repo))
+    profile_cache = SystemProfileCache(static_probe=lambda path: {"cpu": {"logical_cores": 4}},
+                                       dynamic_probe=lambda path: {})
+    pipeline = BatchAnalysisPipeline("prompt.md", db_path=tmp_path / "prp.db", template_dir=templates,
+                                     workers=2, chunk_size=2, profile_cache=profile_cache)
+    return pipeline, repos
+
+
+def test_manifest_formats(tmp_path):
+    (tmp_path / "list.json").write_text('["a", "b"]', encoding="utf-8")
+    (tmp_path / "lines.txt").write_text("# comment\na\n\nb\n", encoding="utf-8")
+    (tmp_path / "items.jsonl").write_text('{"repo_path": "a"}\n"b"\n', encoding="utf-8")
+    for name in ("list.json", "lines.txt", "items.jsonl"):
+        assert load_manifest(tmp_path / name) == ["a", "b"]
+
+
+def test_batch_writes_sessions_snapshots_and_prompts(tmp_path):
+    pipeline, repos = _setup(tmp_path, repo_count=5)
+    reports = []
+    progress = pipeline.run(repos + [str(tmp_path / "missing")], batch_id="nightly",
+                            on_progress=lambda p: reports.append(p.processed))
+
+    assert (progress.completed, progress.failed, progress.skipped) == (5, 1, 0)
+    assert reports == [2, 4, 6]
+
+    conn = sqlite3.connect(tmp_path / "prp.db")
+    statuses = dict(conn.execute("SELECT status, COUNT(*) FROM analysis_sessions GROUP BY status").fetchall())
+    assert statuses == {"prompt_generated": 5, "failed_data_collection": 1}
+    prompts = [row[0] for row in conn.execute("SELECT prompt_content FROM generated_prompts ORDER BY prompt_id")]
+    assert "README: repo 0 on 4 cores" in prompts
+    snapshot = blob_store.read_snapshot(conn, conn.execute("SELECT MIN(snapshot_id) FROM repository_snapshots").fetchone()[0])
+    assert "README.md" in snapshot["files"]
+    assert blob_store.read_profile(conn, 1) == {"cpu": {"logical_cores": 4}}
+    assert conn.execute("SELECT COUNT(*) FROM system_profiles").fetchone()[0] == 5
+    conn.close()
+
+
+def test_rerun_skips_completed_repositories(tmp_path):
+    pipeline, repos = _setup(tmp_path, repo_count=3)
+    pipeline.run(repos[:2], batch_id="resume-me")
+    progress = pipeline.run(repos, batch_id="resume-me")
+    assert (progress.completed, progress.skipped) == (1, 2)
+
+
+def test_rerun_retries_failures_in_place(tmp_path):
+    """A repository that failed is retried on resume and its failure row is reused, not duplicated."""
+    pipeline, repos = _setup(tmp_path, repo_count=2)
+    late = tmp_path / "late_repo"
+    for _ in range(2):
+        assert pipeline.run(repos + [str(late)], batch_id="flaky").failed == 1
+
+    late.mkdir()
+    (late / "README.md").write_text("late", encoding="utf-8")
+    for _ in range(2):
+        progress = pipeline.run(repos + [str(late)], batch_id="flaky")
+    assert (progress.completed, progress.failed, progress.skipped) == (0, 0, 3)
+
+    conn = sqlite3.connect(tmp_path / "prp.db")
+    rows = conn.execute("SELECT status FROM analysis_sessions WHERE target_repository_identifier = ?",
+                        (str(late),)).fetchall()
+    assert rows == [("prompt_generated",)]
+    indexed = conn.execute("SELECT COUNT(*) FROM repository_file_index").fetchone()[0]
+    assert indexed == 3  # Written by the parent from the workers' results.
+    conn.close()
@@ -0,0 +1,87 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.ai import data_collect_service
+from src.business.ai.data_collect_service import DataCollectService
+from src.business.ai.incremental_repo_collector import IncrementalRepositoryCollector
+from src.business.ai.prompt_renderer import CompiledTemplate
+from src.data.implementations.repository_file_index import RepositoryFileIndex
+
+
+def _service(monkeypatch, system=None, repo=None, template=None, delay=0.2, **kwargs):
+    """Builds a DataCollectService whose three collection steps each sleep for `delay` seconds."""
+    service = DataCollectService(**kwargs)
+
+    def slow(value):
+        def step(*args, **kwargs):
+            time.sleep(delay)
+            return value
+        return step
+
+    monkeypatch.setattr(service, "_collect_system_info", slow(system))
+    monkeypatch.setattr(service, "_collect_repository_info", slow(repo))
+    monkeypatch.setattr(service, "_load_prompt_template", slow(template))
+    return service
+
+
+def test_collection_steps_run_concurrently(monkeypatch):
+    """End-to-end latency approaches the slowest step rather than the sum of all three."""
+    service = _service(monkeypatch, system={"cpu": {"logical_cores": 8}}, repo={"readme_content": "hi"},
+                       template=CompiledTemplate("{{readme_content}} {{system_info.cpu.logical_cores}}"))
+    result = service.prepare_analysis_data_and_prompt("repo", "template.md")
+    assert result["prompt_str"] == "hi 8"
+    assert set(result["timings"]) == {"system_info", "repo_info", "template", "render", "total"}
+    assert result["timings"]["total"] < 0.5
+
+
+def test_missing_system_info_is_tolerated(monkeypatch):
+    service = _service(monkeypatch, system=None, repo={"readme_content": "hi"},
+                       template=CompiledTemplate("{{readme_content}}"))
+    result = service.prepare_analysis_data_and_prompt("repo", "template.md")
+    assert result["system_info"] is None
+    assert result["prompt_str"] == "hi"
+
+
+def test_system_info_timeout_is_tolerated(monkeypatch):
+    service = _service(monkeypatch, system={"cpu": {}}, repo={"readme_content": "hi"},
+                       template=CompiledTemplate("{{readme_content}}"), delay=0.3,
+                       step_timeouts={"system_info": 0.05})
+    result = service.prepare_analysis_data_and_prompt("repo", "template.md")
+    assert result is not None
+    assert result["system_info"] is None
+
+
+@pytest.mark.parametrize("missing", ["repo", "template"])
+def test_missing_repo_or_template_aborts(monkeypatch, missing):
+    values = {"system": {}, "repo": {"readme_content": "hi"}, "template": CompiledTemplate("{{readme_content}}")}
+    values[missing] = None
+    service = _service(monkeypatch, **values)
+    assert service.prepare_analysis_data_and_prompt("repo", "template.md") is None
+
+
+def test_repository_info_comes_from_the_collector(tmp_path):
+    """Repository files are read through the incremental collector; an invalid path becomes None."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "README.md").write_text("# Demo", encoding="utf-8")
+    service = DataCollectService(repo_collector=IncrementalRepositoryCollector(RepositoryFileIndex(tmp_path / "prp.db")))
+    repo_data = service._collect_repository_info(str(repo))
+    assert repo_data["readme_content"] == "# Demo"
+    assert repo_data["repository_snapshot"]["added"] == ["README.md"]
+    assert service._collect_repository_info(str(tmp_path / "missing")) is None
+
+
+def test_default_collector_is_created_on_first_use(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_collect_service, "RepositoryFileIndex", lambda: RepositoryFileIndex(tmp_path / "prp.db"))
+    service = DataCollectService()
+    assert service.repo_collector is None
+    assert service._collect_repository_info(str(tmp_path / "missing")) is None
+    assert isinstance(service.repo_collector, IncrementalRepositoryCollector)
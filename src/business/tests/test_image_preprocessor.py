@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+cv2 = pytest.importorskip("cv2")
+import numpy as np
+
+from src.business.ai.image_preprocessor import ImagePreprocessor
+
+
+def _encode_png(image: np.ndarray) -> bytes:
+    ok, encoded = cv2.imencode(".png", image)
+    assert ok
+    return encoded.tobytes()
+
+
+def _gradient_image(width: int, height: int) -> np.ndarray:
+    x = np.linspace(0, 255, width, dtype=np.uint8)
+    y = np.linspace(0, 255, height, dtype=np.uint8)
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[..., 0] = x[None, :]
+    image[..., 1] = y[:, None]
+    cv2.circle(image, (width // 3, height // 2), min(width, height) // 5, (255, 255, 255), -1)
+    return image
+
+
+def test_large_images_are_downscaled_and_shrunk():
+    """Images above max_dimension are resized to fit and re-encoded as a smaller JPEG."""
+    raw = _encode_png(_gradient_image(4000, 2000))
+    prepared = ImagePreprocessor(max_dimension=1000).prepare(raw)
+    assert (prepared.width, prepared.height) == (1000, 500)
+    assert prepared.mime_type == "image/jpeg"
+    assert prepared.payload_size_bytes < len(raw)
+
+
+def test_perceptual_hash_survives_rescaling():
+    """The same picture at different sizes hashes to (nearly) the same pHash."""
+    preprocessor = ImagePreprocessor(max_dimension=4096)
+    big = preprocessor.prepare(_encode_png(_gradient_image(1600, 800)))
+    small = preprocessor.prepare(_encode_png(_gradient_image(400, 200)))
+    assert ImagePreprocessor.hamming_distance(big.phash, small.phash) <= 4
+
+
+def test_undecodable_bytes_raise_value_error():
+    with pytest.raises(ValueError):
+        ImagePreprocessor().prepare(b"definitely not an image")
+
+
+def _fake_generator(submitted, fail_on=None):
+    gemini_api = pytest.importorskip("src.business.ai.gemini_api")
+
+    class FakeModel:
+        def generate_content(self, parts):
+            if parts[1]["data"] == fail_on:
+                raise RuntimeError("upstream rejected the image")
+            submitted.append(parts[1]["data"])
+            return SimpleNamespace(text=f"description {len(submitted)}")
+
+    generator = gemini_api.AIGenerator.__new__(gemini_api.AIGenerator)
+    generator.model = FakeModel()
+    generator.image_preprocessor = ImagePreprocessor(max_dimension=512)
+    generator.image_cache = gemini_api.ImageResultCache()
+    return generator
+
+
+def test_analyze_images_deduplicates_and_caches():
+    """Duplicate images are submitted once and repeat calls are served from cache."""
+    submitted = []
+    generator = _fake_generator(submitted)
+
+    image = _encode_png(_gradient_image(2048, 1024))
+    results = generator.analyze_images([image, image])
+    assert len(submitted) == 1
+    assert results[0]["description"] == results[1]["description"]
+    assert results[0]["payload_size_bytes"] < results[0]["original_size_bytes"]
+
+    again = generator.analyze_image(image)
+    assert again["cached"] is True
+    assert len(submitted) == 1
+
+
+def test_perceptually_similar_images_are_not_shared_unless_asked():
+    """Images with the same pHash but different bytes get their own analysis by default."""
+    submitted = []
+    generator = _fake_generator(submitted)
+    image = _gradient_image(800, 400)
+    marked = image.copy()
+    marked[10, 10] = (0, 0, 255)  # Different bytes, same picture to the pHash.
+    first, second = _encode_png(image), _encode_png(marked)
+    assert generator.image_preprocessor.prepare(first).phash == generator.image_preprocessor.prepare(second).phash
+
+    results = generator.analyze_images([first, second])
+    assert len(submitted) == 2 and results[0]["description"] != results[1]["description"]
+
+    submitted.clear()
+    generator.image_cache = type(generator.image_cache)()
+    results = generator.analyze_images([first, second], dedupe_similar=True)
+    assert len(submitted) == 1
+    assert results[1]["description"] == results[0]["description"]
+    assert results[1]["similar_to"] == results[0]["digest"] != results[1]["digest"]
+
+
+def test_one_bad_image_does_not_fail_the_batch():
+    """Undecodable input and failed submissions are reported per image."""
+    submitted = []
+    good = _encode_png(_gradient_image(300, 200))
+    rejected = _encode_png(_gradient_image(200, 300))
+    generator = _fake_generator(submitted, fail_on=ImagePreprocessor(max_dimension=512).prepare(rejected).data)
+    results = generator.analyze_images([b"not an image", good, rejected])
+    assert "error" in results[0] and "error" in results[2]
+    assert results[1]["description"] == "description 1"
+    assert len(generator.image_cache) == 1  # Failures are not cached.
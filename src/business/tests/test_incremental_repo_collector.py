@@ -0,0 +1,120 @@
+import os
+import json
+import sys
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.ai.incremental_repo_collector import IncrementalRepositoryCollector
+from src.data.implementations import prp_database
+from src.data.implementations.blob_store import collect_garbage
+from src.data.implementations.repository_file_index import RepositoryFileIndex
+
+
+def _bump_mtime(path: Path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "README.md").write_text("# Demo", encoding="utf-8")
+    (repo / "requirements.txt").write_text("numpy\n", encoding="utf-8")
+    (repo / "main.py").write_text("print('ignored')", encoding="utf-8")
+    return repo
+
+
+def test_first_collection_reads_relevant_files(tmp_path):
+    repo = _repo(tmp_path)
+    collector = IncrementalRepositoryCollector(RepositoryFileIndex(tmp_path / "prp.db"))
+    snapshot = collector.collect(str(repo))
+    assert sorted(snapshot.added) == ["README.md", "requirements.txt"]
+    repo_data = snapshot.to_repo_data()
+    assert repo_data["readme_content"] == "# Demo"
+    assert repo_data["requirements_txt_content"] == "numpy\n"
+    assert repo_data["environment_yaml_content"] is None
+    assert json.loads(snapshot.to_snapshot_json())["files"]["README.md"] == "# Demo"
+
+
+def test_reanalysis_only_rereads_changed_files(tmp_path, monkeypatch):
+    """Unchanged files come from the persisted index; the snapshot reports a delta."""
+    repo = _repo(tmp_path)
+    db_path = tmp_path / "prp.db"
+    IncrementalRepositoryCollector(RepositoryFileIndex(db_path)).collect(str(repo))
+
+    (repo / "requirements.txt").write_text("numpy\npandas\n", encoding="utf-8")
+    _bump_mtime(repo / "requirements.txt")
+    (repo / "environment.yaml").write_text("name: demo\n", encoding="utf-8")
+
+    collector = IncrementalRepositoryCollector(RepositoryFileIndex(db_path))
+    reads = []
+    original_read = collector._read
+    monkeypatch.setattr(collector, "_read", lambda path, relative_path, stat:
+                        reads.append(relative_path) or original_read(path, relative_path, stat))
+
+    snapshot = collector.collect(str(repo))
+    assert sorted(reads) == ["environment.yaml", "requirements.txt"]
+    assert snapshot.unchanged == ["README.md"]
+    assert snapshot.modified == ["requirements.txt"]
+    assert snapshot.added == ["environment.yaml"]
+    assert snapshot.delta()["modified"] == {"requirements.txt": "numpy\npandas\n"}
+
+
+def test_removed_files_are_reported_and_forgotten(tmp_path):
+    repo = _repo(tmp_path)
+    index = RepositoryFileIndex(tmp_path / "prp.db")
+    collector = IncrementalRepositoryCollector(index)
+    collector.collect(str(repo))
+
+    (repo / "README.md").unlink()
+    snapshot = collector.collect(str(repo))
+    assert snapshot.removed == ["README.md"]
+    assert "README.md" not in index.load(str(repo.resolve()))
+    assert not collector.collect(str(repo)).changed
+
+
+def test_files_in_subdirectories_are_tracked(tmp_path):
+    """The tree is walked (skipping dependency and VCS directories) and nested changes are detected."""
+    repo = _repo(tmp_path)
+    (repo / "services" / "api").mkdir(parents=True)
+    (repo / "services" / "api" / "requirements.txt").write_text("flask\n", encoding="utf-8")
+    (repo / "node_modules" / "left-pad").mkdir(parents=True)
+    (repo / "node_modules" / "left-pad" / "package.json").write_text("{}", encoding="utf-8")
+    collector = IncrementalRepositoryCollector(RepositoryFileIndex(tmp_path / "prp.db"))
+
+    snapshot = collector.collect(str(repo))
+    assert sorted(snapshot.files) == ["README.md", "requirements.txt", "services/api/requirements.txt"]
+    assert snapshot.to_repo_data()["requirements_txt_content"] == "numpy\n"  # The top-level file wins.
+
+    (repo / "services" / "api" / "requirements.txt").write_text("flask\ngunicorn\n", encoding="utf-8")
+    _bump_mtime(repo / "services" / "api" / "requirements.txt")
+    snapshot = collector.collect(str(repo))
+    assert snapshot.modified == ["services/api/requirements.txt"]
+    assert json.loads(json.dumps(snapshot.to_dict()))["modified"] == ["services/api/requirements.txt"]
+
+
+def test_index_references_blobs_instead_of_copying_content(tmp_path):
+    repo = _repo(tmp_path)
+    db_path = tmp_path / "prp.db"
+    IncrementalRepositoryCollector(RepositoryFileIndex(db_path)).collect(str(repo))
+    conn = prp_database.connect(db_path)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(repository_file_index)")}
+    assert "content" not in columns
+    assert conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 2
+    prp_database.initialize_schema(conn)
+    assert collect_garbage(conn) == 0  # Referenced by the index, so not garbage.
+    conn.commit()
+    conn.close()
+
+    snapshot = IncrementalRepositoryCollector(RepositoryFileIndex(db_path)).collect(str(repo))
+    assert sorted(snapshot.unchanged) == ["README.md", "requirements.txt"]
+    assert snapshot.files["README.md"] == "# Demo"  # Served from the blob store.
+
+
+def test_invalid_path_returns_none(tmp_path):
+    collector = IncrementalRepositoryCollector(RepositoryFileIndex(tmp_path / "prp.db"))
+    assert collector.collect(str(tmp_path / "missing")) is None
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.ai.model_router import ModelRouter
+from src.data.implementations.mock_model_schema import ALL_MOCK_LLMS_LIST, DB_SCHEMA_CONTENT
+from src.data.implementations.sqlite_crud_repository import COMPARISONS, SQLiteConnectionPool, SQLiteCrudRepository
+from src.data.obj.entities import Model
+
+ROUTER = ModelRouter.from_mock_list(ALL_MOCK_LLMS_LIST)
+
+
+def test_focus_phrase_ranks_first_and_partial_terms_follow():
+    routes = ROUTER.route("How is ATP synthesis linked to the citric acid cycle?")
+    assert [route.name for route in routes[:2]] == ["MitoMind", "KrebsLogic"]
+    assert routes[0].score > routes[1].score
+    assert routes[1].matched_terms == ("acid", "citric", "cycle")
+
+
+def test_matches_whole_words_only_and_falls_back_to_the_domain():
+    assert ROUTER.route("catalog of atpase") == []
+    routes = ROUTER.route("Give me a general overview of cosmology", limit=3)
+    assert [route.domain for route in routes] == ["Cosmology"] * 3
+    assert all(route.matched_terms == () for route in routes)
+
+
+def test_agrees_with_the_per_model_substring_check():
+    for _, _, focus in ALL_MOCK_LLMS_LIST:
+        query = f"Tell me about {focus} please"
+        expected = {model.model_id for model in ROUTER.models if model.focus.lower() in query.lower()}
+        top = {route.model_id for route in ROUTER.route(query, limit=50) if route.score >= 1.0}
+        assert expected <= top
+
+
+def test_overlapping_patterns_are_all_found():
+    router = ModelRouter([Model("a", "A", "X", "dark matter"), Model("b", "B", "X", "matter distribution"),
+                          Model("c", "C", "X", "dark matter distribution maps")])
+    assert {route.model_id for route in router.route("dark matter distribution") if route.score >= 1.0} == {"a", "b"}
+
+
+def test_create_comparison_records_the_two_best_models(tmp_path):
+    pool = SQLiteConnectionPool(tmp_path / "mock.db")
+    try:
+        pool.connection().executescript(DB_SCHEMA_CONTENT)
+        pool.connection().executemany("INSERT INTO models (model_id, name, domain, focus) VALUES (?, ?, ?, ?)",
+                                      [(m.model_id, m.name, m.domain, m.focus) for m in ROUTER.models])
+        pool.connection().commit()
+        router = ModelRouter.from_database(tmp_path / "mock.db")
+        comparisons = SQLiteCrudRepository(COMPARISONS, pool)
+        comparison = router.create_comparison("ATP synthesis versus glycolysis pathway", comparisons, "session-1")
+        assert {comparison.model_id_1, comparison.model_id_2} == {"cellular-mitomind", "cellular-cytoclone-3"}
+        assert comparisons.read_by_id(comparison.comparison_id).user_session_id == "session-1"
+        assert router.create_comparison("nothing relevant", comparisons) is None
+    finally:
+        pool.close_all()
@@ -0,0 +1,74 @@
+import sys
+import random
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.ai.model_router import ModelRouter
+from src.business.ai.model_similarity import ENGINE_SESSION_ID, ModelSimilarityEngine, TfidfEmbedder
+from src.data.implementations.mock_model_schema import ALL_MOCK_LLMS_LIST, DB_SCHEMA_CONTENT
+from src.data.obj.entities import Model
+
+MODELS = ModelRouter.from_mock_list(ALL_MOCK_LLMS_LIST).models
+
+
+def _neighbours(engine, models):
+    indices, _ = engine.top_k_neighbors(TfidfEmbedder().fit_transform(models))
+    return {models[i].name: [models[j].name for j in row] for i, row in enumerate(indices)}
+
+
+def test_nearest_models_share_focus_terms():
+    neighbours = _neighbours(ModelSimilarityEngine(top_k=1, workers=1), MODELS)
+    assert neighbours["ImmunoNet"] == ["MembraneMind"]       # T-cell activation / cell membrane transport
+    assert neighbours["DermoScan"] == ["BioBot Alpha"]       # skin barrier function / chloroplast function
+    assert neighbours["KrebsLogic"][0] in ("HepaticGen", "CardioSys")
+
+
+def test_blocked_and_parallel_results_match_the_full_matrix():
+    rng = random.Random(7)
+    words = [f"term{i}" for i in range(40)]
+    models = [Model(f"m{i}", f"M{i}", rng.choice(["Cosmology", "Human Biology"]), " ".join(rng.sample(words, 3)))
+              for i in range(200)]
+    rows = TfidfEmbedder().fit_transform(models)
+    dense = rows.to_dense()
+    similarities = dense @ dense.T
+    np.fill_diagonal(similarities, -np.inf)
+    expected = -np.sort(-similarities, axis=1)[:, :4]
+
+    for engine in (ModelSimilarityEngine(top_k=4, block_size=1000, workers=1),
+                   ModelSimilarityEngine(top_k=4, block_size=33, workers=2)):
+        indices, scores = engine.top_k_neighbors(rows)
+        assert np.allclose(scores, expected, atol=1e-5)
+        assert np.allclose(np.take_along_axis(similarities, indices, axis=1), scores, atol=1e-5)
+
+
+def test_write_connections_stores_each_pair_once_and_replaces_previous_runs(tmp_path):
+    conn = sqlite3.connect(tmp_path / "mock.db")
+    try:
+        conn.executescript(DB_SCHEMA_CONTENT)
+        conn.executemany("INSERT INTO models (model_id, name, domain, focus) VALUES (?, ?, ?, ?)",
+                         [(m.model_id, m.name, m.domain, m.focus) for m in MODELS])
+        conn.commit()
+        engine = ModelSimilarityEngine(top_k=3, workers=1)
+
+        first = engine.write_connections(conn, MODELS)
+        pairs = conn.execute("SELECT model_id_1, model_id_2 FROM comparisons WHERE user_session_id = ?",
+                             (ENGINE_SESSION_ID,)).fetchall()
+        assert first.pairs == len(pairs) > 0
+        assert len({frozenset(pair) for pair in pairs}) == len(pairs)
+        assert all(a != b for a, b in pairs)
+        low, high = conn.execute("SELECT MIN(confidence_score), MAX(confidence_score) FROM inferred_connections "
+                                 "WHERE connection_type = 'similarity'").fetchone()
+        assert engine.min_score - 0.01 <= low <= high <= 1.0
+
+        second = engine.write_connections(conn, MODELS)
+        assert second.replaced == first.pairs
+        assert conn.execute("SELECT COUNT(*) FROM inferred_connections").fetchone()[0] == second.pairs
+    finally:
+        conn.close()
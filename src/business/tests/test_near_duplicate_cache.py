@@ -0,0 +1,105 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.interfaces.IAIService import IAIService
+from src.business.ai.near_duplicate_cache import MinHasher, NearDuplicateCacheAIService
+
+
+class CountingAIService(IAIService):
+    """Fake AI service that records how often it is actually called."""
+    def __init__(self):
+        self.calls = 0
+
+    def generate_text(self, prompt, options=None):
+        self.calls += 1
+        return f"response #{self.calls}"
+
+    def generate_text_stream(self, prompt, options=None):
+        self.calls += 1
+        yield from ("streamed ", f"response #{self.calls}")
+
+    def analyze_image(self, image_data, options=None):
+        return {"bytes": len(image_data)}
+
+
+BASE_PROMPT = " ".join(f"line {i} of the repository readme describing requirement number {i}" for i in range(200))
+
+
+def test_minhash_similarity_tracks_overlap():
+    """Near-identical texts score high, unrelated texts score low."""
+    hasher = MinHasher()
+    edited = BASE_PROMPT.replace("line 150 of", "row 150 in")
+    unrelated = " ".join(f"completely different token stream {i * 7}" for i in range(200))
+    assert MinHasher.similarity(hasher.signature(BASE_PROMPT), hasher.signature(edited)) > 0.9
+    assert MinHasher.similarity(hasher.signature(BASE_PROMPT), hasher.signature(unrelated)) < 0.2
+
+
+def test_exact_and_approximate_hits_skip_inner_service():
+    """Identical and near-identical prompts are served from the cache and counted separately."""
+    inner = CountingAIService()
+    cache = NearDuplicateCacheAIService(inner, threshold=0.85)
+
+    first = cache.generate_text(BASE_PROMPT)
+    assert cache.generate_text(BASE_PROMPT) == first
+    assert cache.generate_text(BASE_PROMPT.replace("line 10 of", "row 10 in")) == first
+    assert inner.calls == 1
+
+    stats = cache.get_stats()
+    assert stats["exact_hits"] == 1
+    assert stats["approximate_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["approximate_hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_streaming_is_delegated_and_cached_once_complete():
+    """A miss streams the inner service's chunks; the joined response then serves later calls."""
+    inner = CountingAIService()
+    cache = NearDuplicateCacheAIService(inner)
+    assert list(cache.generate_text_stream(BASE_PROMPT)) == ["streamed ", "response #1"]
+    assert list(cache.generate_text_stream(BASE_PROMPT)) == ["streamed response #1"]
+    assert cache.generate_text(BASE_PROMPT) == "streamed response #1"
+    assert inner.calls == 1
+
+
+def test_different_options_do_not_share_responses():
+    """A response generated with one set of options is never reused for another."""
+    inner = CountingAIService()
+    cache = NearDuplicateCacheAIService(inner)
+    cache.generate_text(BASE_PROMPT, {"temperature": 0.1})
+    cache.generate_text(BASE_PROMPT, {"temperature": 0.9})
+    assert inner.calls == 2
+
+
+def test_lru_eviction_bounds_entries():
+    """The cache never holds more than max_entries responses."""
+    inner = CountingAIService()
+    cache = NearDuplicateCacheAIService(inner, max_entries=2)
+    for i in range(4):
+        cache.generate_text(f"unique prompt {i} " + "filler " * i)
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 2
+
+
+def test_bootstrap_wraps_the_configured_ai_service(monkeypatch):
+    from config import config
+    from core.bootstrap import ConceptualAIService, configure_project_business_dependencies
+    from core.dependency_container import DependencyContainer
+    monkeypatch.setattr(config, "NEAR_DUPLICATE_CACHE_ENABLED", True)
+    monkeypatch.setattr(config, "GOOGLE_API_KEY", None)
+    container = DependencyContainer()
+    configure_project_business_dependencies(container)
+    service = container.resolve(IAIService)
+    assert isinstance(service, NearDuplicateCacheAIService)
+    assert isinstance(service.inner, ConceptualAIService)
+    first = service.generate_text(BASE_PROMPT, {"temperature": 0})
+    assert service.generate_text(BASE_PROMPT, {"temperature": 0}) == first
+    assert service.stats["exact_hits"] == 1
+    assert service.analyze_image(b"image")["description"]
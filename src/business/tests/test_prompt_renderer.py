@@ -0,0 +1,63 @@
+import os
+import sys
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.ai.prompt_renderer import CompiledTemplate, PromptTemplateLoader
+
+
+def test_render_substitutes_every_occurrence():
+    """Repeated placeholders are all substituted and literals are preserved."""
+    template = CompiledTemplate("A {{name}} and {{name}}; {{missing}}!")
+    assert template.render({"name": "cat"}) == "A cat and cat; missing not found or empty.!"
+    assert template.placeholder_names == ["name", "name", "missing"]
+
+
+def test_dotted_paths_resolve_against_nested_context():
+    """Dotted placeholders walk nested dicts and lists; literal keys take precedence."""
+    context = {
+        "system_info": {"cpu": {"logical_cores": 12}, "gpu_info": {"gpus": [{"name": "GTX 1080 Ti"}]}},
+        "a.b": "literal",
+    }
+    template = CompiledTemplate(
+        "{{system_info.cpu.logical_cores}} {{system_info.gpu_info.gpus.0.name}} {{a.b}} {{system_info.ram.total_gb}}"
+    )
+    assert template.render(context) == "12 GTX 1080 Ti literal system_info.ram.total_gb not found or empty."
+
+
+def test_template_without_placeholders_renders_verbatim():
+    assert CompiledTemplate("plain text").render({}) == "plain text"
+
+
+def test_loader_caches_until_file_changes(tmp_path):
+    """The loader returns the cached compiled template until the file's mtime changes."""
+    template_file = tmp_path / "prompt.md"
+    template_file.write_text("v1 {{x}}", encoding="utf-8")
+    loader = PromptTemplateLoader(tmp_path)
+
+    first = loader.load("prompt.md")
+    assert loader.load("prompt.md") is first
+
+    template_file.write_text("v2 {{x}}", encoding="utf-8")
+    stat = template_file.stat()
+    os.utime(template_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = loader.load("prompt.md")
+    assert second is not first
+    assert second.render({"x": 1}) == "v2 1"
+
+    assert loader.load("does_not_exist.md") is None
+
+
+def test_loader_refuses_templates_outside_its_directory(tmp_path):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "ok.md").write_text("{{x}}", encoding="utf-8")
+    (tmp_path / "secret.md").write_text("secret", encoding="utf-8")
+    loader = PromptTemplateLoader(templates)
+    assert loader.load("ok.md").render({"x": 1}) == "1"
+    assert loader.load("../secret.md") is None
+    assert loader.load(str(tmp_path / "secret.md")) is None
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.ai.response_parser import StreamingResponseParser, parse_response
+
+RESPONSE = '''Here is the analysis of `{repo}`.
+
+```python
+settings = {"requires_gpu": "not the answer"}
+```
+
+```json
+{
+  "minimum": {"ram_gb": "16 GB", "cpu_cores": 4, "gpu_vram_gb": 8, "disk_gb": 20.5,},
+  "requires_gpu": true,
+  "requires_cuda": True,
+  "dependencies": ["torch>=2.0", "numpy"]
+}
+```
+The model needs a CUDA-capable GPU.'''
+
+
+def test_fields_are_available_before_the_stream_ends():
+    parser = StreamingResponseParser()
+    first_seen = {}
+    for offset in range(0, len(RESPONSE), 5):
+        for update in parser.feed(RESPONSE[offset:offset + 5]):
+            first_seen.setdefault(update.path, offset)
+    parsed = parser.close()
+
+    assert first_seen[("minimum", "ram_gb")] < RESPONSE.index('"cpu_cores"')
+    assert first_seen[("requires_gpu",)] < RESPONSE.index('"requires_cuda"')
+    assert parsed.complete and parsed.errors == []
+    assert parsed.text == RESPONSE
+    assert parsed.requirements_json() == ('{"minimum": {"ram_gb": 16.0, "cpu_cores": 4, "gpu_vram_gb": 8.0, '
+                                          '"disk_gb": 20.5}, "requires_gpu": true, "requires_cuda": true}')
+    assert parsed.dependencies_json() == '["torch>=2.0", "numpy"]'
+
+
+def test_chunk_boundaries_do_not_change_the_result():
+    expected = parse_response(RESPONSE).requirements_json()
+    for size in (1, 2, 3, 64):
+        parser = StreamingResponseParser()
+        for offset in range(0, len(RESPONSE), size):
+            parser.feed(RESPONSE[offset:offset + size])
+        assert parser.close().requirements_json() == expected
+
+
+def test_truncated_json_keeps_complete_fields():
+    parsed = parse_response(RESPONSE[:RESPONSE.index('"requires_cuda"') + 10])
+    assert not parsed.complete
+    assert parsed.errors == ["requirements block: truncated"]
+    assert parsed.requirements.requires_gpu is True
+    assert parsed.requirements.minimum.disk_gb == 20.5
+    assert parsed.requirements.requires_cuda is None
+
+
+def test_invalid_fields_are_dropped_and_reported():
+    parsed = parse_response('Result: {"system_requirements": {"minimum": {"ram_gb": -4, "cpu_cores": "two"}, '
+                            '"requires_gpu": "no"}}')
+    assert parsed.requirements_json() == '{"minimum": {}, "requires_gpu": false}'
+    assert [error.split(":")[0] for error in parsed.errors] == ["minimum.ram_gb", "minimum.cpu_cores"]
+
+
+def test_broken_fence_and_responses_without_json():
+    parsed = parse_response('```json\n{"requires_gpu": false, "minimum": {"ram_gb": 4\n```\nThat is all.')
+    assert parsed.requirements_json() == '{"minimum": {"ram_gb": 4.0}, "requires_gpu": false}'
+    assert not parsed.complete
+    empty = parse_response("I could not determine the requirements.")
+    assert (empty.requirements, empty.requirements_json(), empty.errors) == (None, None, [])
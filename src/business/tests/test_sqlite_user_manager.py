@@ -0,0 +1,96 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.users import sqlite_user_manager
+from src.business.users.sqlite_user_manager import SQLiteUserManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SQLiteUserManager(tmp_path / "users.db", identity_map_size=2, hash_iterations=1000, hash_workers=2)
+    yield manager
+    manager.close()
+
+
+def test_emails_are_unique_after_normalization(manager):
+    created = manager.create_user({"email": " Ann@Example.com ", "username": "ann", "password": "s3cret"})
+    assert created["email"] == "Ann@Example.com" and "password_hash" not in created
+    assert manager.get_user_by_email("ann@EXAMPLE.com")["user_id"] == created["user_id"]
+    with pytest.raises(ValueError):
+        manager.create_user({"email": "ann@example.com"})
+    with pytest.raises(ValueError):
+        manager.create_user({"email": "bob@example.com", "role": "OWNER"})
+
+
+def test_identity_map_is_bounded_and_returns_copies(manager):
+    ids = [manager.create_user({"email": f"user{i}@example.com"})["user_id"] for i in range(3)]
+    assert list(manager._by_id) == ids[1:]  # The oldest entry was evicted.
+
+    user = manager.get_user_by_id(ids[2])
+    user["role"] = "SUPER"
+    assert manager.get_user_by_id(ids[2])["role"] == "USER"
+
+    manager.pool.connection().execute("DELETE FROM users WHERE user_id = ?", (ids[2],))
+    assert manager.get_user_by_id(ids[2]) is not None  # Served from memory.
+    assert manager.get_user_by_id(ids[0])["email"] == "user0@example.com"  # Loaded from the database.
+
+
+def test_get_users_by_ids_batches_the_misses(manager):
+    ids = [manager.create_user({"email": f"user{i}@example.com"})["user_id"] for i in range(5)]
+    manager._by_id.clear()
+    statements = []
+    manager.pool.connection().set_trace_callback(statements.append)
+    users = manager.get_users_by_ids([ids[3], 999, ids[0], ids[3], ids[1]])
+    assert list(users) == [ids[3], ids[0], ids[1]]
+    assert len([sql for sql in statements if sql.startswith("SELECT")]) == 1
+
+
+def test_authentication_runs_on_the_worker_pool(manager, monkeypatch):
+    manager.create_user({"email": "ann@example.com", "password": "s3cret"})
+    threads = []
+    verify = sqlite_user_manager.verify_password
+
+    def recording_verify(password, encoded):
+        threads.append(threading.current_thread().name)
+        return verify(password, encoded)
+
+    monkeypatch.setattr(sqlite_user_manager, "verify_password", recording_verify)
+    assert manager.authenticate_user("ANN@example.com", "s3cret")["email"] == "ann@example.com"
+    assert manager.authenticate_user("ann@example.com", "wrong") is None
+    assert manager.authenticate_user("nobody@example.com", "s3cret") is None
+    assert len(threads) == 3  # The unknown email is hashed too.
+    assert all(name.startswith("password-hash") for name in threads)
+
+
+def test_unknown_email_costs_one_verify_from_the_first_request(manager, monkeypatch):
+    """The dummy hash is made at construction, so the first unknown email is not slower than later ones."""
+    def no_hashing(*args, **kwargs):
+        raise AssertionError("hash_password called while authenticating")
+
+    monkeypatch.setattr(sqlite_user_manager, "hash_password", no_hashing)
+    assert manager.authenticate_user("nobody@example.com", "s3cret") is None
+
+
+def test_user_managers_must_implement_authentication():
+    from src.business.interfaces.IUserManager import IUserManager
+
+    class Partial(IUserManager):
+        def create_user(self, user_data):
+            return user_data
+
+        def get_user_by_id(self, user_id):
+            return None
+
+        def get_user_by_email(self, email):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
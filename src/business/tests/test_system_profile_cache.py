@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.sys import system_profile_cache
+from src.business.sys.system_profile_cache import SystemProfileCache
+
+
+class ProbeCounter:
+    """Fake probes that count how often they are invoked."""
+    def __init__(self):
+        self.static_calls = 0
+        self.dynamic_calls = 0
+
+    def static(self, disk_path):
+        self.static_calls += 1
+        return {"os": {"system": "Linux"}, "cpu": {"logical_cores": 12}, "ram": {"total_gb": 16.0}}
+
+    def dynamic(self, disk_path):
+        self.dynamic_calls += 1
+        return {"cpu": {"usage_percent": float(self.dynamic_calls)}, "ram": {"available_gb": 8.0}}
+
+
+def _cache(probes, tmp_path, **kwargs):
+    return SystemProfileCache(cache_file=tmp_path / "static.json", disk_path=tmp_path,
+                              static_probe=probes.static, dynamic_probe=probes.dynamic, **kwargs)
+
+
+def test_profile_merges_static_and_dynamic_sections(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_profile_cache, "current_boot_id", lambda: "boot-a")
+    probes = ProbeCounter()
+    profile = _cache(probes, tmp_path).get_profile()
+    assert profile["cpu"] == {"logical_cores": 12, "usage_percent": 1.0}
+    assert profile["ram"] == {"total_gb": 16.0, "available_gb": 8.0}
+
+
+def test_vram_samples_are_merged_into_their_gpu(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_profile_cache, "current_boot_id", lambda: "boot-a")
+    static = {"gpu_info": {"nvidia_driver_version": "570", "gpus": [{"id": 0, "total_vram_gb": 11.0}]}}
+    dynamic = {"gpu_info": {"gpus": [{"id": 0, "free_vram_gb": 9.72, "used_vram_gb": 1.18}]}}
+    profile = SystemProfileCache(cache_file=tmp_path / "static.json", disk_path=tmp_path,
+                                 static_probe=lambda path: static, dynamic_probe=lambda path: dynamic).get_profile()
+    assert profile["gpu_info"] == {"nvidia_driver_version": "570", "gpus": [
+        {"id": 0, "total_vram_gb": 11.0, "free_vram_gb": 9.72, "used_vram_gb": 1.18}]}
+    assert static["gpu_info"]["gpus"][0] == {"id": 0, "total_vram_gb": 11.0}
+
+
+def test_dynamic_facts_respect_ttl_and_per_call_max_age(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_profile_cache, "current_boot_id", lambda: "boot-a")
+    probes = ProbeCounter()
+    cache = _cache(probes, tmp_path, dynamic_ttl=60.0)
+    cache.get_profile()
+    cache.get_profile()
+    assert probes.dynamic_calls == 1
+    assert cache.get_profile(max_age=0)["cpu"]["usage_percent"] == 2.0
+    assert probes.static_calls == 1
+    assert "usage_percent" not in cache.get_profile(include_dynamic=False)["cpu"]
+
+
+def test_static_facts_are_probed_once_per_boot(tmp_path, monkeypatch):
+    """A new cache instance reuses persisted static facts until the boot id changes."""
+    monkeypatch.setattr(system_profile_cache, "current_boot_id", lambda: "boot-a")
+    probes = ProbeCounter()
+    _cache(probes, tmp_path).get_profile()
+    _cache(probes, tmp_path).get_profile()
+    assert probes.static_calls == 1
+
+    monkeypatch.setattr(system_profile_cache, "current_boot_id", lambda: "boot-b")
+    _cache(probes, tmp_path).get_profile()
+    assert probes.static_calls == 2
+
+
+def test_returned_profile_is_a_copy(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_profile_cache, "current_boot_id", lambda: "boot-a")
+    cache = _cache(ProbeCounter(), tmp_path)
+    cache.get_profile()["cpu"]["logical_cores"] = -1
+    assert cache.get_profile()["cpu"]["logical_cores"] == 12
+
+
+def test_default_probes_produce_hardware_specs_layout(tmp_path):
+    """The real probes run without psutil and fill the expected sections."""
+    profile = SystemProfileCache(disk_path=tmp_path).get_profile()
+    for section in ("os", "cpu", "ram", "disk", "gpu_info", "python"):
+        assert section in profile
+    assert profile["cpu"]["logical_cores"]
@@ -0,0 +1 @@
+# Initializes the src.business.users package.
@@ -0,0 +1,236 @@
+# sqlite_user_manager.py
+"""
+SQLite-backed IUserManager.
+
+- Emails are unique after normalization (trimmed, case-folded): the users table has a
+  unique index on email_normalized, so 'Ann@Example.com' and ' ann@example.com' are the
+  same account and a lookup by email is a single index probe.
+- A bounded identity map (LRU) keeps hot users in memory, indexed by id and by
+  normalized email, so repeated lookups do not touch the database at all.
+- Password hashing (PBKDF2-HMAC-SHA256) runs on a small thread pool. hashlib releases
+  the GIL while it hashes, so logins run in parallel. authenticate_user waits for the
+  hash on the calling thread; callers that can wait asynchronously use
+  authenticate_user_async and keep their thread free.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from loguru import logger
+
+from config import config
+from src.business.interfaces.IUserManager import IUserManager, UserDataType
+from src.data.implementations.sqlite_crud_repository import SQLiteConnectionPool
+
+USER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT,
+    email TEXT NOT NULL,                       -- As entered
+    email_normalized TEXT NOT NULL,            -- Trimmed and case-folded; the lookup key
+    role TEXT NOT NULL DEFAULT 'USER',         -- One of config.ROLES
+    password_hash TEXT,                        -- 'pbkdf2_sha256$<iterations>$<salt>$<hash>', base64
+    created_timestamp TEXT NOT NULL            -- ISO 8601 timestamp of account creation
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_normalized ON users (email_normalized);
+"""
+
+# Columns returned to callers; the password hash never leaves this module.
+USER_COLUMNS = ("user_id", "username", "email", "role", "created_timestamp")
+_SELECT_USERS = f"SELECT {', '.join(USER_COLUMNS)} FROM users"
+
+HASH_SCHEME = "pbkdf2_sha256"
+
+
+def initialize_user_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(USER_SCHEMA)
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().casefold()
+
+
+def hash_password(password: str, iterations: int = config.PASSWORD_HASH_ITERATIONS) -> str:
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return "$".join((HASH_SCHEME, str(iterations), base64.b64encode(salt).decode(), base64.b64encode(digest).decode()))
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Checks a password against a hash from hash_password(), in constant time."""
+    try:
+        scheme, iterations, salt, expected = encoded.split("$")
+    except ValueError:
+        return False
+    if scheme != HASH_SCHEME:
+        return False
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), base64.b64decode(salt), int(iterations))
+    return hmac.compare_digest(digest, base64.b64decode(expected))
+
+
+class SQLiteUserManager(IUserManager):
+    """
+    User accounts in SQLite (config.DB_PATH by default).
+
+    The identity map holds the last `identity_map_size` users looked up or created and
+    returns copies, so callers cannot change what others see. This manager is assumed
+    to be the only writer of the users table.
+    """
+    def __init__(self, db_path: Optional[Union[str, Path]] = None,
+                 identity_map_size: int = config.USER_IDENTITY_MAP_SIZE,
+                 hash_iterations: int = config.PASSWORD_HASH_ITERATIONS,
+                 hash_workers: int = config.PASSWORD_HASH_WORKERS,
+                 pool: Optional[SQLiteConnectionPool] = None):
+        self.pool = pool or SQLiteConnectionPool(db_path or config.DB_PATH)
+        self.identity_map_size = max(0, identity_map_size)
+        self.hash_iterations = hash_iterations
+        self._hashers = ThreadPoolExecutor(max_workers=max(1, hash_workers), thread_name_prefix="password-hash")
+        # Checked against when an email is unknown. Computed up front: computing it on the first
+        # unknown email would make that response measurably slower and reveal the email is unregistered.
+        self._unknown_user_hash = hash_password("", self.hash_iterations)
+        self._by_id: "OrderedDict[int, UserDataType]" = OrderedDict()
+        self._id_by_email: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        conn = self.pool.connection()
+        with conn:
+            initialize_user_schema(conn)
+
+    # --- Identity map ---
+
+    def _remember(self, user: UserDataType) -> None:
+        if not self.identity_map_size:
+            return
+        with self._lock:
+            self._by_id[user["user_id"]] = user
+            self._by_id.move_to_end(user["user_id"])
+            self._id_by_email[normalize_email(user["email"])] = user["user_id"]
+            while len(self._by_id) > self.identity_map_size:
+                _, evicted = self._by_id.popitem(last=False)
+                self._id_by_email.pop(normalize_email(evicted["email"]), None)
+
+    def _cached(self, user_id: Any) -> Optional[UserDataType]:
+        with self._lock:
+            user = self._by_id.get(user_id)
+            if user is not None:
+                self._by_id.move_to_end(user_id)
+                return dict(user)
+        return None
+
+    def _load(self, where: str, value: Any) -> Optional[UserDataType]:
+        row = self.pool.connection().execute(f"{_SELECT_USERS} WHERE {where} = ?", (value,)).fetchone()
+        if row is None:
+            return None
+        user = dict(row)
+        self._remember(user)
+        return dict(user)
+
+    # --- IUserManager ---
+
+    def create_user(self, user_data: UserDataType) -> UserDataType:
+        """
+        Creates a user from 'email' (required), 'username', 'role' (default 'USER') and
+        'password'. Raises ValueError for a missing email, an unknown role or an email in use.
+        """
+        email = (user_data.get("email") or "").strip()
+        if "@" not in email:
+            raise ValueError("A user needs a valid email address.")
+        role = user_data.get("role", "USER")
+        if role not in config.ROLES:
+            raise ValueError(f"Unknown role '{role}'. Expected one of: {', '.join(config.ROLES)}")
+        password = user_data.get("password")
+        password_hash = self.hash_password_async(password).result() if password else None
+
+        user = {"username": user_data.get("username"), "email": email, "role": role,
+                "created_timestamp": datetime.now().isoformat()}
+        conn = self.pool.connection()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO users (username, email, email_normalized, role, password_hash, created_timestamp) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (user["username"], email, normalize_email(email), role, password_hash, user["created_timestamp"]),
+                )
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"A user with email {email} already exists.") from e
+        user = {"user_id": cursor.lastrowid, **user}
+        self._remember(user)
+        logger.info(f"Created user {user['user_id']} ({role}).")
+        return dict(user)
+
+    def get_user_by_id(self, user_id: Any) -> Optional[UserDataType]:
+        return self._cached(user_id) or self._load("user_id", user_id)
+
+    def get_user_by_email(self, email: str) -> Optional[UserDataType]:
+        normalized = normalize_email(email)
+        user_id = self._id_by_email.get(normalized)
+        cached = None if user_id is None else self._cached(user_id)
+        return cached or self._load("email_normalized", normalized)
+
+    def get_users_by_ids(self, user_ids: Iterable[Any]) -> Dict[Any, UserDataType]:
+        """Serves hot users from the identity map and fetches the rest in one query."""
+        user_ids = list(dict.fromkeys(user_ids))
+        found: Dict[Any, UserDataType] = {}
+        missing = []
+        for user_id in user_ids:
+            user = self._cached(user_id)
+            if user is None:
+                missing.append(user_id)
+            else:
+                found[user_id] = user
+        if missing:
+            # json_each takes the whole id list as one parameter, however long it is.
+            rows = self.pool.connection().execute(
+                f"{_SELECT_USERS} WHERE user_id IN (SELECT value FROM json_each(?))", (json.dumps(missing),)
+            )
+            for row in rows:
+                user = dict(row)
+                self._remember(user)
+                found[user["user_id"]] = dict(user)
+        return {user_id: found[user_id] for user_id in user_ids if user_id in found}
+
+    def authenticate_user(self, email: str, password: str) -> Optional[UserDataType]:
+        """
+        Blocks the calling thread for the full hash (config.PASSWORD_HASH_ITERATIONS rounds,
+        typically a few hundred milliseconds). Use authenticate_user_async where the caller can
+        wait asynchronously instead.
+        """
+        return self.authenticate_user_async(email, password).result()
+
+    # --- Password hashing on the worker pool ---
+
+    def hash_password_async(self, password: str) -> "Future[str]":
+        return self._hashers.submit(hash_password, password, self.hash_iterations)
+
+    def authenticate_user_async(self, email: str, password: str) -> "Future[Optional[UserDataType]]":
+        """
+        Resolves to the user when the password matches, otherwise None. The lookup and the
+        hash both run on the worker pool; an unknown email costs the same hash as a wrong
+        password, so response times do not reveal which emails are registered.
+        """
+        def check() -> Optional[UserDataType]:
+            row = self.pool.connection().execute(
+                f"SELECT {', '.join(USER_COLUMNS)}, password_hash FROM users WHERE email_normalized = ?",
+                (normalize_email(email),),
+            ).fetchone()
+            if row is None or row["password_hash"] is None:
+                verify_password(password, self._unknown_user_hash)
+                return None
+            if not verify_password(password, row["password_hash"]):
+                return None
+            user = {column: row[column] for column in USER_COLUMNS}
+            self._remember(user)
+            return dict(user)
+        return self._hashers.submit(check)
+
+    def close(self) -> None:
+        self._hashers.shutdown(wait=True)
+        self.pool.close_all()
@@ -0,0 +1,256 @@
+# analytics_index.py
+"""
+Indexed columns over the JSON stored in prp.db, so analytics questions such as
+"which sessions ran on machines with under 16 GB RAM" or "which results required
+CUDA" are answered by SQLite indexes instead of parsing every row in Python.
+
+- ai_analysis_results gets VIRTUAL generated columns over parsed_system_requirements_json.
+- system_profiles.profile_data may be a compressed blob manifest, which SQLite cannot
+  look inside, so its facts are extracted into the indexed system_profile_facts table
+  when profiles are written (and backfilled by sync_profile_facts). The SYSTEM_PROFILES
+  mapping calls index_profiles on every write, so repository, unit-of-work and job
+  writes are indexed without a trigger (which could not read a manifest).
+"""
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from src.data.implementations import prp_database
+from src.data.implementations.blob_store import BlobStore, is_manifest
+from src.data.implementations.read_replicas import ReplicaManager, read_connection
+
+PROFILE_FACTS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS system_profile_facts (
+        profile_id INTEGER PRIMARY KEY,            -- Same id as system_profiles.profile_id
+        session_id INTEGER NOT NULL,
+        os_system TEXT,                            -- e.g. 'Linux', 'Windows', 'Darwin'
+        logical_cores INTEGER,
+        physical_cores INTEGER,
+        ram_total_gb REAL,
+        gpu_count INTEGER NOT NULL DEFAULT 0,
+        gpu_vram_gb REAL,                          -- Largest single-GPU VRAM
+        FOREIGN KEY (profile_id) REFERENCES system_profiles (profile_id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_profile_facts_session ON system_profile_facts (session_id)",
+    "CREATE INDEX IF NOT EXISTS idx_profile_facts_ram ON system_profile_facts (ram_total_gb)",
+    "CREATE INDEX IF NOT EXISTS idx_profile_facts_cores ON system_profile_facts (logical_cores)",
+    "CREATE INDEX IF NOT EXISTS idx_profile_facts_vram ON system_profile_facts (gpu_vram_gb)",
+    "CREATE INDEX IF NOT EXISTS idx_profile_facts_os ON system_profile_facts (os_system)",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_profile_facts_delete AFTER DELETE ON system_profiles
+    BEGIN
+        DELETE FROM system_profile_facts WHERE profile_id = OLD.profile_id;
+    END
+    """,
+]
+
+# Generated columns on ai_analysis_results: (column, type, JSON path into parsed_system_requirements_json).
+# The paths follow the schema of parsed system requirements ({"minimum": {...}, "requires_cuda": ...}).
+RESULT_GENERATED_COLUMNS = [
+    ("req_min_ram_gb", "REAL", "$.minimum.ram_gb"),
+    ("req_min_cpu_cores", "INTEGER", "$.minimum.cpu_cores"),
+    ("req_min_gpu_vram_gb", "REAL", "$.minimum.gpu_vram_gb"),
+    ("req_min_disk_gb", "REAL", "$.minimum.disk_gb"),
+    ("req_requires_gpu", "INTEGER", "$.requires_gpu"),
+    ("req_requires_cuda", "INTEGER", "$.requires_cuda"),
+]
+
+
+def ensure_profile_facts_schema(conn: sqlite3.Connection) -> None:
+    """Creates the facts table, its indexes and its delete trigger. Idempotent; never commits."""
+    for statement in PROFILE_FACTS_SCHEMA:
+        conn.execute(statement)
+
+
+def ensure_analytics_schema(conn: sqlite3.Connection) -> None:
+    """Creates the facts table, generated columns and their indexes. Idempotent."""
+    ensure_profile_facts_schema(conn)
+
+    existing = {row[1] for row in conn.execute("PRAGMA table_xinfo(ai_analysis_results)")}
+    for column, column_type, path in RESULT_GENERATED_COLUMNS:
+        if column not in existing:
+            # json_valid guards the index against malformed JSON, which would otherwise make inserts fail.
+            conn.execute(
+                f"ALTER TABLE ai_analysis_results ADD COLUMN {column} {column_type} GENERATED ALWAYS AS "
+                f"(CASE WHEN json_valid(parsed_system_requirements_json) "
+                f"THEN json_extract(parsed_system_requirements_json, '{path}') END) VIRTUAL"
+            )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_results_{column} ON ai_analysis_results ({column})")
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_profile_facts(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Pulls the commonly queried facts out of a profile in the hardware_specs.json layout."""
+    cpu = profile.get("cpu") or {}
+    gpus = (profile.get("gpu_info") or {}).get("gpus") or []
+    vram = [_number(gpu.get("total_vram_gb")) for gpu in gpus if isinstance(gpu, dict)]
+    vram = [value for value in vram if value is not None]
+    cores = _number(cpu.get("logical_cores"))
+    physical = _number(cpu.get("physical_cores"))
+    return {
+        "os_system": (profile.get("os") or {}).get("system"),
+        "logical_cores": int(cores) if cores is not None else None,
+        "physical_cores": int(physical) if physical is not None else None,
+        "ram_total_gb": _number((profile.get("ram") or {}).get("total_gb")),
+        "gpu_count": len(gpus),
+        "gpu_vram_gb": max(vram) if vram else None,
+    }
+
+
+def index_profile_facts(conn: sqlite3.Connection, profile_id: int, session_id: int, profile: Dict[str, Any]) -> None:
+    """Records the facts of one profile. Call in the same transaction that inserts the profile."""
+    facts = extract_profile_facts(profile)
+    conn.execute(
+        "INSERT OR REPLACE INTO system_profile_facts "
+        "(profile_id, session_id, os_system, logical_cores, physical_cores, ram_total_gb, gpu_count, gpu_vram_gb) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (profile_id, session_id, facts["os_system"], facts["logical_cores"], facts["physical_cores"],
+         facts["ram_total_gb"], facts["gpu_count"], facts["gpu_vram_gb"]),
+    )
+
+
+def index_profiles(conn: sqlite3.Connection, profiles: Iterable[Any]) -> None:
+    """
+    Records the facts of stored SystemProfile entities (keys assigned) in the caller's transaction.
+    profile_data may be plain JSON or a blob manifest; anything unparseable is indexed as an empty profile.
+    """
+    profiles = [profile for profile in profiles if profile.profile_id is not None]
+    if not profiles:
+        return
+    ensure_profile_facts_schema(conn)
+    # update_many cannot tell which keys matched a row; facts of missing profiles would break the foreign key.
+    ids = [profile.profile_id for profile in profiles]
+    stored = {row[0] for row in conn.execute(
+        f"SELECT profile_id FROM system_profiles WHERE profile_id IN ({', '.join('?' * len(ids))})", ids)}
+    profiles = [profile for profile in profiles if profile.profile_id in stored]
+    store = None
+    for profile in profiles:
+        try:
+            data = json.loads(profile.profile_data or "{}")
+            if is_manifest(data):
+                store = store or BlobStore(conn)
+                data = store.unpack(profile.profile_data)
+        except ValueError:
+            data = {}
+        index_profile_facts(conn, profile.profile_id, profile.session_id, data if isinstance(data, dict) else {})
+
+
+def sync_profile_facts(conn: sqlite3.Connection, batch_size: int = 1000) -> int:
+    """Extracts facts for every profile that has none yet (e.g. rows written before this index). Returns the count."""
+    store = BlobStore(conn)
+    indexed = 0
+    while True:
+        rows = conn.execute(
+            "SELECT p.profile_id, p.session_id, p.profile_data FROM system_profiles p "
+            "LEFT JOIN system_profile_facts f ON f.profile_id = p.profile_id "
+            "WHERE f.profile_id IS NULL LIMIT ?",
+            (batch_size,),
+        ).fetchall()
+        if not rows:
+            return indexed
+        for profile_id, session_id, profile_data in rows:
+            try:
+                profile = store.unpack(profile_data)
+            except ValueError:
+                profile = {}
+            index_profile_facts(conn, profile_id, session_id, profile if isinstance(profile, dict) else {})
+            indexed += 1
+
+
+@dataclass
+class SessionFacts:
+    session_id: int
+    target_repository_identifier: str
+    os_system: Optional[str]
+    logical_cores: Optional[int]
+    ram_total_gb: Optional[float]
+    gpu_vram_gb: Optional[float]
+
+
+class AnalyticsQueries:
+    """
+    Small query API over the indexed columns; every filter is served by an index.
+    With `replicas`, queries run on its read-only snapshots (see read_replicas.py).
+    """
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, backfill: bool = True,
+                 replicas: Optional[ReplicaManager] = None):
+        self.db_path = db_path
+        self.replicas = replicas
+        with prp_database.transaction(self.db_path) as conn:
+            prp_database.initialize_schema(conn)
+            ensure_analytics_schema(conn)
+            if backfill:
+                sync_profile_facts(conn)
+
+    def _query(self, sql: str, params: List[Any]) -> List[sqlite3.Row]:
+        with read_connection(self.db_path, self.replicas) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def find_sessions(self, max_ram_gb: Optional[float] = None, min_ram_gb: Optional[float] = None,
+                      min_cores: Optional[int] = None, min_gpu_vram_gb: Optional[float] = None,
+                      os_system: Optional[str] = None, limit: Optional[int] = None) -> List[SessionFacts]:
+        """Sessions whose machine matches every given bound (max_ram_gb is exclusive)."""
+        clauses, params = [], []
+        for clause, value in (("f.ram_total_gb < ?", max_ram_gb), ("f.ram_total_gb >= ?", min_ram_gb),
+                              ("f.logical_cores >= ?", min_cores), ("f.gpu_vram_gb >= ?", min_gpu_vram_gb),
+                              ("f.os_system = ?", os_system)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = ("SELECT s.session_id, s.target_repository_identifier, f.os_system, f.logical_cores, "
+               "f.ram_total_gb, f.gpu_vram_gb FROM system_profile_facts f "
+               "JOIN analysis_sessions s ON s.session_id = f.session_id")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY s.session_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [SessionFacts(*row) for row in self._query(sql, params)]
+
+    def find_results(self, requires_cuda: Optional[bool] = None, requires_gpu: Optional[bool] = None,
+                     min_ram_gb_at_least: Optional[float] = None, min_ram_gb_at_most: Optional[float] = None,
+                     min_cores_at_least: Optional[int] = None, min_gpu_vram_gb_at_least: Optional[float] = None,
+                     limit: Optional[int] = None) -> List[int]:
+        """result_ids of AI results whose parsed minimum requirements match every given bound."""
+        clauses, params = [], []
+        for clause, value in (("req_requires_cuda = ?", None if requires_cuda is None else int(requires_cuda)),
+                              ("req_requires_gpu = ?", None if requires_gpu is None else int(requires_gpu)),
+                              ("req_min_ram_gb >= ?", min_ram_gb_at_least),
+                              ("req_min_ram_gb <= ?", min_ram_gb_at_most),
+                              ("req_min_cpu_cores >= ?", min_cores_at_least),
+                              ("req_min_gpu_vram_gb >= ?", min_gpu_vram_gb_at_least)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = "SELECT result_id FROM ai_analysis_results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY result_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [row[0] for row in self._query(sql, params)]
+
+    def count_sessions_by_os(self) -> Dict[str, int]:
+        rows = self._query("SELECT os_system, COUNT(*) FROM system_profile_facts GROUP BY os_system", [])
+        return {row[0]: row[1] for row in rows}
+
+    def explain(self, sql: str, params: Optional[List[Any]] = None) -> List[str]:
+        """Returns SQLite's query plan, handy for checking that a filter hits an index."""
+        return [row[3] for row in self._query("EXPLAIN QUERY PLAN " + sql, params or [])]
+
+
+def parsed_requirements_json(minimum: Dict[str, Any], **flags: Any) -> str:
+    """Builds a parsed_system_requirements_json value in the indexed layout."""
+    return json.dumps({"minimum": minimum, **flags})
@@ -0,0 +1,315 @@
+# blob_store.py
+"""
+Content-addressed, compressed blob storage for prp.db.
+
+repository_snapshots.snapshot_data and system_profiles.profile_data are stored as
+small JSON manifests whose large strings are replaced by references to rows in the
+`blobs` table (keyed by SHA-256 of the uncompressed bytes). Identical READMEs,
+requirements files and profiles are therefore stored once, however many sessions
+capture them. Rows written before the migration are plain JSON and are read unchanged.
+The repository file index (repository_file_index.blob_hash) references blobs too.
+"""
+import json
+import zlib
+import hashlib
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+
+from loguru import logger
+
+from src.data.implementations import prp_database
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is always available.
+    zstandard = None
+
+BLOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {schema}blobs (
+    blob_hash TEXT PRIMARY KEY,                -- SHA-256 of the uncompressed bytes
+    codec TEXT NOT NULL,                       -- 'zstd', 'zlib' or 'raw'
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+MANIFEST_KEY = "$manifest"
+BLOB_REF_KEY = "$blob"
+MANIFEST_VERSION = 1
+
+
+def initialize_blob_schema(conn: sqlite3.Connection, schema: str = "main") -> None:
+    # A single execute (not executescript) so an open transaction is not committed early.
+    conn.execute(BLOB_SCHEMA.format(schema=f"{schema}."))
+
+
+def _compress(raw: bytes, level: int):
+    """Returns (codec, stored bytes), falling back to raw when compression does not help."""
+    if zstandard is not None:
+        codec, stored = "zstd", zstandard.ZstdCompressor(level=level).compress(raw)
+    else:
+        codec, stored = "zlib", zlib.compress(raw, min(level, 9))
+    if len(stored) >= len(raw):
+        return "raw", raw
+    return codec, stored
+
+
+def _decompress(codec: str, stored: bytes) -> bytes:
+    if codec == "raw":
+        return bytes(stored)
+    if codec == "zlib":
+        return zlib.decompress(stored)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Blob was stored with zstd but the 'zstandard' package is not installed.")
+        return zstandard.ZstdDecompressor().decompress(stored)
+    raise ValueError(f"Unknown blob codec: {codec}")
+
+
+class BlobStore:
+    """
+    Stores and fetches compressed blobs on an existing connection (callers own the transaction).
+    `schema` selects an attached database (e.g. an archive) instead of main.
+    """
+    def __init__(self, conn: sqlite3.Connection, compression_level: int = 6, min_blob_bytes: int = 128,
+                 schema: str = "main"):
+        self.conn = conn
+        self.compression_level = compression_level
+        self.min_blob_bytes = min_blob_bytes
+        self.table = f"{schema}.blobs"
+        self._cache: Dict[str, bytes] = {}
+        initialize_blob_schema(conn, schema)
+
+    def put(self, raw: bytes) -> str:
+        """Stores the bytes if not already present and returns their hash."""
+        blob_hash = hashlib.sha256(raw).hexdigest()
+        exists = self.conn.execute(f"SELECT 1 FROM {self.table} WHERE blob_hash = ?", (blob_hash,)).fetchone()
+        if not exists:
+            codec, stored = _compress(raw, self.compression_level)
+            # OR IGNORE: another connection may store the same content between the check and the insert.
+            self.conn.execute(
+                f"INSERT OR IGNORE INTO {self.table} (blob_hash, codec, raw_size, stored_size, data) VALUES (?, ?, ?, ?, ?)",
+                (blob_hash, codec, len(raw), len(stored), stored),
+            )
+        return blob_hash
+
+    def get(self, blob_hash: str) -> bytes:
+        cached = self._cache.get(blob_hash)
+        if cached is not None:
+            return cached
+        row = self.conn.execute(f"SELECT codec, data FROM {self.table} WHERE blob_hash = ?", (blob_hash,)).fetchone()
+        if row is None:
+            raise KeyError(f"Blob not found: {blob_hash}")
+        raw = _decompress(row[0], row[1])
+        self._cache[blob_hash] = raw
+        return raw
+
+    # --- JSON manifests ---
+
+    def _externalize(self, value: Any) -> Any:
+        if isinstance(value, str) and len(value) >= self.min_blob_bytes:
+            return {BLOB_REF_KEY: self.put(value.encode("utf-8"))}
+        if isinstance(value, dict):
+            return {key: self._externalize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._externalize(item) for item in value]
+        return value
+
+    def _internalize(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if len(value) == 1 and BLOB_REF_KEY in value:
+                return self.get(value[BLOB_REF_KEY]).decode("utf-8")
+            return {key: self._internalize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._internalize(item) for item in value]
+        return value
+
+    def pack_snapshot(self, snapshot: Union[str, Dict[str, Any]]) -> str:
+        """Turns snapshot JSON into a manifest whose large strings (file contents) are blob references."""
+        data = json.loads(snapshot) if isinstance(snapshot, str) else snapshot
+        return json.dumps({MANIFEST_KEY: MANIFEST_VERSION, "data": self._externalize(data)})
+
+    def pack_document(self, document: Union[str, Dict[str, Any]]) -> str:
+        """Stores a whole JSON document (e.g. a system profile) as one blob and returns its manifest."""
+        text = document if isinstance(document, str) else json.dumps(document, sort_keys=True)
+        return json.dumps({MANIFEST_KEY: MANIFEST_VERSION, "blob": self.put(text.encode("utf-8"))})
+
+    def pack_text(self, text: str) -> str:
+        """Stores a plain text value (e.g. a prompt) as a manifest; short texts stay inline."""
+        return json.dumps({MANIFEST_KEY: MANIFEST_VERSION, "data": self._externalize(text)})
+
+    def unpack_text(self, stored_text: Optional[str]) -> Optional[str]:
+        """
+        Like unpack(), but returns JSON text: a document exactly as it was packed, a snapshot
+        re-serialized. Anything that is not a manifest (legacy JSON, other text) is returned unchanged.
+        """
+        if not stored_text or not stored_text.startswith('{"' + MANIFEST_KEY):
+            return stored_text
+        try:
+            data = json.loads(stored_text)
+        except ValueError:
+            return stored_text
+        if not is_manifest(data):
+            return stored_text
+        if "blob" in data:
+            return self.get(data["blob"]).decode("utf-8")
+        return json.dumps(self._internalize(data["data"]))
+
+    def unpack(self, stored_text: str) -> Any:
+        """Reassembles a manifest written by pack_snapshot/pack_document/pack_text; plain legacy JSON is returned as parsed."""
+        data = json.loads(stored_text)
+        if not is_manifest(data):
+            return data
+        if "blob" in data:
+            return json.loads(self.get(data["blob"]).decode("utf-8"))
+        return self._internalize(data["data"])
+
+
+def is_manifest(data: Any) -> bool:
+    return isinstance(data, dict) and data.get(MANIFEST_KEY) == MANIFEST_VERSION
+
+
+def referenced_hashes(value: Any, found: Optional[Set[str]] = None) -> Set[str]:
+    """Collects every blob hash referenced by a parsed manifest."""
+    found = set() if found is None else found
+    if isinstance(value, dict):
+        if BLOB_REF_KEY in value and len(value) == 1:
+            found.add(value[BLOB_REF_KEY])
+        elif is_manifest(value) and "blob" in value:
+            found.add(value["blob"])
+        else:
+            for item in value.values():
+                referenced_hashes(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            referenced_hashes(item, found)
+    return found
+
+
+def file_index_hashes(conn: sqlite3.Connection, found: Optional[Set[str]] = None, schema: str = "main") -> Set[str]:
+    """Collects the blob hashes referenced by the repository file index, if the database has one."""
+    found = set() if found is None else found
+    if conn.execute(f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'repository_file_index'").fetchone():
+        found.update(blob_hash for (blob_hash,) in conn.execute(
+            f"SELECT blob_hash FROM {schema}.repository_file_index WHERE blob_hash IS NOT NULL"))
+    return found
+
+
+def read_snapshot(conn: sqlite3.Connection, snapshot_id: int) -> Optional[Dict[str, Any]]:
+    """Returns the reassembled snapshot_data of one repository snapshot."""
+    row = conn.execute("SELECT snapshot_data FROM repository_snapshots WHERE snapshot_id = ?", (snapshot_id,)).fetchone()
+    return None if row is None else BlobStore(conn).unpack(row[0])
+
+
+def read_profile(conn: sqlite3.Connection, profile_id: int) -> Optional[Dict[str, Any]]:
+    """Returns the reassembled profile_data of one system profile."""
+    row = conn.execute("SELECT profile_data FROM system_profiles WHERE profile_id = ?", (profile_id,)).fetchone()
+    return None if row is None else BlobStore(conn).unpack(row[0])
+
+
+def collect_garbage(conn: sqlite3.Connection) -> int:
+    """Deletes blobs no longer referenced by any snapshot, profile or file index entry. Returns the number removed."""
+    initialize_blob_schema(conn)
+    live = file_index_hashes(conn)
+    for (text,) in conn.execute("SELECT snapshot_data FROM repository_snapshots WHERE snapshot_data LIKE '{\"$manifest\"%'"):
+        referenced_hashes(json.loads(text), live)
+    for (text,) in conn.execute("SELECT profile_data FROM system_profiles WHERE profile_data LIKE '{\"$manifest\"%'"):
+        referenced_hashes(json.loads(text), live)
+    dead = [(blob_hash,) for (blob_hash,) in conn.execute("SELECT blob_hash FROM blobs") if blob_hash not in live]
+    conn.executemany("DELETE FROM blobs WHERE blob_hash = ?", dead)
+    return len(dead)
+
+
+@dataclass
+class MigrationReport:
+    """Space accounting for a blob-store migration."""
+    snapshots_migrated: int = 0
+    profiles_migrated: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    file_bytes_before: int = 0
+    file_bytes_after: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def ratio(self) -> float:
+        return self.bytes_before / self.bytes_after if self.bytes_after else 0.0
+
+
+def _column_bytes(conn: sqlite3.Connection) -> int:
+    snapshots = conn.execute("SELECT COALESCE(SUM(LENGTH(CAST(snapshot_data AS BLOB))), 0) FROM repository_snapshots").fetchone()[0]
+    profiles = conn.execute("SELECT COALESCE(SUM(LENGTH(CAST(profile_data AS BLOB))), 0) FROM system_profiles").fetchone()[0]
+    blobs = conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()[0]
+    return snapshots + profiles + blobs
+
+
+def _rows_to_migrate(conn: sqlite3.Connection, table: str, key: str, column: str, after: int,
+                     limit: int) -> List[tuple]:
+    """The next `limit` legacy rows with a key above `after`: one indexed range scan per batch."""
+    return conn.execute(
+        f"SELECT {key}, {column} FROM {table} WHERE {key} > ? AND {column} NOT LIKE '{{\"$manifest\"%' "
+        f"ORDER BY {key} LIMIT ?",
+        (after, limit),
+    ).fetchall()
+
+
+def migrate_to_blob_store(db_path: Optional[Union[str, Path]] = None, batch_size: int = 500,
+                          vacuum: bool = False) -> MigrationReport:
+    """
+    Rewrites existing snapshot and profile rows as manifests over the blob table.
+    Safe to re-run: rows that are already manifests are skipped. Each batch commits
+    separately so an interrupted migration can simply be resumed.
+    """
+    report = MigrationReport()
+    db_file = Path(db_path) if db_path else None
+    if db_file is not None and db_file.exists():
+        report.file_bytes_before = db_file.stat().st_size
+
+    conn = prp_database.connect(db_path)
+    try:
+        prp_database.initialize_schema(conn)
+        store = BlobStore(conn)
+        report.bytes_before = _column_bytes(conn)
+
+        for table, key, column, pack in (
+            ("repository_snapshots", "snapshot_id", "snapshot_data", store.pack_snapshot),
+            ("system_profiles", "profile_id", "profile_data", store.pack_document),
+        ):
+            after = -2 ** 63
+            while True:
+                rows = _rows_to_migrate(conn, table, key, column, after, batch_size)
+                if not rows:
+                    break
+                after = rows[-1][0]
+                with conn:
+                    for row_id, text in rows:
+                        try:
+                            packed = pack(text)
+                        except ValueError:
+                            logger.warning(f"Skipping {table}.{key}={row_id}: {column} is not valid JSON.")
+                            continue
+                        conn.execute(f"UPDATE {table} SET {column} = ? WHERE {key} = ?", (packed, row_id))
+                        if table == "repository_snapshots":
+                            report.snapshots_migrated += 1
+                        else:
+                            report.profiles_migrated += 1
+
+        report.bytes_after = _column_bytes(conn)
+        if vacuum:
+            conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    if db_file is not None and db_file.exists():
+        report.file_bytes_after = db_file.stat().st_size
+    logger.info(
+        f"Blob store migration: {report.snapshots_migrated} snapshots, {report.profiles_migrated} profiles; "
+        f"{report.bytes_before} -> {report.bytes_after} bytes ({report.bytes_saved} saved)."
+    )
+    return report
@@ -0,0 +1,186 @@
+# cached_crud_repository.py
+"""
+Read-through cache in front of any ICrudRepository.
+
+read_by_id results (including misses) are kept in an LRU with a TTL and dropped
+whenever this wrapper writes the same ids. Writes made by other processes or
+connections are picked up through an optional change counter, e.g. SQLite's
+PRAGMA data_version on a dedicated connection, which clears the cache when it moves.
+"""
+import copy
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from src.data.interfaces.ICrudRepository import BulkResult, ICrudRepository, Page, T
+
+_MISSING = object()  # Cached "no such row" marker.
+
+
+def sqlite_data_version(pool) -> Callable[[], int]:
+    """
+    Change counter for the database of a SQLiteConnectionPool. PRAGMA data_version moves when
+    any *other* connection commits, so it is read on one dedicated connection that never writes:
+    every commit (this process's pool threads, unit-of-work writes, other processes) moves it.
+    """
+    conn = sqlite3.connect(pool.db_path, check_same_thread=False)
+    lock = threading.Lock()
+
+    def counter() -> int:
+        with lock:
+            return conn.execute("PRAGMA data_version").fetchone()[0]
+    return counter
+
+
+class CachedCrudRepository(ICrudRepository[T]):
+    """Caches read_by_id of the wrapped repository; every other read is delegated unchanged."""
+    def __init__(self, inner: ICrudRepository[T], max_entries: int = 1024, ttl_seconds: float = 60.0,
+                 negative_ttl_seconds: float = 5.0, change_counter: Optional[Callable[[], Any]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.inner = inner
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._change_counter = change_counter
+        self._clock = clock
+        # item id -> (item or _MISSING, expires at); ordered for LRU eviction.
+        self._entries: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped by every invalidation so in-flight loads never store stale rows.
+        self._seen_version: Any = None
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "evictions": 0, "expirations": 0,
+                      "invalidations": 0, "external_invalidations": 0}
+        logger.debug(f"CachedCrudRepository initialized (max_entries={max_entries}, ttl={ttl_seconds}s).")
+
+    # --- Cache bookkeeping ---
+
+    def _check_external_changes(self) -> None:
+        if self._change_counter is None:
+            return
+        version = self._change_counter()
+        with self._lock:
+            previous, self._seen_version = self._seen_version, version
+            # The baseline is taken on the first read, before anything is cached.
+            if previous is not None and previous != version:
+                self._entries.clear()
+                self._generation += 1
+                self.stats["external_invalidations"] += 1
+
+    def _invalidate(self, item_ids: Iterable[Any]) -> None:
+        with self._lock:
+            for item_id in item_ids:
+                if self._entries.pop(item_id, None) is not None:
+                    self.stats["invalidations"] += 1
+            self._generation += 1
+
+    def _store(self, item_id: Any, value: Any, generation: int) -> None:
+        ttl = self.negative_ttl_seconds if value is _MISSING else self.ttl_seconds
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[item_id] = (value, self._clock() + ttl)
+            self._entries.move_to_end(item_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drops every cached entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters, the hit rate and the current number of entries."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["negative_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["negative_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    # --- ICrudRepository ---
+
+    def read_by_id(self, item_id: Any) -> Optional[T]:
+        self._check_external_changes()
+        with self._lock:
+            entry = self._entries.get(item_id)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(item_id)
+                    if value is _MISSING:
+                        self.stats["negative_hits"] += 1
+                        return None
+                    self.stats["hits"] += 1
+                    return copy.copy(value)  # Callers may mutate what they get back.
+                del self._entries[item_id]
+                self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            generation = self._generation
+
+        item = self.inner.read_by_id(item_id)
+        self._store(item_id, _MISSING if item is None else copy.copy(item), generation)
+        return item
+
+    def read_all(self) -> List[T]:
+        return self.inner.read_all()
+
+    def create(self, item: T) -> T:
+        created = self.inner.create(item)
+        self._invalidate([self.inner._item_id(created)])  # Drops a cached "missing" for this id.
+        return created
+
+    def update(self, item: T) -> T:
+        try:
+            return self.inner.update(item)
+        finally:
+            self._invalidate([self.inner._item_id(item)])
+
+    def delete(self, item_id: Any) -> None:
+        try:
+            self.inner.delete(item_id)
+        finally:
+            self._invalidate([item_id])
+
+    def create_many(self, items: Iterable[T], chunk_size: int = 500) -> BulkResult:
+        result = self.inner.create_many(items, chunk_size)
+        self._invalidate(result.ids)
+        return result
+
+    def update_many(self, items: Iterable[T], chunk_size: int = 500) -> BulkResult:
+        items = list(items)
+        try:
+            return self.inner.update_many(items, chunk_size)
+        finally:
+            self._invalidate(self.inner._item_id(item) for item in items)
+
+    def delete_many(self, item_ids: Iterable[Any], chunk_size: int = 500) -> BulkResult:
+        item_ids = list(item_ids)
+        try:
+            return self.inner.delete_many(item_ids, chunk_size)
+        finally:
+            self._invalidate(item_ids)
+
+    def upsert_many(self, items: Iterable[T], chunk_size: int = 500) -> BulkResult:
+        items = list(items)
+        try:
+            return self.inner.upsert_many(items, chunk_size)
+        finally:
+            self._invalidate(self.inner._item_id(item) for item in items)
+
+    def iter_all(self, batch_size: int = 500, fields: Optional[Sequence[str]] = None) -> Iterator[T]:
+        return self.inner.iter_all(batch_size, fields)
+
+    def page(self, after_key: Optional[Any] = None, limit: int = 100,
+             fields: Optional[Sequence[str]] = None) -> Page[T]:
+        return self.inner.page(after_key, limit, fields)
+
+    def _item_id(self, item: T) -> Any:
+        return self.inner._item_id(item)
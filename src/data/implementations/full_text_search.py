@@ -0,0 +1,214 @@
+# full_text_search.py
+"""
+FTS5 full-text search over generated_prompts.prompt_content and
+ai_analysis_results.ai_response_raw.
+
+The FTS tables hold their own copy of the plain text, kept in sync by triggers
+on the source tables. That copy is never compressed: text_codec shrinks the source
+columns only, and the index costs at least the text's size again. The triggers call no application SQL functions, so any
+connection (the sqlite3 shell included) can write the tables: they index values
+stored as TEXT and drop the entry of a deleted row. A value the app stores
+compressed (see text_codec.py) is a BLOB the triggers skip; the writer indexes
+its plain text through index_stored_text in the same transaction.
+AnalysisSearch ranks matches with bm25, returns highlighted snippets and filters
+by session and date.
+"""
+import sqlite3
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from loguru import logger
+
+from src.data.implementations import prp_database, text_codec
+from src.data.implementations.read_replicas import ReplicaManager, read_connection
+
+# '_' is kept inside tokens so identifiers such as cuda_runtime or no_module match as a whole.
+FTS_TOKENIZER = "unicode61 remove_diacritics 2 tokenchars '_'"
+
+# (fts table, source table, key column, text column)
+FTS_INDEXES = (
+    ("generated_prompts_fts", "generated_prompts", "prompt_id", "prompt_content"),
+    ("ai_analysis_results_fts", "ai_analysis_results", "result_id", "ai_response_raw"),
+)
+
+KIND_PROMPT = "prompt"
+KIND_RESULT = "result"
+
+
+def _index_statements(fts: str, table: str, key: str, column: str) -> List[str]:
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({column}, tokenize=\"{FTS_TOKENIZER}\")",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} WHEN typeof(NEW.{column}) = 'text' BEGIN
+            INSERT INTO {fts} (rowid, {column}) VALUES (NEW.{key}, NEW.{column});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM {fts} WHERE rowid = OLD.{key};
+        END
+        """,
+        # Compressing a row in place (text_codec.compress_existing_rows) stores a BLOB with
+        # the same text, so its index entry stays as is.
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {table}
+        WHEN typeof(NEW.{column}) = 'text' AND NEW.{column} IS NOT OLD.{column} BEGIN
+            DELETE FROM {fts} WHERE rowid = OLD.{key};
+            INSERT INTO {fts} (rowid, {column}) VALUES (NEW.{key}, NEW.{column});
+        END
+        """,
+    ]
+
+
+def _populate(conn: sqlite3.Connection, fts: str, table: str, key: str, column: str) -> None:
+    conn.execute(f"INSERT INTO {fts} (rowid, {column}) SELECT {key}, {column} FROM {table} "
+                 f"WHERE typeof({column}) = 'text'")
+    # Compressed rows are decompressed here rather than by prp_decompress(), in batches.
+    compressed = conn.execute(f"SELECT {key}, {column} FROM {table} WHERE typeof({column}) = 'blob'")
+    text_codec.load_dictionaries(conn)
+    while batch := compressed.fetchmany(500):
+        conn.executemany(f"INSERT INTO {fts} (rowid, {column}) VALUES (?, ?)",
+                         [(row_id, text_codec.decompress_text(value)) for row_id, value in batch])
+
+
+def ensure_search_schema(conn: sqlite3.Connection) -> None:
+    """Creates the FTS indexes and their triggers; an index created over existing rows is built from them."""
+    for fts, table, key, column in FTS_INDEXES:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)).fetchone()
+        for statement in _index_statements(fts, table, key, column):
+            conn.execute(statement)
+        if not exists:
+            _populate(conn, fts, table, key, column)
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> None:
+    """Rebuilds the FTS indexes from the source tables and merges their segments."""
+    for fts, table, key, column in FTS_INDEXES:
+        conn.execute(f"DELETE FROM {fts}")
+        _populate(conn, fts, table, key, column)
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('optimize')")
+
+
+def index_stored_text(conn: sqlite3.Connection, table: str, rows: Iterable[Tuple[int, str]]) -> None:
+    """
+    Indexes the plain text of rows just written to `table`, given as (row id, text) pairs, in
+    the caller's transaction. Only rows stored compressed need it (the triggers index the
+    rest); nothing is done when the database has no index.
+    """
+    fts, _, key, column = next(index for index in FTS_INDEXES if index[1] == table)
+    texts = dict(rows)
+    if not texts or conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)).fetchone() is None:
+        return
+    row_ids = list(texts)
+    for start in range(0, len(row_ids), 500):
+        chunk = row_ids[start:start + 500]
+        compressed = [row_id for (row_id,) in conn.execute(
+            f"SELECT {key} FROM {table} WHERE typeof({column}) = 'blob' AND {key} IN ({', '.join('?' * len(chunk))})",
+            chunk,
+        )]
+        conn.executemany(f"DELETE FROM {fts} WHERE rowid = ?", [(row_id,) for row_id in compressed])
+        conn.executemany(f"INSERT INTO {fts} (rowid, {column}) VALUES (?, ?)",
+                         [(row_id, texts[row_id]) for row_id in compressed])
+
+
+def text_indexer(table: str) -> Callable[[sqlite3.Connection, List[Any]], None]:
+    """An EntityMapping.after_write hook that indexes the written entities' compressed text."""
+    _, _, key, column = next(index for index in FTS_INDEXES if index[1] == table)
+
+    def index(conn: sqlite3.Connection, items: List[Any]) -> None:
+        index_stored_text(conn, table, ((getattr(item, key), getattr(item, column)) for item in items
+                                        if getattr(item, key) is not None and isinstance(getattr(item, column), str)))
+    return index
+
+
+def to_match_expression(text: str) -> str:
+    """
+    Turns free text into an FTS5 query that matches all of its terms, so input like
+    `ModuleNotFoundError: torch` is not parsed as FTS5 syntax. A trailing '*' keeps prefix search.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word.rstrip("*") if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+@dataclass
+class SearchHit:
+    kind: str                      # 'prompt' or 'result'
+    row_id: int                    # prompt_id or result_id
+    session_id: int
+    timestamp: str
+    score: float                   # bm25; lower is a better match
+    snippet: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class AnalysisSearch:
+    """
+    Ranked full-text search over prompts and AI responses in prp.db. With `replicas`,
+    searches run on its read-only snapshots (see read_replicas.py).
+    """
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, highlight: Tuple[str, str] = ("[", "]"),
+                 snippet_tokens: int = 16, replicas: Optional[ReplicaManager] = None):
+        self.db_path = db_path
+        self.highlight = highlight
+        self.snippet_tokens = snippet_tokens
+        self.replicas = replicas
+        with prp_database.transaction(self.db_path) as conn:
+            prp_database.initialize_schema(conn)
+            ensure_search_schema(conn)
+        if replicas is not None:
+            replicas.refresh()  # A snapshot taken before the index was created would have no FTS tables.
+
+    def _query(self, kind: str, match: str, session_id: Optional[int], since: Optional[str],
+               until: Optional[str], limit: int) -> Tuple[str, List[Any]]:
+        if kind == KIND_PROMPT:
+            fts, source = "generated_prompts_fts", "generated_prompts p ON p.prompt_id = f.rowid"
+            columns, timestamp = "p.prompt_id, p.session_id, p.creation_timestamp", "p.creation_timestamp"
+        else:
+            fts = "ai_analysis_results_fts"
+            source = ("ai_analysis_results r ON r.result_id = f.rowid "
+                      "JOIN generated_prompts p ON p.prompt_id = r.prompt_id")
+            columns, timestamp = "r.result_id, p.session_id, r.response_timestamp", "r.response_timestamp"
+        clauses, params = [f"{fts} MATCH ?"], [match]
+        for clause, value in (("p.session_id = ?", session_id), (f"{timestamp} >= ?", since), (f"{timestamp} < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = (f"SELECT {columns}, bm25({fts}) AS score, "
+               f"snippet({fts}, 0, ?, ?, '…', ?) FROM {fts} f JOIN {source} "
+               f"WHERE {' AND '.join(clauses)} ORDER BY score LIMIT ?")
+        return sql, [self.highlight[0], self.highlight[1], self.snippet_tokens, *params, limit]
+
+    def search(self, text: str, kinds: Sequence[str] = (KIND_PROMPT, KIND_RESULT), session_id: Optional[int] = None,
+               since: Optional[str] = None, until: Optional[str] = None, limit: int = 20,
+               raw: bool = False) -> List[SearchHit]:
+        """
+        Returns the best `limit` matches across the requested kinds, best first.
+        `since`/`until` are ISO timestamps (until is exclusive). With raw=True, `text`
+        is passed to FTS5 unchanged (phrases, OR, NEAR, column filters).
+        Raises ValueError for an empty query or invalid FTS5 syntax.
+        """
+        match = text.strip() if raw else to_match_expression(text)
+        if not match:
+            raise ValueError("Search text is empty.")
+        hits: List[SearchHit] = []
+        try:
+            with read_connection(self.db_path, self.replicas) as conn:
+                for kind in kinds:
+                    if kind not in (KIND_PROMPT, KIND_RESULT):
+                        raise ValueError(f"Unknown search kind: {kind}")
+                    sql, params = self._query(kind, match, session_id, since, until, limit)
+                    hits.extend(SearchHit(kind, *row) for row in conn.execute(sql, params))
+        except sqlite3.OperationalError as e:
+            if "fts5" in str(e) or "syntax" in str(e):
+                raise ValueError(f"Invalid search query: {e}") from e
+            raise
+        hits.sort(key=lambda hit: hit.score)
+        logger.debug(f"Full-text search for {match!r} returned {len(hits[:limit])} hits.")
+        return hits[:limit]
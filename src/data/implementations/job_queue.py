@@ -0,0 +1,297 @@
+# job_queue.py
+"""
+A durable job queue in prp.db.
+
+Jobs are rows in the `jobs` table, so they survive restarts and can be enqueued
+by one process (the web app) and run by another (the workers). A worker claims
+the highest-priority ready job with a lease: the job stays 'running' until its
+lease (the visibility timeout) expires, after which another worker may claim it
+again. A job that fails is retried with exponential backoff until it runs out of
+attempts.
+
+A job may belong to an analysis session; analysis_sessions.status then follows
+the job's state in the same transaction as each transition.
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from loguru import logger
+
+from config import config
+from src.data.implementations import prp_database
+from src.data.implementations.sqlite_crud_repository import SQLiteConnectionPool
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# analysis_sessions.status for each job state.
+SESSION_STATUS = {
+    JOB_QUEUED: "queued",
+    JOB_RUNNING: "running",
+    JOB_SUCCEEDED: "completed_successfully",
+    JOB_FAILED: "failed",
+}
+
+# session_id is not a foreign key: retention may archive a session while its job row stays behind.
+JOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,                        -- Which handler runs the job (e.g. 'analysis')
+    payload TEXT NOT NULL,                     -- JSON arguments for the handler
+    priority INTEGER NOT NULL DEFAULT 0,       -- Higher runs first
+    state TEXT NOT NULL,                       -- 'queued', 'running', 'succeeded' or 'failed'
+    attempts INTEGER NOT NULL DEFAULT 0,       -- Times the job has been claimed
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,                -- Unix time: when a queued job may run, or a running job's lease ends
+    lease_owner TEXT,                          -- Worker holding the current lease
+    session_id INTEGER,                        -- analysis_sessions row whose status follows this job
+    result TEXT,                               -- JSON returned by the handler
+    error TEXT,                                -- Last failure
+    created_timestamp TEXT NOT NULL,           -- ISO 8601
+    finished_timestamp TEXT                    -- ISO 8601, once succeeded or failed
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (state, priority DESC, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs (session_id);
+"""
+
+
+def initialize_job_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(JOB_SCHEMA)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for a failure that retrying cannot fix; the job fails at once."""
+    def __init__(self, message: str, session_status: Optional[str] = None):
+        super().__init__(message)
+        self.session_status = session_status
+
+
+@dataclass
+class Job:
+    job_id: int
+    kind: str
+    payload: Dict[str, Any]
+    priority: int
+    state: str
+    attempts: int
+    max_attempts: int
+    available_at: float
+    lease_owner: Optional[str] = None
+    session_id: Optional[int] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_timestamp: Optional[str] = None
+    finished_timestamp: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        values = dict(row)
+        values["payload"] = json.loads(values["payload"])
+        values["result"] = json.loads(values["result"]) if values["result"] is not None else None
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# Called inside the completing transaction, e.g. to store what the job produced atomically with
+# its state. Returns the result to keep in jobs.result (such as the ids of the rows it wrote).
+CompletionHook = Callable[[sqlite3.Connection, Job, Any], Any]
+
+
+class SQLiteJobQueue:
+    """
+    The jobs table in prp.db (or `db_path`), shared by any number of threads and processes.
+
+    Every transition is guarded by the lease: a worker whose lease has expired (and
+    whose job was claimed by another worker) can no longer complete or fail it.
+    """
+    def __init__(self, db_path: Optional[Union[str, Path]] = None,
+                 visibility_timeout: float = config.JOB_VISIBILITY_TIMEOUT_SECONDS,
+                 max_attempts: int = config.JOB_MAX_ATTEMPTS,
+                 retry_delay: float = config.JOB_RETRY_DELAY_SECONDS,
+                 pool: Optional[SQLiteConnectionPool] = None):
+        self.pool = pool or SQLiteConnectionPool(db_path or config.PRP_DB_PATH)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        conn = self.pool.connection()
+        with conn:
+            prp_database.initialize_schema(conn)
+            initialize_job_schema(conn)
+
+    @staticmethod
+    def worker_id() -> str:
+        """Identifies the calling thread across processes and hosts, e.g. 'host:1234:job-worker-0'."""
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+    def _set_session_status(self, conn: sqlite3.Connection, session_id: Optional[int], status: str) -> None:
+        if session_id is not None:
+            conn.execute("UPDATE analysis_sessions SET status = ? WHERE session_id = ?", (status, session_id))
+
+    # --- Producers ---
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], priority: int = 0, session_id: Optional[int] = None,
+                max_attempts: Optional[int] = None, delay: float = 0.0,
+                conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Adds a job and returns its id; the session's status becomes 'queued'. Pass `conn`
+        to enqueue inside the caller's transaction (e.g. the one creating the session).
+        """
+        own = conn is None
+        conn = conn or self.pool.connection()
+        try:
+            job_id = conn.execute(
+                "INSERT INTO jobs (kind, payload, priority, state, max_attempts, available_at, session_id, created_timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, json.dumps(payload), priority, JOB_QUEUED, max_attempts or self.max_attempts,
+                 time.time() + delay, session_id, _now_iso()),
+            ).lastrowid
+            self._set_session_status(conn, session_id, SESSION_STATUS[JOB_QUEUED])
+            if own:
+                conn.commit()
+        except Exception:
+            if own:
+                conn.rollback()
+            raise
+        return job_id
+
+    # --- Workers ---
+
+    def claim(self, kinds: Optional[Sequence[str]] = None, worker: Optional[str] = None) -> Optional[Job]:
+        """
+        Leases the highest-priority ready job (oldest first among equals), or returns None.
+        Ready means queued and due, or running with an expired lease. An expired job
+        with no attempts left is failed instead of being handed out again.
+        """
+        worker = worker or self.worker_id()
+        kind_filter = f"AND kind IN ({', '.join('?' for _ in kinds)})" if kinds else ""
+        conn = self.pool.connection()
+        while True:
+            now = time.time()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")  # One claimer at a time, so a job is leased once.
+                row = conn.execute(
+                    f"SELECT * FROM jobs WHERE state IN (?, ?) AND available_at <= ? {kind_filter} "
+                    f"ORDER BY priority DESC, job_id LIMIT 1",
+                    (JOB_QUEUED, JOB_RUNNING, now, *(kinds or ())),
+                ).fetchone()
+                if row is None:
+                    return None
+                job = Job.from_row(row)
+                if job.state == JOB_RUNNING and job.attempts >= job.max_attempts:
+                    self._finish(conn, job, JOB_FAILED, error=job.error or "Lease expired on the last attempt.")
+                    logger.warning(f"Job {job.job_id} ({job.kind}) failed: lease expired after {job.attempts} attempts.")
+                    continue
+                job.state, job.attempts, job.lease_owner = JOB_RUNNING, job.attempts + 1, worker
+                job.available_at = now + self.visibility_timeout
+                conn.execute(
+                    "UPDATE jobs SET state = ?, attempts = ?, lease_owner = ?, available_at = ? WHERE job_id = ?",
+                    (job.state, job.attempts, worker, job.available_at, job.job_id),
+                )
+                self._set_session_status(conn, job.session_id, SESSION_STATUS[JOB_RUNNING])
+            return job
+
+    def heartbeat(self, job: Job) -> bool:
+        """Extends the lease on a running job. Returns False when the lease was lost."""
+        available_at = time.time() + self.visibility_timeout
+        conn = self.pool.connection()
+        with conn:
+            extended = conn.execute(
+                "UPDATE jobs SET available_at = ? WHERE job_id = ? AND state = ? AND lease_owner = ? AND attempts = ?",
+                (available_at, job.job_id, JOB_RUNNING, job.lease_owner, job.attempts),
+            ).rowcount
+        if extended:
+            job.available_at = available_at
+        return bool(extended)
+
+    def _owns(self, conn: sqlite3.Connection, job: Job) -> bool:
+        return conn.execute(
+            "SELECT 1 FROM jobs WHERE job_id = ? AND state = ? AND lease_owner = ? AND attempts = ?",
+            (job.job_id, JOB_RUNNING, job.lease_owner, job.attempts),
+        ).fetchone() is not None
+
+    def _finish(self, conn: sqlite3.Connection, job: Job, state: str, result: Any = None,
+                error: Optional[str] = None, session_status: Optional[str] = None) -> None:
+        conn.execute(
+            "UPDATE jobs SET state = ?, result = ?, error = ?, lease_owner = NULL, finished_timestamp = ? WHERE job_id = ?",
+            (state, json.dumps(result) if result is not None else None, error, _now_iso(), job.job_id),
+        )
+        self._set_session_status(conn, job.session_id, session_status or SESSION_STATUS[state])
+
+    def complete(self, job: Job, result: Any = None, on_complete: Optional[CompletionHook] = None) -> bool:
+        """
+        Marks a leased job as succeeded. `on_complete(conn, job, result)` runs in the same
+        transaction and its return value is stored instead of `result`.
+        Returns False (and changes nothing) when the lease was lost.
+        """
+        conn = self.pool.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if not self._owns(conn, job):
+                logger.warning(f"Job {job.job_id}: lease lost before completion; the result is discarded.")
+                return False
+            if on_complete is not None:
+                result = on_complete(conn, job, result)
+            self._finish(conn, job, JOB_SUCCEEDED, result=result)
+        return True
+
+    def fail(self, job: Job, error: str, retry: bool = True, session_status: Optional[str] = None) -> bool:
+        """
+        Records a failed attempt. The job is queued again after retry_delay * 2^(attempts - 1)
+        seconds while it has attempts left and `retry` is True; otherwise it fails for good.
+        Returns False when the lease was lost.
+        """
+        conn = self.pool.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if not self._owns(conn, job):
+                return False
+            if retry and job.attempts < job.max_attempts:
+                delay = self.retry_delay * 2 ** (job.attempts - 1)
+                conn.execute(
+                    "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, available_at = ? WHERE job_id = ?",
+                    (JOB_QUEUED, error, time.time() + delay, job.job_id),
+                )
+                self._set_session_status(conn, job.session_id, SESSION_STATUS[JOB_QUEUED])
+                logger.info(f"Job {job.job_id} ({job.kind}) attempt {job.attempts} failed; retrying in {delay:.0f}s: {error}")
+            else:
+                self._finish(conn, job, JOB_FAILED, error=error, session_status=session_status)
+                logger.warning(f"Job {job.job_id} ({job.kind}) failed after {job.attempts} attempt(s): {error}")
+        return True
+
+    # --- Status ---
+
+    def get(self, job_id: int) -> Optional[Job]:
+        row = self.pool.connection().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def counts(self) -> Dict[str, int]:
+        """Jobs per state."""
+        rows = self.pool.connection().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def recent(self, state: Optional[str] = None, limit: int = 50) -> List[Job]:
+        """The newest jobs, optionally only those in one state."""
+        sql, params = "SELECT * FROM jobs", []
+        if state:
+            sql, params = sql + " WHERE state = ?", [state]
+        rows = self.pool.connection().execute(f"{sql} ORDER BY job_id DESC LIMIT ?", (*params, limit)).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    def close(self) -> None:
+        self.pool.close_all()
@@ -0,0 +1,100 @@
+# mock_model_schema.py
+"""
+Schema and seed rows of the mock model database (config.DB_PATH): models, comparisons,
+inferred_connections and questions_and_hypotheses. Used by admin/create_mock_data.py
+and admin/generate_synthetic_data.py.
+"""
+
+# --- Mock LLM Data ---
+_cellular_biology_data = [
+    ("BioBot Alpha", "Cellular Biology", "chloroplast function"),
+    ("MitoMind", "Cellular Biology", "ATP synthesis"),
+    ("CytoClone 3", "Cellular Biology", "glycolysis pathway"),
+    ("PhotosynthAI", "Cellular Biology", "light-dependent reactions"),
+    ("KrebsLogic", "Cellular Biology", "citric acid cycle enzymes"),
+    ("EnzymeGen", "Cellular Biology", "protein folding in organelles"),
+    ("GeneLinker", "Cellular Biology", "DNA replication stages"),
+    ("MembraneMind", "Cellular Biology", "cell membrane transport"),
+    ("RibosomeAI", "Cellular Biology", "mRNA translation"),
+    ("CellCycleX", "Cellular Biology", "mitosis checkpoints"),
+]
+_cosmology_data = [
+    ("CosmoComp", "Cosmology", "dark matter distribution"),
+    ("GalaxyForge", "Cosmology", "spiral arm formation"),
+    ("StarBirthAI", "Cosmology", "stellar nursery dynamics"),
+    ("BlackHoleNet", "Cosmology", "accretion disk physics"),
+    ("UniverseSim 7", "Cosmology", "cosmic microwave background"),
+    ("ClusterMind", "Cosmology", "galaxy cluster mergers"),
+    ("RedshiftAI", "Cosmology", "Hubble constant values"),
+    ("Gravitron", "Cosmology", "large-scale structure growth"),
+    ("QuasarSense", "Cosmology", "active galactic nuclei"),
+    ("NebulaGen", "Cosmology", "interstellar medium properties"),
+]
+_human_biology_data = [
+    ("NeuroConnect", "Human Biology", "neurotransmitter pathways"),
+    ("CardioSys", "Human Biology", "cardiac cycle mechanics"),
+    ("ImmunoNet", "Human Biology", "T-cell activation"),
+    ("RenalFlow", "Human Biology", "nephron filtration"),
+    ("HormoneAI", "Human Biology", "endocrine feedback loops"),
+    ("MusculoMind", "Human Biology", "sarcomere contraction"),
+    ("HepaticGen", "Human Biology", "liver detoxification enzymes"),
+    ("DermoScan", "Human Biology", "skin barrier function"),
+    ("BoneSynth", "Human Biology", "osteoblast activity"),
+    ("VascNet", "Human Biology", "blood vessel elasticity"),
+]
+ALL_MOCK_LLMS_LIST = _cellular_biology_data + _cosmology_data + _human_biology_data
+
+# --- Database Schema Content ---
+DB_SCHEMA_CONTENT = """
+PRAGMA foreign_keys = ON;
+
+DROP TABLE IF EXISTS models;
+CREATE TABLE models (
+    model_id        VARCHAR(255) PRIMARY KEY NOT NULL,
+    name            VARCHAR(255) NOT NULL,
+    domain          VARCHAR(255) NOT NULL,
+    focus           TEXT,
+    description     TEXT
+);
+
+DROP TABLE IF EXISTS comparisons;
+CREATE TABLE comparisons (
+    comparison_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    model_id_1          VARCHAR(255) NOT NULL,
+    model_id_2          VARCHAR(255) NOT NULL,
+    comparison_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    user_session_id     VARCHAR(255),
+    FOREIGN KEY (model_id_1) REFERENCES models (model_id),
+    FOREIGN KEY (model_id_2) REFERENCES models (model_id)
+);
+
+DROP TABLE IF EXISTS inferred_connections;
+CREATE TABLE inferred_connections (
+    connection_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+    comparison_id   INTEGER NOT NULL,
+    connection_text TEXT NOT NULL,
+    connection_type VARCHAR(100),
+    confidence_score DECIMAL(3,2),
+    generated_by_ai BOOLEAN,
+    timestamp       DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (comparison_id) REFERENCES comparisons (comparison_id)
+);
+
+DROP TABLE IF EXISTS questions_and_hypotheses;
+CREATE TABLE questions_and_hypotheses (
+    question_id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_text       TEXT NOT NULL,
+    submitted_by_user_id VARCHAR(255),
+    submission_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    related_comparison_id INTEGER,
+    FOREIGN KEY (related_comparison_id) REFERENCES comparisons (comparison_id)
+);
+"""
+
+
+def mock_model_id(name: str, domain: str) -> str:
+    """
+    The model_id used for a mock LLM,
+    e.g. ('BioBot Alpha', 'Cellular Biology') -> 'cellular-biobot-alpha'.
+    """
+    return f"{domain.split()[0].lower()}-{name.replace(' ', '-').lower()}"
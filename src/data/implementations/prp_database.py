@@ -0,0 +1,96 @@
+# prp_database.py
+"""
+Schema and connection helpers for the analysis database (prp.db).
+"""
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from config import config
+from src.data.implementations import text_codec
+
+PRP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_sessions (
+    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    target_repository_identifier TEXT NOT NULL, -- Path or identifier of the repo analyzed
+    analysis_timestamp TEXT NOT NULL,          -- ISO 8601 timestamp of session creation
+    user_notes TEXT,                           -- Optional notes provided by the user
+    status TEXT                                -- Current status (e.g., 'created', 'failed_data_collection', 'completed_successfully')
+);
+CREATE TABLE IF NOT EXISTS system_profiles (
+    profile_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL,               -- Foreign key to analysis_sessions
+    profile_timestamp TEXT NOT NULL,           -- ISO 8601 timestamp of profile collection
+    profile_data TEXT NOT NULL,                -- A single JSON blob of the entire system profile
+    FOREIGN KEY (session_id) REFERENCES analysis_sessions (session_id)
+);
+CREATE TABLE IF NOT EXISTS repository_snapshots (
+    snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL,               -- Foreign key to analysis_sessions
+    snapshot_data TEXT NOT NULL,               -- A single JSON blob of all captured file contents
+    creation_timestamp TEXT NOT NULL,          -- ISO 8601 timestamp of snapshot creation
+    FOREIGN KEY (session_id) REFERENCES analysis_sessions (session_id)
+);
+CREATE TABLE IF NOT EXISTS generated_prompts (
+    prompt_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL,               -- Foreign key to analysis_sessions
+    prompt_type TEXT,                          -- Type of prompt (e.g., 'initial_analysis', 'follow_up')
+    template_name_used TEXT,                   -- Filename of the template used
+    prompt_content TEXT NOT NULL,              -- The full text of the prompt
+    creation_timestamp TEXT NOT NULL,          -- ISO 8601 timestamp of prompt generation
+    FOREIGN KEY (session_id) REFERENCES analysis_sessions (session_id)
+);
+CREATE TABLE IF NOT EXISTS ai_analysis_results (
+    result_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    prompt_id INTEGER NOT NULL,                -- Foreign key to generated_prompts
+    ai_response_raw TEXT NOT NULL,             -- The raw text response received from the AI
+    response_timestamp TEXT NOT NULL,          -- ISO 8601 timestamp of response reception
+    parsed_system_requirements_json TEXT,      -- JSON string of parsed system requirements
+    parsed_dependencies_json TEXT,             -- JSON string of parsed dependencies (if AI provides this)
+    FOREIGN KEY (prompt_id) REFERENCES generated_prompts (prompt_id)
+);
+"""
+
+
+def connect(db_path: Optional[Union[str, Path]] = None, timeout: float = 30.0) -> sqlite3.Connection:
+    """
+    Opens a connection to prp.db (or the given path) with foreign keys enforced, Row access
+    and the text codec's SQL functions. `timeout` is how long a writer waits for a lock
+    held by another connection or process.
+    """
+    db_path = Path(db_path) if db_path else config.PRP_DB_PATH
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=timeout)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    text_codec.register_text_codec(conn)
+    return conn
+
+
+@contextmanager
+def transaction(db_path: Optional[Union[str, Path]] = None) -> Iterator[sqlite3.Connection]:
+    """Yields a connection inside a transaction that is committed on success and rolled back on error."""
+    conn = connect(db_path)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def initialize_schema(conn: sqlite3.Connection) -> None:
+    """
+    Creates the prp.db tables if they do not exist yet. A new database is switched to
+    incremental auto-vacuum first, so space freed by retention can be reclaimed in steps,
+    and compresses prompt and response text from the start (see text_codec; an existing
+    database opts in through text_codec.compress_existing_rows).
+    """
+    new = conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+    if new and not conn.in_transaction:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")  # Applies the setting even when the journal mode already wrote a header (WAL).
+    conn.executescript(PRP_SCHEMA)
+    if new:
+        text_codec.initialize_codec_schema(conn)
+        text_codec.register_text_codec(conn)
@@ -0,0 +1,269 @@
+# read_replicas.py
+"""
+Read-only snapshot replicas of prp.db for reporting and dashboard queries.
+
+ReplicaManager copies the primary database into a new snapshot file with SQLite's
+online backup API, a few hundred pages per step, so the primary is only read-locked
+for one short step at a time. Read-only queries then run on the newest snapshot,
+opened immutable (no locks, no journal), as long as it is no older than the
+configured staleness bound. Without a fresh enough snapshot they fall back to the
+primary. Long analytics queries therefore never hold locks on prp.db, and writers
+stop seeing SQLITE_BUSY caused by them.
+
+Snapshots are never modified. A refresh writes the next generation beside the
+current one, and a superseded snapshot is deleted once its last reader is done.
+
+Each copy reads the whole primary and writes it out again, so its cost grows with
+prp.db, not with what changed. A refresh therefore first checks PRAGMA data_version
+and, when nothing was committed since the last copy, only marks the current snapshot
+fresh. On a large, busy database raise PRP_REPLICA_REFRESH_SECONDS (and with it
+PRP_REPLICA_MAX_STALENESS_SECONDS) until Snapshot.copy_seconds is a small share of
+the interval; PRP_REPLICA_BACKUP_PAGES trades copy speed against how long each step
+holds the primary's read lock.
+"""
+import time
+import shutil
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+from loguru import logger
+
+from config import config
+from src.data.implementations import prp_database
+from src.data.implementations.text_codec import register_text_codec
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+@dataclass
+class Snapshot:
+    """One generation of the replica."""
+    path: Path
+    generation: int
+    as_of: float                   # time.time() when last found current: everything committed by then is in it
+    copy_seconds: float
+    readers: int = 0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.as_of
+
+
+class ReplicaManager:
+    """
+    Keeps a read-only snapshot of prp.db (or the given path) at most `max_staleness`
+    seconds old. start() refreshes it every `refresh_interval` seconds on a background
+    thread; refresh() takes one synchronously. Each manager owns a directory of its own
+    under `replica_dir`, removed by close().
+    """
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, replica_dir: Optional[Union[str, Path]] = None,
+                 max_staleness: float = config.PRP_REPLICA_MAX_STALENESS_SECONDS,
+                 refresh_interval: float = config.PRP_REPLICA_REFRESH_SECONDS,
+                 pages: int = config.PRP_REPLICA_BACKUP_PAGES, step_sleep: float = 0.01, max_restarts: int = 3):
+        self.db_path = Path(db_path) if db_path else config.PRP_DB_PATH
+        self.max_staleness = max_staleness
+        self.refresh_interval = refresh_interval
+        self.pages = pages
+        self.step_sleep = step_sleep
+        self.max_restarts = max_restarts
+        parent = Path(replica_dir) if replica_dir else config.PRP_REPLICA_DIR
+        parent.mkdir(parents=True, exist_ok=True)
+        self.directory = Path(tempfile.mkdtemp(prefix=f"{self.db_path.stem}-", dir=parent))
+        self.fallbacks = 0                          # Reads served by the primary for want of a fresh snapshot
+        self.unchanged = 0                          # Refreshes that found nothing new to copy
+        self._source: Optional[sqlite3.Connection] = None
+        self._copied_version: Optional[int] = None  # The source's data_version when the current snapshot was copied
+        self._current: Optional[Snapshot] = None
+        self._retired: List[Snapshot] = []
+        self._generation = 0
+        self._lock = threading.Lock()               # Guards the snapshot list and reader counts
+        self._refresh_lock = threading.Lock()       # One copy at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def current(self) -> Optional[Snapshot]:
+        return self._current
+
+    # --- Copying ---
+
+    def _copy(self, source: sqlite3.Connection, target: sqlite3.Connection) -> int:
+        """
+        Backs up in steps of `pages`. A write to the primary between steps restarts the
+        copy; after `max_restarts` it finishes in a single step instead, which holds one
+        read transaction (in WAL mode that does not block writers either). Returns the restarts.
+        """
+        restarts, remaining = 0, None
+
+        def progress(status: int, left: int, total: int) -> None:
+            nonlocal restarts, remaining
+            if remaining is not None and left > remaining:
+                restarts += 1
+                if restarts > self.max_restarts:
+                    raise _TooManyRestarts()
+            remaining = left
+
+        try:
+            source.backup(target, pages=self.pages, progress=progress, sleep=self.step_sleep)
+        except _TooManyRestarts:
+            source.backup(target)
+        return restarts
+
+    def _source_connection(self) -> sqlite3.Connection:
+        # Kept open between refreshes: data_version only reports commits made since this connection first read it.
+        if self._source is None:
+            self._source = sqlite3.connect(self.db_path, timeout=config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+                                           check_same_thread=False)
+        return self._source
+
+    def refresh(self) -> Snapshot:
+        """
+        Copies the primary into a new snapshot, makes it current and returns it. When
+        nothing was committed since the current snapshot was copied, that one is kept
+        and only its as_of is moved forward.
+        """
+        with self._refresh_lock:
+            as_of, started = time.time(), time.perf_counter()
+            source = self._source_connection()
+            version = source.execute("PRAGMA data_version").fetchone()[0]
+            with self._lock:
+                current = self._current
+                if current is not None and version == self._copied_version:
+                    current.as_of = as_of
+                    self.unchanged += 1
+                    return current
+            self._generation += 1
+            path = self.directory / f"snapshot-{self._generation}.db"
+            target = sqlite3.connect(path)
+            target.execute("PRAGMA synchronous = OFF")  # A crash only loses a disposable copy; no fsyncs competing with writers.
+            try:
+                restarts = self._copy(source, target)
+                target.execute("PRAGMA journal_mode = DELETE")  # A plain file, so it can be opened immutable.
+            except BaseException:
+                target.close()
+                path.unlink(missing_ok=True)
+                raise
+            finally:
+                target.close()
+            self._copied_version = version  # A commit during the copy is in it too, but is copied again next time.
+            snapshot = Snapshot(path, self._generation, as_of, time.perf_counter() - started)
+            with self._lock:
+                if self._current is not None:
+                    self._retired.append(self._current)
+                self._current = snapshot
+                self._collect()
+        logger.debug(f"Replica {snapshot.generation} of {self.db_path} copied in {snapshot.copy_seconds:.3f}s "
+                     f"({restarts} restarts).")
+        return snapshot
+
+    def _collect(self) -> None:
+        # Called with self._lock held. A file still open elsewhere (Windows) is retried on the next call.
+        for snapshot in list(self._retired):
+            if snapshot.readers == 0:
+                try:
+                    snapshot.path.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+                self._retired.remove(snapshot)
+
+    # --- Background refresh ---
+
+    def start(self) -> "ReplicaManager":
+        """Takes a first snapshot, then keeps refreshing on a daemon thread."""
+        if self._thread is None:
+            self.refresh()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="prp-replicas", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except sqlite3.Error as e:
+                logger.warning(f"Replica refresh of {self.db_path} failed: {e}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        """Stops refreshing and removes the snapshot directory."""
+        self.stop()
+        with self._refresh_lock:
+            if self._source is not None:
+                self._source.close()
+                self._source = None
+        with self._lock:
+            self._current = None
+            self._retired.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    # --- Reads ---
+
+    def _acquire(self) -> Optional[Snapshot]:
+        with self._lock:
+            snapshot = self._current
+            if snapshot is None or snapshot.age > self.max_staleness:
+                self.fallbacks += 1
+                return None
+            snapshot.readers += 1
+            return snapshot
+
+    def _release(self, snapshot: Snapshot) -> None:
+        with self._lock:
+            snapshot.readers -= 1
+            self._collect()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        A connection for read-only queries: on the current snapshot when it is within the
+        staleness bound, otherwise on the primary. The snapshot stays on disk until it closes.
+        """
+        snapshot = self._acquire()
+        if snapshot is None:
+            conn = prp_database.connect(self.db_path)
+        else:
+            conn = sqlite3.connect(f"{snapshot.path.as_uri()}?immutable=1", uri=True)
+            conn.row_factory = sqlite3.Row
+            register_text_codec(conn)
+        try:
+            yield conn
+        finally:
+            conn.close()
+            if snapshot is not None:
+                self._release(snapshot)
+
+    def __enter__(self) -> "ReplicaManager":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+@contextmanager
+def read_connection(db_path: Optional[Union[str, Path]] = None,
+                    replicas: Optional[ReplicaManager] = None) -> Iterator[sqlite3.Connection]:
+    """A connection for read-only queries: through `replicas` when given, otherwise on prp.db itself."""
+    if replicas is not None:
+        with replicas.reader() as conn:
+            yield conn
+        return
+    conn = prp_database.connect(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,118 @@
+# repository_file_index.py
+"""
+Persisted per-repository file fingerprints (path, size, mtime, content hash)
+used to re-read only the files that changed since the last analysis. Captured
+text lives in the blob table (see blob_store.py), so the index holds only a
+reference and a file shared with repository snapshots is stored once.
+"""
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from src.data.implementations import prp_database
+from src.data.implementations.blob_store import BlobStore, initialize_blob_schema
+
+FILE_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repository_file_index (
+    repository_identifier TEXT NOT NULL,       -- Same identifier as analysis_sessions.target_repository_identifier
+    relative_path TEXT NOT NULL,               -- Path of the file relative to the repository root
+    size_bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,                -- SHA-256 of the file bytes
+    blob_hash TEXT,                            -- blobs row holding the captured text (NULL if the file was too large)
+    indexed_timestamp TEXT NOT NULL,           -- ISO 8601 timestamp of the last (re)read
+    PRIMARY KEY (repository_identifier, relative_path)
+);
+"""
+
+
+@dataclass
+class FileFingerprint:
+    """
+    The last known state of one captured file. `content` is only set on a freshly
+    read file (apply() stores it as a blob); fingerprints from load() carry `blob_hash`.
+    """
+    relative_path: str
+    size_bytes: int
+    mtime_ns: int
+    content_hash: str
+    blob_hash: Optional[str] = None
+    content: Optional[str] = None
+
+    def matches_stat(self, size_bytes: int, mtime_ns: int) -> bool:
+        return self.size_bytes == size_bytes and self.mtime_ns == mtime_ns
+
+
+class RepositoryFileIndex:
+    """
+    Stores file fingerprints in prp.db next to repository_snapshots.
+    A short-lived connection is opened per call so the index can be used from worker threads.
+    """
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, initialize: bool = True):
+        self.db_path = db_path
+        if not initialize:  # The caller has already created the table.
+            return
+        with prp_database.transaction(self.db_path) as conn:
+            conn.execute(FILE_INDEX_SCHEMA)
+            initialize_blob_schema(conn)
+
+    def load(self, repository_identifier: str) -> Dict[str, FileFingerprint]:
+        """Returns the fingerprints recorded for a repository, keyed by relative path."""
+        conn = prp_database.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT relative_path, size_bytes, mtime_ns, content_hash, blob_hash "
+                "FROM repository_file_index WHERE repository_identifier = ?",
+                (repository_identifier,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {row["relative_path"]: FileFingerprint(*row) for row in rows}
+
+    def read_contents(self, blob_hashes: Iterable[str]) -> Dict[str, str]:
+        """Returns the captured text of the given blobs, keyed by hash."""
+        conn = prp_database.connect(self.db_path)
+        try:
+            store = BlobStore(conn)
+            return {blob_hash: store.get(blob_hash).decode("utf-8") for blob_hash in set(blob_hashes)}
+        finally:
+            conn.close()
+
+    def apply(self, repository_identifier: str, upserted: Iterable[FileFingerprint],
+              removed: Iterable[str]) -> None:
+        """
+        Writes changed fingerprints (storing their content as blobs) and drops removed
+        paths in a single transaction.
+        """
+        with prp_database.transaction(self.db_path) as conn:
+            self.apply_on(conn, repository_identifier, upserted, removed)
+
+    @staticmethod
+    def apply_on(conn: sqlite3.Connection, repository_identifier: str, upserted: Iterable[FileFingerprint],
+                 removed: Iterable[str]) -> None:
+        """Like apply(), on a connection whose transaction the caller owns."""
+        now = datetime.now(timezone.utc).isoformat()
+        store = BlobStore(conn)
+        rows = []
+        for fp in upserted:
+            if fp.content is not None:
+                fp.blob_hash = store.put(fp.content.encode("utf-8"))
+            rows.append((repository_identifier, fp.relative_path, fp.size_bytes, fp.mtime_ns, fp.content_hash,
+                         fp.blob_hash, now))
+        conn.executemany(
+            "INSERT OR REPLACE INTO repository_file_index "
+            "(repository_identifier, relative_path, size_bytes, mtime_ns, content_hash, blob_hash, indexed_timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.executemany(
+            "DELETE FROM repository_file_index WHERE repository_identifier = ? AND relative_path = ?",
+            [(repository_identifier, path) for path in removed],
+        )
+
+    def forget(self, repository_identifier: str) -> None:
+        """Drops every fingerprint for a repository, forcing a full re-read next time."""
+        with prp_database.transaction(self.db_path) as conn:
+            conn.execute("DELETE FROM repository_file_index WHERE repository_identifier = ?", (repository_identifier,))
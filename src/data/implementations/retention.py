@@ -0,0 +1,420 @@
+# retention.py
+"""
+Retention for prp.db: sessions older than a policy move to yearly archive databases.
+
+Each archive (prp_archive_<year>.db in config.PRP_ARCHIVE_DIR) has the prp.db schema
+plus its own blob table, and prompt and response text is compressed into it with the
+blob store on the way in. Sessions are copied and then deleted batch by batch; the
+freed pages are handed back to the filesystem with incremental vacuum, a few
+thousand pages at a time, instead of a blocking VACUUM.
+
+ArchivedSessionReader ATTACHes the archives so archived sessions stay readable
+next to live ones.
+"""
+import json
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from loguru import logger
+
+from config import config
+from src.data.implementations import prp_database
+from src.data.implementations.blob_store import (
+    BlobStore, collect_garbage, file_index_hashes, initialize_blob_schema, is_manifest, referenced_hashes,
+)
+from src.data.implementations.sqlite_crud_repository import EntityMapping
+from src.data.implementations.text_codec import decompress_text
+from src.data.implementations.unit_of_work import PRP_FLUSH_ORDER
+
+ARCHIVE_PREFIX = "prp_archive_"
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Rows of the sessions staged in temp.retention_batch, per table.
+_IN_BATCH = "session_id IN (SELECT session_id FROM temp.retention_batch)"
+_BATCH_FILTERS = {
+    "analysis_sessions": _IN_BATCH,
+    "system_profiles": _IN_BATCH,
+    "repository_snapshots": _IN_BATCH,
+    "generated_prompts": _IN_BATCH,
+    "ai_analysis_results": f"prompt_id IN (SELECT prompt_id FROM main.generated_prompts WHERE {_IN_BATCH})",
+}
+# Large text columns; they dominate the bytes a session occupies.
+_TEXT_COLUMNS = (
+    ("system_profiles", "profile_data"),
+    ("repository_snapshots", "snapshot_data"),
+    ("generated_prompts", "prompt_content"),
+    ("ai_analysis_results", "ai_response_raw"),
+)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Sessions older than `max_age_days` are archived, except each repository's newest `keep_latest_per_repository`."""
+    max_age_days: int = config.PRP_RETENTION_DAYS
+    keep_latest_per_repository: int = 1
+
+    def cutoff(self, now: Optional[datetime] = None) -> str:
+        return ((now or datetime.now()) - timedelta(days=self.max_age_days)).isoformat()
+
+
+@dataclass
+class RetentionReport:
+    """What a retention run archived (or, for a dry run, would archive) and the space involved."""
+    cutoff: str
+    dry_run: bool
+    sessions_by_archive: Dict[str, int] = field(default_factory=dict)
+    profiles: int = 0
+    snapshots: int = 0
+    prompts: int = 0
+    results: int = 0
+    row_bytes: int = 0                # Text column bytes of the selected rows
+    blob_bytes: int = 0               # Stored bytes of blobs only the selected rows reference
+    blobs_collected: int = 0
+    pages_reclaimed: int = 0
+    file_bytes_before: int = 0
+    file_bytes_after: int = 0
+
+    @property
+    def sessions(self) -> int:
+        return sum(self.sessions_by_archive.values())
+
+    @property
+    def estimated_bytes(self) -> int:
+        return self.row_bytes + self.blob_bytes
+
+
+def archive_path(year: str, archive_dir: Optional[Union[str, Path]] = None) -> Path:
+    return Path(archive_dir or config.PRP_ARCHIVE_DIR) / f"{ARCHIVE_PREFIX}{year}.db"
+
+
+def list_archives(archive_dir: Optional[Union[str, Path]] = None) -> Dict[str, Path]:
+    """Returns {schema alias: path} for every archive database, oldest year first."""
+    directory = Path(archive_dir or config.PRP_ARCHIVE_DIR)
+    archives = {}
+    for path in sorted(directory.glob(f"{ARCHIVE_PREFIX}*.db")):
+        year = path.stem[len(ARCHIVE_PREFIX):]
+        if re.fullmatch(r"\d{4}", year):
+            archives[f"archive_{year}"] = path
+    return archives
+
+
+def _archive_year(timestamp: str) -> str:
+    year = (timestamp or "")[:4]
+    return year if re.fullmatch(r"\d{4}", year) else "0000"
+
+
+def initialize_archive(path: Path) -> None:
+    """Creates an archive database with the prp.db schema and a blob table (on its own connection, so it can be ATTACHed)."""
+    conn = prp_database.connect(path)
+    try:
+        prp_database.initialize_schema(conn)
+        initialize_blob_schema(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> None:
+    """
+    Switches an existing database to incremental auto-vacuum. This needs one full
+    VACUUM (blocking, and temporarily twice the file size); new databases get the setting at creation.
+    """
+    conn.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM main")
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages_per_step: int = 2000, max_steps: Optional[int] = None) -> int:
+    """
+    Returns free pages to the filesystem in steps of `pages_per_step`, each its own short
+    write transaction so readers and writers are never blocked for long. Returns the pages released.
+    """
+    if conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+        logger.warning("prp.db is not in incremental auto-vacuum mode; run enable_incremental_vacuum() once.")
+        return 0
+    released, steps = 0, 0
+    free = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+    while free and (max_steps is None or steps < max_steps):
+        # The pragma frees one page per step of the statement, so it has to be read to the end.
+        conn.execute(f"PRAGMA main.incremental_vacuum({int(pages_per_step)})").fetchall()
+        remaining = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+        released += free - remaining
+        free, steps = remaining, steps + 1
+    if conn.execute("PRAGMA main.journal_mode").fetchone()[0] == "wal":
+        conn.execute("PRAGMA main.wal_checkpoint(TRUNCATE)").fetchall()
+    return released
+
+
+def _manifest_hashes(conn: sqlite3.Connection, selected: bool) -> Set[str]:
+    """Blob hashes referenced by the staged sessions (selected=True) or by everything else, file index included."""
+    found: Set[str] = set() if selected else file_index_hashes(conn)
+    membership = "IN" if selected else "NOT IN"
+    for table, column in (("repository_snapshots", "snapshot_data"), ("system_profiles", "profile_data")):
+        for (text,) in conn.execute(
+            f"SELECT {column} FROM main.{table} WHERE session_id {membership} "
+            f"(SELECT session_id FROM temp.retention_batch) AND {column} LIKE '{{\"$manifest\"%'"
+        ):
+            referenced_hashes(json.loads(text), found)
+    return found
+
+
+class RetentionEngine:
+    """
+    Archives expired sessions from prp.db.
+
+        engine = RetentionEngine(policy=RetentionPolicy(max_age_days=365))
+        report = engine.plan()            # dry run: counts and sizes only
+        report = engine.apply()           # archive, collect blobs, incremental vacuum
+
+    Each batch is copied into the archive in one transaction and deleted from prp.db in a
+    second. (With prp.db in WAL mode SQLite does not make a transaction across attached
+    databases atomic, so one transaction would not be safer.) Archive writes are upserts:
+    an interrupted run can leave rows in both places, never in neither, and simply re-runs.
+    """
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, archive_dir: Optional[Union[str, Path]] = None,
+                 policy: Optional[RetentionPolicy] = None, batch_size: int = 100):
+        self.db_path = Path(db_path) if db_path else config.PRP_DB_PATH
+        self.archive_dir = Path(archive_dir or config.PRP_ARCHIVE_DIR)
+        self.policy = policy or RetentionPolicy()
+        self.batch_size = max(1, batch_size)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = prp_database.connect(self.db_path)
+        prp_database.initialize_schema(conn)
+        initialize_blob_schema(conn)
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS retention_batch (session_id INTEGER PRIMARY KEY)")
+        conn.commit()
+        return conn
+
+    def _expired(self, conn: sqlite3.Connection, cutoff: str) -> Dict[str, List[int]]:
+        """Returns the session ids to archive, grouped by archive year."""
+        rows = conn.execute(
+            """
+            SELECT session_id, analysis_timestamp FROM (
+                SELECT session_id, analysis_timestamp,
+                       ROW_NUMBER() OVER (PARTITION BY target_repository_identifier
+                                          ORDER BY analysis_timestamp DESC, session_id DESC) AS recency
+                FROM main.analysis_sessions
+            )
+            WHERE analysis_timestamp < ? AND recency > ?
+            ORDER BY session_id
+            """,
+            (cutoff, self.policy.keep_latest_per_repository),
+        ).fetchall()
+        by_year: Dict[str, List[int]] = {}
+        for session_id, timestamp in rows:
+            by_year.setdefault(_archive_year(timestamp), []).append(session_id)
+        return by_year
+
+    @staticmethod
+    def _stage(conn: sqlite3.Connection, session_ids: List[int]) -> None:
+        conn.execute("DELETE FROM temp.retention_batch")
+        conn.executemany("INSERT INTO temp.retention_batch (session_id) VALUES (?)", [(i,) for i in session_ids])
+
+    def _measure(self, conn: sqlite3.Connection, report: RetentionReport) -> None:
+        """Adds row counts and byte sizes of the staged sessions to the report."""
+        for table, attribute in (("system_profiles", "profiles"), ("repository_snapshots", "snapshots"),
+                                 ("generated_prompts", "prompts"), ("ai_analysis_results", "results")):
+            count = conn.execute(f"SELECT COUNT(*) FROM main.{table} WHERE {_BATCH_FILTERS[table]}").fetchone()[0]
+            setattr(report, attribute, getattr(report, attribute) + count)
+        for table, column in _TEXT_COLUMNS:
+            report.row_bytes += conn.execute(
+                f"SELECT COALESCE(SUM(LENGTH(CAST({column} AS BLOB))), 0) FROM main.{table} WHERE {_BATCH_FILTERS[table]}"
+            ).fetchone()[0]
+        only_selected = _manifest_hashes(conn, True) - _manifest_hashes(conn, False)
+        if only_selected:
+            sizes = dict(conn.execute("SELECT blob_hash, stored_size FROM main.blobs"))
+            report.blob_bytes += sum(sizes.get(blob_hash, 0) for blob_hash in only_selected)
+
+    def plan(self, now: Optional[datetime] = None) -> RetentionReport:
+        """Dry run: reports what apply() would archive, without changing anything."""
+        report = RetentionReport(cutoff=self.policy.cutoff(now), dry_run=True)
+        conn = self._open()
+        try:
+            for year, session_ids in self._expired(conn, report.cutoff).items():
+                report.sessions_by_archive[archive_path(year, self.archive_dir).name] = len(session_ids)
+                self._stage(conn, session_ids)
+                self._measure(conn, report)
+            conn.rollback()
+        finally:
+            conn.close()
+        return report
+
+    def apply(self, now: Optional[datetime] = None, vacuum_pages: int = 2000,
+              convert_to_incremental: bool = False) -> RetentionReport:
+        """
+        Archives the expired sessions, deletes blobs nothing references any more and
+        releases the freed pages. With convert_to_incremental=True a database created
+        before incremental auto-vacuum is switched over first (one full VACUUM).
+        """
+        report = RetentionReport(cutoff=self.policy.cutoff(now), dry_run=False)
+        report.file_bytes_before = self._file_bytes()
+        conn = self._open()
+        try:
+            if convert_to_incremental and conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+                logger.info("Switching prp.db to incremental auto-vacuum (one full VACUUM).")
+                enable_incremental_vacuum(conn)
+            for year, session_ids in self._expired(conn, report.cutoff).items():
+                path = archive_path(year, self.archive_dir)
+                self._archive_sessions(conn, year, path, session_ids, report)
+                report.sessions_by_archive[path.name] = len(session_ids)
+                logger.info(f"Archived {len(session_ids)} sessions into {path.name}.")
+            with conn:
+                report.blobs_collected = collect_garbage(conn)
+            report.pages_reclaimed = incremental_vacuum(conn, vacuum_pages)
+        finally:
+            conn.close()
+        report.file_bytes_after = self._file_bytes()
+        logger.info(
+            f"Retention: {report.sessions} sessions archived, {report.blobs_collected} blobs collected, "
+            f"{report.pages_reclaimed} pages reclaimed ({report.file_bytes_before} -> {report.file_bytes_after} bytes)."
+        )
+        return report
+
+    def _archive_sessions(self, conn: sqlite3.Connection, year: str, path: Path, session_ids: List[int],
+                          report: RetentionReport) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        initialize_archive(path)
+        self._stage(conn, session_ids)
+        self._measure(conn, report)
+        conn.rollback()
+        alias = f"archive_{year}"
+        conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(path),))
+        try:
+            for start in range(0, len(session_ids), self.batch_size):
+                # Copy, commit, then delete: the archive is durable before prp.db lets go of the rows.
+                with conn:
+                    self._stage(conn, session_ids[start:start + self.batch_size])
+                    self._copy_batch(conn, alias)
+                with conn:
+                    for mapping in reversed(PRP_FLUSH_ORDER):  # Children first.
+                        conn.execute(f"DELETE FROM main.{mapping.table} WHERE {_BATCH_FILTERS[mapping.table]}")
+        finally:
+            conn.execute(f"DETACH DATABASE {alias}")
+
+    def _copy_batch(self, conn: sqlite3.Connection, alias: str) -> None:
+        store = BlobStore(conn, schema=alias)  # A store per batch keeps its read cache small.
+
+        def carry(text: str, pack: Callable[[str], str]) -> str:
+            # Manifests keep their text and take their blobs along; legacy JSON is packed into the archive.
+            try:
+                data = json.loads(text)
+            except ValueError:
+                return text
+            if is_manifest(data):
+                for blob_hash in referenced_hashes(data):
+                    conn.execute(f"INSERT OR IGNORE INTO {alias}.blobs SELECT * FROM main.blobs WHERE blob_hash = ?",
+                                 (blob_hash,))
+                return text
+            return pack(text)
+
+        converters: Dict[str, Callable[[Any], Any]] = {
+            "profile_data": lambda text: carry(text, store.pack_document),
+            "snapshot_data": lambda text: carry(text, store.pack_snapshot),
+            "prompt_content": lambda value: store.pack_text(decompress_text(value)),
+            "ai_response_raw": lambda value: store.pack_text(decompress_text(value)),
+        }
+        for mapping in PRP_FLUSH_ORDER:  # Parents first.
+            columns = (mapping.key, *mapping.columns)
+            convert = [converters.get(column) for column in columns]
+            rows = [
+                tuple(value if fn is None or value is None else fn(value) for fn, value in zip(convert, row))
+                for row in conn.execute(
+                    f"SELECT {', '.join(columns)} FROM main.{mapping.table} WHERE {_BATCH_FILTERS[mapping.table]}"
+                )
+            ]
+            conn.executemany(_archive_upsert(alias, mapping), rows)
+
+    def _file_bytes(self) -> int:
+        return sum(path.stat().st_size for path in (self.db_path, Path(f"{self.db_path}-wal")) if path.exists())
+
+
+def _archive_upsert(alias: str, mapping: EntityMapping) -> str:
+    # An upsert rather than INSERT OR REPLACE: REPLACE deletes the old row first, which
+    # would trip the archive's foreign keys when a session is re-archived after an interrupted run.
+    columns = (mapping.key, *mapping.columns)
+    updates = ", ".join(f"{column} = excluded.{column}" for column in mapping.columns)
+    return (f"INSERT INTO {alias}.{mapping.table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({mapping.key}) DO UPDATE SET {updates}")
+
+
+class ArchivedSessionReader:
+    """
+    Read path over prp.db and every archive, on one connection with the archives ATTACHed.
+
+    TEMP views all_analysis_sessions, all_system_profiles, all_repository_snapshots,
+    all_generated_prompts and all_ai_analysis_results union the live and archived rows
+    and add a `source` column ('main' or 'archive_<year>'). Prompt and response text is
+    decompressed in the views, by prp_decompress() for live rows and prp_unpack() for
+    archived ones; snapshot and profile data stay manifests, as in the live tables, and
+    are reassembled by get_session().
+    SQLite attaches at most 10 databases by default, i.e. ten archive years.
+    """
+    _UNPACKED = ("prompt_content", "ai_response_raw")
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, archive_dir: Optional[Union[str, Path]] = None):
+        self.conn = prp_database.connect(db_path)
+        prp_database.initialize_schema(self.conn)
+        self.archives = list_archives(archive_dir)
+        self._stores: Dict[str, BlobStore] = {}
+        self.conn.create_function("prp_unpack", 2, self._unpack, deterministic=True)
+        for alias, path in self.archives.items():
+            self.conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(path),))
+        for mapping in PRP_FLUSH_ORDER:
+            columns = (mapping.key, *mapping.columns)
+            branches = [f"SELECT {', '.join(map(mapping.selected, columns))}, 'main' AS source FROM main.{mapping.table}"]
+            for alias in self.archives:
+                selected = [f"prp_unpack('{alias}', {column}) AS {column}" if column in self._UNPACKED else column
+                            for column in columns]
+                branches.append(f"SELECT {', '.join(selected)}, '{alias}' FROM {alias}.{mapping.table}")
+            self.conn.execute(f"DROP VIEW IF EXISTS temp.all_{mapping.table}")
+            self.conn.execute(f"CREATE TEMP VIEW all_{mapping.table} AS {' UNION ALL '.join(branches)}")
+
+    def _store(self, source: str) -> BlobStore:
+        # Archive blobs are read on a connection of their own: a SQL function must not
+        # run queries on the connection that is calling it.
+        store = self._stores.get(source)
+        if store is None:
+            store = self._stores[source] = BlobStore(prp_database.connect(self.archives[source]))
+        return store
+
+    def _unpack(self, source: str, text: Optional[str]) -> Any:
+        if text is None or source == "main":
+            return text
+        value = self._store(source).unpack(text)
+        return value if isinstance(value, str) else json.dumps(value)
+
+    def get_session(self, session_id: int) -> Optional[Dict[str, Any]]:
+        """Returns a session with its profiles, snapshots, prompts and results, wherever it is stored."""
+        session = self.conn.execute("SELECT * FROM all_analysis_sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if session is None:
+            return None
+        source = session["source"]
+        store = BlobStore(self.conn) if source == "main" else self._store(source)
+        children = {}
+        for table, column in (("system_profiles", "profile_data"), ("repository_snapshots", "snapshot_data")):
+            rows = self.conn.execute(f"SELECT * FROM all_{table} WHERE session_id = ? AND source = ?",
+                                     (session_id, source)).fetchall()
+            children[table] = [{**dict(row), column: store.unpack(row[column])} for row in rows]
+        prompts = []
+        for row in self.conn.execute("SELECT * FROM all_generated_prompts WHERE session_id = ? AND source = ? "
+                                     "ORDER BY prompt_id", (session_id, source)).fetchall():
+            results = self.conn.execute("SELECT * FROM all_ai_analysis_results WHERE prompt_id = ? AND source = ? "
+                                        "ORDER BY result_id", (row["prompt_id"], source)).fetchall()
+            prompts.append({**dict(row), "results": [dict(result) for result in results]})
+        return {**dict(session), **children, "generated_prompts": prompts}
+
+    def close(self) -> None:
+        for store in self._stores.values():
+            store.conn.close()
+        self._stores.clear()
+        self.conn.close()
+
+    def __enter__(self) -> "ArchivedSessionReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,483 @@
+# sqlite_crud_repository.py
+"""
+Generic SQLite implementation of ICrudRepository.
+
+- SQLiteConnectionPool hands each thread its own connection, opened once in WAL
+  mode with a busy timeout, so readers never wait behind a writer and writers
+  queue on the lock instead of failing with "database is locked". A thread's
+  connection is closed when the thread exits.
+- Writes commit on their own only when the connection has no open transaction;
+  inside a caller's transaction they run in a savepoint and leave the commit to it.
+- EntityMapping declares once how an entity maps to a table; the repository
+  builds its SQL from it at construction time, and the same SQL text is reused
+  on every call so sqlite3's per-connection statement cache keeps it prepared.
+- Reads build entities straight from the cursor with a row factory compiled once
+  per entity type and projection, skipping the intermediate sqlite3.Row.
+- Snapshot and profile JSON columns go through the blob store (blob_store.py): they
+  are packed into manifests on write and reassembled on read.
+"""
+import sqlite3
+import weakref
+import threading
+import dataclasses
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from loguru import logger
+
+from config import config
+from src.data.implementations import prp_database, text_codec
+from src.data.implementations.analytics_index import index_profiles
+from src.data.implementations.blob_store import MANIFEST_KEY, BlobStore
+from src.data.implementations.full_text_search import text_indexer
+from src.data.implementations.read_replicas import ReplicaManager
+from src.data.interfaces.ICrudRepository import BulkResult, ICrudRepository, Page
+from src.data.obj.entities import (
+    AIAnalysisResult, AnalysisSession, Comparison, GeneratedPrompt, Model, RepositorySnapshot, SystemProfile,
+)
+
+T = TypeVar('T')
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, max(1, size)))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def atomic(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Makes a block of writes atomic. With no transaction open it commits (or rolls back)
+    on its own; inside a caller's transaction it uses a savepoint, so a failure undoes
+    only the block and the commit stays with the caller.
+    """
+    if not conn.in_transaction:
+        with conn:
+            yield conn
+        return
+    conn.execute("SAVEPOINT crud_write")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK TO crud_write")
+        conn.execute("RELEASE crud_write")
+        raise
+    conn.execute("RELEASE crud_write")
+
+
+RowFactory = Callable[[Optional[sqlite3.Cursor], Sequence[Any]], Any]
+
+
+@lru_cache(maxsize=None)
+def compile_row_factory(entity_type: Type[T], fields: Tuple[str, ...]) -> RowFactory:
+    """
+    Returns `factory(cursor, row)` building an entity from a row holding `fields` in order,
+    usable as a cursor's row_factory. The constructor call is generated as source once per
+    (type, fields), the way dataclasses generates __init__, so each row costs one call with
+    constant indexes: positional when the row has every field in order, keywords otherwise.
+    """
+    names = tuple(field.name for field in dataclasses.fields(entity_type))
+    unknown = set(fields) - set(names)
+    if unknown:  # Also keeps anything but field names out of the generated source.
+        raise ValueError(f"{entity_type.__name__} has no fields {', '.join(sorted(unknown))}")
+    if fields == names:
+        arguments = ", ".join(f"row[{index}]" for index in range(len(fields)))
+    else:
+        arguments = ", ".join(f"{name}=row[{index}]" for index, name in enumerate(fields))
+    namespace: Dict[str, Any] = {"entity_type": entity_type}
+    exec(f"def factory(cursor, row):\n    return entity_type({arguments})\n", namespace)
+    factory = namespace["factory"]
+    factory.__qualname__ = f"{entity_type.__name__}_row_factory"
+    return factory
+
+
+class _ThreadConnection:
+    """Holds a thread's connection in its threading.local; collected (and the connection closed) when the thread exits."""
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+class SQLiteConnectionPool:
+    """
+    One connection per thread for a single database file, closed when the thread exits,
+    so thread-per-request servers do not accumulate connections.
+    `initializer` runs once, on the first connection opened (e.g. to create the schema).
+    """
+    def __init__(self, db_path: Union[str, Path], busy_timeout_ms: int = config.SQLITE_BUSY_TIMEOUT_MS,
+                 cached_statements: int = config.SQLITE_CACHED_STATEMENTS, journal_mode: str = "WAL",
+                 initializer: Optional[Callable[[sqlite3.Connection], None]] = None):
+        self.db_path = Path(db_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self.journal_mode = journal_mode
+        self._initializer = initializer
+        self._initialized = False
+        self._local = threading.local()
+        self._lock = threading.RLock()  # Reentrant: a finalizer may run while this thread holds it.
+        self._connections: List[sqlite3.Connection] = []
+
+    def _open(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False only so close_all() can close every thread's connection;
+        # each connection is otherwise used by the thread that opened it.
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.journal_mode.upper() == "WAL":
+            conn.execute("PRAGMA synchronous = NORMAL")  # Durable across application crashes in WAL mode.
+        conn.execute("PRAGMA foreign_keys = ON")
+        text_codec.register_text_codec(conn)  # prp_compress()/prp_decompress(), used by mappings with compressed columns.
+        with self._lock:
+            if not self._initialized and self._initializer is not None:
+                with conn:
+                    self._initializer(conn)
+            self._initialized = True
+            self._connections.append(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Returns the calling thread's connection, opening it on first use."""
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = self._local.holder = _ThreadConnection(self._open())
+            # threading.local drops the holder when the thread exits; the connection goes with it.
+            weakref.finalize(holder, self._release, holder.conn)
+        return holder.conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if conn not in self._connections:
+                return  # Already closed by close_all().
+            self._connections.remove(conn)
+        conn.close()
+
+    def close_all(self) -> None:
+        """Closes every connection opened by the pool. Threads get a fresh one on next use."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    @property
+    def open_connections(self) -> int:
+        return len(self._connections)
+
+
+@dataclass(frozen=True)
+class EntityMapping(Generic[T]):
+    """
+    How an entity type maps to a table: the key column and the other columns, in field order.
+    `compressed` columns are stored through the text codec (see text_codec.py); `packed`
+    maps JSON columns to the BlobStore packer ("snapshot" or "document") that stores them.
+    `after_write(conn, items)` runs in the writing transaction once items are stored with
+    their keys (e.g. to keep a derived index in step). `generated_key` is False for tables
+    whose key is not an INTEGER PRIMARY KEY, so items must bring their own.
+    """
+    entity_type: Type[T]
+    table: str
+    key: str
+    columns: Tuple[str, ...]
+    compressed: Tuple[str, ...] = ()
+    packed: Tuple[Tuple[str, str], ...] = ()
+    after_write: Optional[Callable[[sqlite3.Connection, List[T]], None]] = None
+    generated_key: bool = True
+
+    @classmethod
+    def for_dataclass(cls, entity_type: Type[T], table: str, key: Optional[str] = None,
+                      compressed: Tuple[str, ...] = (), packed: Tuple[Tuple[str, str], ...] = (),
+                      after_write: Optional[Callable[[sqlite3.Connection, List[T]], None]] = None,
+                      generated_key: bool = True) -> "EntityMapping[T]":
+        """Maps a dataclass whose field names are the column names; the key defaults to the first field."""
+        names = [field.name for field in dataclasses.fields(entity_type)]
+        key = key or names[0]
+        return cls(entity_type, table, key, tuple(name for name in names if name != key), compressed, packed,
+                   after_write, generated_key)
+
+    def placeholder(self, column: str) -> str:
+        """The parameter of a column in INSERT/UPDATE statements."""
+        return f"prp_compress('{column}', ?)" if column in self.compressed else "?"
+
+    def selected(self, column: str) -> str:
+        """The expression reading a column in SELECT statements."""
+        return f"prp_decompress({column}) AS {column}" if column in self.compressed else column
+
+    def row_factory(self, fields: Optional[Tuple[str, ...]] = None) -> RowFactory:
+        """Row factory for rows holding the key and `fields` (all columns when None); other fields keep their defaults."""
+        return compile_row_factory(self.entity_type, (self.key, *(self.columns if fields is None else fields)))
+
+    def values(self, item: T, store: Optional[BlobStore] = None) -> Tuple[Any, ...]:
+        """Column values of an item in `columns` order; packed columns are stored through `store` when given."""
+        if store is None or not self.packed:
+            return tuple(getattr(item, column) for column in self.columns)
+        packers = dict(self.packed)
+        return tuple(_pack(store, packers[column], getattr(item, column)) if column in packers
+                     else getattr(item, column) for column in self.columns)
+
+    def unpack(self, store: BlobStore, items: Iterable[T]) -> None:
+        """Replaces the manifests in the packed columns of freshly read items with the text they stand for."""
+        for item in items:
+            for column, _ in self.packed:
+                value = getattr(item, column, None)
+                if isinstance(value, str):
+                    setattr(item, column, store.unpack_text(value))
+
+
+def _pack(store: BlobStore, kind: str, value: Any) -> Any:
+    """Packs JSON text as a manifest; manifests and values that are not JSON are stored as they are."""
+    if not isinstance(value, str) or not value or value.startswith('{"' + MANIFEST_KEY):
+        return value
+    try:
+        return store.pack_snapshot(value) if kind == "snapshot" else store.pack_document(value)
+    except ValueError:
+        return value
+
+
+class SQLiteCrudRepository(ICrudRepository[T]):
+    """
+    ICrudRepository over one table, using a per-thread connection from the pool.
+    With `replicas`, reads (read_by_id, read_all, page and so iter_all) run on its
+    read-only snapshots and may lag writes by up to its staleness bound; a read made
+    while this thread's connection is inside a transaction stays on that connection,
+    so it sees the transaction's own writes.
+    """
+    def __init__(self, mapping: EntityMapping[T], pool: SQLiteConnectionPool,
+                 replicas: Optional[ReplicaManager] = None):
+        self.mapping = mapping
+        self.pool = pool
+        self.replicas = replicas
+        self._page_sql: Dict[Tuple[Optional[Tuple[str, ...]], bool], str] = {}
+        columns = ", ".join(mapping.columns)
+        placeholders = ", ".join(mapping.placeholder(column) for column in mapping.columns)
+        select = f"SELECT {mapping.key}, {', '.join(map(mapping.selected, mapping.columns))} FROM {mapping.table}"
+        self._sql: Dict[str, str] = {
+            "insert": f"INSERT INTO {mapping.table} ({columns}) VALUES ({placeholders})",
+            "insert_with_key": f"INSERT INTO {mapping.table} ({mapping.key}, {columns}) VALUES (?, {placeholders})",
+            "select_by_id": f"{select} WHERE {mapping.key} = ?",
+            "select_all": f"{select} ORDER BY {mapping.key}",
+            "update": f"UPDATE {mapping.table} SET {', '.join(f'{c} = {mapping.placeholder(c)}' for c in mapping.columns)} "
+                      f"WHERE {mapping.key} = ?",
+            "delete": f"DELETE FROM {mapping.table} WHERE {mapping.key} = ?",
+            "upsert": f"INSERT INTO {mapping.table} ({mapping.key}, {columns}) VALUES (?, {placeholders}) "
+                      f"ON CONFLICT ({mapping.key}) DO UPDATE SET "
+                      f"{', '.join(f'{c} = excluded.{c}' for c in mapping.columns)}",
+        }
+
+    def _store(self, conn: sqlite3.Connection) -> Optional[BlobStore]:
+        """The blob store packed columns go through, or None when the mapping has none."""
+        return BlobStore(conn) if self.mapping.packed else None
+
+    def _require_keys(self, items: Iterable[T]) -> None:
+        if not self.mapping.generated_key and any(getattr(item, self.mapping.key) is None for item in items):
+            raise ValueError(f"{self.mapping.table} does not generate keys; every item needs a {self.mapping.key}.")
+
+    def _written(self, conn: sqlite3.Connection, items: List[T]) -> None:
+        if self.mapping.after_write is not None and items:
+            self.mapping.after_write(conn, items)
+
+    def _unpacked(self, conn: sqlite3.Connection, result: Any) -> Any:
+        """Reassembles the packed columns of a read result (an entity, a list of them or None) read on `conn`."""
+        if self.mapping.packed and result:
+            self.mapping.unpack(BlobStore(conn), result if isinstance(result, list) else [result])
+        return result
+
+    def create(self, item: T) -> T:
+        self._require_keys([item])
+        conn = self.pool.connection()
+        item_id = getattr(item, self.mapping.key)
+        with atomic(conn):
+            values = self.mapping.values(item, self._store(conn))
+            if item_id is None:
+                cursor = conn.execute(self._sql["insert"], values)
+                setattr(item, self.mapping.key, cursor.lastrowid)
+            else:
+                conn.execute(self._sql["insert_with_key"], (item_id, *values))
+            self._written(conn, [item])
+        return item
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """The connection reads run on: a replica snapshot when there is one to use, else this thread's."""
+        conn = self.pool.connection()
+        if self.replicas is None or conn.in_transaction:
+            yield conn
+        else:
+            with self.replicas.reader() as replica:
+                yield replica
+
+    def _read(self, statement: str, params: Tuple[Any, ...] = (), fields: Optional[Tuple[str, ...]] = None,
+              one: bool = False) -> Any:
+        """Runs a SELECT of entities (one, or a list) and reassembles their packed columns."""
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = self.mapping.row_factory(fields)
+            cursor.execute(statement, params)
+            return self._unpacked(conn, cursor.fetchone() if one else cursor.fetchall())
+
+    def read_by_id(self, item_id: Any) -> Optional[T]:
+        return self._read(self._sql["select_by_id"], (item_id,), one=True)
+
+    def read_all(self) -> List[T]:
+        return self._read(self._sql["select_all"])
+
+    def update(self, item: T) -> T:
+        conn = self.pool.connection()
+        item_id = getattr(item, self.mapping.key)
+        with atomic(conn):
+            cursor = conn.execute(self._sql["update"], (*self.mapping.values(item, self._store(conn)), item_id))
+            if cursor.rowcount:
+                self._written(conn, [item])
+        if cursor.rowcount == 0:
+            raise ValueError(f"No {self.mapping.table} row with {self.mapping.key}={item_id} to update.")
+        return item
+
+    def delete(self, item_id: Any) -> None:
+        conn = self.pool.connection()
+        with atomic(conn):
+            conn.execute(self._sql["delete"], (item_id,))
+
+    # --- Bulk operations: executemany per chunk, all chunks in one transaction ---
+
+    def insert_batch(self, conn: sqlite3.Connection, chunk: List[T], result: BulkResult) -> None:
+        """Inserts items on a connection whose transaction the caller owns, assigning generated keys."""
+        self._require_keys(chunk)
+        store = self._store(conn)
+        new_items = [item for item in chunk if getattr(item, self.mapping.key) is None]
+        keyed_items = [item for item in chunk if getattr(item, self.mapping.key) is not None]
+        if new_items:
+            conn.executemany(self._sql["insert"], [self.mapping.values(item, store) for item in new_items])
+            # The write lock is held for the whole statement, so the generated rowids are consecutive.
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            for offset, item in enumerate(new_items):
+                setattr(item, self.mapping.key, last_id - len(new_items) + 1 + offset)
+        if keyed_items:
+            conn.executemany(self._sql["insert_with_key"],
+                             [(getattr(item, self.mapping.key), *self.mapping.values(item, store)) for item in keyed_items])
+        self._written(conn, chunk)
+        result.affected += len(chunk)
+        result.ids.extend(getattr(item, self.mapping.key) for item in chunk)
+
+    def create_many(self, items: Iterable[T], chunk_size: int = 500) -> BulkResult:
+        result = BulkResult()
+        conn = self.pool.connection()
+        with atomic(conn):
+            for chunk in _chunks(items, chunk_size):
+                self.insert_batch(conn, chunk, result)
+        return result
+
+    def update_many(self, items: Iterable[T], chunk_size: int = 500) -> BulkResult:
+        result = BulkResult()
+        conn = self.pool.connection()
+        with atomic(conn):
+            store = self._store(conn)
+            for chunk in _chunks(items, chunk_size):
+                cursor = conn.executemany(
+                    self._sql["update"],
+                    [(*self.mapping.values(item, store), getattr(item, self.mapping.key)) for item in chunk],
+                )
+                self._written(conn, chunk)
+                result.affected += cursor.rowcount
+                result.ids.extend(getattr(item, self.mapping.key) for item in chunk)
+        return result
+
+    def delete_many(self, item_ids: Iterable[Any], chunk_size: int = 500) -> BulkResult:
+        result = BulkResult()
+        conn = self.pool.connection()
+        with atomic(conn):
+            for chunk in _chunks(item_ids, chunk_size):
+                result.affected += conn.executemany(self._sql["delete"], [(item_id,) for item_id in chunk]).rowcount
+        return result
+
+    def upsert_many(self, items: Iterable[T], chunk_size: int = 500) -> BulkResult:
+        """Items without a key are inserted; keyed items are inserted or, on key conflict, updated in place."""
+        result = BulkResult()
+        conn = self.pool.connection()
+        with atomic(conn):
+            store = self._store(conn)
+            for chunk in _chunks(items, chunk_size):
+                new_items = [item for item in chunk if getattr(item, self.mapping.key) is None]
+                keyed_items = [item for item in chunk if getattr(item, self.mapping.key) is not None]
+                if new_items:
+                    self.insert_batch(conn, new_items, BulkResult())
+                if keyed_items:
+                    conn.executemany(self._sql["upsert"],
+                                     [(getattr(item, self.mapping.key), *self.mapping.values(item, store))
+                                      for item in keyed_items])
+                    self._written(conn, keyed_items)
+                result.affected += len(chunk)
+                result.ids.extend(getattr(item, self.mapping.key) for item in chunk)
+        return result
+
+    def _item_id(self, item: T) -> Any:
+        return getattr(item, self.mapping.key)
+
+    # --- Keyset pagination ---
+
+    def _page_statement(self, fields: Optional[Tuple[str, ...]], first: bool) -> str:
+        statement = self._page_sql.get((fields, first))
+        if statement is None:
+            unknown = set(fields or ()) - set(self.mapping.columns)
+            if unknown:
+                raise ValueError(f"Unknown {self.mapping.table} fields: {', '.join(sorted(unknown))}")
+            selected = ", ".join((self.mapping.key, *map(self.mapping.selected,
+                                                         fields if fields is not None else self.mapping.columns)))
+            where = "" if first else f" WHERE {self.mapping.key} > ?"
+            statement = (f"SELECT {selected} FROM {self.mapping.table}{where} "
+                         f"ORDER BY {self.mapping.key} LIMIT ?")
+            self._page_sql[(fields, first)] = statement
+        return statement
+
+    def page(self, after_key: Optional[Any] = None, limit: int = 100,
+             fields: Optional[Sequence[str]] = None) -> Page[T]:
+        """
+        Each page is one indexed range scan on the primary key, so deep pages cost
+        the same as the first, and nothing stays open between pages.
+        """
+        limit = max(1, limit)
+        projection = tuple(fields) if fields is not None else None
+        first = after_key is None
+        params = (limit + 1,) if first else (after_key, limit + 1)
+        statement = self._page_statement(projection, first)
+        items = self._read(statement, params, projection)
+        next_key = getattr(items[limit - 1], self.mapping.key) if len(items) > limit else None
+        return Page(items[:limit], next_key)
+
+
+# --- prp.db entity mappings ---
+ANALYSIS_SESSIONS = EntityMapping.for_dataclass(AnalysisSession, "analysis_sessions")
+SYSTEM_PROFILES = EntityMapping.for_dataclass(SystemProfile, "system_profiles", packed=(("profile_data", "document"),),
+                                              after_write=index_profiles)
+REPOSITORY_SNAPSHOTS = EntityMapping.for_dataclass(RepositorySnapshot, "repository_snapshots",
+                                                   packed=(("snapshot_data", "snapshot"),))
+GENERATED_PROMPTS = EntityMapping.for_dataclass(GeneratedPrompt, "generated_prompts", compressed=("prompt_content",),
+                                                after_write=text_indexer("generated_prompts"))
+AI_ANALYSIS_RESULTS = EntityMapping.for_dataclass(AIAnalysisResult, "ai_analysis_results",
+                                                  compressed=("ai_response_raw",),
+                                                  after_write=text_indexer("ai_analysis_results"))
+
+PRP_MAPPINGS = (ANALYSIS_SESSIONS, SYSTEM_PROFILES, REPOSITORY_SNAPSHOTS, GENERATED_PROMPTS, AI_ANALYSIS_RESULTS)
+
+# --- Mock model database entity mappings ---
+MODELS = EntityMapping.for_dataclass(Model, "models", generated_key=False)
+COMPARISONS = EntityMapping.for_dataclass(Comparison, "comparisons")
+
+
+def create_prp_pool(db_path: Optional[Union[str, Path]] = None) -> SQLiteConnectionPool:
+    """A pool over prp.db (or the given path) that creates the schema on first connection."""
+    pool = SQLiteConnectionPool(db_path or config.PRP_DB_PATH, initializer=prp_database.initialize_schema)
+    logger.debug(f"SQLite connection pool created for {pool.db_path}.")
+    return pool
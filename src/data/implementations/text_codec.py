@@ -0,0 +1,359 @@
+# text_codec.py
+"""
+Transparent compression of the large TEXT columns of prp.db:
+generated_prompts.prompt_content and ai_analysis_results.ai_response_raw.
+
+A value of at least PRP_TEXT_CODEC_MIN_BYTES is stored as a BLOB: a format byte
+followed by a zlib stream primed with a preset dictionary trained on the column's
+own rows. zlib records the dictionary's Adler-32 in the stream header (RFC 1950),
+which is how a value finds its dictionary in `codec_dictionaries` again, however
+many dictionaries have been trained since. A database never holds two dictionaries
+with the same id; the process-wide cache may (from different databases), and zlib's
+trailing checksum tells which one a value was compressed with. Short values, values
+that do not shrink and rows written before the codec stay TEXT and are read unchanged.
+
+Every prp.db connection gets two SQL functions (see register_text_codec):
+prp_compress(column, text) for writes and prp_decompress(value) for reads. Text is
+only decompressed when a query selects the column, so listing and filtering rows
+costs nothing extra and SQLite's page cache holds the compressed bytes. The
+codec is opt-in (PRP_TEXT_CODEC_ENABLED); with it off, values are written as TEXT
+and compressed ones written earlier are still read.
+
+Only the source columns shrink: the full-text index (full_text_search.py) keeps its
+own uncompressed copy of every prompt and response, so a searchable database still
+stores each text once in plain form.
+"""
+import zlib
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from config import config
+
+CODEC_SCHEMA = """
+CREATE TABLE IF NOT EXISTS codec_dictionaries (
+    dictionary_id INTEGER PRIMARY KEY,         -- Adler-32 of the dictionary, as recorded in zlib stream headers
+    column_name TEXT NOT NULL,                 -- Column it was trained on, e.g. 'prompt_content'
+    sample_count INTEGER NOT NULL,             -- Rows it was trained on
+    created_timestamp TEXT NOT NULL,           -- ISO 8601; the newest dictionary of a column compresses new values
+    data BLOB NOT NULL
+);
+"""
+
+# (table, key column, text column) of every compressed column.
+CODEC_COLUMNS = (
+    ("generated_prompts", "prompt_id", "prompt_content"),
+    ("ai_analysis_results", "result_id", "ai_response_raw"),
+)
+
+FORMAT_ZLIB = 1
+MAX_DICTIONARY_BYTES = 32 * 1024  # zlib's window: a longer dictionary's first bytes could never be referenced.
+
+# Dictionaries never change once stored (a retrained one gets a new id), so one
+# process-wide cache keyed by id serves every connection and database. Adler-32 ids of
+# dictionaries from different databases can collide, so an id maps to every one seen.
+_dictionaries: Dict[int, List[bytes]] = {}
+_dictionaries_lock = threading.Lock()
+
+Dictionary = Tuple[int, bytes]
+
+
+def initialize_codec_schema(conn: sqlite3.Connection) -> None:
+    # A single execute (not executescript) so an open transaction is not committed early.
+    conn.execute(CODEC_SCHEMA)
+
+
+def _cache_dictionary(dictionary_id: int, data: bytes) -> None:
+    with _dictionaries_lock:
+        candidates = _dictionaries.setdefault(dictionary_id, [])
+        if data not in candidates:
+            candidates.append(data)
+
+
+def _has_codec_schema(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'codec_dictionaries'"
+    ).fetchone() is not None
+
+
+def load_dictionaries(conn: sqlite3.Connection) -> Dict[str, Dictionary]:
+    """Caches every dictionary stored in the database and returns the newest one of each column."""
+    if not _has_codec_schema(conn):
+        return {}
+    newest: Dict[str, Dictionary] = {}
+    for dictionary_id, column, data in conn.execute(
+        "SELECT dictionary_id, column_name, data FROM codec_dictionaries ORDER BY created_timestamp"
+    ).fetchall():
+        _cache_dictionary(dictionary_id, bytes(data))
+        newest[column] = (dictionary_id, bytes(data))
+    return newest
+
+
+def _load_dictionaries_from(db_path: str) -> None:
+    # Used from inside prp_decompress(), which must not run queries on the connection calling it.
+    conn = sqlite3.connect(f"{Path(db_path).as_uri()}?mode=ro", uri=True)
+    try:
+        load_dictionaries(conn)
+    finally:
+        conn.close()
+
+
+def _compressor(dictionary: Optional[Dictionary], level: int):
+    return zlib.compressobj(level, zdict=dictionary[1]) if dictionary else zlib.compressobj(level)
+
+
+def _deflate(text: str, compressor, min_bytes: int) -> Union[str, bytes]:
+    raw = text.encode("utf-8")
+    if len(raw) < min_bytes:
+        return text
+    stored = bytes((FORMAT_ZLIB,)) + compressor.compress(raw) + compressor.flush()
+    return stored if len(stored) < len(raw) else text
+
+
+def compress_text(text: str, dictionary: Optional[Dictionary] = None, level: int = 6,
+                  min_bytes: int = 0) -> Union[str, bytes]:
+    """Returns the stored form of `text`: codec bytes, or the text itself when short or incompressible."""
+    return _deflate(text, _compressor(dictionary, level), min_bytes)
+
+
+def decompress_text(value: Any, db_path: Optional[str] = None) -> Any:
+    """
+    Returns the text of a stored value. TEXT (and NULL) is returned as is; codec bytes
+    are decompressed, loading an unknown dictionary from `db_path` when given.
+    """
+    if not isinstance(value, (bytes, memoryview)):
+        return value
+    stored = memoryview(value)
+    if not stored or stored[0] != FORMAT_ZLIB:
+        raise ValueError("Not a text codec value.")
+    stream = stored[1:]
+    if not stream[1] & 0x20:  # FDICT clear: compressed without a dictionary.
+        return zlib.decompress(stream).decode("utf-8")
+    dictionary_id = int.from_bytes(stream[2:6], "big")
+    tried: List[bytes] = []
+    for reload in (False, True):
+        if reload:
+            if not db_path:
+                break
+            _load_dictionaries_from(db_path)
+        for zdict in list(_dictionaries.get(dictionary_id, ())):
+            if zdict in tried:
+                continue
+            tried.append(zdict)
+            text = _inflate(stream, zdict)
+            if text is not None:
+                return text
+    raise LookupError(f"Text codec dictionary {dictionary_id:#010x} is not loaded.")
+
+
+def _inflate(stream: memoryview, zdict: bytes) -> Optional[str]:
+    """The text of a stream, or None when `zdict` is another dictionary with the same id."""
+    decompressor = zlib.decompressobj(zdict=zdict)
+    try:
+        raw = decompressor.decompress(stream) + decompressor.flush()
+    except zlib.error:  # The stream's Adler-32 of the data does not match.
+        return None
+    return raw.decode("utf-8") if decompressor.eof else None
+
+
+class TextCodec:
+    """
+    The codec state of one connection: the newest dictionary of each column. Writes are
+    compressed only when `enabled`: by default when PRP_TEXT_CODEC_ENABLED is set and the
+    database has a codec_dictionaries table (new databases get one from initialize_schema;
+    existing ones from compress_existing_rows).
+    """
+    def __init__(self, dictionaries: Dict[str, Dictionary], enabled: bool, db_path: Optional[str] = None,
+                 level: int = config.PRP_TEXT_CODEC_LEVEL, min_bytes: int = config.PRP_TEXT_CODEC_MIN_BYTES):
+        self.dictionaries = dictionaries
+        self.enabled = enabled
+        self.db_path = db_path
+        self.level = level
+        self.min_bytes = min_bytes
+        # Copying a compressor already primed with the dictionary skips hashing 32 KB per value.
+        self._primed = {column: _compressor(dictionary, level) for column, dictionary in dictionaries.items()}
+
+    def compress(self, column: str, value: Any) -> Any:
+        if not self.enabled or not isinstance(value, str):
+            return value  # NULLs, and values that are already compressed, pass through.
+        primed = self._primed.get(column)
+        return _deflate(value, primed.copy() if primed else _compressor(None, self.level), self.min_bytes)
+
+    def decompress(self, value: Any) -> Any:
+        return decompress_text(value, self.db_path)
+
+
+def register_text_codec(conn: sqlite3.Connection, enabled: Optional[bool] = None) -> TextCodec:
+    """
+    Adds prp_compress(column, text) and prp_decompress(value) to a connection. Call it
+    again after training dictionaries on the connection so new writes use them.
+    `enabled` overrides PRP_TEXT_CODEC_ENABLED for this connection's writes.
+    """
+    main = next((row[2] for row in conn.execute("PRAGMA database_list") if row[1] == "main"), "")
+    if enabled is None:
+        enabled = config.PRP_TEXT_CODEC_ENABLED
+    codec = TextCodec(load_dictionaries(conn), enabled and _has_codec_schema(conn), main or None)
+    # Not deterministic: the result depends on the newest dictionary of the column.
+    conn.create_function("prp_compress", 2, codec.compress)
+    conn.create_function("prp_decompress", 1, codec.decompress, deterministic=True)
+    return codec
+
+
+# --- Dictionary training ---
+
+def train_dictionary(samples: Iterable[str], size: int = MAX_DICTIONARY_BYTES, min_count: int = 2) -> bytes:
+    """
+    Builds a zlib preset dictionary from sample texts: the lines found in the most samples
+    (template boilerplate, headings, common requirement lines), chosen by the bytes they
+    would save. The most valuable lines go last, where match distances are shortest.
+    """
+    counts: Counter = Counter()
+    for text in samples:
+        counts.update(set(text.splitlines(keepends=True)))
+    scored = sorted(
+        ((count * len(line.encode("utf-8")), line) for line, count in counts.items()
+         if count >= min_count and line.strip()),
+        reverse=True,
+    )
+    chosen, used = [], 0
+    for _, line in scored:
+        length = len(line.encode("utf-8"))
+        if used + length <= size:
+            chosen.append(line)
+            used += length
+    return "".join(reversed(chosen)).encode("utf-8")
+
+
+def train_column_dictionary(conn: sqlite3.Connection, column: str, sample_size: int = 1000,
+                            size: int = MAX_DICTIONARY_BYTES) -> Optional[int]:
+    """
+    Trains a dictionary on a random sample of a codec column and stores it (the caller owns
+    the transaction). Returns its id, or None when the rows have too little in common.
+    """
+    table = next(table for table, _, name in CODEC_COLUMNS if name == column)
+    initialize_codec_schema(conn)
+    samples = [decompress_text(value) for (value,) in conn.execute(
+        f"SELECT {column} FROM {table} ORDER BY RANDOM() LIMIT ?", (sample_size,)
+    )]
+    data = train_dictionary(samples, size)
+    if len(samples) < 2 or not data:
+        return None
+    dictionary_id = zlib.adler32(data)
+    while True:  # Ids are Adler-32s and can collide; a dictionary's id must name only it.
+        stored = conn.execute("SELECT data FROM codec_dictionaries WHERE dictionary_id = ?", (dictionary_id,)).fetchone()
+        if stored is None or bytes(stored[0]) == data:
+            break
+        data = data[1:]  # Its first bytes are the least valuable ones (see train_dictionary).
+        if not data:
+            return None
+        dictionary_id = zlib.adler32(data)
+    conn.execute(
+        "INSERT OR IGNORE INTO codec_dictionaries (dictionary_id, column_name, sample_count, created_timestamp, data) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (dictionary_id, column, len(samples), datetime.now(timezone.utc).isoformat(), data),
+    )
+    _cache_dictionary(dictionary_id, data)
+    logger.info(f"Trained a {len(data)}-byte dictionary for {column} on {len(samples)} rows ({dictionary_id:#010x}).")
+    return dictionary_id
+
+
+# --- Migration of existing rows ---
+
+@dataclass
+class CodecMigrationReport:
+    """Space accounting for compressing the codec columns of an existing prp.db."""
+    dictionaries_trained: int = 0
+    rows_rewritten: int = 0
+    rows_compressed: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    file_bytes_before: int = 0
+    file_bytes_after: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def ratio(self) -> float:
+        return self.bytes_before / self.bytes_after if self.bytes_after else 0.0
+
+
+def codec_column_bytes(conn: sqlite3.Connection) -> int:
+    """Bytes stored in the codec columns, plus their dictionaries."""
+    total = sum(
+        conn.execute(f"SELECT COALESCE(SUM(LENGTH(CAST({column} AS BLOB))), 0) FROM {table}").fetchone()[0]
+        for table, _, column in CODEC_COLUMNS
+    )
+    if _has_codec_schema(conn):
+        total += conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM codec_dictionaries").fetchone()[0]
+    return total
+
+
+def compress_existing_rows(db_path: Optional[Union[str, Path]] = None, retrain: bool = False,
+                           recompress: bool = False, batch_size: int = 500, sample_size: int = 1000,
+                           vacuum: bool = False) -> CodecMigrationReport:
+    """
+    Compresses rows written before the codec. A column without a dictionary (or every
+    column, with retrain=True) gets one trained on its rows first; recompress=True also
+    rewrites values that are already compressed, e.g. with a freshly trained dictionary.
+    Safe to re-run, and each batch commits separately so an interrupted run can be resumed.
+    The rows are compressed even while PRP_TEXT_CODEC_ENABLED is off, but rows written
+    afterwards stay plain TEXT until it is set. The full-text index is not compressed.
+    """
+    from src.data.implementations import prp_database
+
+    report = CodecMigrationReport()
+    db_file = Path(db_path) if db_path else config.PRP_DB_PATH
+    if db_file.exists():
+        report.file_bytes_before = db_file.stat().st_size
+
+    conn = prp_database.connect(db_file)
+    try:
+        prp_database.initialize_schema(conn)
+        with conn:
+            initialize_codec_schema(conn)
+            trained = load_dictionaries(conn)
+            for _, _, column in CODEC_COLUMNS:
+                if (retrain or column not in trained) and train_column_dictionary(conn, column, sample_size):
+                    report.dictionaries_trained += 1
+        if not config.PRP_TEXT_CODEC_ENABLED:
+            logger.warning("PRP_TEXT_CODEC_ENABLED is off: existing rows are compressed now, "
+                           "but new rows are written uncompressed until it is set.")
+        register_text_codec(conn, enabled=True)
+        report.bytes_before = codec_column_bytes(conn)
+
+        for table, key, column in CODEC_COLUMNS:
+            where = "" if recompress else f" WHERE typeof({column}) = 'text'"
+            row_ids = [row[0] for row in conn.execute(f"SELECT {key} FROM {table}{where} ORDER BY {key}")]
+            for start in range(0, len(row_ids), batch_size):
+                with conn:
+                    conn.executemany(
+                        f"UPDATE {table} SET {column} = prp_compress(?, prp_decompress({column})) WHERE {key} = ?",
+                        [(column, row_id) for row_id in row_ids[start:start + batch_size]],
+                    )
+                report.rows_rewritten += len(row_ids[start:start + batch_size])
+            report.rows_compressed += conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE typeof({column}) = 'blob'"
+            ).fetchone()[0]
+
+        report.bytes_after = codec_column_bytes(conn)
+        if vacuum:
+            conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    if db_file.exists():
+        report.file_bytes_after = db_file.stat().st_size
+    logger.info(
+        f"Text codec migration: {report.rows_rewritten} rows rewritten, {report.rows_compressed} compressed; "
+        f"{report.bytes_before} -> {report.bytes_after} bytes "
+        f"({report.bytes_saved} saved)."
+    )
+    return report
@@ -0,0 +1,224 @@
+# unit_of_work.py
+"""
+Unit of work for the analysis session lifecycle in prp.db.
+
+An analysis writes a session, its system profile, repository snapshot, prompts
+and AI results. UnitOfWork buffers those rows and writes them in one transaction
+(one commit, no partial state on a crash), inserting tables in foreign-key order
+and filling each child's foreign key from its parent's generated id.
+
+WriteBehindWriter goes one step further under load: units submitted from many
+threads are grouped into a single transaction per flush (group commit).
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from src.data.interfaces.ICrudRepository import BulkResult
+from src.data.implementations.sqlite_crud_repository import (
+    AI_ANALYSIS_RESULTS, ANALYSIS_SESSIONS, GENERATED_PROMPTS, REPOSITORY_SNAPSHOTS, SYSTEM_PROFILES,
+    EntityMapping, SQLiteConnectionPool, SQLiteCrudRepository,
+)
+
+# Parents before children, so generated keys exist before they are referenced.
+PRP_FLUSH_ORDER: Tuple[EntityMapping, ...] = (
+    ANALYSIS_SESSIONS, SYSTEM_PROFILES, REPOSITORY_SNAPSHOTS, GENERATED_PROMPTS, AI_ANALYSIS_RESULTS,
+)
+
+
+class UnitOfWork:
+    """
+    Buffers new entities and inserts them together.
+
+        with UnitOfWork(pool) as uow:
+            session = uow.add(AnalysisSession(...))
+            prompt = uow.add(GeneratedPrompt(...), session_id=session)
+            uow.add(AIAnalysisResult(...), prompt_id=prompt)
+
+    Keyword arguments to add() name a foreign-key field and the (possibly not yet
+    inserted) parent entity it refers to. Leaving the block commits; an exception discards.
+    Units handed to a WriteBehindWriter need no pool of their own.
+    """
+    def __init__(self, pool: Optional[SQLiteConnectionPool] = None, flush_order: Sequence[EntityMapping] = PRP_FLUSH_ORDER):
+        self.pool = pool
+        self.flush_order = tuple(flush_order)
+        self._mappings = {mapping.entity_type: mapping for mapping in self.flush_order}
+        self._pending: List[Tuple[Any, Dict[str, Any]]] = []
+
+    def add(self, item: Any, **parents: Any) -> Any:
+        if type(item) not in self._mappings:
+            raise TypeError(f"{type(item).__name__} is not part of this unit of work's flush order.")
+        for field, parent in parents.items():
+            if type(parent) not in self._mappings:
+                raise TypeError(f"Parent for '{field}' must be a {', '.join(t.__name__ for t in self._mappings)}.")
+        self._pending.append((item, parents))
+        return item
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def commit(self) -> int:
+        """Writes every buffered entity in one transaction. Returns the number of rows inserted."""
+        if not self._pending:
+            return 0
+        if self.pool is None:
+            raise RuntimeError("This UnitOfWork has no connection pool; submit it to a WriteBehindWriter instead.")
+        conn = self.pool.connection()
+        with conn:
+            written = write_units(conn, [self], self.flush_order)
+        self._pending.clear()
+        return written
+
+    def discard(self) -> None:
+        self._pending.clear()
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+@lru_cache(maxsize=None)
+def _repository_for(mapping: EntityMapping) -> SQLiteCrudRepository:
+    # Only its prepared SQL is used; rows are written on the caller's connection.
+    return SQLiteCrudRepository(mapping, None)
+
+
+def write_units(conn, units: Sequence[UnitOfWork], flush_order: Sequence[EntityMapping] = PRP_FLUSH_ORDER) -> int:
+    """
+    Inserts the entities of several units on a connection whose transaction the caller owns,
+    one executemany per table. On error, keys generated so far are reset so the units can be retried.
+    """
+    mappings = {mapping.entity_type: mapping for mapping in flush_order}
+    by_mapping: Dict[EntityMapping, List[Tuple[Any, Dict[str, Any]]]] = {mapping: [] for mapping in flush_order}
+    for unit in units:
+        for item, parents in unit._pending:
+            by_mapping[mappings[type(item)]].append((item, parents))
+
+    assigned: List[Tuple[Any, str]] = []
+    try:
+        written = 0
+        for mapping in flush_order:
+            entries = by_mapping[mapping]
+            if not entries:
+                continue
+            for item, parents in entries:
+                for field, parent in parents.items():
+                    parent_id = getattr(parent, mappings[type(parent)].key)
+                    if parent_id is None:
+                        raise ValueError(f"{type(item).__name__}.{field} refers to a {type(parent).__name__} "
+                                         f"that is neither stored nor added before it in the flush order.")
+                    setattr(item, field, parent_id)
+            items = [item for item, _ in entries]
+            assigned.extend((item, mapping.key) for item in items if getattr(item, mapping.key) is None)
+            _repository_for(mapping).insert_batch(conn, items, BulkResult())
+            written += len(items)
+        return written
+    except Exception:
+        for item, key in assigned:
+            setattr(item, key, None)
+        raise
+
+
+class WriteBehindWriter:
+    """
+    Commits units of work on a background thread, grouping everything submitted
+    within `max_delay` seconds (up to `max_units`) into one transaction.
+
+    submit() returns a Future resolved with the number of rows written once the
+    unit is durable. If a grouped transaction fails, it is retried in halves so a
+    single bad unit only fails its own future.
+    """
+    def __init__(self, pool: SQLiteConnectionPool, max_units: int = 64, max_delay: float = 0.05,
+                 flush_order: Sequence[EntityMapping] = PRP_FLUSH_ORDER):
+        self.pool = pool
+        self.max_units = max(1, max_units)
+        self.max_delay = max_delay
+        self.flush_order = tuple(flush_order)
+        self._queue: "queue.Queue[Optional[Tuple[UnitOfWork, Future]]]" = queue.Queue()
+        self.stats = {"units": 0, "transactions": 0, "failed_units": 0}
+        self._thread = threading.Thread(target=self._run, name="prp-write-behind", daemon=True)
+        self._closed = False
+        self._thread.start()
+
+    def submit(self, unit: UnitOfWork) -> Future:
+        if self._closed:
+            raise RuntimeError("WriteBehindWriter is closed.")
+        future: Future = Future()
+        self._queue.put((unit, future))
+        return future
+
+    def close(self) -> None:
+        """Flushes everything submitted so far and stops the background thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def __enter__(self) -> "WriteBehindWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            while len(batch) < self.max_units:
+                try:
+                    entry = self._queue.get(timeout=self.max_delay)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._flush(batch)
+
+    def _commit(self, entries: List[Tuple[UnitOfWork, Future]]) -> List[int]:
+        units = [unit for unit, _ in entries]
+        counts = [unit.pending for unit in units]
+        conn = self.pool.connection()
+        with conn:
+            write_units(conn, units, self.flush_order)
+        self.stats["transactions"] += 1
+        return counts
+
+    def _flush(self, batch: List[Tuple[UnitOfWork, Future]]) -> None:
+        try:
+            counts = self._commit(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                self._fail(batch[0], e)
+                return
+            # Bisect so one bad unit costs O(log n) extra transactions, not one per unit.
+            logger.warning(f"Grouped commit of {len(batch)} units failed ({e}); retrying in halves.")
+            middle = len(batch) // 2
+            self._flush(batch[:middle])
+            self._flush(batch[middle:])
+            return
+        for entry, count in zip(batch, counts):
+            self._succeed(entry, count)
+
+    def _succeed(self, entry: Tuple[UnitOfWork, Future], count: int) -> None:
+        unit, future = entry
+        unit._pending.clear()
+        self.stats["units"] += 1
+        future.set_result(count)
+
+    def _fail(self, entry: Tuple[UnitOfWork, Future], error: Exception) -> None:
+        self.stats["failed_units"] += 1
+        entry[1].set_exception(error)
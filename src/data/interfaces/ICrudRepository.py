@@ -1,9 +1,37 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, List, Optional, Any
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar, List, Optional, Any, Iterable, Iterator, Sequence
 
 # Define a TypeVar for the entity type the repository operates on
 T = TypeVar('T')
 
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of a bulk operation.
+
+    Attributes:
+        affected: Number of rows inserted, updated or deleted.
+        ids: Identifiers of the items written, in input order (empty for deletes).
+    """
+    affected: int = 0
+    ids: List[Any] = field(default_factory=list)
+
+
+@dataclass
+class Page(Generic[T]):
+    """
+    One page of a keyset-paginated read.
+
+    Attributes:
+        items: The items on this page, ordered by identifier.
+        next_key: The identifier to pass as `after_key` for the next page, or None on the last page.
+    """
+    items: List[T]
+    next_key: Optional[Any] = None
+
+
 class ICrudRepository(ABC, Generic[T]):
     """
     Interface (Abstract Base Class) for basic CRUD (Create, Read, Update, Delete)
@@ -87,4 +115,129 @@ class ICrudRepository(ABC, Generic[T]):
         Raises:
             NotImplementedError: This method must be implemented by subclasses.
         """
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    # --- Bulk operations ---
+    # These default implementations loop over the single-item methods so every repository
+    # supports them; database-backed implementations should override them to batch the work.
+
+    def create_many(self, items: Iterable[T], chunk_size: int = 500) -> BulkResult:
+        """
+        Creates many items.
+
+        Args:
+            items: The items to create.
+            chunk_size: How many items implementations send to the backend per batch.
+
+        Returns:
+            A BulkResult with the number created and their identifiers.
+        """
+        result = BulkResult()
+        for item in items:
+            created = self.create(item)
+            result.affected += 1
+            result.ids.append(self._item_id(created))
+        return result
+
+    def update_many(self, items: Iterable[T], chunk_size: int = 500) -> BulkResult:
+        """
+        Updates many existing items.
+
+        Args:
+            items: The items with updated information.
+            chunk_size: How many items implementations send to the backend per batch.
+
+        Returns:
+            A BulkResult with the number of items updated and their identifiers.
+        """
+        result = BulkResult()
+        for item in items:
+            self.update(item)
+            result.affected += 1
+            result.ids.append(self._item_id(item))
+        return result
+
+    def delete_many(self, item_ids: Iterable[Any], chunk_size: int = 500) -> BulkResult:
+        """
+        Deletes many items by their unique identifiers.
+
+        Args:
+            item_ids: The identifiers of the items to delete.
+            chunk_size: How many identifiers implementations send to the backend per batch.
+
+        Returns:
+            A BulkResult with the number of identifiers processed.
+        """
+        result = BulkResult()
+        for item_id in item_ids:
+            self.delete(item_id)
+            result.affected += 1
+        return result
+
+    def upsert_many(self, items: Iterable[T], chunk_size: int = 500) -> BulkResult:
+        """
+        Creates items that do not exist yet and updates those that do.
+
+        Args:
+            items: The items to write.
+            chunk_size: How many items implementations send to the backend per batch.
+
+        Returns:
+            A BulkResult with the number of items written and their identifiers.
+        """
+        result = BulkResult()
+        for item in items:
+            item_id = self._item_id(item)
+            if item_id is not None and self.read_by_id(item_id) is not None:
+                written = self.update(item)
+            else:
+                written = self.create(item)
+            result.affected += 1
+            result.ids.append(self._item_id(written))
+        return result
+
+    def _item_id(self, item: T) -> Any:
+        """
+        Returns the identifier of an item, used by the default bulk operations.
+        Override when the identifier is not stored in an `id` attribute.
+        """
+        return getattr(item, "id", None)
+
+    # --- Streaming and paginated reads ---
+
+    def iter_all(self, batch_size: int = 500, fields: Optional[Sequence[str]] = None) -> Iterator[T]:
+        """
+        Streams all items ordered by identifier, holding at most one batch in memory.
+
+        Args:
+            batch_size: How many items implementations fetch per round trip.
+            fields: Optional subset of fields to load; the others keep their defaults.
+                    Use it to skip large columns that are not needed.
+
+        Yields:
+            The items, one at a time.
+        """
+        after_key = None
+        while True:
+            page = self.page(after_key=after_key, limit=batch_size, fields=fields)
+            yield from page.items
+            if page.next_key is None:
+                return
+            after_key = page.next_key
+
+    def page(self, after_key: Optional[Any] = None, limit: int = 100,
+             fields: Optional[Sequence[str]] = None) -> "Page[T]":
+        """
+        Reads the items whose identifier sorts after `after_key` (keyset pagination).
+
+        Args:
+            after_key: The `next_key` of the previous page, or None for the first page.
+            limit: The maximum number of items on the page.
+            fields: Optional subset of fields to load (ignored by this default implementation).
+
+        Returns:
+            The page of items and the key to continue from.
+        """
+        items = sorted((item for item in self.read_all()
+                        if after_key is None or self._item_id(item) > after_key), key=self._item_id)
+        return Page(items[:limit], self._item_id(items[limit - 1]) if len(items) > limit else None)
@@ -0,0 +1,99 @@
+# entities.py
+"""
+Entity objects for the tables in prp.db and for the models and comparisons tables of
+the mock model database. Field names match the column names, and the primary key is
+the first field (None until the row has been inserted).
+
+Entities are dataclasses with __slots__: no per-instance __dict__, so a large result
+set costs a fixed few bytes per field instead of a dict per row.
+"""
+from dataclasses import dataclass, fields
+from typing import Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """
+    Rebuilds a dataclass with __slots__ for its fields, as dataclass(slots=True) does
+    on Python 3.10+ (the project still supports 3.9).
+    """
+    names = tuple(field.name for field in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in (*names, "__dict__", "__weakref__"):
+        # Field defaults live on in the generated __init__; as class attributes they would clash with the slots.
+        namespace.pop(name, None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@slotted
+@dataclass
+class AnalysisSession:
+    session_id: Optional[int] = None
+    target_repository_identifier: str = ""
+    analysis_timestamp: str = ""
+    user_notes: Optional[str] = None
+    status: Optional[str] = None
+
+
+@slotted
+@dataclass
+class SystemProfile:
+    profile_id: Optional[int] = None
+    session_id: int = 0
+    profile_timestamp: str = ""
+    profile_data: str = ""
+
+
+@slotted
+@dataclass
+class RepositorySnapshot:
+    snapshot_id: Optional[int] = None
+    session_id: int = 0
+    snapshot_data: str = ""
+    creation_timestamp: str = ""
+
+
+@slotted
+@dataclass
+class GeneratedPrompt:
+    prompt_id: Optional[int] = None
+    session_id: int = 0
+    prompt_type: Optional[str] = None
+    template_name_used: Optional[str] = None
+    prompt_content: str = ""
+    creation_timestamp: str = ""
+
+
+@slotted
+@dataclass
+class AIAnalysisResult:
+    result_id: Optional[int] = None
+    prompt_id: int = 0
+    ai_response_raw: str = ""
+    response_timestamp: str = ""
+    parsed_system_requirements_json: Optional[str] = None
+    parsed_dependencies_json: Optional[str] = None
+
+
+# --- Mock model database (see src/data/implementations/mock_model_schema.py) ---
+
+@slotted
+@dataclass
+class Model:
+    model_id: Optional[str] = None             # Not generated: e.g. 'cellular-biobot-alpha'
+    name: str = ""
+    domain: str = ""
+    focus: Optional[str] = None
+    description: Optional[str] = None
+
+
+@slotted
+@dataclass
+class Comparison:
+    comparison_id: Optional[int] = None
+    model_id_1: str = ""
+    model_id_2: str = ""
+    comparison_timestamp: Optional[str] = None
+    user_session_id: Optional[str] = None
@@ -0,0 +1,99 @@
+import json
+import sys
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.implementations import prp_database
+from src.data.implementations.analytics_index import AnalyticsQueries, parsed_requirements_json
+from src.data.implementations.blob_store import BlobStore
+
+NOW = "2025-01-01T00:00:00"
+
+
+def _profile(ram_gb, cores, system="Linux", vram=None):
+    gpus = [{"name": "GPU", "total_vram_gb": vram}] if vram is not None else []
+    return {"os": {"system": system}, "cpu": {"logical_cores": cores, "physical_cores": cores // 2},
+            "ram": {"total_gb": ram_gb}, "gpu_info": {"gpus": gpus}}
+
+
+def _insert_session(conn, name, profile, requirements=None, packed=False):
+    session_id = conn.execute(
+        "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp, status) VALUES (?, ?, ?)",
+        (name, NOW, "completed_successfully"),
+    ).lastrowid
+    profile_data = BlobStore(conn).pack_document(profile) if packed else json.dumps(profile)
+    conn.execute("INSERT INTO system_profiles (session_id, profile_timestamp, profile_data) VALUES (?, ?, ?)",
+                 (session_id, NOW, profile_data))
+    prompt_id = conn.execute(
+        "INSERT INTO generated_prompts (session_id, prompt_type, prompt_content, creation_timestamp) VALUES (?, ?, ?, ?)",
+        (session_id, "initial_analysis", "prompt", NOW),
+    ).lastrowid
+    return conn.execute(
+        "INSERT INTO ai_analysis_results (prompt_id, ai_response_raw, response_timestamp, parsed_system_requirements_json) "
+        "VALUES (?, ?, ?, ?)",
+        (prompt_id, "raw", NOW, requirements),
+    ).lastrowid
+
+
+def test_profile_facts_are_backfilled_from_plain_and_packed_rows(test_db):
+    with prp_database.transaction(test_db) as conn:
+        prp_database.initialize_schema(conn)
+        _insert_session(conn, "small", _profile(8, 4))
+        _insert_session(conn, "big", _profile(64, 32, vram=24), packed=True)
+        _insert_session(conn, "mac", _profile(16, 10, system="Darwin"), packed=True)
+
+    queries = AnalyticsQueries(test_db)
+    assert [s.target_repository_identifier for s in queries.find_sessions(max_ram_gb=16)] == ["small"]
+    assert [s.target_repository_identifier for s in queries.find_sessions(min_cores=8, os_system="Linux")] == ["big"]
+    assert [s.gpu_vram_gb for s in queries.find_sessions(min_gpu_vram_gb=12)] == [24.0]
+    assert queries.count_sessions_by_os() == {"Darwin": 1, "Linux": 2}
+
+
+def test_result_requirements_are_queryable_and_indexed(test_db):
+    AnalyticsQueries(test_db)  # Adds the generated columns before rows are written.
+    with prp_database.transaction(test_db) as conn:
+        cuda = _insert_session(conn, "cuda", _profile(32, 8),
+                               parsed_requirements_json({"ram_gb": 16, "cpu_cores": 4, "gpu_vram_gb": 8}, requires_cuda=True))
+        light = _insert_session(conn, "light", _profile(32, 8),
+                                parsed_requirements_json({"ram_gb": 2, "cpu_cores": 1}, requires_cuda=False))
+        _insert_session(conn, "malformed", _profile(32, 8), "not json")
+
+    queries = AnalyticsQueries(test_db)
+    assert queries.find_results(requires_cuda=True) == [cuda]
+    assert queries.find_results(min_ram_gb_at_most=4) == [light]
+    assert queries.find_results(min_ram_gb_at_least=8, min_gpu_vram_gb_at_least=8) == [cuda]
+
+    plan = " ".join(queries.explain("SELECT result_id FROM ai_analysis_results WHERE req_requires_cuda = ?", [1]))
+    assert "idx_results_req_requires_cuda" in plan
+    plan = " ".join(queries.explain("SELECT profile_id FROM system_profile_facts WHERE ram_total_gb < ?", [16]))
+    assert "idx_profile_facts_ram" in plan
+
+
+def test_profiles_written_through_the_repository_are_indexed_without_a_backfill(test_db):
+    from src.data.implementations.sqlite_crud_repository import SYSTEM_PROFILES, SQLiteCrudRepository, create_prp_pool
+    from src.data.implementations.unit_of_work import UnitOfWork
+    from src.data.obj.entities import AnalysisSession, SystemProfile
+
+    pool = create_prp_pool(test_db)
+    try:
+        with UnitOfWork(pool) as uow:
+            session = uow.add(AnalysisSession(target_repository_identifier="uow", analysis_timestamp=NOW))
+            uow.add(SystemProfile(profile_timestamp=NOW, profile_data=json.dumps(_profile(8, 4))), session_id=session)
+        profiles = SQLiteCrudRepository(SYSTEM_PROFILES, pool)
+        created = profiles.create(SystemProfile(session_id=session.session_id, profile_timestamp=NOW,
+                                                profile_data=json.dumps(_profile(64, 32, vram=24))))
+
+        queries = AnalyticsQueries(test_db, backfill=False)
+        assert [s.ram_total_gb for s in queries.find_sessions()] == [8.0, 64.0]
+
+        created.profile_data = json.dumps(_profile(128, 64))
+        profiles.update(created)
+        assert [s.ram_total_gb for s in queries.find_sessions(min_ram_gb=100)] == [128.0]
+        assert profiles.update_many([SystemProfile(profile_id=999, session_id=session.session_id,
+                                                   profile_timestamp=NOW, profile_data="{}")]).affected == 0
+    finally:
+        pool.close_all()
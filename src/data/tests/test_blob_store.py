@@ -0,0 +1,79 @@
+import json
+import sys
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.implementations import prp_database
+from src.data.implementations.blob_store import (
+    BlobStore, collect_garbage, migrate_to_blob_store, read_profile, read_snapshot,
+)
+
+README = "# Shared README\n" + "Install the requirements and run main.py.\n" * 200
+
+
+def _insert_legacy_sessions(db_path, count):
+    """Writes sessions in the pre-migration format: full JSON blobs per row."""
+    with prp_database.transaction(db_path) as conn:
+        prp_database.initialize_schema(conn)
+        for i in range(count):
+            session_id = conn.execute(
+                "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp, status) VALUES (?, ?, ?)",
+                (f"repo-{i}", "2025-01-01T00:00:00", "completed_successfully"),
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO repository_snapshots (session_id, snapshot_data, creation_timestamp) VALUES (?, ?, ?)",
+                (session_id, json.dumps({"files": {"README.md": README, "setup.py": f"# {i}"}}), "2025-01-01T00:00:00"),
+            )
+            conn.execute(
+                "INSERT INTO system_profiles (session_id, profile_timestamp, profile_data) VALUES (?, ?, ?)",
+                (session_id, "2025-01-01T00:00:00", json.dumps({"cpu": {"logical_cores": 12}, "notes": "x" * 500})),
+            )
+
+
+def test_identical_content_is_stored_once(test_db):
+    with prp_database.transaction(test_db) as conn:
+        store = BlobStore(conn)
+        first = store.pack_snapshot({"files": {"README.md": README}})
+        second = store.pack_snapshot({"files": {"README.md": README, "tiny.txt": "kept inline"}})
+        assert conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 1
+        assert store.unpack(second) == {"files": {"README.md": README, "tiny.txt": "kept inline"}}
+        assert len(first) < 200
+
+
+def test_legacy_rows_are_read_transparently(test_db):
+    _insert_legacy_sessions(test_db, 1)
+    conn = prp_database.connect(test_db)
+    assert read_snapshot(conn, 1)["files"]["README.md"] == README
+    assert read_profile(conn, 1)["cpu"]["logical_cores"] == 12
+    conn.close()
+
+
+def test_migration_rewrites_rows_and_reports_savings(test_db):
+    _insert_legacy_sessions(test_db, 20)
+    report = migrate_to_blob_store(test_db, batch_size=7)
+    assert (report.snapshots_migrated, report.profiles_migrated) == (20, 20)
+    assert report.bytes_saved > 0
+    assert report.bytes_after * 10 < report.bytes_before
+
+    conn = prp_database.connect(test_db)
+    assert read_snapshot(conn, 5) == {"files": {"README.md": README, "setup.py": "# 4"}}
+    assert read_profile(conn, 20)["notes"] == "x" * 500
+    conn.close()
+
+    # Re-running is a no-op.
+    again = migrate_to_blob_store(test_db)
+    assert (again.snapshots_migrated, again.profiles_migrated) == (0, 0)
+
+
+def test_garbage_collection_removes_unreferenced_blobs(test_db):
+    _insert_legacy_sessions(test_db, 2)
+    migrate_to_blob_store(test_db)
+    with prp_database.transaction(test_db) as conn:
+        BlobStore(conn).put(b"orphan" * 100)
+        conn.execute("DELETE FROM system_profiles")
+        assert collect_garbage(conn) == 2  # the orphan and the shared profile blob
+        assert read_snapshot(conn, 1)["files"]["README.md"] == README
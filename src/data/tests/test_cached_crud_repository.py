@@ -0,0 +1,121 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.implementations.cached_crud_repository import CachedCrudRepository, sqlite_data_version
+from src.data.implementations.sqlite_crud_repository import ANALYSIS_SESSIONS, SQLiteCrudRepository, create_prp_pool
+from src.data.obj.entities import AnalysisSession
+
+
+class CountingRepository(SQLiteCrudRepository):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.reads = 0
+
+    def read_by_id(self, item_id):
+        self.reads += 1
+        return super().read_by_id(item_id)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def pool(test_db):
+    pool = create_prp_pool(test_db)
+    yield pool
+    pool.close_all()
+    for suffix in ("-wal", "-shm"):
+        Path(str(test_db) + suffix).unlink(missing_ok=True)
+
+
+def _session(name="/repos/a"):
+    return AnalysisSession(target_repository_identifier=name, analysis_timestamp="t0")
+
+
+def test_hits_misses_ttl_and_negative_caching(pool):
+    inner = CountingRepository(ANALYSIS_SESSIONS, pool)
+    clock = FakeClock()
+    cache = CachedCrudRepository(inner, ttl_seconds=10, negative_ttl_seconds=1, clock=clock)
+    cache.create(_session())
+
+    first = cache.read_by_id(1)
+    first.status = "mutated by caller"
+    assert cache.read_by_id(1).status is None  # Cached copy is not affected.
+    assert cache.read_by_id(42) is None and cache.read_by_id(42) is None
+    assert inner.reads == 2
+
+    clock.now = 5  # Negative entry expired, positive entry still fresh.
+    cache.read_by_id(1)
+    cache.read_by_id(42)
+    assert inner.reads == 3
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["negative_hits"], stats["misses"], stats["expirations"]) == (2, 1, 3, 1)
+
+
+def test_writes_invalidate_and_lru_evicts(pool):
+    inner = CountingRepository(ANALYSIS_SESSIONS, pool)
+    cache = CachedCrudRepository(inner, max_entries=2)
+    assert cache.read_by_id(1) is None
+    created = cache.create(_session())
+    assert cache.read_by_id(1) == created  # The cached miss was dropped.
+
+    created.status = "done"
+    cache.update(created)
+    assert cache.read_by_id(1).status == "done"
+    cache.delete_many([1])
+    assert cache.read_by_id(1) is None
+
+    cache.create_many([_session("/b"), _session("/c")])
+    for item_id in (2, 3, 1):
+        cache.read_by_id(item_id)
+    assert cache.get_stats()["evictions"] >= 1
+
+
+def test_commits_from_another_connection_clear_the_cache(pool, test_db):
+    inner = CountingRepository(ANALYSIS_SESSIONS, pool)
+    cache = CachedCrudRepository(inner, change_counter=sqlite_data_version(pool))
+    cache.create(_session())
+    assert cache.read_by_id(1).status is None
+
+    other = create_prp_pool(test_db)  # Stands in for another process.
+    other_conn = other.connection()
+    with other_conn:
+        other_conn.execute("UPDATE analysis_sessions SET status = 'external' WHERE session_id = 1")
+    other.close_all()
+
+    assert cache.read_by_id(1).status == "external"
+    assert cache.get_stats()["external_invalidations"] == 1
+
+
+def test_external_commits_are_seen_from_threads_that_have_not_read_before(pool, test_db):
+    """One change counter for the database, so a thread's first read cannot miss an earlier commit."""
+    import threading
+
+    cache = CachedCrudRepository(CountingRepository(ANALYSIS_SESSIONS, pool), change_counter=sqlite_data_version(pool))
+    cache.create(_session())
+    assert cache.read_by_id(1).status is None
+
+    other = create_prp_pool(test_db)
+    other_conn = other.connection()
+    with other_conn:
+        other_conn.execute("UPDATE analysis_sessions SET status = 'external' WHERE session_id = 1")
+    other.close_all()
+
+    seen = []
+    reader = threading.Thread(target=lambda: seen.append(cache.read_by_id(1).status))
+    reader.start()
+    reader.join()
+    assert seen == ["external"]
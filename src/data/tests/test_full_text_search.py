@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.implementations import prp_database
+from src.data.implementations.full_text_search import AnalysisSearch, to_match_expression
+
+
+def _analysis(conn, name, prompt, response, timestamp):
+    session_id = conn.execute(
+        "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp, status) VALUES (?, ?, ?)",
+        (name, timestamp, "completed_successfully"),
+    ).lastrowid
+    prompt_id = conn.execute(
+        "INSERT INTO generated_prompts (session_id, prompt_content, creation_timestamp) VALUES (?, ?, ?)",
+        (session_id, prompt, timestamp),
+    ).lastrowid
+    result_id = conn.execute(
+        "INSERT INTO ai_analysis_results (prompt_id, ai_response_raw, response_timestamp) VALUES (?, ?, ?)",
+        (prompt_id, response, timestamp),
+    ).lastrowid
+    return session_id, prompt_id, result_id
+
+
+def test_existing_rows_are_indexed_and_ranked(test_db):
+    with prp_database.transaction(test_db) as conn:
+        prp_database.initialize_schema(conn)
+        _analysis(conn, "a", "requirements.txt lists torch and numpy", "Needs CUDA 12 for torch.", "2025-01-01T00:00:00")
+        _analysis(conn, "b", "requirements.txt lists flask", "ModuleNotFoundError: No module named 'torch'",
+                  "2025-03-01T00:00:00")
+
+    search = AnalysisSearch(test_db)  # Built over the rows written before the index existed.
+    hits = search.search("torch")
+    assert {(hit.kind, hit.session_id) for hit in hits} == {("prompt", 1), ("result", 1), ("result", 2)}
+    assert all("[torch]" in hit.snippet for hit in hits)
+
+    error = search.search("ModuleNotFoundError: torch", kinds=["result"])
+    assert [hit.session_id for hit in error] == [2]
+    assert [hit.session_id for hit in search.search("torch", since="2025-02-01T00:00:00")] == [2]
+    assert [hit.kind for hit in search.search("torch", session_id=1, kinds=["prompt"])] == ["prompt"]
+
+
+def test_triggers_keep_the_index_in_sync(test_db):
+    search = AnalysisSearch(test_db)
+    with prp_database.transaction(test_db) as conn:
+        _, prompt_id, result_id = _analysis(conn, "a", "uses pandas", "pandas is fine", "2025-01-01T00:00:00")
+    assert len(search.search("pandas")) == 2
+
+    with prp_database.transaction(test_db) as conn:
+        conn.execute("UPDATE ai_analysis_results SET ai_response_raw = 'polars instead' WHERE result_id = ?", (result_id,))
+    assert [hit.kind for hit in search.search("pandas")] == ["prompt"]
+    assert [hit.kind for hit in search.search("polars")] == ["result"]
+    assert search.search("pand*", kinds=["prompt"])[0].row_id == prompt_id
+
+    with prp_database.transaction(test_db) as conn:
+        conn.execute("DELETE FROM ai_analysis_results WHERE result_id = ?", (result_id,))
+    assert search.search("polars") == []
+
+
+def test_query_escaping_and_errors(test_db):
+    assert to_match_expression('cuda_runtime "12"') == '"cuda_runtime" """12"""'
+    search = AnalysisSearch(test_db)
+    with pytest.raises(ValueError):
+        search.search("   ")
+    with pytest.raises(ValueError):
+        search.search("AND OR (", raw=True)
@@ -0,0 +1,109 @@
+import sys
+import time
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.implementations.job_queue import (
+    JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, SQLiteJobQueue,
+)
+
+
+def _session(queue: SQLiteJobQueue) -> int:
+    conn = queue.pool.connection()
+    with conn:
+        return conn.execute(
+            "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES (?, ?)",
+            ("/repos/a", "2025-01-01T00:00:00"),
+        ).lastrowid
+
+
+def _session_status(queue: SQLiteJobQueue, session_id: int) -> str:
+    return queue.pool.connection().execute(
+        "SELECT status FROM analysis_sessions WHERE session_id = ?", (session_id,)
+    ).fetchone()[0]
+
+
+def test_claims_by_priority_then_age_and_filters_by_kind(test_db):
+    queue = SQLiteJobQueue(test_db)
+    try:
+        low = queue.enqueue("analysis", {"n": 1})
+        high = queue.enqueue("analysis", {"n": 2}, priority=5)
+        later = queue.enqueue("analysis", {"n": 3}, priority=5)
+        other = queue.enqueue("model_similarity", {}, priority=9)
+        queue.enqueue("analysis", {"n": 4}, priority=9, delay=60)  # Not due yet.
+
+        claimed = [queue.claim(["analysis"]).job_id for _ in range(3)]
+        assert claimed == [high, later, low]
+        assert queue.claim(["analysis"]) is None
+        assert queue.claim().job_id == other
+        assert queue.counts() == {JOB_QUEUED: 1, JOB_RUNNING: 4}
+    finally:
+        queue.close()
+
+
+def test_session_status_follows_the_job_and_results_are_stored(test_db):
+    queue = SQLiteJobQueue(test_db)
+    try:
+        session_id = _session(queue)
+        job_id = queue.enqueue("analysis", {"repo_path": "/repos/a"}, session_id=session_id)
+        assert _session_status(queue, session_id) == "queued"
+
+        job = queue.claim()
+        assert (job.job_id, job.attempts, job.payload) == (job_id, 1, {"repo_path": "/repos/a"})
+        assert _session_status(queue, session_id) == "running"
+
+        assert queue.complete(job, {"result_id": 7})
+        stored = queue.get(job_id)
+        assert (stored.state, stored.result, stored.lease_owner) == (JOB_SUCCEEDED, {"result_id": 7}, None)
+        assert _session_status(queue, session_id) == "completed_successfully"
+    finally:
+        queue.close()
+
+
+def test_failures_back_off_then_fail_for_good(test_db):
+    queue = SQLiteJobQueue(test_db, max_attempts=2, retry_delay=0.05)
+    try:
+        session_id = _session(queue)
+        job_id = queue.enqueue("analysis", {}, session_id=session_id)
+
+        assert queue.fail(queue.claim(), "timeout talking to the AI service")
+        retried = queue.get(job_id)
+        assert (retried.state, retried.error) == (JOB_QUEUED, "timeout talking to the AI service")
+        assert queue.claim() is None  # Backing off.
+        time.sleep(0.06)
+
+        assert queue.fail(queue.claim(), "timeout again")
+        assert queue.get(job_id).state == JOB_FAILED
+        assert _session_status(queue, session_id) == "failed"
+
+        permanent = queue.enqueue("analysis", {}, session_id=session_id)
+        queue.fail(queue.claim(), "no such repository", retry=False, session_status="failed_data_collection")
+        assert queue.get(permanent).attempts == 1
+        assert _session_status(queue, session_id) == "failed_data_collection"
+    finally:
+        queue.close()
+
+
+def test_expired_leases_are_reclaimed_and_the_stale_worker_is_ignored(test_db):
+    queue = SQLiteJobQueue(test_db, visibility_timeout=0.05, max_attempts=2)
+    try:
+        job_id = queue.enqueue("analysis", {})
+        stale = queue.claim(worker="worker-a")
+        assert queue.claim(worker="worker-b") is None
+        time.sleep(0.06)
+
+        fresh = queue.claim(worker="worker-b")
+        assert (fresh.job_id, fresh.attempts) == (job_id, 2)
+        assert not queue.heartbeat(stale)
+        assert not queue.complete(stale, "late result")
+        assert queue.heartbeat(fresh)
+
+        time.sleep(0.06)  # Second lease expires too: no attempts left.
+        assert queue.claim(worker="worker-c") is None
+        assert queue.get(job_id).state == JOB_FAILED
+    finally:
+        queue.close()
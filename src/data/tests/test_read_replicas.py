@@ -0,0 +1,96 @@
+import sys
+import time
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.implementations import prp_database
+from src.data.implementations.full_text_search import AnalysisSearch
+from src.data.implementations.read_replicas import ReplicaManager
+
+
+def _add_session(db_path: Path, repo: str) -> None:
+    with prp_database.transaction(db_path) as conn:
+        prp_database.initialize_schema(conn)
+        session_id = conn.execute(
+            "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES (?, ?)",
+            (repo, "2025-01-01T00:00:00"),
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO generated_prompts (session_id, prompt_content, creation_timestamp) "
+            "VALUES (?, prp_compress('prompt_content', ?), ?)",
+            (session_id, f"{repo} needs torch and cuda. " * 20, "2025-01-01T00:00:00"),
+        )
+
+
+def _sessions(replicas: ReplicaManager) -> int:
+    with replicas.reader() as conn:
+        return conn.execute("SELECT COUNT(*) FROM analysis_sessions").fetchone()[0]
+
+
+def test_reads_use_the_snapshot_until_it_is_refreshed_or_stale(test_db, tmp_path):
+    _add_session(test_db, "/repos/a")
+    replicas = ReplicaManager(test_db, tmp_path, max_staleness=0.2)
+    try:
+        assert _sessions(replicas) == 1 and replicas.fallbacks == 1  # No snapshot yet: the primary answers.
+        first = replicas.refresh()
+        _add_session(test_db, "/repos/b")
+        assert _sessions(replicas) == 1  # Snapshot taken before the second session.
+
+        replicas.refresh()
+        assert _sessions(replicas) == 2
+        assert not first.path.exists()  # Superseded and unread, so deleted.
+
+        time.sleep(0.25)
+        _add_session(test_db, "/repos/c")
+        assert _sessions(replicas) == 3 and replicas.fallbacks == 2  # Too stale: the primary answers.
+    finally:
+        replicas.close()
+    assert not replicas.directory.exists()
+
+
+def test_a_superseded_snapshot_survives_until_its_reader_closes(test_db, tmp_path):
+    _add_session(test_db, "/repos/a")
+    replicas = ReplicaManager(test_db, tmp_path)
+    try:
+        first = replicas.refresh()
+        with replicas.reader() as conn:
+            _add_session(test_db, "/repos/b")
+            replicas.refresh()
+            assert first.path.exists()
+            assert conn.execute("SELECT COUNT(*) FROM generated_prompts").fetchone()[0] == 1
+        assert not first.path.exists()
+    finally:
+        replicas.close()
+
+
+def test_search_runs_on_the_replica_and_decompresses_text(test_db, tmp_path):
+    search = AnalysisSearch(test_db)
+    _add_session(test_db, "/repos/a")
+    with ReplicaManager(test_db, tmp_path, refresh_interval=60) as replicas:
+        replica_search = AnalysisSearch(test_db, replicas=replicas)
+        hits = replica_search.search("cuda", kinds=["prompt"])
+        assert [hit.session_id for hit in hits] == [1] and "[cuda]" in hits[0].snippet
+        _add_session(test_db, "/repos/b")
+        assert len(replica_search.search("cuda")) == 1
+        assert len(search.search("cuda")) == 2
+        assert replicas.fallbacks == 0
+
+
+def test_a_refresh_without_new_commits_keeps_the_snapshot(test_db, tmp_path):
+    _add_session(test_db, "/repos/a")
+    replicas = ReplicaManager(test_db, tmp_path, max_staleness=0.2)
+    try:
+        first = replicas.refresh()
+        time.sleep(0.25)
+        assert replicas.refresh() is first and replicas.unchanged == 1
+        assert _sessions(replicas) == 1 and replicas.fallbacks == 0  # Found current again, so fresh.
+
+        _add_session(test_db, "/repos/b")
+        assert replicas.refresh().generation == 2
+        assert _sessions(replicas) == 2
+    finally:
+        replicas.close()
@@ -0,0 +1,114 @@
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.implementations import prp_database
+from src.data.implementations.blob_store import BlobStore
+from src.data.implementations.full_text_search import AnalysisSearch
+from src.data.implementations.retention import (
+    ArchivedSessionReader, RetentionEngine, RetentionPolicy, incremental_vacuum, list_archives,
+)
+
+NOW = datetime(2025, 6, 1)
+README = "# README\n" + "Run pip install -r requirements.txt before main.py.\n" * 200
+
+
+def _session(conn, repo, timestamp, legacy_snapshot=False):
+    session_id = conn.execute(
+        "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp, status) VALUES (?, ?, ?)",
+        (repo, timestamp, "completed_successfully"),
+    ).lastrowid
+    snapshot = {"files": {"README.md": README + repo}}
+    conn.execute(
+        "INSERT INTO repository_snapshots (session_id, snapshot_data, creation_timestamp) VALUES (?, ?, ?)",
+        (session_id, json.dumps(snapshot) if legacy_snapshot else BlobStore(conn).pack_snapshot(snapshot), timestamp),
+    )
+    conn.execute(
+        "INSERT INTO system_profiles (session_id, profile_timestamp, profile_data) VALUES (?, ?, ?)",
+        (session_id, timestamp, BlobStore(conn).pack_document({"ram_gb": 16})),
+    )
+    prompt_id = conn.execute(
+        "INSERT INTO generated_prompts (session_id, prompt_content, creation_timestamp) VALUES (?, ?, ?)",
+        (session_id, f"Analyze {repo}: " + "torch numpy " * 100, timestamp),
+    ).lastrowid
+    conn.execute(
+        "INSERT INTO ai_analysis_results (prompt_id, ai_response_raw, response_timestamp) VALUES (?, ?, ?)",
+        (prompt_id, f"{repo} needs CUDA 12", timestamp),
+    )
+    return session_id
+
+
+def _populate(db_path):
+    with prp_database.transaction(db_path) as conn:
+        prp_database.initialize_schema(conn)
+        ids = {
+            "old-a": _session(conn, "repo-a", "2023-03-01T00:00:00", legacy_snapshot=True),
+            "old-b": _session(conn, "repo-b", "2024-02-01T00:00:00"),
+            "latest-a": _session(conn, "repo-a", "2024-04-01T00:00:00"),
+            "new-b": _session(conn, "repo-b", "2025-05-20T00:00:00"),
+        }
+    return ids
+
+
+def test_dry_run_reports_without_changing_anything(test_db, tmp_path):
+    _populate(test_db)
+    report = RetentionEngine(test_db, tmp_path, RetentionPolicy(max_age_days=90)).plan(now=NOW)
+    # latest-a is old but is repo-a's newest session, so it stays.
+    assert report.sessions_by_archive == {"prp_archive_2023.db": 1, "prp_archive_2024.db": 1}
+    assert (report.profiles, report.snapshots, report.prompts, report.results) == (2, 2, 2, 2)
+    assert report.estimated_bytes > 0
+    assert list_archives(tmp_path) == {}
+    with prp_database.transaction(test_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM analysis_sessions").fetchone()[0] == 4
+
+
+def test_apply_archives_and_archived_sessions_stay_readable(test_db, tmp_path):
+    ids = _populate(test_db)
+    AnalysisSearch(test_db)  # FTS triggers must follow the deletes.
+    report = RetentionEngine(test_db, tmp_path, RetentionPolicy(max_age_days=90), batch_size=1).apply(now=NOW)
+    assert report.sessions == 2
+    assert set(list_archives(tmp_path)) == {"archive_2023", "archive_2024"}
+
+    with prp_database.transaction(test_db) as conn:
+        remaining = {row[0] for row in conn.execute("SELECT session_id FROM analysis_sessions")}
+        assert remaining == {ids["latest-a"], ids["new-b"]}
+        assert conn.execute("SELECT COUNT(*) FROM ai_analysis_results").fetchone()[0] == 2
+    assert {hit.session_id for hit in AnalysisSearch(test_db).search("CUDA")} == remaining
+
+    with ArchivedSessionReader(test_db, tmp_path) as reader:
+        archived = reader.get_session(ids["old-a"])
+        assert archived["source"] == "archive_2023"
+        assert archived["repository_snapshots"][0]["snapshot_data"]["files"]["README.md"] == README + "repo-a"
+        assert archived["system_profiles"][0]["profile_data"] == {"ram_gb": 16}
+        assert archived["generated_prompts"][0]["prompt_content"].startswith("Analyze repo-a: torch")
+        assert archived["generated_prompts"][0]["results"][0]["ai_response_raw"] == "repo-a needs CUDA 12"
+        assert reader.get_session(ids["new-b"])["source"] == "main"
+        rows = reader.conn.execute(
+            "SELECT source, COUNT(*) FROM all_ai_analysis_results WHERE ai_response_raw LIKE '%CUDA%' GROUP BY source"
+        ).fetchall()
+        assert dict(map(tuple, rows)) == {"main": 2, "archive_2023": 1, "archive_2024": 1}
+
+
+def test_rerun_is_idempotent_and_space_is_reclaimed_incrementally(test_db, tmp_path):
+    _populate(test_db)
+    engine = RetentionEngine(test_db, tmp_path, RetentionPolicy(max_age_days=90, keep_latest_per_repository=0))
+    assert engine.apply(now=NOW).sessions == 3
+    assert engine.apply(now=NOW).sessions == 0
+
+    conn = prp_database.connect(test_db)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 2  # Only new-b's snapshot and the shared profile.
+    conn.executemany("INSERT INTO blobs VALUES (?, 'raw', 1, 1, zeroblob(8192))", [(str(i),) for i in range(50)])
+    conn.commit()
+    conn.execute("DELETE FROM blobs WHERE codec = 'raw' AND raw_size = 1")
+    conn.commit()
+    assert incremental_vacuum(conn, pages_per_step=10) > 10
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    conn.close()
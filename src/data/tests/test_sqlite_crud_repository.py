@@ -0,0 +1,271 @@
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.bootstrap import configure_project_data_dependencies
+from core.dependency_container import DependencyContainer
+from src.data.interfaces.ICrudRepository import ICrudRepository
+from src.data.implementations.mock_model_schema import DB_SCHEMA_CONTENT
+from src.data.implementations.read_replicas import ReplicaManager
+from src.data.implementations.sqlite_crud_repository import (
+    ANALYSIS_SESSIONS, COMPARISONS, MODELS, SYSTEM_PROFILES, SQLiteConnectionPool, SQLiteCrudRepository,
+    create_prp_pool,
+)
+from src.data.obj.entities import AnalysisSession, Comparison, Model, SystemProfile
+
+
+@pytest.fixture
+def pool(test_db):
+    pool = create_prp_pool(test_db)
+    yield pool
+    pool.close_all()
+    for suffix in ("-wal", "-shm"):
+        Path(str(test_db) + suffix).unlink(missing_ok=True)
+
+
+def test_crud_round_trip(pool):
+    repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    created = repo.create(AnalysisSession(target_repository_identifier="/repos/a", analysis_timestamp="t0", status="created"))
+    assert created.session_id == 1
+
+    created.status = "completed_successfully"
+    repo.update(created)
+    assert repo.read_by_id(1) == created
+    assert [s.target_repository_identifier for s in repo.read_all()] == ["/repos/a"]
+
+    repo.delete(1)
+    assert repo.read_by_id(1) is None
+    with pytest.raises(ValueError):
+        repo.update(created)
+
+
+def test_pool_uses_wal_and_one_connection_per_thread(pool):
+    main_conn = pool.connection()
+    assert main_conn is pool.connection()
+    assert main_conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(pool.connection()))
+    worker.start()
+    worker.join()
+    assert seen[0] is not main_conn
+    assert pool.open_connections == 1  # The worker's connection closed when the thread exited.
+    with pytest.raises(sqlite3.ProgrammingError):
+        seen[0].execute("SELECT 1")
+
+
+def test_thread_per_request_does_not_accumulate_connections(pool):
+    repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    for _ in range(20):
+        request = threading.Thread(target=lambda: repo.read_all())
+        request.start()
+        request.join()
+    assert pool.open_connections == 0
+
+
+def test_writes_inside_a_caller_transaction_leave_the_commit_to_it(pool):
+    repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    conn = pool.connection()
+    conn.execute("INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES ('/outer', 't0')")
+    repo.create(AnalysisSession(target_repository_identifier="/inner", analysis_timestamp="t0"))
+    with pytest.raises(sqlite3.IntegrityError):
+        repo.create(AnalysisSession(session_id=1, target_repository_identifier="/dup", analysis_timestamp="t0"))
+    assert conn.in_transaction  # Neither write committed the caller's transaction, and the failure kept it open.
+    conn.rollback()
+    assert repo.read_all() == []
+
+
+def test_readers_are_not_blocked_by_an_open_write_transaction(pool):
+    repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    repo.create(AnalysisSession(target_repository_identifier="/repos/a", analysis_timestamp="t0"))
+
+    writer = pool.connection()
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("UPDATE analysis_sessions SET status = 'uncommitted'")
+    try:
+        result = []
+        reader = threading.Thread(target=lambda: result.append(repo.read_by_id(1)))
+        reader.start()
+        reader.join(timeout=2)
+        assert not reader.is_alive()
+        assert result[0].status is None  # Sees the last committed version.
+    finally:
+        writer.rollback()
+
+
+def test_repositories_register_through_the_container(test_db, monkeypatch):
+    from config import config
+    monkeypatch.setattr(config, "PRP_DB_PATH", test_db)
+    container = DependencyContainer()
+    configure_project_data_dependencies(container)
+    repo = container.resolve(ICrudRepository[AnalysisSession])
+    assert repo is container.resolve(ICrudRepository[AnalysisSession])
+    repo.create(AnalysisSession(target_repository_identifier="/repos/b", analysis_timestamp="t0"))
+    assert len(repo.read_all()) == 1
+    container.resolve(SQLiteConnectionPool).close_all()
+    for suffix in ("-wal", "-shm"):
+        Path(str(test_db) + suffix).unlink(missing_ok=True)
+
+
+def test_reads_go_through_replicas_outside_transactions(pool, tmp_path):
+    writer = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    profiles = SQLiteCrudRepository(SYSTEM_PROFILES, pool)
+    session = writer.create(AnalysisSession(target_repository_identifier="/repos/a", analysis_timestamp="t0"))
+    profile = '{"cpu": {"logical_cores": 4}}'
+    profiles.create(SystemProfile(session_id=session.session_id, profile_timestamp="t0", profile_data=profile))
+    with ReplicaManager(pool.db_path, tmp_path, refresh_interval=60) as replicas:
+        reader = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool, replicas)
+        writer.create(AnalysisSession(target_repository_identifier="/repos/b", analysis_timestamp="t1"))
+        assert [s.session_id for s in reader.read_all()] == [1]  # The snapshot predates the second session.
+        assert reader.read_by_id(2) is None
+        assert [s.session_id for s in reader.iter_all(batch_size=1)] == [1]
+        # Packed columns are reassembled from the snapshot's blobs.
+        assert SQLiteCrudRepository(SYSTEM_PROFILES, pool, replicas).read_by_id(1).profile_data == profile
+
+        conn = pool.connection()
+        conn.execute("INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES ('/c', 't2')")
+        assert reader.read_by_id(3) is not None  # Inside a transaction: its own writes are visible.
+        conn.commit()
+
+        replicas.refresh()
+        assert [s.session_id for s in reader.page(limit=10).items] == [1, 2, 3]
+        assert replicas.fallbacks == 0
+
+
+def test_container_gives_repositories_replicas_when_enabled(test_db, tmp_path, monkeypatch):
+    from config import config
+    monkeypatch.setattr(config, "PRP_DB_PATH", test_db)
+    monkeypatch.setattr(config, "PRP_REPLICA_DIR", tmp_path)
+    monkeypatch.setattr(config, "PRP_REPLICAS_ENABLED", True)
+    monkeypatch.setattr(config, "CRUD_CACHE_ENABLED", False)
+    container = DependencyContainer()
+    configure_project_data_dependencies(container)
+    try:
+        assert container.resolve(ICrudRepository[AnalysisSession]).replicas is container.resolve(ReplicaManager)
+    finally:
+        container.resolve(ReplicaManager).close()
+        container.resolve(SQLiteConnectionPool).close_all()
+
+
+def _sessions(count, prefix="/repos/bulk"):
+    return [AnalysisSession(target_repository_identifier=f"{prefix}/{i}", analysis_timestamp="t0") for i in range(count)]
+
+
+def test_bulk_operations_report_counts_and_generated_ids(pool):
+    repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    repo.create(AnalysisSession(target_repository_identifier="/repos/first", analysis_timestamp="t0"))
+
+    created = repo.create_many(_sessions(1234), chunk_size=100)
+    assert created.affected == 1234
+    assert created.ids == list(range(2, 1236))
+    assert repo.read_by_id(created.ids[-1]).target_repository_identifier == "/repos/bulk/1233"
+
+    items = [repo.read_by_id(i) for i in created.ids[:10]]
+    for item in items:
+        item.status = "completed_successfully"
+    missing = AnalysisSession(session_id=99999, target_repository_identifier="/repos/missing", analysis_timestamp="t0")
+    assert repo.update_many(items + [missing]).affected == 10
+
+    existing = repo.read_by_id(2)
+    existing.status = "upserted"
+    upserted = repo.upsert_many([existing, AnalysisSession(session_id=5000, target_repository_identifier="/repos/k",
+                                                           analysis_timestamp="t0")] + _sessions(2, "/repos/new"))
+    assert upserted.ids == [2, 5000, 1236, 1237]
+    assert repo.read_by_id(2).status == "upserted"
+
+    deleted = repo.delete_many(created.ids[:500] + [123456], chunk_size=64)
+    assert deleted.affected == 500
+    assert len(repo.read_all()) == 1 + 1234 - 500 + 3
+
+
+def test_bulk_create_is_atomic(pool):
+    repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    bad = _sessions(5)
+    bad[3].target_repository_identifier = None  # Violates NOT NULL.
+    with pytest.raises(Exception):
+        repo.create_many(bad, chunk_size=2)
+    assert repo.read_all() == []
+
+
+def test_keyset_pages_cover_the_table_once(pool):
+    repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    repo.create_many(_sessions(25))
+
+    seen, after_key = [], None
+    while True:
+        page = repo.page(after_key=after_key, limit=10)
+        seen.extend(item.session_id for item in page.items)
+        if page.next_key is None:
+            break
+        after_key = page.next_key
+    assert seen == list(range(1, 26))
+    assert [item.session_id for item in repo.iter_all(batch_size=7)] == seen
+
+    projected = repo.page(limit=1, fields=["status"]).items[0]
+    assert (projected.session_id, projected.target_repository_identifier) == (1, "")
+    with pytest.raises(ValueError):
+        repo.page(fields=["no_such_column"])
+
+
+def test_iter_all_memory_stays_flat_when_blob_columns_are_skipped(pool):
+    import tracemalloc
+    from src.data.implementations.sqlite_crud_repository import REPOSITORY_SNAPSHOTS
+    from src.data.obj.entities import RepositorySnapshot
+
+    sessions = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    session_id = sessions.create(AnalysisSession(target_repository_identifier="/repos/a", analysis_timestamp="t0")).session_id
+    snapshots = SQLiteCrudRepository(REPOSITORY_SNAPSHOTS, pool)
+    snapshots.create_many(RepositorySnapshot(session_id=session_id, snapshot_data="x" * 20_000,
+                                             creation_timestamp="t0") for _ in range(500))
+
+    tracemalloc.start()
+    count = sum(1 for _ in snapshots.iter_all(batch_size=50, fields=["session_id", "creation_timestamp"]))
+    projected_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    full = sum(1 for _ in snapshots.iter_all(batch_size=50))
+    streamed_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert count == full == 500
+    assert projected_peak < 1_000_000
+    assert streamed_peak < 5_000_000  # One batch of ~1 MB, not the 10 MB table.
+
+
+def test_entities_are_slotted_and_row_factories_are_compiled_once(pool):
+    repo = SQLiteCrudRepository(ANALYSIS_SESSIONS, pool)
+    repo.create(AnalysisSession(target_repository_identifier="/repos/a", analysis_timestamp="t0"))
+    session = repo.read_by_id(1)
+    assert not hasattr(session, "__dict__")
+    with pytest.raises(AttributeError):
+        session.unknown_field = 1
+
+    assert ANALYSIS_SESSIONS.row_factory() is ANALYSIS_SESSIONS.row_factory()
+    projected = ANALYSIS_SESSIONS.row_factory(("status",))(None, (7, "created"))
+    assert projected == AnalysisSession(session_id=7, status="created")
+    with pytest.raises(ValueError):
+        ANALYSIS_SESSIONS.row_factory(("status=1) or (",))
+
+
+def test_model_and_comparison_mappings(test_db):
+    pool = SQLiteConnectionPool(test_db)
+    try:
+        pool.connection().executescript(DB_SCHEMA_CONTENT)
+        models = SQLiteCrudRepository(MODELS, pool)
+        models.create_many([Model("a-one", "One", "Astro"), Model("b-two", "Two", "Bio")])
+        comparison = SQLiteCrudRepository(COMPARISONS, pool).create(Comparison(model_id_1="a-one", model_id_2="b-two"))
+        assert comparison.comparison_id == 1
+        assert [model.model_id for model in models.read_all()] == ["a-one", "b-two"]
+        with pytest.raises(ValueError):
+            models.create_many([Model(name="No key", domain="Astro")])  # Text keys are never generated.
+    finally:
+        pool.close_all()
+        for suffix in ("-wal", "-shm"):
+            Path(str(test_db) + suffix).unlink(missing_ok=True)
@@ -0,0 +1,195 @@
+import sys
+import sqlite3
+import zlib
+from pathlib import Path
+
+import pytest
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import config
+from src.data.implementations import prp_database, text_codec
+from src.data.implementations.full_text_search import AnalysisSearch, index_stored_text
+from src.data.implementations.sqlite_crud_repository import GENERATED_PROMPTS, SQLiteCrudRepository, create_prp_pool
+from src.data.obj.entities import GeneratedPrompt
+
+TEMPLATE = (
+    "You are an expert build engineer. Analyze the repository below and report the minimum system requirements.\n"
+    "Answer with a JSON block holding minimum.ram_gb, minimum.cpu_cores, minimum.gpu_vram_gb and minimum.disk_gb,\n"
+    "then requires_gpu and requires_cuda, followed by a short justification for every value.\n"
+    "Consider the declared dependencies, the README, Dockerfiles, CI workflows and any notebooks.\n"
+    "## Repository files\n"
+)
+
+
+def _prompt(n: int) -> str:
+    return f"{TEMPLATE}README of repository {n}: uses torch {n}.0 and numpy.\n"
+
+
+@pytest.fixture
+def codec_enabled(monkeypatch):
+    monkeypatch.setattr(config, "PRP_TEXT_CODEC_ENABLED", True)
+
+
+def test_long_text_is_stored_compressed_and_read_back_transparently(test_db, codec_enabled):
+    pool = create_prp_pool(test_db)
+    try:
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES ('/r', 't0')")
+        prompts = SQLiteCrudRepository(GENERATED_PROMPTS, pool)
+        long = prompts.create(GeneratedPrompt(session_id=1, prompt_content=_prompt(1), creation_timestamp="t0"))
+        short = prompts.create(GeneratedPrompt(session_id=1, prompt_content="hi", creation_timestamp="t0"))
+
+        stored = dict(pool.connection().execute("SELECT prompt_id, typeof(prompt_content) FROM generated_prompts"))
+        assert stored == {long.prompt_id: "blob", short.prompt_id: "text"}
+        assert prompts.read_by_id(long.prompt_id).prompt_content == _prompt(1)
+        assert [p.prompt_content for p in prompts.read_all()] == [_prompt(1), "hi"]
+        assert prompts.page(fields=["session_id"]).items[0].prompt_content == ""  # Not selected, not decompressed.
+
+        long.prompt_content = _prompt(2)
+        prompts.update(long)
+        assert prompts.read_by_id(long.prompt_id).prompt_content == _prompt(2)
+    finally:
+        pool.close_all()
+
+
+def test_trained_dictionary_shrinks_values_and_is_found_by_id(test_db):
+    samples = [_prompt(n) for n in range(50)]
+    data = text_codec.train_dictionary(samples)
+    assert 0 < len(data) <= text_codec.MAX_DICTIONARY_BYTES
+    dictionary = (text_codec.zlib.adler32(data), data)
+
+    plain = text_codec.compress_text(_prompt(99))
+    primed = text_codec.compress_text(_prompt(99), dictionary)
+    assert len(primed) < len(plain) / 3
+
+    text_codec._dictionaries.clear()
+    conn = prp_database.connect(test_db)
+    with conn:
+        prp_database.initialize_schema(conn)
+        conn.execute("INSERT INTO codec_dictionaries VALUES (?, 'prompt_content', 50, 't0', ?)", (dictionary[0], data))
+    conn.close()
+    assert text_codec.decompress_text(primed, str(test_db)) == _prompt(99)  # Loaded on a cache miss.
+
+
+def _legacy_database(db_path: Path) -> None:
+    """A prp.db from before the codec: plain text rows, already indexed for search."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(prp_database.PRP_SCHEMA)
+    conn.execute("INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES ('/r', 't0')")
+    conn.executemany("INSERT INTO generated_prompts (session_id, prompt_content, creation_timestamp) VALUES (1, ?, 't0')",
+                     [(_prompt(n),) for n in range(30)])
+    conn.commit()
+    conn.close()
+    AnalysisSearch(db_path)
+
+
+def test_migration_compresses_existing_rows_and_keeps_search_working(test_db, codec_enabled):
+    _legacy_database(test_db)
+    conn = prp_database.connect(test_db)
+    assert not text_codec.register_text_codec(conn).enabled  # Not opted in yet: writes stay plain text.
+    conn.close()
+
+    report = text_codec.compress_existing_rows(test_db, batch_size=7)
+    assert (report.dictionaries_trained, report.rows_rewritten, report.rows_compressed) == (1, 30, 30)
+    assert report.bytes_after < report.bytes_before / 3
+    assert text_codec.compress_existing_rows(test_db).rows_rewritten == 0  # Nothing left to do.
+
+    hits = AnalysisSearch(test_db).search("torch 7.0", kinds=["prompt"])
+    assert [hit.row_id for hit in hits] == [8]
+    assert "[torch]" in hits[0].snippet
+
+    conn = prp_database.connect(test_db)
+    try:
+        with conn:
+            prompt_id = conn.execute("INSERT INTO generated_prompts (session_id, prompt_content, creation_timestamp) "
+                                     "VALUES (1, prp_compress('prompt_content', ?), 't1')",
+                                     (_prompt(100) + "uses jax\n",)).lastrowid
+            index_stored_text(conn, "generated_prompts", [(prompt_id, _prompt(100) + "uses jax\n")])
+            conn.execute("DELETE FROM generated_prompts WHERE prompt_id = 8")
+        assert conn.execute("SELECT typeof(prompt_content) FROM generated_prompts WHERE prompt_id = 31").fetchone()[0] == "blob"
+    finally:
+        conn.close()
+    search = AnalysisSearch(test_db)
+    assert [hit.row_id for hit in search.search("jax")] == [31]
+    assert search.search("torch 7.0", kinds=["prompt"]) == []
+
+
+def test_migration_compresses_rows_without_opting_new_writes_in(test_db):
+    _legacy_database(test_db)
+    report = text_codec.compress_existing_rows(test_db)
+    assert report.rows_compressed == 30
+    conn = prp_database.connect(test_db)
+    try:
+        assert conn.execute("SELECT typeof(prp_compress('prompt_content', ?))", (_prompt(1),)).fetchone()[0] == "text"
+    finally:
+        conn.close()
+
+
+def test_codec_is_off_by_default(test_db):
+    conn = prp_database.connect(test_db)
+    try:
+        prp_database.initialize_schema(conn)
+        assert conn.execute("SELECT typeof(prp_compress('prompt_content', ?))", (_prompt(1),)).fetchone()[0] == "text"
+    finally:
+        conn.close()
+
+
+def test_compressed_writes_are_searchable_and_plain_connections_can_write(test_db, codec_enabled):
+    pool = create_prp_pool(test_db)
+    try:
+        search = AnalysisSearch(test_db)
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES ('/r', 't0')")
+        prompts = SQLiteCrudRepository(GENERATED_PROMPTS, pool)
+        stored = prompts.create(GeneratedPrompt(session_id=1, prompt_content=_prompt(1) + "uses jax\n", creation_timestamp="t0"))
+        assert [hit.row_id for hit in search.search("jax")] == [stored.prompt_id]
+        stored.prompt_content = _prompt(2) + "uses flax\n"
+        prompts.update(stored)
+        assert search.search("jax") == []
+        assert [hit.row_id for hit in search.search("flax")] == [stored.prompt_id]
+    finally:
+        pool.close_all()
+
+    plain = sqlite3.connect(test_db)  # No SQL functions registered, as in the sqlite3 shell.
+    try:
+        with plain:
+            plain.execute("INSERT INTO generated_prompts (session_id, prompt_content, creation_timestamp) VALUES (1, 'uses mlx', 't1')")
+            plain.execute("DELETE FROM generated_prompts WHERE prompt_id = ?", (stored.prompt_id,))
+    finally:
+        plain.close()
+    assert search.search("flax") == []
+    assert [hit.row_id for hit in search.search("mlx")] == [stored.prompt_id + 1]
+
+
+def test_dictionaries_with_the_same_id_are_told_apart(test_db):
+    first = text_codec.train_dictionary([_prompt(n) for n in range(20)])
+    other = text_codec.train_dictionary([_prompt(n).upper() for n in range(20)])
+    # A second dictionary under the same id, as another database could hold.
+    text_codec._dictionaries.clear()
+    text_codec._cache_dictionary(zlib.adler32(first), other)
+    text_codec._cache_dictionary(zlib.adler32(first), first)
+    primed = text_codec.compress_text(_prompt(99), (zlib.adler32(first), first))
+    assert text_codec.decompress_text(primed) == _prompt(99)
+
+    conn = prp_database.connect(test_db)
+    try:
+        with conn:
+            prp_database.initialize_schema(conn)
+            conn.execute("INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES ('/r', 't0')")
+            conn.executemany("INSERT INTO generated_prompts (session_id, prompt_content, creation_timestamp) VALUES (1, ?, 't0')",
+                             [(_prompt(n),) for n in range(20)])
+            conn.execute("DELETE FROM codec_dictionaries")
+            trained = text_codec.train_dictionary(text_codec.decompress_text(value) for (value,) in
+                                                  conn.execute("SELECT prompt_content FROM generated_prompts"))
+            conn.execute("INSERT INTO codec_dictionaries VALUES (?, 'prompt_content', 1, 't0', ?)",
+                         (zlib.adler32(trained), b"an unrelated dictionary"))  # Takes the id the new one would get.
+            dictionary_id = text_codec.train_column_dictionary(conn, "prompt_content")
+        assert dictionary_id != zlib.adler32(trained)
+        data = conn.execute("SELECT data FROM codec_dictionaries WHERE dictionary_id = ?", (dictionary_id,)).fetchone()[0]
+        assert zlib.adler32(data) == dictionary_id
+    finally:
+        conn.close()
@@ -0,0 +1,117 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.implementations.blob_store import is_manifest
+from src.data.implementations.sqlite_crud_repository import (
+    REPOSITORY_SNAPSHOTS, SYSTEM_PROFILES, SQLiteCrudRepository, create_prp_pool,
+)
+from src.data.implementations.unit_of_work import UnitOfWork, WriteBehindWriter
+from src.data.obj.entities import (
+    AIAnalysisResult, AnalysisSession, GeneratedPrompt, RepositorySnapshot, SystemProfile,
+)
+
+
+@pytest.fixture
+def pool(test_db):
+    pool = create_prp_pool(test_db)
+    yield pool
+    pool.close_all()
+    for suffix in ("-wal", "-shm"):
+        Path(str(test_db) + suffix).unlink(missing_ok=True)
+
+
+def _analysis(uow, name):
+    """Buffers the full lifecycle of one analysis, children added before parents are stored."""
+    session = uow.add(AnalysisSession(target_repository_identifier=name, analysis_timestamp="t0", status="completed"))
+    uow.add(SystemProfile(profile_timestamp="t0", profile_data="{}"), session_id=session)
+    uow.add(RepositorySnapshot(snapshot_data="{}", creation_timestamp="t0"), session_id=session)
+    prompt = uow.add(GeneratedPrompt(prompt_content="prompt", creation_timestamp="t0"), session_id=session)
+    result = uow.add(AIAnalysisResult(ai_response_raw="raw", response_timestamp="t0"), prompt_id=prompt)
+    return session, prompt, result
+
+
+def _count(pool, table):
+    return pool.connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_unit_of_work_writes_the_lifecycle_in_one_transaction(pool):
+    conn = pool.connection()
+    commits = []
+    conn.set_trace_callback(lambda sql: commits.append(sql) if sql == "COMMIT" else None)
+    with UnitOfWork(pool) as uow:
+        session, prompt, result = _analysis(uow, "/repos/a")
+        assert session.session_id is None  # Nothing is written until the block ends.
+    conn.set_trace_callback(None)
+
+    assert len(commits) == 1
+    assert result.prompt_id == prompt.prompt_id
+    assert conn.execute("SELECT session_id FROM generated_prompts").fetchone()[0] == session.session_id
+    assert _count(pool, "ai_analysis_results") == 1
+
+
+def test_profiles_and_snapshots_are_stored_as_blob_manifests(pool):
+    profile_json = json.dumps({"cpu": {"model": "x" * 500}})
+    snapshot_json = json.dumps({"files": {"README.md": "# Demo " * 100}})
+    with UnitOfWork(pool) as uow:
+        session = uow.add(AnalysisSession(target_repository_identifier="/repos/a", analysis_timestamp="t0"))
+        profile = uow.add(SystemProfile(profile_timestamp="t0", profile_data=profile_json), session_id=session)
+        snapshot = uow.add(RepositorySnapshot(snapshot_data=snapshot_json, creation_timestamp="t0"), session_id=session)
+
+    conn = pool.connection()
+    for table, column in (("system_profiles", "profile_data"), ("repository_snapshots", "snapshot_data")):
+        assert is_manifest(json.loads(conn.execute(f"SELECT {column} FROM {table}").fetchone()[0]))
+    assert _count(pool, "blobs") == 2
+    assert SQLiteCrudRepository(SYSTEM_PROFILES, pool).read_by_id(profile.profile_id).profile_data == profile_json
+    snapshots = SQLiteCrudRepository(REPOSITORY_SNAPSHOTS, pool)
+    assert json.loads(snapshots.read_by_id(snapshot.snapshot_id).snapshot_data) == json.loads(snapshot_json)
+    assert json.loads(snapshots.page().items[0].snapshot_data) == json.loads(snapshot_json)
+
+
+def test_failed_unit_leaves_no_partial_state(pool):
+    uow = UnitOfWork(pool)
+    session, _, result = _analysis(uow, "/repos/a")
+    result.ai_response_raw = None  # Violates NOT NULL on the last table written.
+    with pytest.raises(Exception):
+        uow.commit()
+    assert _count(pool, "analysis_sessions") == 0
+    assert session.session_id is None  # Generated keys are reset, so the unit can be fixed and retried.
+
+    result.ai_response_raw = "raw"
+    assert uow.commit() == 5
+    assert _count(pool, "ai_analysis_results") == 1
+
+
+def test_write_behind_groups_units_and_isolates_failures(pool):
+    with WriteBehindWriter(pool, max_units=100, max_delay=0.2) as writer:
+        futures, lock = [], threading.Lock()
+
+        def produce(offset):
+            for i in range(10):
+                uow = UnitOfWork()
+                _, _, result = _analysis(uow, f"/repos/{offset + i}")
+                if offset + i == 7:
+                    result.ai_response_raw = None
+                with lock:
+                    futures.append(writer.submit(uow))
+
+        producers = [threading.Thread(target=produce, args=(n * 10,)) for n in range(4)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+
+    failed = [future for future in futures if future.exception() is not None]
+    assert len(failed) == 1
+    assert _count(pool, "analysis_sessions") == 39
+    assert _count(pool, "ai_analysis_results") == 39
+    assert writer.stats["units"] == 39
+    assert writer.stats["transactions"] < 39
@@ -13,11 +13,21 @@ def create_app(container: DependencyContainer) -> Flask:
     # from custom routes. The template_folder points to the correct location.
     app = Flask(__name__, static_folder=None, template_folder="templates")
     CORS(app) # Enable CORS for all routes
+    # Blueprints resolve shared services (e.g. the prp.db ReplicaManager) from the container.
+    app.extensions['container'] = container
 
     # Register the brand routes blueprint
     from routes.brand_routes import brand_bp
     app.register_blueprint(brand_bp)
 
+    # Register the analysis search API blueprint
+    from src.presentation.api_server.flask_app.routes.search_routes import search_bp
+    app.register_blueprint(search_bp)
+
+    # Register the background job API blueprint (token-protected, see config.JOBS_API_TOKEN)
+    from src.presentation.api_server.flask_app.routes.job_routes import jobs_bp
+    app.register_blueprint(jobs_bp)
+
     # Route for favicon.ico at the root, as browsers expect it there
     @app.route('/favicon.ico')
     def serve_favicon():
@@ -51,4 +61,4 @@ def create_app(container: DependencyContainer) -> Flask:
     def internal_server_error(e):
         return render_template('500.html', app_name=config.APP_NAME), 500
 
-    return app
\ No newline at end of file
+    return app
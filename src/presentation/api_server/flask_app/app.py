@@ -17,6 +17,8 @@ from config.config import DEBUG_MODE
 # Import the blueprints for the routes
 from src.presentation.api_server.flask_app.routes.main_routes import main_bp
 from src.presentation.api_server.flask_app.routes.brand_routes import brand_bp
+from src.presentation.api_server.flask_app.routes.search_routes import search_bp
+from src.presentation.api_server.flask_app.routes.job_routes import jobs_bp
 
 def create_app():
     """Create and configure an instance of the Flask application."""
@@ -25,9 +27,11 @@ def create_app():
     # Register blueprints
     app.register_blueprint(main_bp)
     app.register_blueprint(brand_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(jobs_bp)
 
     return app
 
 if __name__ == '__main__':
     app = create_app()
-    app.run(debug=DEBUG_MODE, port=5000)
\ No newline at end of file
+    app.run(debug=DEBUG_MODE, port=5000)
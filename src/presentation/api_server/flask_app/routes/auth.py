@@ -0,0 +1,23 @@
+import hmac
+
+from flask import current_app, jsonify, request
+
+# Import the project's configuration to get the API token
+from config import config
+
+
+def require_token():
+    """
+    before_request hook shared by the job and search APIs: refuses requests without
+    "Authorization: Bearer <JOBS_API_TOKEN>" (app.config['JOBS_API_TOKEN'] overrides config).
+    """
+    token = current_app.config.get('JOBS_API_TOKEN', config.JOBS_API_TOKEN)
+    if not token:
+        return jsonify({'error': 'This API is disabled until JOBS_API_TOKEN is set.'}), 403
+    scheme, _, supplied = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(supplied.strip().encode(), token.encode()):
+        response = jsonify({'error': 'A valid bearer token is required.'})
+        response.status_code = 401
+        response.headers['WWW-Authenticate'] = 'Bearer'
+        return response
+    return None
@@ -0,0 +1,100 @@
+from pathlib import Path
+from typing import Optional
+
+from flask import Blueprint, current_app, jsonify, request, url_for
+
+# Import the project's configuration to get the database path
+from config import config
+from src.business.ai.analysis_jobs import DEFAULT_ANALYSIS_TEMPLATE, enqueue_analysis
+from src.business.ai.batch_analysis import DEFAULT_TEMPLATE_DIR
+from src.business.ai.prompt_renderer import PromptTemplateLoader
+from src.data.implementations.job_queue import SQLiteJobQueue
+from src.presentation.api_server.flask_app.routes.auth import require_token
+
+# Create a Blueprint for the background job API. Requests only enqueue and read job rows;
+# the analyses themselves run in the job workers (admin/run_job_workers.py).
+# Every endpoint needs "Authorization: Bearer <JOBS_API_TOKEN>"; analyses are limited to
+# repositories under ANALYSIS_REPO_ROOTS and templates in the prompt template directory.
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+jobs_bp.before_request(require_token)
+
+
+def _allowed_repo_path(repo_path: str) -> Optional[str]:
+    """The resolved path when it lies under one of the allowed roots (app.config['ANALYSIS_REPO_ROOTS'] overrides config)."""
+    resolved = Path(repo_path).resolve()
+    roots = current_app.config.get('ANALYSIS_REPO_ROOTS', config.ANALYSIS_REPO_ROOTS)
+    if any(resolved.is_relative_to(Path(root).resolve()) for root in roots):
+        return str(resolved)
+    return None
+
+
+def _get_templates() -> PromptTemplateLoader:
+    """The templates analyses may use (app.config['PROMPT_TEMPLATE_DIR'] overrides the default directory)."""
+    templates = current_app.extensions.get('prompt_templates')
+    if templates is None:
+        templates = PromptTemplateLoader(current_app.config.get('PROMPT_TEMPLATE_DIR', DEFAULT_TEMPLATE_DIR))
+        current_app.extensions['prompt_templates'] = templates
+    return templates
+
+
+def _get_queue() -> SQLiteJobQueue:
+    """One SQLiteJobQueue per app; the database path can be overridden with app.config['PRP_DB_PATH']."""
+    queue = current_app.extensions.get('job_queue')
+    if queue is None:
+        queue = SQLiteJobQueue(current_app.config.get('PRP_DB_PATH', config.PRP_DB_PATH))
+        current_app.extensions['job_queue'] = queue
+    return queue
+
+
+def _job_response(job, status_code: int = 200):
+    body = job.to_dict()
+    body['status_url'] = url_for('jobs.get_job', job_id=job.job_id)
+    response = jsonify(body)
+    response.status_code = status_code
+    if status_code == 202:
+        response.headers['Location'] = body['status_url']
+    return response
+
+
+@jobs_bp.route('/analyses', methods=['POST'])
+def enqueue_analysis_job():
+    """
+    Queues an analysis of a repository and returns 202 with the job; poll its status_url.
+    JSON body: repo_path (required), template_filename, priority (higher runs first), user_notes.
+    """
+    body = request.get_json(silent=True) or {}
+    repo_path = str(body.get('repo_path') or '').strip()
+    if not repo_path:
+        return jsonify({'error': "Field 'repo_path' is required."}), 400
+    allowed_path = _allowed_repo_path(repo_path)
+    if allowed_path is None:
+        return jsonify({'error': f"Repository '{repo_path}' is not under an allowed analysis root."}), 403
+    template_filename = str(body.get('template_filename') or DEFAULT_ANALYSIS_TEMPLATE)
+    template_path = _get_templates().resolve(template_filename)
+    if template_path is None or not template_path.is_file():
+        return jsonify({'error': f"Unknown prompt template '{template_filename}'."}), 400
+    try:
+        priority = int(body.get('priority', 0))
+    except (TypeError, ValueError):
+        return jsonify({'error': "Field 'priority' must be an integer."}), 400
+    job = enqueue_analysis(_get_queue(), allowed_path, template_filename,
+                           priority=priority, user_notes=body.get('user_notes'))
+    return _job_response(job, 202)
+
+
+@jobs_bp.route('/<int:job_id>', methods=['GET'])
+def get_job(job_id: int):
+    """The job's state, attempts, last error and result."""
+    job = _get_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': f'Job {job_id} not found.'}), 404
+    return _job_response(job)
+
+
+@jobs_bp.route('', methods=['GET'])
+def list_jobs():
+    """Job counts per state and the newest jobs. Query parameters: state, limit."""
+    queue = _get_queue()
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    jobs = queue.recent(request.args.get('state'), limit)
+    return jsonify({'counts': queue.counts(), 'jobs': [job.to_dict() for job in jobs]})
@@ -0,0 +1,67 @@
+from pathlib import Path
+from typing import Optional
+
+from flask import Blueprint, current_app, jsonify, request
+
+# Import the project's configuration to get the database path
+from config import config
+from src.data.implementations.full_text_search import KIND_PROMPT, KIND_RESULT, AnalysisSearch
+from src.data.implementations.read_replicas import ReplicaManager
+from src.presentation.api_server.flask_app.routes.auth import require_token
+
+# Create a Blueprint for the analysis search API. Prompts and responses describe private
+# repositories, so it takes the job API's bearer token (config.JOBS_API_TOKEN).
+search_bp = Blueprint('search', __name__, url_prefix='/api/search')
+search_bp.before_request(require_token)
+
+MAX_LIMIT = 100
+
+
+def _get_replicas(db_path: Path) -> Optional[ReplicaManager]:
+    """
+    The ReplicaManager singleton of the app's dependency container (see core/bootstrap.py), when
+    app.config['PRP_REPLICAS_ENABLED'] (default config.PRP_REPLICAS_ENABLED) is set and it
+    snapshots the database being searched. Without one, searches read prp.db itself.
+    """
+    if not current_app.config.get('PRP_REPLICAS_ENABLED', config.PRP_REPLICAS_ENABLED):
+        return None
+    container = current_app.extensions.get('container')
+    if container is None:
+        return None
+    replicas = container.resolve(ReplicaManager)
+    if replicas.db_path.resolve() != Path(db_path).resolve():
+        current_app.logger.warning(f"Replicas snapshot {replicas.db_path}, not {db_path}; searching the database itself.")
+        return None
+    return replicas
+
+
+def _get_search() -> AnalysisSearch:
+    """One AnalysisSearch per app; the database path can be overridden with app.config['PRP_DB_PATH']."""
+    search = current_app.extensions.get('analysis_search')
+    if search is None:
+        db_path = current_app.config.get('PRP_DB_PATH', config.PRP_DB_PATH)
+        search = AnalysisSearch(db_path, highlight=('<mark>', '</mark>'), replicas=_get_replicas(db_path))
+        current_app.extensions['analysis_search'] = search
+    return search
+
+
+@search_bp.route('', methods=['GET'])
+def search_analyses():
+    """
+    Full-text search over generated prompts and AI responses.
+    Query parameters: q (required), kind (prompt|result, repeatable), session_id, since, until, limit.
+    """
+    text = request.args.get('q', '').strip()
+    if not text:
+        return jsonify({'error': "Query parameter 'q' is required."}), 400
+    kinds = request.args.getlist('kind') or [KIND_PROMPT, KIND_RESULT]
+    try:
+        session_id = request.args.get('session_id', type=int)
+        limit = min(max(request.args.get('limit', 20, type=int), 1), MAX_LIMIT)
+        hits = _get_search().search(
+            text, kinds=kinds, session_id=session_id,
+            since=request.args.get('since'), until=request.args.get('until'), limit=limit,
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'query': text, 'count': len(hits), 'hits': [hit.to_dict() for hit in hits]})
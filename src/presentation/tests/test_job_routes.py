@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.business.ai.analysis_jobs import DEFAULT_ANALYSIS_TEMPLATE
+from src.presentation.api_server.flask_app.routes.job_routes import jobs_bp
+
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def jobs_app(tmp_path):
+    """A minimal app with only the jobs blueprint, backed by a throwaway prp.db and template directory."""
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / DEFAULT_ANALYSIS_TEMPLATE).write_text("Analyze {{repository_path}}", encoding="utf-8")
+    (tmp_path / "secret.md").write_text("not a template", encoding="utf-8")
+    app = Flask(__name__)
+    app.config.update({"TESTING": True, "PRP_DB_PATH": tmp_path / "prp.db", "JOBS_API_TOKEN": TOKEN,
+                       "ANALYSIS_REPO_ROOTS": [Path("/repos")], "PROMPT_TEMPLATE_DIR": templates})
+    app.register_blueprint(jobs_bp)
+    yield app
+    queue = app.extensions.get("job_queue")
+    if queue is not None:
+        queue.close()
+
+
+@pytest.fixture
+def jobs_client(jobs_app):
+    client = jobs_app.test_client()
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {TOKEN}"
+    return client
+
+
+def test_enqueue_returns_202_and_the_job_can_be_polled(jobs_client):
+    """Enqueueing creates a queued session and job; the Location header points at its status."""
+    response = jobs_client.post("/api/jobs/analyses", json={"repo_path": "/repos/a", "priority": 3})
+    assert response.status_code == 202
+    job = response.get_json()
+    assert (job["state"], job["priority"], job["payload"]["repo_path"]) == ("queued", 3, "/repos/a")
+    assert response.headers["Location"].endswith(f"/api/jobs/{job['job_id']}")
+
+    polled = jobs_client.get(response.headers["Location"]).get_json()
+    assert (polled["job_id"], polled["session_id"], polled["state"]) == (job["job_id"], job["session_id"], "queued")
+    assert jobs_client.get("/api/jobs").get_json()["counts"] == {"queued": 1}
+
+
+def test_job_endpoints_reject_bad_requests(jobs_client):
+    """Missing repositories and bad priorities are 400s; unknown jobs are 404s."""
+    assert jobs_client.post("/api/jobs/analyses", json={}).status_code == 400
+    assert jobs_client.post("/api/jobs/analyses", json={"repo_path": "/repos/r", "priority": "high"}).status_code == 400
+    assert jobs_client.get("/api/jobs/999").status_code == 404
+
+
+def test_job_endpoints_require_the_bearer_token(jobs_app):
+    client = jobs_app.test_client()
+    assert client.get("/api/jobs").status_code == 401
+    assert client.get("/api/jobs", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.post("/api/jobs/analyses", json={"repo_path": "/repos/a"}).status_code == 401
+
+    jobs_app.config["JOBS_API_TOKEN"] = ""  # No token configured: the API stays closed.
+    assert client.get("/api/jobs", headers={"Authorization": "Bearer "}).status_code == 403
+
+
+def test_analyses_are_limited_to_allowed_repositories_and_templates(jobs_client):
+    for repo_path in ("/etc", "/repos/../etc", "relative/repo"):
+        assert jobs_client.post("/api/jobs/analyses", json={"repo_path": repo_path}).status_code == 403
+    for template in ("../secret.md", "/etc/passwd", "missing.md"):
+        response = jobs_client.post("/api/jobs/analyses", json={"repo_path": "/repos/a", "template_filename": template})
+        assert response.status_code == 400
+    response = jobs_client.post("/api/jobs/analyses", json={"repo_path": "/repos/a/../b"})
+    assert response.status_code == 202
+    assert response.get_json()["payload"]["repo_path"] == "/repos/b"
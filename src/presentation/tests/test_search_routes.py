@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+# --- Root Project Path Setup (CRITICAL for Imports) ---
+ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.dependency_container import DependencyContainer
+from src.data.implementations import prp_database
+from src.data.implementations.read_replicas import ReplicaManager
+from src.presentation.api_server.flask_app.routes.search_routes import search_bp
+
+TOKEN = "test-token"
+
+
+def _search_app(tmp_path):
+    """A minimal app with only the search blueprint, backed by a throwaway prp.db."""
+    db_path = tmp_path / "prp.db"
+    with prp_database.transaction(db_path) as conn:
+        prp_database.initialize_schema(conn)
+        session_id = conn.execute(
+            "INSERT INTO analysis_sessions (target_repository_identifier, analysis_timestamp) VALUES (?, ?)",
+            ("/repos/a", "2025-01-01T00:00:00"),
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO generated_prompts (session_id, prompt_content, creation_timestamp) VALUES (?, ?, ?)",
+            (session_id, "Analyze a project that depends on torch.", "2025-01-01T00:00:00"),
+        )
+    app = Flask(__name__)
+    app.config.update({"TESTING": True, "PRP_DB_PATH": db_path, "JOBS_API_TOKEN": TOKEN})
+    app.register_blueprint(search_bp)
+    return app
+
+
+def _client(app):
+    client = app.test_client()
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {TOKEN}"
+    return client
+
+
+@pytest.fixture
+def search_client(tmp_path):
+    return _client(_search_app(tmp_path))
+
+
+def test_search_endpoint_returns_ranked_hits(search_client):
+    """The search API returns JSON hits with highlighted snippets."""
+    response = search_client.get("/api/search?q=torch&kind=prompt")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["count"] == 1
+    assert body["hits"][0]["session_id"] == 1
+    assert "<mark>torch</mark>" in body["hits"][0]["snippet"]
+
+
+def test_search_endpoint_rejects_bad_requests(search_client):
+    """Missing queries and unknown kinds are reported as 400s."""
+    assert search_client.get("/api/search").status_code == 400
+    assert search_client.get("/api/search?q=torch&kind=models").status_code == 400
+
+
+def test_search_requires_the_bearer_token(tmp_path):
+    """Searches need the job API's token, and are refused while none is configured."""
+    app = _search_app(tmp_path)
+    client = app.test_client()
+    response = client.get("/api/search?q=torch")
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert client.get("/api/search?q=torch", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    app.config["JOBS_API_TOKEN"] = ""
+    assert client.get("/api/search?q=torch", headers={"Authorization": "Bearer "}).status_code == 403
+
+
+def test_search_reads_the_containers_replicas(tmp_path):
+    """With replicas enabled, searches use the container's ReplicaManager instead of starting another."""
+    app = _search_app(tmp_path)
+    app.config["PRP_REPLICAS_ENABLED"] = True
+    with ReplicaManager(app.config["PRP_DB_PATH"], tmp_path / "replicas", refresh_interval=60) as replicas:
+        container = DependencyContainer()
+        container.register_instance(ReplicaManager, replicas)
+        app.extensions["container"] = container
+        response = _client(app).get("/api/search?q=torch")
+        assert response.get_json()["count"] == 1
+        assert app.extensions["analysis_search"].replicas is replicas
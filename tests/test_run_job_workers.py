@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Tests for admin/run_job_workers.py: the script bootstraps its own AI service and
+collector, and with --drain it exits once the queued analyses have run.
+"""
+
+import sys
+import importlib.util
+from pathlib import Path
+import pytest
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from src.business.ai.analysis_jobs import enqueue_analysis
+from src.data.implementations.job_queue import JOB_SUCCEEDED, SQLiteJobQueue
+
+SCRIPT = PROJECT_ROOT / "admin" / "run_job_workers.py"
+
+
+@pytest.fixture(scope="module")
+def run_job_workers():
+    spec = importlib.util.spec_from_file_location("run_job_workers", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_drain_runs_a_queued_analysis_and_exits(run_job_workers, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "GOOGLE_API_KEY", None)  # The offline AI service.
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "README.md").write_text("# Demo", encoding="utf-8")
+    db_path = tmp_path / "prp.db"
+    queue = SQLiteJobQueue(db_path)
+    try:
+        job = enqueue_analysis(queue, str(repo))
+    finally:
+        queue.close()
+
+    run_job_workers.main(["--db", str(db_path), "--threads", "1", "--processes", "0",
+                          "--poll-interval", "0.05", "--drain"])
+
+    queue = SQLiteJobQueue(db_path)
+    try:
+        done = queue.get(job.job_id)
+        assert done.state == JOB_SUCCEEDED, done.error
+        conn = queue.pool.connection()
+        prompt = conn.execute(
+            "SELECT prompt_content FROM generated_prompts WHERE prompt_id = ?",
+            (done.result["prompt_id"],),
+        ).fetchone()[0]
+        assert "# Demo" in prompt
+        indexed = conn.execute(
+            "SELECT COUNT(*) FROM repository_file_index WHERE repository_identifier = ?",
+            (str(repo.resolve()),),
+        ).fetchone()[0]
+        assert indexed == 1
+    finally:
+        queue.close()